@@ -0,0 +1,27 @@
+-- ============================================================================
+-- Migration 004: Sync Log Checkpoints
+-- Date: 2026-10-16
+--
+-- Adds:
+--   1. checkpoint column to sync_logs (JSON progress used by `--resume`)
+--
+-- Safe to run multiple times (checks IF NOT EXISTS).
+-- Works on MySQL 5.7+ / MariaDB 10.3+.
+--
+-- For SQLite: use `python setup-dev-db.py --reset` instead.
+-- ============================================================================
+
+-- 1. Add checkpoint column to sync_logs
+SET @col_exists = (
+    SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'sync_logs'
+      AND COLUMN_NAME = 'checkpoint'
+);
+SET @sql = IF(@col_exists = 0,
+    'ALTER TABLE sync_logs ADD COLUMN checkpoint MEDIUMTEXT NULL COMMENT ''JSON resume state while running/failed, NULL once done'' AFTER error_message',
+    'SELECT ''checkpoint column already exists'' AS status'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,28 @@
+-- ============================================================================
+-- Migration 005: Advertiser Ads Freshness
+-- Date: 2026-10-16
+--
+-- Adds:
+--   1. ads_synced_at column to advertisers (used by SYNC_ADS_FRESH_HOURS to
+--      skip re-fetching ads for unchanged advertisers)
+--
+-- Safe to run multiple times (checks IF NOT EXISTS).
+-- Works on MySQL 5.7+ / MariaDB 10.3+.
+--
+-- For SQLite: use `python setup-dev-db.py --reset` instead.
+-- ============================================================================
+
+-- 1. Add ads_synced_at column to advertisers
+SET @col_exists = (
+    SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'advertisers'
+      AND COLUMN_NAME = 'ads_synced_at'
+);
+SET @sql = IF(@col_exists = 0,
+    'ALTER TABLE advertisers ADD COLUMN ads_synced_at TIMESTAMP NULL COMMENT ''Last time this advertiser''''s ads were fetched in full'' AFTER raw_hash',
+    'SELECT ''ads_synced_at column already exists'' AS status'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,73 @@
+-- ============================================================================
+-- Migration 006: Sharded Sync Runs
+-- Date: 2026-10-16
+--
+-- Adds:
+--   1. run_id, shard_index, shard_count columns to sync_logs (`--shard i/N`)
+--   2. idx_run index on sync_logs.run_id
+--
+-- Safe to run multiple times (checks IF NOT EXISTS).
+-- Works on MySQL 5.7+ / MariaDB 10.3+.
+--
+-- For SQLite: use `python setup-dev-db.py --reset` instead.
+-- ============================================================================
+
+-- 1a. Add run_id column to sync_logs
+SET @col_exists = (
+    SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'sync_logs'
+      AND COLUMN_NAME = 'run_id'
+);
+SET @sql = IF(@col_exists = 0,
+    'ALTER TABLE sync_logs ADD COLUMN run_id VARCHAR(64) NULL COMMENT ''Shared by the shards of one sharded run (--shard i/N)'' AFTER checkpoint',
+    'SELECT ''run_id column already exists'' AS status'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- 1b. Add shard_index column to sync_logs
+SET @col_exists = (
+    SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'sync_logs'
+      AND COLUMN_NAME = 'shard_index'
+);
+SET @sql = IF(@col_exists = 0,
+    'ALTER TABLE sync_logs ADD COLUMN shard_index INT NULL COMMENT ''i of i/N (1-based)'' AFTER run_id',
+    'SELECT ''shard_index column already exists'' AS status'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- 1c. Add shard_count column to sync_logs
+SET @col_exists = (
+    SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'sync_logs'
+      AND COLUMN_NAME = 'shard_count'
+);
+SET @sql = IF(@col_exists = 0,
+    'ALTER TABLE sync_logs ADD COLUMN shard_count INT NULL COMMENT ''N of i/N'' AFTER shard_index',
+    'SELECT ''shard_count column already exists'' AS status'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- 2. Add index on run_id
+SET @idx_exists = (
+    SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'sync_logs'
+      AND INDEX_NAME = 'idx_run'
+);
+SET @sql = IF(@idx_exists = 0,
+    'CREATE INDEX idx_run ON sync_logs(run_id)',
+    'SELECT ''idx_run index already exists'' AS status'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
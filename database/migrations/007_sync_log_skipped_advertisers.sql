@@ -0,0 +1,28 @@
+-- ============================================================================
+-- Migration 007: Deadline-Skipped Advertisers
+-- Date: 2026-10-16
+--
+-- Adds:
+--   1. skipped_advertisers column to sync_logs (advertisers left unsynced when
+--      a run hit SYNC_TIME_BUDGET_SECONDS; synced first on the next run)
+--
+-- Safe to run multiple times (checks IF NOT EXISTS).
+-- Works on MySQL 5.7+ / MariaDB 10.3+.
+--
+-- For SQLite: use `python setup-dev-db.py --reset` instead.
+-- ============================================================================
+
+-- 1. Add skipped_advertisers column to sync_logs
+SET @col_exists = (
+    SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'sync_logs'
+      AND COLUMN_NAME = 'skipped_advertisers'
+);
+SET @sql = IF(@col_exists = 0,
+    'ALTER TABLE sync_logs ADD COLUMN skipped_advertisers MEDIUMTEXT NULL COMMENT ''JSON list of network advertiser IDs skipped at the time budget'' AFTER shard_count',
+    'SELECT ''skipped_advertisers column already exists'' AS status'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
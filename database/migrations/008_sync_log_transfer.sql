@@ -0,0 +1,59 @@
+-- ============================================================================
+-- Migration 008: Sync Transfer Accounting
+-- Date: 2026-10-16
+--
+-- Adds:
+--   1. bytes_wire, bytes_decoded columns to sync_logs (API response bytes
+--      before and after decompression)
+--   2. transfer column to sync_logs (JSON breakdown per API endpoint)
+--
+-- Safe to run multiple times (checks IF NOT EXISTS).
+-- Works on MySQL 5.7+ / MariaDB 10.3+.
+--
+-- For SQLite: use `python setup-dev-db.py --reset` instead.
+-- ============================================================================
+
+-- 1a. Add bytes_wire column to sync_logs
+SET @col_exists = (
+    SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'sync_logs'
+      AND COLUMN_NAME = 'bytes_wire'
+);
+SET @sql = IF(@col_exists = 0,
+    'ALTER TABLE sync_logs ADD COLUMN bytes_wire BIGINT NOT NULL DEFAULT 0 COMMENT ''API response body bytes as transferred (compressed)'' AFTER skipped_advertisers',
+    'SELECT ''bytes_wire column already exists'' AS status'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- 1b. Add bytes_decoded column to sync_logs
+SET @col_exists = (
+    SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'sync_logs'
+      AND COLUMN_NAME = 'bytes_decoded'
+);
+SET @sql = IF(@col_exists = 0,
+    'ALTER TABLE sync_logs ADD COLUMN bytes_decoded BIGINT NOT NULL DEFAULT 0 COMMENT ''API response body bytes after decompression'' AFTER bytes_wire',
+    'SELECT ''bytes_decoded column already exists'' AS status'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- 2. Add transfer column to sync_logs
+SET @col_exists = (
+    SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'sync_logs'
+      AND COLUMN_NAME = 'transfer'
+);
+SET @sql = IF(@col_exists = 0,
+    'ALTER TABLE sync_logs ADD COLUMN transfer TEXT NULL COMMENT ''JSON requests/wire/decoded bytes per API endpoint'' AFTER bytes_decoded',
+    'SELECT ''transfer column already exists'' AS status'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
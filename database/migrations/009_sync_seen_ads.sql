@@ -0,0 +1,23 @@
+-- ============================================================================
+-- Migration 009: Staged Seen Ads
+-- Date: 2026-10-16
+--
+-- Adds:
+--   1. sync_seen_ads table (ads returned during a sync run, used to delete
+--      stale ads with one statement per run instead of one per advertiser)
+--
+-- Safe to run multiple times (CREATE TABLE IF NOT EXISTS).
+-- Works on MySQL 5.7+ / MariaDB 10.3+.
+--
+-- For SQLite: use `python setup-dev-db.py --reset` instead.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS sync_seen_ads (
+    sync_log_id         INT             NOT NULL,
+    advertiser_id       INT             NOT NULL    COMMENT 'Advertiser whose complete ad list included the ad',
+    network_ad_id       VARCHAR(255)    NOT NULL,
+
+    PRIMARY KEY (sync_log_id, network_ad_id),
+    INDEX idx_log_advertiser (sync_log_id, advertiser_id),
+    CONSTRAINT fk_seen_ads_sync_log FOREIGN KEY (sync_log_id) REFERENCES sync_logs(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,36 @@
+-- ============================================================================
+-- Migration 010: Shared Ads Crawls
+-- Date: 2026-10-16
+--
+-- Adds:
+--   1. sync_shared_crawls table (one global ads crawl per sharded run,
+--      claimed by the first shard to start)
+--   2. sync_shared_ads table (the crawl's ads, read by every shard)
+--
+-- Safe to run multiple times (CREATE TABLE IF NOT EXISTS).
+-- Works on MySQL 5.7+ / MariaDB 10.3+.
+--
+-- For SQLite: use `python setup-dev-db.py --reset` instead.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS sync_shared_crawls (
+    id                  INT AUTO_INCREMENT PRIMARY KEY,
+    network             ENUM('flexoffers', 'awin', 'cj', 'impact') NOT NULL,
+    run_id              VARCHAR(64)     NOT NULL,
+    status              ENUM('running', 'done', 'failed') NOT NULL DEFAULT 'running',
+    complete            BOOLEAN         NOT NULL DEFAULT TRUE   COMMENT 'FALSE if a page failed and the crawl stopped short',
+    replayed_at         DOUBLE          NULL        COMMENT 'Unix time the pages were downloaded, if every page was a 304 replay',
+    started_at          TIMESTAMP       NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    UNIQUE KEY uk_network_run (network, run_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS sync_shared_ads (
+    id                  BIGINT AUTO_INCREMENT PRIMARY KEY,
+    crawl_id            INT             NOT NULL,
+    network_advertiser_id VARCHAR(255)  NOT NULL,
+    raw                 MEDIUMTEXT      NOT NULL    COMMENT 'The ad as returned by the API (JSON)',
+
+    INDEX idx_crawl (crawl_id, id),
+    CONSTRAINT fk_shared_ads_crawl FOREIGN KEY (crawl_id) REFERENCES sync_shared_crawls(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
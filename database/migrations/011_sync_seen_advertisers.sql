@@ -0,0 +1,22 @@
+-- ============================================================================
+-- Migration 011: Staged Seen Advertisers
+-- Date: 2026-10-16
+--
+-- Adds:
+--   1. sync_seen_advertisers table (advertisers returned during a sync run,
+--      used to deactivate the unseen ones with one statement per network
+--      instead of a NOT IN list of every seen ID)
+--
+-- Safe to run multiple times (CREATE TABLE IF NOT EXISTS).
+-- Works on MySQL 5.7+ / MariaDB 10.3+.
+--
+-- For SQLite: use `python setup-dev-db.py --reset` instead.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS sync_seen_advertisers (
+    sync_log_id             INT             NOT NULL,
+    network_advertiser_id   VARCHAR(255)    NOT NULL,
+
+    PRIMARY KEY (sync_log_id, network_advertiser_id),
+    CONSTRAINT fk_seen_advertisers_sync_log FOREIGN KEY (sync_log_id) REFERENCES sync_logs(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
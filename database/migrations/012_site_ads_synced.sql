@@ -0,0 +1,24 @@
+-- ============================================================================
+-- Migration 012: Per-Site Ads Freshness
+-- Date: 2026-10-16
+--
+-- Adds:
+--   1. site_ads_synced table (when a site's own ads of an advertiser were last
+--      fetched in full, used by SYNC_ADS_FRESH_HOURS for CJ, whose ads differ
+--      per domain)
+--
+-- Safe to run multiple times (CREATE TABLE IF NOT EXISTS).
+-- Works on MySQL 5.7+ / MariaDB 10.3+.
+--
+-- For SQLite: use `python setup-dev-db.py --reset` instead.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS site_ads_synced (
+    site_id             INT             NOT NULL,
+    advertiser_id       INT             NOT NULL,
+    synced_at           TIMESTAMP       NOT NULL,
+
+    PRIMARY KEY (site_id, advertiser_id),
+    CONSTRAINT fk_site_ads_synced_site FOREIGN KEY (site_id) REFERENCES sites(id) ON DELETE CASCADE,
+    CONSTRAINT fk_site_ads_synced_advertiser FOREIGN KEY (advertiser_id) REFERENCES advertisers(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -10,7 +10,12 @@
 -- Use a clean slate (drop tables in reverse dependency order)
 SET FOREIGN_KEY_CHECKS = 0;
 DROP TABLE IF EXISTS export_logs;
+DROP TABLE IF EXISTS sync_shared_ads;
+DROP TABLE IF EXISTS sync_shared_crawls;
+DROP TABLE IF EXISTS sync_seen_advertisers;
+DROP TABLE IF EXISTS sync_seen_ads;
 DROP TABLE IF EXISTS sync_logs;
+DROP TABLE IF EXISTS site_ads_synced;
 DROP TABLE IF EXISTS site_advertiser_rules;
 DROP TABLE IF EXISTS placements;
 DROP TABLE IF EXISTS ads;
@@ -82,6 +87,7 @@ CREATE TABLE advertisers (
     -- Sync tracking
     last_synced_at          TIMESTAMP       NULL,
     raw_hash                VARCHAR(64)     NULL        COMMENT 'SHA-256 of raw API response for change detection',
+    ads_synced_at           TIMESTAMP       NULL        COMMENT 'Last time this advertiser''s ads were fetched in full',
 
     created_at              TIMESTAMP       NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at              TIMESTAMP       NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
@@ -255,6 +261,23 @@ CREATE TABLE site_advertiser_rules (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 
+-- ============================================================================
+-- TABLE: site_ads_synced
+-- Purpose: When a site's own ads of an advertiser were last fetched in full,
+--          for networks whose ads differ per site (CJ: one PID per domain).
+--          Used by SYNC_ADS_FRESH_HOURS instead of advertisers.ads_synced_at.
+-- ============================================================================
+CREATE TABLE site_ads_synced (
+    site_id             INT             NOT NULL,
+    advertiser_id       INT             NOT NULL,
+    synced_at           TIMESTAMP       NOT NULL,
+
+    PRIMARY KEY (site_id, advertiser_id),
+    CONSTRAINT fk_site_ads_synced_site FOREIGN KEY (site_id) REFERENCES sites(id) ON DELETE CASCADE,
+    CONSTRAINT fk_site_ads_synced_advertiser FOREIGN KEY (advertiser_id) REFERENCES advertisers(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+
 -- ============================================================================
 -- TABLE: sync_logs
 -- Purpose: Audit trail of every sync run. Useful for troubleshooting
@@ -271,10 +294,80 @@ CREATE TABLE sync_logs (
     ads_synced          INT             NOT NULL DEFAULT 0,
     ads_deleted         INT             NOT NULL DEFAULT 0   COMMENT 'Stale ads hard-deleted this run',
     error_message       TEXT            NULL,
+    checkpoint          MEDIUMTEXT      NULL        COMMENT 'JSON resume state while running/failed, NULL once done',
+    run_id              VARCHAR(64)     NULL        COMMENT 'Shared by the shards of one sharded run (--shard i/N)',
+    shard_index         INT             NULL        COMMENT 'i of i/N (1-based)',
+    shard_count         INT             NULL        COMMENT 'N of i/N',
+    skipped_advertisers MEDIUMTEXT      NULL        COMMENT 'JSON list of network advertiser IDs skipped at the time budget',
+    bytes_wire          BIGINT          NOT NULL DEFAULT 0   COMMENT 'API response body bytes as transferred (compressed)',
+    bytes_decoded       BIGINT          NOT NULL DEFAULT 0   COMMENT 'API response body bytes after decompression',
+    transfer            TEXT            NULL        COMMENT 'JSON requests/wire/decoded bytes per API endpoint',
 
     INDEX idx_network (network),
     INDEX idx_status (status),
-    INDEX idx_started (started_at)
+    INDEX idx_started (started_at),
+    INDEX idx_run (run_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+
+-- ============================================================================
+-- TABLE: sync_seen_ads
+-- Purpose: Ads returned during a sync run, staged so stale ads are deleted
+--          with one statement at the end of the run. Emptied once it has
+--          been used.
+-- ============================================================================
+CREATE TABLE sync_seen_ads (
+    sync_log_id         INT             NOT NULL,
+    advertiser_id       INT             NOT NULL    COMMENT 'Advertiser whose complete ad list included the ad',
+    network_ad_id       VARCHAR(255)    NOT NULL,
+
+    PRIMARY KEY (sync_log_id, network_ad_id),
+    INDEX idx_log_advertiser (sync_log_id, advertiser_id),
+    CONSTRAINT fk_seen_ads_sync_log FOREIGN KEY (sync_log_id) REFERENCES sync_logs(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+
+-- ============================================================================
+-- TABLE: sync_seen_advertisers
+-- Purpose: Advertisers returned during a sync run, staged so unseen ones are
+--          deactivated with one statement when the network (or the last
+--          shard of the run) finishes. Emptied once it has been used.
+-- ============================================================================
+CREATE TABLE sync_seen_advertisers (
+    sync_log_id             INT             NOT NULL,
+    network_advertiser_id   VARCHAR(255)    NOT NULL,
+
+    PRIMARY KEY (sync_log_id, network_advertiser_id),
+    CONSTRAINT fk_seen_advertisers_sync_log FOREIGN KEY (sync_log_id) REFERENCES sync_logs(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+
+-- ============================================================================
+-- TABLE: sync_shared_crawls / sync_shared_ads
+-- Purpose: A global ads crawl (Impact) made once per sharded run and read
+--          by every shard, instead of each shard crawling it again.
+--          Deleted when the last shard of the run finishes.
+-- ============================================================================
+CREATE TABLE sync_shared_crawls (
+    id                  INT AUTO_INCREMENT PRIMARY KEY,
+    network             ENUM('flexoffers', 'awin', 'cj', 'impact') NOT NULL,
+    run_id              VARCHAR(64)     NOT NULL,
+    status              ENUM('running', 'done', 'failed') NOT NULL DEFAULT 'running',
+    complete            BOOLEAN         NOT NULL DEFAULT TRUE   COMMENT 'FALSE if a page failed and the crawl stopped short',
+    replayed_at         DOUBLE          NULL        COMMENT 'Unix time the pages were downloaded, if every page was a 304 replay',
+    started_at          TIMESTAMP       NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    UNIQUE KEY uk_network_run (network, run_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE sync_shared_ads (
+    id                  BIGINT AUTO_INCREMENT PRIMARY KEY,
+    crawl_id            INT             NOT NULL,
+    network_advertiser_id VARCHAR(255)  NOT NULL,
+    raw                 MEDIUMTEXT      NOT NULL    COMMENT 'The ad as returned by the API (JSON)',
+
+    INDEX idx_crawl (crawl_id, id),
+    CONSTRAINT fk_shared_ads_crawl FOREIGN KEY (crawl_id) REFERENCES sync_shared_crawls(id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 
@@ -72,6 +72,7 @@ CREATE TABLE advertisers (
     -- Sync tracking
     last_synced_at          TEXT    NULL,
     raw_hash                TEXT    NULL,
+    ads_synced_at           TEXT    NULL,   -- Last time this advertiser's ads were fetched in full
 
     created_at              TEXT    NOT NULL DEFAULT (datetime('now')),
     updated_at              TEXT    NOT NULL DEFAULT (datetime('now')),
@@ -254,6 +255,23 @@ BEGIN
 END;
 
 
+-- ============================================================================
+-- TABLE: site_ads_synced
+-- Purpose: When a site's own ads of an advertiser were last synced, for
+--          networks whose ads differ per site (CJ: one PID per domain).
+-- ============================================================================
+
+CREATE TABLE site_ads_synced (
+    site_id             INTEGER NOT NULL,
+    advertiser_id       INTEGER NOT NULL,
+    synced_at           TEXT    NOT NULL,
+
+    PRIMARY KEY (site_id, advertiser_id),
+    CONSTRAINT fk_site_ads_synced_site FOREIGN KEY (site_id) REFERENCES sites(id) ON DELETE CASCADE,
+    CONSTRAINT fk_site_ads_synced_advertiser FOREIGN KEY (advertiser_id) REFERENCES advertisers(id) ON DELETE CASCADE
+);
+
+
 -- ============================================================================
 -- TABLE: sync_logs
 -- Purpose: Audit trail of every sync run.
@@ -269,12 +287,83 @@ CREATE TABLE sync_logs (
     advertisers_synced  INTEGER NOT NULL DEFAULT 0,
     ads_synced          INTEGER NOT NULL DEFAULT 0,
     ads_deleted         INTEGER NOT NULL DEFAULT 0,
-    error_message       TEXT    NULL
+    error_message       TEXT    NULL,
+    checkpoint          TEXT    NULL,   -- JSON resume state while running/failed, NULL once done
+    run_id              TEXT    NULL,   -- Shared by the shards of one sharded run (--shard i/N)
+    shard_index         INTEGER NULL,   -- i of i/N (1-based)
+    shard_count         INTEGER NULL,   -- N of i/N
+    skipped_advertisers TEXT    NULL,   -- JSON list of network advertiser IDs skipped at the time budget
+    bytes_wire          INTEGER NOT NULL DEFAULT 0, -- API response body bytes as transferred (compressed)
+    bytes_decoded       INTEGER NOT NULL DEFAULT 0, -- API response body bytes after decompression
+    transfer            TEXT    NULL    -- JSON requests/wire/decoded bytes per API endpoint
 );
 
 CREATE INDEX idx_sync_logs_network ON sync_logs(network);
 CREATE INDEX idx_sync_logs_status ON sync_logs(status);
 CREATE INDEX idx_sync_logs_started ON sync_logs(started_at);
+CREATE INDEX idx_sync_logs_run ON sync_logs(run_id);
+
+
+-- ============================================================================
+-- TABLE: sync_seen_ads
+-- Purpose: Ads returned during a sync run, staged for stale-ad deletion.
+-- ============================================================================
+
+CREATE TABLE sync_seen_ads (
+    sync_log_id         INTEGER NOT NULL,
+    advertiser_id       INTEGER NOT NULL,   -- Advertiser whose complete ad list included the ad
+    network_ad_id       TEXT    NOT NULL,
+
+    PRIMARY KEY (sync_log_id, network_ad_id),
+    CONSTRAINT fk_seen_ads_sync_log FOREIGN KEY (sync_log_id) REFERENCES sync_logs(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_sync_seen_ads_advertiser ON sync_seen_ads(sync_log_id, advertiser_id);
+
+
+-- ============================================================================
+-- TABLE: sync_seen_advertisers
+-- Purpose: Advertisers returned during a sync run, staged for deactivating
+--          the unseen ones.
+-- ============================================================================
+
+CREATE TABLE sync_seen_advertisers (
+    sync_log_id             INTEGER NOT NULL,
+    network_advertiser_id   TEXT    NOT NULL,
+
+    PRIMARY KEY (sync_log_id, network_advertiser_id),
+    CONSTRAINT fk_seen_advertisers_sync_log FOREIGN KEY (sync_log_id) REFERENCES sync_logs(id) ON DELETE CASCADE
+);
+
+
+-- ============================================================================
+-- TABLE: sync_shared_crawls / sync_shared_ads
+-- Purpose: A global ads crawl (Impact) made once per sharded run and read
+--          by every shard.
+-- ============================================================================
+
+CREATE TABLE sync_shared_crawls (
+    id                  INTEGER PRIMARY KEY AUTOINCREMENT,
+    network             TEXT    NOT NULL CHECK (network IN ('flexoffers', 'awin', 'cj', 'impact')),
+    run_id              TEXT    NOT NULL,
+    status              TEXT    NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'done', 'failed')),
+    complete            INTEGER NOT NULL DEFAULT 1, -- 0 if a page failed and the crawl stopped short
+    replayed_at         REAL    NULL,   -- Unix time the pages were downloaded, if every page was a 304 replay
+    started_at          TEXT    NOT NULL DEFAULT (datetime('now')),
+
+    UNIQUE (network, run_id)
+);
+
+CREATE TABLE sync_shared_ads (
+    id                  INTEGER PRIMARY KEY AUTOINCREMENT,
+    crawl_id            INTEGER NOT NULL,
+    network_advertiser_id TEXT  NOT NULL,
+    raw                 TEXT    NOT NULL,   -- The ad as returned by the API (JSON)
+
+    CONSTRAINT fk_shared_ads_crawl FOREIGN KEY (crawl_id) REFERENCES sync_shared_crawls(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_sync_shared_ads_crawl ON sync_shared_ads(crawl_id, id);
 
 
 -- ============================================================================
@@ -80,7 +80,12 @@ def verify_database() -> bool:
             "sites",
             "placements",
             "site_advertiser_rules",
+            "site_ads_synced",
             "sync_logs",
+            "sync_seen_ads",
+            "sync_seen_advertisers",
+            "sync_shared_crawls",
+            "sync_shared_ads",
             "export_logs",
         ]
 
@@ -0,0 +1,101 @@
+"""Time response decoding and raw_hash serialization on an Impact /Ads payload.
+
+Compares the standard library calls the sync used before src/jsoncodec.py
+with jsoncodec.loads() and canonical(), and checks that canonical() still
+produces the exact bytes stored hashes were computed from. Without orjson
+installed (``uv sync --extra json``) both decode rows use the standard
+library.
+
+The payload is generated, shaped like an Impact /Ads page, so no
+credentials or network access are needed.
+
+Usage:
+    cd sync-service
+    uv run python bench_jsoncodec.py [--ads 1000] [--repeat 5]
+"""
+
+import argparse
+import hashlib
+import json
+import timeit
+
+from src import jsoncodec
+
+
+def impact_ads_page(count: int) -> bytes:
+    """Build an Impact /Ads response body with count ads."""
+    ads = [
+        {
+            "Id": str(1000000 + i),
+            "Name": f"Spring Sale {i} – 20% off “everything” 🏕",
+            "Description": f'Tents, stoves & more.\n<b>"Ad {i}"</b> Café, Zürich',
+            "CampaignId": str(9000 + i % 50),
+            "CampaignName": f"Outdoor Gear Co {i % 50}",
+            "Type": "BANNER" if i % 3 else "TEXT_LINK",
+            "TrackingLink": f"https://outdoor.sjv.io/c/1234/{1000000 + i}/5678",
+            "LandingPageUrl": f"https://www.example.com/sale?utm_source=impact&ad={i}",
+            "Code": f'<a href="https://outdoor.sjv.io/c/1234/{1000000 + i}/5678">'
+            f'<img src="https://a.impactradius-go.com/display-ad/{i}.jpg" '
+            f'width="300" height="250"/></a>',
+            "IframeCode": "",
+            "Width": "300",
+            "Height": "250",
+            "CreativeUrl": f"https://a.impactradius-go.com/display-ad/{i}.jpg",
+            "Labels": ["Outdoor", "Camping", "Sale"],
+            "Language": "ENGLISH",
+            "AllowDeepLinking": "true",
+            "MobileReady": "true",
+            "StartDate": "2026-03-01T00:00:00-08:00",
+            "EndDate": None,
+            "DiscountPercent": 20.5,
+            "Uri": f"/Mediapartners/IRabc/Ads/{1000000 + i}",
+        }
+        for i in range(count)
+    ]
+    return json.dumps({"@page": "1", "@numpages": "1", "Ads": ads}).encode()
+
+
+def old_hash(raw: dict) -> str:
+    """raw_hash as computed before jsoncodec."""
+    return hashlib.sha256(json.dumps(raw, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def new_hash(raw: dict) -> str:
+    """raw_hash as Mapper.compute_hash() computes it now."""
+    return hashlib.sha256(jsoncodec.canonical(raw)).hexdigest()
+
+
+def best_ms(func, repeat: int) -> float:
+    """Fastest of repeat runs of func, in milliseconds."""
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ads", type=int, default=1000, help="ads in the payload")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement")
+    args = parser.parse_args()
+
+    body = impact_ads_page(args.ads)
+    ads = json.loads(body)["Ads"]
+    assert all(old_hash(ad) == new_hash(ad) for ad in ads), "raw_hash bytes changed"
+
+    per_1000 = 1000 / args.ads
+    rows = [
+        ("decode: json.loads", best_ms(lambda: json.loads(body), args.repeat)),
+        (
+            f"decode: jsoncodec.loads ({jsoncodec.BACKEND})",
+            best_ms(lambda: jsoncodec.loads(body), args.repeat),
+        ),
+        ("hash:   json.dumps", best_ms(lambda: [old_hash(ad) for ad in ads], args.repeat)),
+        ("hash:   jsoncodec.canonical", best_ms(lambda: [new_hash(ad) for ad in ads], args.repeat)),
+    ]
+
+    print(f"Impact /Ads payload: {args.ads} ads, {len(body) / 1e6:.1f} MB")
+    print(f"ms per 1000 ads (best of {args.repeat}):")
+    for label, ms in rows:
+        print(f"  {label:<36} {ms * per_1000:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
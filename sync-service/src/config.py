@@ -7,6 +7,109 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+SYNC_MODES = ("default", "async", "pipeline")
+
+
+@dataclass
+class SyncOptions:
+    """Tuning for how a single network client runs its sync."""
+
+    # Sync engine:
+    #   "default"  - blocking clients, one advertiser at a time
+    #   "async"    - httpx.AsyncClient with concurrent per-advertiser ad fetching
+    #   "pipeline" - fetch, map and DB write stages overlapping in threads
+    mode: str = "default"
+
+    # Advertisers fetched at once in async mode (None = per-network default)
+    async_concurrency: int | None = None
+
+    # Pipeline mode: advertisers buffered between stages, and ad rows per DB flush
+    pipeline_queue_size: int = 8
+    pipeline_batch_size: int = 500
+
+    # Rows written per multi-row upsert statement
+    write_batch_size: int = 500
+
+    # Advertisers completed between checkpoints (each checkpoint commits)
+    checkpoint_interval: int = 10
+
+    # Continue the latest running/failed sync log from its checkpoint (--resume)
+    resume: bool = False
+
+    # Skip the ads fetch for unchanged advertisers whose ads were synced within
+    # this many hours (0 = always fetch), with a full sweep every Nth run
+    ads_fresh_hours: int = 0
+    full_sweep_every: int = 4
+
+    # Per-network time budget in seconds (0 = unlimited). With a budget,
+    # advertisers are synced most valuable first and the rest are skipped at
+    # the deadline, then synced first on the next run.
+    time_budget_seconds: int = 0
+
+    # Impact ads held in memory while grouping the global ads crawl by
+    # campaign (and CJ links shared across domains); past this many, the
+    # groups move to a temporary SQLite file
+    spill_threshold: int = 20000
+
+    # Sync only shard i of N of each network's advertisers (--shard i/N).
+    # All shards of one run share run_id; the last to finish deactivates
+    # stale advertisers.
+    shard_index: int = 1
+    shard_count: int = 1
+    run_id: str | None = None
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """At most ``requests`` per ``period`` seconds, with up to ``burst`` back to back.
+
+    burst=1 spaces requests evenly, which never exceeds the limit in any
+    window of ``period`` seconds. A daily quota can use a larger burst so
+    that a run is not paced at one request per minute.
+    """
+
+    requests: int
+    period: float
+    burst: int = 1
+
+
+def parse_rate_limit(value: str) -> RateLimit:
+    """Parse ``requests/seconds`` or ``requests/seconds/burst`` (e.g. ``25/5``)."""
+    parts = value.strip().split("/")
+    if len(parts) not in (2, 3):
+        raise ValueError(f"Invalid rate limit '{value}' (expected requests/seconds[/burst])")
+    requests, period = int(parts[0]), float(parts[1])
+    burst = int(parts[2]) if len(parts) == 3 else 1
+    if requests < 1 or period <= 0 or burst < 1:
+        raise ValueError(f"Invalid rate limit '{value}' (values must be positive)")
+    return RateLimit(requests, period, burst)
+
+
+@dataclass
+class HttpOptions:
+    """Connection pooling and timeouts shared by every network client."""
+
+    # Pool size across all clients, and idle connections kept open for reuse
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+
+    # Negotiate HTTP/2 where the server supports it (needs the h2 package)
+    http2: bool = False
+
+    # Seconds per request (connect_timeout None = same as timeout), with
+    # per-host overrides, e.g. {"link-search.api.cj.com": 60}
+    timeout: float = 30.0
+    connect_timeout: float | None = None
+    host_timeouts: dict[str, float] = field(default_factory=dict)
+
+    # On-disk response cache for conditional requests (None = disabled):
+    # entries are dropped after cache_ttl_hours and least recently used
+    # entries are evicted beyond cache_max_mb
+    cache_path: str | None = None
+    cache_ttl_hours: float = 72.0
+    cache_max_mb: int = 256
+
 
 @dataclass
 class Config:
@@ -23,11 +126,27 @@ class Config:
     cj_api_token: str | None = None
     cj_cid: str | None = None
     cj_domain_website_ids: dict[str, str] = field(default_factory=dict)
+    # Search links once per advertiser and derive other domains' links by PID
+    cj_share_link_search: bool = False
+    cj_link_verify_sample: int = 3
 
     # Impact (Rag)
     impact_account_sid: str | None = None
     impact_auth_token: str | None = None
 
+    # Orchestration - max networks synced in parallel (1 = sequential)
+    sync_workers: int = 1
+
+    # Per-client sync behaviour
+    sync: SyncOptions = field(default_factory=SyncOptions)
+
+    # Shared HTTP transport
+    http: HttpOptions = field(default_factory=HttpOptions)
+
+    # Request rate limits replacing the clients' defaults, keyed by
+    # "network" or "network:host"
+    rate_limits: dict[str, RateLimit] = field(default_factory=dict)
+
 
 def load_config() -> Config:
     """Load configuration from environment variables."""
@@ -51,6 +170,60 @@ def load_config() -> Config:
                 domain, wid = pair.strip().split(":", 1)
                 cj_website_ids[domain.strip()] = wid.strip()
 
+    # Parse HTTP_HOST_TIMEOUTS env var
+    # Format: "host1:seconds1,host2:seconds2"
+    host_timeouts: dict[str, float] = {}
+    raw_timeouts = os.getenv("HTTP_HOST_TIMEOUTS", "")
+    if raw_timeouts:
+        for pair in raw_timeouts.split(","):
+            if ":" in pair:
+                host, seconds = pair.strip().rsplit(":", 1)
+                host_timeouts[host.strip()] = float(seconds)
+
+    raw_connect_timeout = os.getenv("HTTP_CONNECT_TIMEOUT")
+    http_options = HttpOptions(
+        max_connections=max(1, int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))),
+        max_keepalive_connections=max(0, int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+        http2=os.getenv("HTTP_HTTP2", "").strip().lower() in ("1", "true", "yes"),
+        timeout=float(os.getenv("HTTP_TIMEOUT", "30")),
+        connect_timeout=float(raw_connect_timeout) if raw_connect_timeout else None,
+        host_timeouts=host_timeouts,
+        cache_path=os.getenv("HTTP_CACHE_PATH", "").strip() or None,
+        cache_ttl_hours=max(0.0, float(os.getenv("HTTP_CACHE_TTL_HOURS", "72"))),
+        cache_max_mb=max(1, int(os.getenv("HTTP_CACHE_MAX_MB", "256"))),
+    )
+
+    # Parse RATE_LIMITS env var
+    # Format: "network=requests/seconds,network:host=requests/seconds[/burst]"
+    rate_limits: dict[str, RateLimit] = {}
+    raw_limits = os.getenv("RATE_LIMITS", "")
+    if raw_limits:
+        for pair in raw_limits.split(","):
+            if "=" in pair:
+                key, value = pair.strip().split("=", 1)
+                rate_limits[key.strip()] = parse_rate_limit(value)
+
+    sync_mode = os.getenv("SYNC_MODE", "default").strip().lower() or "default"
+    if sync_mode not in SYNC_MODES:
+        raise ValueError(
+            f"Invalid SYNC_MODE '{sync_mode}' (expected one of {', '.join(SYNC_MODES)})"
+        )
+
+    raw_concurrency = os.getenv("SYNC_ASYNC_CONCURRENCY")
+    sync_options = SyncOptions(
+        mode=sync_mode,
+        async_concurrency=int(raw_concurrency) if raw_concurrency else None,
+        pipeline_queue_size=max(1, int(os.getenv("SYNC_PIPELINE_QUEUE_SIZE", "8"))),
+        pipeline_batch_size=max(1, int(os.getenv("SYNC_PIPELINE_BATCH_SIZE", "500"))),
+        write_batch_size=max(1, int(os.getenv("SYNC_WRITE_BATCH_SIZE", "500"))),
+        checkpoint_interval=max(1, int(os.getenv("SYNC_CHECKPOINT_INTERVAL", "10"))),
+        ads_fresh_hours=max(0, int(os.getenv("SYNC_ADS_FRESH_HOURS", "0"))),
+        full_sweep_every=max(0, int(os.getenv("SYNC_FULL_SWEEP_EVERY", "4"))),
+        time_budget_seconds=max(0, int(os.getenv("SYNC_TIME_BUDGET_SECONDS", "0"))),
+        spill_threshold=max(0, int(os.getenv("SYNC_SPILL_THRESHOLD", "20000"))),
+    )
+
     return Config(
         flexoffers_domain_keys=flexoffers_keys,
         awin_api_token=os.getenv("AWIN_API_TOKEN"),
@@ -58,6 +231,13 @@ def load_config() -> Config:
         cj_api_token=os.getenv("CJ_API_TOKEN"),
         cj_cid=os.getenv("CJ_CID"),
         cj_domain_website_ids=cj_website_ids,
+        cj_share_link_search=os.getenv("CJ_SHARE_LINK_SEARCH", "").strip().lower()
+        in ("1", "true", "yes"),
+        cj_link_verify_sample=max(0, int(os.getenv("CJ_LINK_VERIFY_SAMPLE", "3"))),
         impact_account_sid=os.getenv("IMPACT_ACCOUNT_SID"),
         impact_auth_token=os.getenv("IMPACT_AUTH_TOKEN"),
+        sync_workers=max(1, int(os.getenv("SYNC_WORKERS", "1"))),
+        sync=sync_options,
+        http=http_options,
+        rate_limits=rate_limits,
     )
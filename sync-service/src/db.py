@@ -5,10 +5,12 @@ Supports dual-database configuration:
 - Otherwise uses MYSQL_* env vars → MySQL (production)
 """
 
+import json
 import logging
 import os
 import sqlite3
 import sys
+from collections.abc import Iterator
 from contextlib import contextmanager
 from pathlib import Path
 
@@ -176,6 +178,15 @@ def _execute_rowcount(conn, sql: str, params: tuple = ()) -> int:
             return cur.rowcount
 
 
+def _execute_many(conn, sql: str, params: list[tuple]) -> None:
+    """Execute a write query once per parameter tuple."""
+    if _use_sqlite:
+        conn.executemany(sql, params)
+    else:
+        with conn.cursor() as cur:
+            cur.executemany(sql, params)
+
+
 def _placeholder() -> str:
     """Return the correct placeholder for the database type."""
     return "?" if _use_sqlite else "%s"
@@ -186,10 +197,227 @@ def _now() -> str:
     return "datetime('now')" if _use_sqlite else "NOW()"
 
 
+# =============================================================================
+# UPSERT HELPERS
+# =============================================================================
+
+# Rows per multi-row upsert statement (see upsert_advertisers/upsert_ads)
+UPSERT_BATCH_SIZE = 500
+
+# Bound parameters allowed in one SQLite statement (SQLITE_MAX_VARIABLE_NUMBER)
+_SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+# SQLite 3.35+ returns upserted IDs with RETURNING; older versions re-select them
+_SQLITE_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Marks a column the row must provide (no default)
+_REQUIRED = object()
+
+# Upserted advertisers columns and their defaults, in parameter order
+_ADVERTISER_COLUMNS = {
+    "network": _REQUIRED,
+    "network_advertiser_id": _REQUIRED,
+    "name": _REQUIRED,
+    "website_url": None,
+    "category": None,
+    "description": None,
+    "logo_url": None,
+    "network_rank": None,
+    "country_code": None,
+    "epc": 0,
+    "raw_hash": _REQUIRED,
+}
+
+# Upserted ads columns (no weight column — weight is managed via
+# weight_override on ads / default_weight on advertisers)
+_AD_COLUMNS = {
+    "network": _REQUIRED,
+    "network_ad_id": _REQUIRED,
+    "advertiser_id": _REQUIRED,
+    "creative_type": "banner",
+    "tracking_url": _REQUIRED,
+    "destination_url": None,
+    "status": "active",
+    "epc": 0,
+    "raw_hash": _REQUIRED,
+    "ad_content": None,
+    "advert_name": _REQUIRED,
+    "bannercode": _REQUIRED,
+    "imagetype": "",
+    "image_url": None,
+    "width": _REQUIRED,
+    "height": _REQUIRED,
+    "campaign_name": "General Promotion",
+    "enable_stats": "Y",
+    "show_everyone": "Y",
+    "show_desktop": "Y",
+    "show_mobile": "Y",
+    "show_tablet": "Y",
+    "show_ios": "Y",
+    "show_android": "Y",
+    "autodelete": "Y",
+    "autodisable": "N",
+    "budget": 0,
+    "click_rate": 0,
+    "impression_rate": 0,
+    "state_required": "N",
+    "geo_cities": "a:0:{}",
+    "geo_states": "a:0:{}",
+    "geo_countries": "a:0:{}",
+    "schedule_start": 0,
+    "schedule_end": 2650941780,
+}
+
+
+def _row_params(columns: dict, data: dict) -> tuple:
+    """Parameter values of one row, in column order."""
+    return tuple(
+        data[column] if default is _REQUIRED else data.get(column, default)
+        for column, default in columns.items()
+    )
+
+
+def _upsert_sql(table: str, columns: dict, key: str, row_count: int, extra: tuple = ()) -> str:
+    """Build an INSERT of row_count rows that updates rows whose key already exists.
+
+    Every column but network and the key is updated, plus the `extra`
+    assignments, and last_synced_at is set to now. On MySQL an updated row
+    also sets LAST_INSERT_ID(), so a single-row upsert reports its ID as
+    lastrowid whether it inserted or updated.
+    """
+    p = _placeholder()
+    now = _now()
+    row = "(" + ", ".join([p] * len(columns) + [now]) + ")"
+    values = ", ".join([row] * row_count)
+    updated = [column for column in columns if column not in ("network", key)]
+
+    if _use_sqlite:
+        conflict = f"ON CONFLICT(network, {key}) DO UPDATE SET"
+        assignments = [f"{column} = excluded.{column}" for column in updated]
+    else:
+        conflict = "ON DUPLICATE KEY UPDATE"
+        assignments = ["id = LAST_INSERT_ID(id)"]
+        assignments += [f"{column} = VALUES({column})" for column in updated]
+    assignments += [*extra, f"last_synced_at = {now}"]
+
+    return f"""INSERT INTO {table} ({", ".join(columns)}, last_synced_at)
+              VALUES {values}
+              {conflict} {", ".join(assignments)}"""
+
+
+def _select_by_keys(
+    conn, table: str, key: str, network: str, keys: list[str], chunk_size: int
+) -> dict[str, tuple[int, str]]:
+    """Load {key: (id, raw_hash)} for the given keys of a network."""
+    p = _placeholder()
+    found: dict[str, tuple[int, str]] = {}
+    unique_keys = list(dict.fromkeys(keys))
+    chunk_size = max(1, min(chunk_size, _SQLITE_MAX_VARIABLES - 1))
+    for start in range(0, len(unique_keys), chunk_size):
+        chunk = unique_keys[start : start + chunk_size]
+        sql = f"""SELECT id, {key}, raw_hash FROM {table}
+                  WHERE network = {p} AND {key} IN ({", ".join([p] * len(chunk))})"""
+        for row in _execute_query(conn, sql, (network, *chunk)):
+            found[row[key]] = (row["id"], row["raw_hash"])
+    return found
+
+
+def _upsert_row(
+    conn,
+    table: str,
+    key: str,
+    columns: dict,
+    data: dict,
+    known: dict[str, tuple[int, str]] | None,
+    extra: tuple = (),
+) -> tuple[int, bool]:
+    """Write one row unless its raw_hash is unchanged.
+
+    Returns:
+        Tuple of (id, was_changed).
+    """
+    if known is None:
+        # One lookup for both the hash and the ID
+        known = _select_by_keys(conn, table, key, data["network"], [data[key]], 1)
+    cached = known.get(data[key])
+    if cached is not None and cached[1] == data["raw_hash"]:
+        return cached[0], False
+
+    sql = _upsert_sql(table, columns, key, 1, extra)
+    params = _row_params(columns, data)
+    if not _use_sqlite:
+        row_id = _execute_write(conn, sql, params)
+    elif _SQLITE_RETURNING:
+        row_id = _execute_one(conn, f"{sql} RETURNING id", params)["id"]
+    else:
+        _execute_write(conn, sql, params)
+        row_id = _select_by_keys(conn, table, key, data["network"], [data[key]], 1)[data[key]][0]
+
+    known[data[key]] = (row_id, data["raw_hash"])
+    return row_id, True
+
+
+def _upsert_rows(
+    conn,
+    table: str,
+    key: str,
+    columns: dict,
+    rows: list[dict],
+    known: dict[str, tuple[int, str]] | None,
+    batch_size: int,
+    extra: tuple = (),
+) -> list[tuple[int, bool]]:
+    """Write the new or changed rows of one network in multi-row upserts.
+
+    Returns:
+        (id, was_changed) for each row, in order.
+    """
+    if not rows:
+        return []
+    network = rows[0]["network"]
+    if known is None:
+        known = _select_by_keys(conn, table, key, network, [r[key] for r in rows], batch_size)
+
+    changed_flags = [known.get(row[key], (None, None))[1] != row["raw_hash"] for row in rows]
+    changed = [row for row, flag in zip(rows, changed_flags, strict=True) if flag]
+
+    rows_per_statement = max(1, batch_size)
+    if _use_sqlite:
+        rows_per_statement = min(rows_per_statement, _SQLITE_MAX_VARIABLES // len(columns))
+
+    for start in range(0, len(changed), rows_per_statement):
+        batch = changed[start : start + rows_per_statement]
+        sql = _upsert_sql(table, columns, key, len(batch), extra)
+        params = tuple(value for row in batch for value in _row_params(columns, row))
+        if _use_sqlite and _SQLITE_RETURNING:
+            written_ids = {
+                row[key]: row["id"]
+                for row in _execute_query(conn, f"{sql} RETURNING id, {key}", params)
+            }
+        else:
+            # Updated rows keep their known ID; only new ones are looked up
+            _execute_write(conn, sql, params)
+            new_keys = [row[key] for row in batch if row[key] not in known]
+            written_ids = {
+                row_key: row_id
+                for row_key, (row_id, _) in _select_by_keys(
+                    conn, table, key, network, new_keys, batch_size
+                ).items()
+            }
+        for row in batch:
+            row_id = written_ids[row[key]] if row[key] in written_ids else known[row[key]][0]
+            known[row[key]] = (row_id, row["raw_hash"])
+
+    return [(known[row[key]][0], flag) for row, flag in zip(rows, changed_flags, strict=True)]
+
+
 # =============================================================================
 # ADVERTISER UPSERT FUNCTIONS
 # =============================================================================
 
+# Written advertisers are reactivated
+_ADVERTISER_UPDATES = ("is_active = 1",)
+
 
 def get_advertiser_hash(conn, network: str, network_advertiser_id: str) -> str | None:
     """Get existing raw_hash for an advertiser, or None if not found."""
@@ -199,91 +427,126 @@ def get_advertiser_hash(conn, network: str, network_advertiser_id: str) -> str |
     return row["raw_hash"] if row else None
 
 
-def upsert_advertiser(conn, data: dict) -> tuple[int, bool]:
+def load_advertiser_hashes(conn, network: str) -> dict[str, tuple[int, str]]:
+    """Load {network_advertiser_id: (id, raw_hash)} for a network in one query."""
+    p = _placeholder()
+    sql = f"SELECT id, network_advertiser_id, raw_hash FROM advertisers WHERE network = {p}"
+    return {
+        row["network_advertiser_id"]: (row["id"], row["raw_hash"])
+        for row in _execute_query(conn, sql, (network,))
+    }
+
+
+def upsert_advertiser(
+    conn, data: dict, known: dict[str, tuple[int, str]] | None = None
+) -> tuple[int, bool]:
     """Insert or update advertiser, skipping if raw_hash unchanged.
 
+    Args:
+        conn: Database connection.
+        data: Advertiser row.
+        known: Index from load_advertiser_hashes(). When given, unchanged
+            advertisers are answered from it without a query, and written
+            ones are added to it.
+
     Returns:
         Tuple of (advertiser_id, was_changed).
     """
-    existing_hash = get_advertiser_hash(conn, data["network"], data["network_advertiser_id"])
+    return _upsert_row(
+        conn,
+        "advertisers",
+        "network_advertiser_id",
+        _ADVERTISER_COLUMNS,
+        data,
+        known,
+        _ADVERTISER_UPDATES,
+    )
+
 
-    if existing_hash == data["raw_hash"]:
-        # No change - return existing ID
-        p = _placeholder()
-        sql = f"SELECT id FROM advertisers WHERE network = {p} AND network_advertiser_id = {p}"
-        row = _execute_one(conn, sql, (data["network"], data["network_advertiser_id"]))
-        return row["id"], False
+def upsert_advertisers(
+    conn,
+    rows: list[dict],
+    known: dict[str, tuple[int, str]] | None = None,
+    batch_size: int = UPSERT_BATCH_SIZE,
+) -> list[tuple[int, bool]]:
+    """Batch equivalent of upsert_advertiser() for advertisers of one network.
+
+    Unchanged rows are skipped; the rest are written batch_size rows per
+    statement.
 
+    Returns:
+        (advertiser_id, was_changed) for each row, in order.
+    """
+    return _upsert_rows(
+        conn,
+        "advertisers",
+        "network_advertiser_id",
+        _ADVERTISER_COLUMNS,
+        rows,
+        known,
+        batch_size,
+        _ADVERTISER_UPDATES,
+    )
+
+
+def _ads_synced_since(conn, advertiser_id: int, cutoff: str, age: int, site_id: int | None) -> bool:
+    """Whether an advertiser's ads (a site's own, with site_id) were synced after cutoff."""
     p = _placeholder()
-    now = _now()
+    if site_id is None:
+        sql = f"SELECT 1 AS fresh FROM advertisers WHERE id = {p} AND ads_synced_at >= {cutoff}"
+        return _execute_one(conn, sql, (advertiser_id, age)) is not None
+
+    sql = f"""SELECT 1 AS fresh FROM site_ads_synced
+              WHERE site_id = {p} AND advertiser_id = {p} AND synced_at >= {cutoff}"""
+    return _execute_one(conn, sql, (site_id, advertiser_id, age)) is not None
+
 
+def ads_synced_within(conn, advertiser_id: int, hours: int, site_id: int | None = None) -> bool:
+    """Whether an advertiser's ads were fully synced in the last `hours` hours.
+
+    With site_id, only that site's own sync counts (see mark_ads_synced()).
+    """
+    p = _placeholder()
     if _use_sqlite:
-        sql = f"""INSERT INTO advertisers
-                  (network, network_advertiser_id, name, website_url, category,
-                   description, logo_url, network_rank, country_code, epc, raw_hash, last_synced_at)
-                  VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {now})
-                  ON CONFLICT(network, network_advertiser_id) DO UPDATE SET
-                      name = excluded.name,
-                      website_url = excluded.website_url,
-                      category = excluded.category,
-                      description = excluded.description,
-                      logo_url = excluded.logo_url,
-                      network_rank = excluded.network_rank,
-                      country_code = excluded.country_code,
-                      epc = excluded.epc,
-                      raw_hash = excluded.raw_hash,
-                      is_active = 1,
-                      last_synced_at = {now}"""
-        params = (
-            data["network"],
-            data["network_advertiser_id"],
-            data["name"],
-            data.get("website_url"),
-            data.get("category"),
-            data.get("description"),
-            data.get("logo_url"),
-            data.get("network_rank"),
-            data.get("country_code"),
-            data.get("epc", 0),
-            data["raw_hash"],
-        )
-        _execute_write(conn, sql, params)
+        cutoff = f"datetime('now', '-' || {p} || ' hours')"
     else:
-        sql = f"""INSERT INTO advertisers
-                  (network, network_advertiser_id, name, website_url, category,
-                   description, logo_url, network_rank, country_code, epc, raw_hash, last_synced_at)
-                  VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {now})
-                  ON DUPLICATE KEY UPDATE
-                      name = VALUES(name),
-                      website_url = VALUES(website_url),
-                      category = VALUES(category),
-                      description = VALUES(description),
-                      logo_url = VALUES(logo_url),
-                      network_rank = VALUES(network_rank),
-                      country_code = VALUES(country_code),
-                      epc = VALUES(epc),
-                      raw_hash = VALUES(raw_hash),
-                      is_active = TRUE,
-                      last_synced_at = {now}"""
-        params = (
-            data["network"],
-            data["network_advertiser_id"],
-            data["name"],
-            data.get("website_url"),
-            data.get("category"),
-            data.get("description"),
-            data.get("logo_url"),
-            data.get("network_rank"),
-            data.get("country_code"),
-            data.get("epc", 0),
-            data["raw_hash"],
-        )
-        _execute_write(conn, sql, params)
+        cutoff = f"NOW() - INTERVAL {p} HOUR"
+    return _ads_synced_since(conn, advertiser_id, cutoff, hours, site_id)
+
+
+def ads_synced_within_seconds(
+    conn, advertiser_id: int, seconds: int, site_id: int | None = None
+) -> bool:
+    """Whether an advertiser's ads were fully synced in the last `seconds` seconds."""
+    p = _placeholder()
+    if _use_sqlite:
+        cutoff = f"datetime('now', '-' || {p} || ' seconds')"
+    else:
+        cutoff = f"NOW() - INTERVAL {p} SECOND"
+    return _ads_synced_since(conn, advertiser_id, cutoff, seconds, site_id)
+
+
+def mark_ads_synced(conn, advertiser_id: int, site_id: int | None = None) -> None:
+    """Record that an advertiser's ads were just fetched and written in full.
+
+    Args:
+        site_id: For networks whose ads differ per site (CJ), the site whose
+            ads these were, recorded in site_ads_synced as well.
+    """
+    p = _placeholder()
+    now = _now()
+    sql = f"UPDATE advertisers SET ads_synced_at = {now} WHERE id = {p}"
+    _execute_write(conn, sql, (advertiser_id,))
+    if site_id is None:
+        return
 
-    # Fetch the ID
-    sql = f"SELECT id FROM advertisers WHERE network = {p} AND network_advertiser_id = {p}"
-    row = _execute_one(conn, sql, (data["network"], data["network_advertiser_id"]))
-    return row["id"], True
+    if _use_sqlite:
+        upsert = "ON CONFLICT(site_id, advertiser_id) DO UPDATE SET synced_at = excluded.synced_at"
+    else:
+        upsert = "ON DUPLICATE KEY UPDATE synced_at = VALUES(synced_at)"
+    sql = f"""INSERT INTO site_ads_synced (site_id, advertiser_id, synced_at)
+              VALUES ({p}, {p}, {now}) {upsert}"""
+    _execute_write(conn, sql, (site_id, advertiser_id))
 
 
 # =============================================================================
@@ -299,167 +562,49 @@ def get_ad_hash(conn, network: str, network_ad_id: str) -> str | None:
     return row["raw_hash"] if row else None
 
 
-def upsert_ad(conn, data: dict) -> tuple[int, bool]:
+def load_ad_hashes(conn, network: str) -> dict[str, tuple[int, str]]:
+    """Load {network_ad_id: (id, raw_hash)} for a network in one query."""
+    p = _placeholder()
+    sql = f"SELECT id, network_ad_id, raw_hash FROM ads WHERE network = {p}"
+    return {
+        row["network_ad_id"]: (row["id"], row["raw_hash"])
+        for row in _execute_query(conn, sql, (network,))
+    }
+
+
+def upsert_ad(
+    conn, data: dict, known: dict[str, tuple[int, str]] | None = None
+) -> tuple[int, bool]:
     """Insert or update ad, skipping if raw_hash unchanged.
 
+    Args:
+        conn: Database connection.
+        data: Ad row.
+        known: Index from load_ad_hashes(). When given, unchanged ads are
+            answered from it without a query, and written ones are added
+            to it.
+
     Returns:
         Tuple of (ad_id, was_changed).
     """
-    existing_hash = get_ad_hash(conn, data["network"], data["network_ad_id"])
+    return _upsert_row(conn, "ads", "network_ad_id", _AD_COLUMNS, data, known)
 
-    if existing_hash == data["raw_hash"]:
-        # No change - return existing ID
-        p = _placeholder()
-        sql = f"SELECT id FROM ads WHERE network = {p} AND network_ad_id = {p}"
-        row = _execute_one(conn, sql, (data["network"], data["network_ad_id"]))
-        return row["id"], False
 
-    p = _placeholder()
-    now = _now()
+def upsert_ads(
+    conn,
+    rows: list[dict],
+    known: dict[str, tuple[int, str]] | None = None,
+    batch_size: int = UPSERT_BATCH_SIZE,
+) -> list[tuple[int, bool]]:
+    """Batch equivalent of upsert_ad() for ads of one network.
 
-    # Common parameter values (no weight column — weight is managed via
-    # weight_override on ads / default_weight on advertisers)
-    params_values = (
-        data["network"],
-        data["network_ad_id"],
-        data["advertiser_id"],
-        data.get("creative_type", "banner"),
-        data["tracking_url"],
-        data.get("destination_url"),
-        data.get("status", "active"),
-        data.get("epc", 0),
-        data["raw_hash"],
-        data.get("ad_content"),
-        data["advert_name"],
-        data["bannercode"],
-        data.get("imagetype", ""),
-        data.get("image_url"),
-        data["width"],
-        data["height"],
-        data.get("campaign_name", "General Promotion"),
-        data.get("enable_stats", "Y"),
-        data.get("show_everyone", "Y"),
-        data.get("show_desktop", "Y"),
-        data.get("show_mobile", "Y"),
-        data.get("show_tablet", "Y"),
-        data.get("show_ios", "Y"),
-        data.get("show_android", "Y"),
-        data.get("autodelete", "Y"),
-        data.get("autodisable", "N"),
-        data.get("budget", 0),
-        data.get("click_rate", 0),
-        data.get("impression_rate", 0),
-        data.get("state_required", "N"),
-        data.get("geo_cities", "a:0:{}"),
-        data.get("geo_states", "a:0:{}"),
-        data.get("geo_countries", "a:0:{}"),
-        data.get("schedule_start", 0),
-        data.get("schedule_end", 2650941780),
-    )
+    Unchanged rows are skipped; the rest are written batch_size rows per
+    statement.
 
-    if _use_sqlite:
-        sql = f"""INSERT INTO ads
-                  (network, network_ad_id, advertiser_id, creative_type, tracking_url,
-                   destination_url, status, epc, raw_hash, ad_content, last_synced_at,
-                   advert_name, bannercode, imagetype, image_url, width, height,
-                   campaign_name, enable_stats, show_everyone, show_desktop, show_mobile,
-                   show_tablet, show_ios, show_android, autodelete, autodisable,
-                   budget, click_rate, impression_rate, state_required,
-                   geo_cities, geo_states, geo_countries, schedule_start, schedule_end)
-                  VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {now},
-                          {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p},
-                          {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p},
-                          {p}, {p}, {p}, {p}, {p})
-                  ON CONFLICT(network, network_ad_id) DO UPDATE SET
-                      advertiser_id = excluded.advertiser_id,
-                      creative_type = excluded.creative_type,
-                      tracking_url = excluded.tracking_url,
-                      destination_url = excluded.destination_url,
-                      status = excluded.status,
-                      epc = excluded.epc,
-                      raw_hash = excluded.raw_hash,
-                      ad_content = excluded.ad_content,
-                      last_synced_at = {now},
-                      advert_name = excluded.advert_name,
-                      bannercode = excluded.bannercode,
-                      imagetype = excluded.imagetype,
-                      image_url = excluded.image_url,
-                      width = excluded.width,
-                      height = excluded.height,
-                      campaign_name = excluded.campaign_name,
-                      enable_stats = excluded.enable_stats,
-                      show_everyone = excluded.show_everyone,
-                      show_desktop = excluded.show_desktop,
-                      show_mobile = excluded.show_mobile,
-                      show_tablet = excluded.show_tablet,
-                      show_ios = excluded.show_ios,
-                      show_android = excluded.show_android,
-                      autodelete = excluded.autodelete,
-                      autodisable = excluded.autodisable,
-                      budget = excluded.budget,
-                      click_rate = excluded.click_rate,
-                      impression_rate = excluded.impression_rate,
-                      state_required = excluded.state_required,
-                      geo_cities = excluded.geo_cities,
-                      geo_states = excluded.geo_states,
-                      geo_countries = excluded.geo_countries,
-                      schedule_start = excluded.schedule_start,
-                      schedule_end = excluded.schedule_end"""
-        _execute_write(conn, sql, params_values)
-    else:
-        sql = f"""INSERT INTO ads
-                  (network, network_ad_id, advertiser_id, creative_type, tracking_url,
-                   destination_url, status, epc, raw_hash, ad_content, last_synced_at,
-                   advert_name, bannercode, imagetype, image_url, width, height,
-                   campaign_name, enable_stats, show_everyone, show_desktop, show_mobile,
-                   show_tablet, show_ios, show_android, autodelete, autodisable,
-                   budget, click_rate, impression_rate, state_required,
-                   geo_cities, geo_states, geo_countries, schedule_start, schedule_end)
-                  VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {now},
-                          {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p},
-                          {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p},
-                          {p}, {p}, {p}, {p}, {p})
-                  ON DUPLICATE KEY UPDATE
-                      advertiser_id = VALUES(advertiser_id),
-                      creative_type = VALUES(creative_type),
-                      tracking_url = VALUES(tracking_url),
-                      destination_url = VALUES(destination_url),
-                      status = VALUES(status),
-                      epc = VALUES(epc),
-                      raw_hash = VALUES(raw_hash),
-                      ad_content = VALUES(ad_content),
-                      last_synced_at = {now},
-                      advert_name = VALUES(advert_name),
-                      bannercode = VALUES(bannercode),
-                      imagetype = VALUES(imagetype),
-                      image_url = VALUES(image_url),
-                      width = VALUES(width),
-                      height = VALUES(height),
-                      campaign_name = VALUES(campaign_name),
-                      enable_stats = VALUES(enable_stats),
-                      show_everyone = VALUES(show_everyone),
-                      show_desktop = VALUES(show_desktop),
-                      show_mobile = VALUES(show_mobile),
-                      show_tablet = VALUES(show_tablet),
-                      show_ios = VALUES(show_ios),
-                      show_android = VALUES(show_android),
-                      autodelete = VALUES(autodelete),
-                      autodisable = VALUES(autodisable),
-                      budget = VALUES(budget),
-                      click_rate = VALUES(click_rate),
-                      impression_rate = VALUES(impression_rate),
-                      state_required = VALUES(state_required),
-                      geo_cities = VALUES(geo_cities),
-                      geo_states = VALUES(geo_states),
-                      geo_countries = VALUES(geo_countries),
-                      schedule_start = VALUES(schedule_start),
-                      schedule_end = VALUES(schedule_end)"""
-        _execute_write(conn, sql, params_values)
-
-    # Fetch the ID
-    sql = f"SELECT id FROM ads WHERE network = {p} AND network_ad_id = {p}"
-    row = _execute_one(conn, sql, (data["network"], data["network_ad_id"]))
-    return row["id"], True
+    Returns:
+        (ad_id, was_changed) for each row, in order.
+    """
+    return _upsert_rows(conn, "ads", "network_ad_id", _AD_COLUMNS, rows, known, batch_size)
 
 
 # =============================================================================
@@ -467,24 +612,30 @@ def upsert_ad(conn, data: dict) -> tuple[int, bool]:
 # =============================================================================
 
 
-def create_sync_log(conn, network: str, site_domain: str | None = None) -> int:
+def create_sync_log(
+    conn,
+    network: str,
+    site_domain: str | None = None,
+    run_id: str | None = None,
+    shard_index: int | None = None,
+    shard_count: int | None = None,
+) -> int:
     """Create a new sync log entry when starting a sync.
 
+    Args:
+        run_id, shard_index, shard_count: Set for one shard of a sharded run
+            (``--shard i/N``); NULL for a regular sync.
+
     Returns:
         The ID of the created sync log entry.
     """
     p = _placeholder()
     now = _now()
 
-    sql = f"""INSERT INTO sync_logs (network, site_domain, status, started_at)
-              VALUES ({p}, {p}, 'running', {now})"""
-    row_id = _execute_write(conn, sql, (network, site_domain))
-
-    if _use_sqlite:
-        return row_id
-    else:
-        row = _execute_one(conn, "SELECT LAST_INSERT_ID() AS id", ())
-        return row["id"]
+    sql = f"""INSERT INTO sync_logs
+              (network, site_domain, status, started_at, run_id, shard_index, shard_count)
+              VALUES ({p}, {p}, 'running', {now}, {p}, {p}, {p})"""
+    return _execute_write(conn, sql, (network, site_domain, run_id, shard_index, shard_count))
 
 
 def update_sync_log(
@@ -523,6 +674,164 @@ def update_sync_log(
     )
 
 
+def save_sync_checkpoint(conn, log_id: int, checkpoint: dict | None) -> None:
+    """Store a sync's resume state as JSON (None clears it)."""
+    p = _placeholder()
+    value = json.dumps(checkpoint) if checkpoint is not None else None
+    _execute_write(conn, f"UPDATE sync_logs SET checkpoint = {p} WHERE id = {p}", (value, log_id))
+
+
+def get_resumable_sync_log(
+    conn,
+    network: str,
+    site_domain: str | None = None,
+    run_id: str | None = None,
+    shard_index: int | None = None,
+) -> dict | None:
+    """Get the latest sync log for a network/site if it can be resumed.
+
+    A log is resumable when it is the most recent one for the network,
+    site and shard, never finished (status running or failed) and has a
+    checkpoint.
+
+    Returns:
+        Dict with id, status and the parsed checkpoint, or None.
+    """
+    p = _placeholder()
+    same = "IS" if _use_sqlite else "<=>"
+
+    sql = f"""SELECT id, status, checkpoint FROM sync_logs
+              WHERE network = {p} AND site_domain {same} {p}
+              AND run_id {same} {p} AND shard_index {same} {p}
+              ORDER BY id DESC LIMIT 1"""
+    row = _execute_one(conn, sql, (network, site_domain, run_id, shard_index))
+
+    if not row or row["status"] not in ("running", "failed") or not row["checkpoint"]:
+        return None
+    return {"id": row["id"], "status": row["status"], "checkpoint": json.loads(row["checkpoint"])}
+
+
+def count_successful_syncs(
+    conn, network: str, site_domain: str | None = None, exclude_run_id: str | None = None
+) -> int:
+    """Count completed syncs for a network/site (used to schedule full sweeps).
+
+    The shards of a sharded run count as one sync. Shards of exclude_run_id
+    are left out, so every shard of a run sees the same count.
+    """
+    p = _placeholder()
+    same_site = "IS" if _use_sqlite else "<=>"
+
+    sql = f"""SELECT COUNT(DISTINCT run_id)
+                     + COALESCE(SUM(CASE WHEN run_id IS NULL THEN 1 ELSE 0 END), 0) AS cnt
+              FROM sync_logs
+              WHERE network = {p} AND site_domain {same_site} {p} AND status = 'success'
+              AND (run_id IS NULL OR run_id <> {p})"""
+    row = _execute_one(conn, sql, (network, site_domain, exclude_run_id or ""))
+    return row["cnt"]
+
+
+def get_shard_sync_logs(conn, network: str, site_domain: str | None, run_id: str) -> list[dict]:
+    """Get the sync logs of every shard of a sharded run for a network/site.
+
+    Returns:
+        List of dicts with id, shard_index, shard_count, status and the
+        parsed checkpoint (None once cleared).
+    """
+    p = _placeholder()
+    same_site = "IS" if _use_sqlite else "<=>"
+
+    sql = f"""SELECT id, shard_index, shard_count, status, checkpoint FROM sync_logs
+              WHERE network = {p} AND site_domain {same_site} {p} AND run_id = {p}
+              ORDER BY id"""
+    rows = _execute_query(conn, sql, (network, site_domain, run_id))
+    for row in rows:
+        row["checkpoint"] = json.loads(row["checkpoint"]) if row["checkpoint"] else None
+    return rows
+
+
+def save_skipped_advertisers(conn, log_id: int, network_advertiser_ids: set[str]) -> None:
+    """Record the advertisers a sync left unsynced when its time budget ran out."""
+    p = _placeholder()
+    value = json.dumps(sorted(network_advertiser_ids)) if network_advertiser_ids else None
+    _execute_write(
+        conn, f"UPDATE sync_logs SET skipped_advertisers = {p} WHERE id = {p}", (value, log_id)
+    )
+
+
+def save_transfer_stats(conn, log_id: int, by_endpoint: dict[str, dict[str, int]]) -> None:
+    """Record a sync's API response bytes, in total and per endpoint.
+
+    Args:
+        by_endpoint: {"Ads": {"requests": n, "wire": bytes, "decoded": bytes}, ...}
+    """
+    p = _placeholder()
+    wire = sum(counts["wire"] for counts in by_endpoint.values())
+    decoded = sum(counts["decoded"] for counts in by_endpoint.values())
+    value = json.dumps(by_endpoint, sort_keys=True) if by_endpoint else None
+    _execute_write(
+        conn,
+        f"""UPDATE sync_logs SET bytes_wire = {p}, bytes_decoded = {p}, transfer = {p}
+            WHERE id = {p}""",
+        (wire, decoded, value, log_id),
+    )
+
+
+def count_api_requests(conn, network: str, seconds: int) -> int:
+    """Count a network's API requests made by syncs started in the last `seconds` seconds.
+
+    Sums the per-endpoint request counts in sync_logs.transfer, which
+    running syncs update at every checkpoint.
+    """
+    p = _placeholder()
+    if _use_sqlite:
+        cutoff = f"datetime('now', '-' || {p} || ' seconds')"
+    else:
+        cutoff = f"NOW() - INTERVAL {p} SECOND"
+
+    sql = f"""SELECT transfer FROM sync_logs
+              WHERE network = {p} AND started_at >= {cutoff} AND transfer IS NOT NULL"""
+    total = 0
+    for row in _execute_query(conn, sql, (network, int(seconds))):
+        try:
+            by_endpoint = json.loads(row["transfer"])
+        except (TypeError, ValueError):
+            continue
+        total += sum(int(counts.get("requests", 0)) for counts in by_endpoint.values())
+    return total
+
+
+def get_skipped_advertisers(
+    conn, network: str, site_domain: str | None = None, shard_index: int | None = None
+) -> set[str]:
+    """Get the advertisers skipped by the latest successful sync for a network/site/shard.
+
+    Returns:
+        Set of network advertiser IDs (empty if that sync finished everything).
+    """
+    p = _placeholder()
+    same = "IS" if _use_sqlite else "<=>"
+
+    sql = f"""SELECT skipped_advertisers FROM sync_logs
+              WHERE network = {p} AND site_domain {same} {p} AND shard_index {same} {p}
+              AND status = 'success'
+              ORDER BY id DESC LIMIT 1"""
+    row = _execute_one(conn, sql, (network, site_domain, shard_index))
+
+    if not row or not row["skipped_advertisers"]:
+        return set()
+    return set(json.loads(row["skipped_advertisers"]))
+
+
+def reopen_sync_log(conn, log_id: int) -> None:
+    """Mark a failed or interrupted sync log as running again for a resume."""
+    p = _placeholder()
+    sql = f"""UPDATE sync_logs
+              SET status = 'running', error_message = NULL, completed_at = NULL
+              WHERE id = {p}"""
+    _execute_write(conn, sql, (log_id,))
+
+
 # =============================================================================
 # SITE LOOKUP FUNCTIONS
 # =============================================================================
@@ -570,6 +879,55 @@ def ensure_site_advertiser_rule(conn, site_id: int, advertiser_id: int) -> None:
     _execute_write(conn, sql, (site_id, advertiser_id))
 
 
+def ensure_site_advertiser_rules(conn, site_ids: list[int], advertiser_ids: list[int]) -> int:
+    """Ensure a site_advertiser_rules row exists for every (site, advertiser) pair.
+
+    Creates the missing 'default' rules with one INSERT ... SELECT per
+    UPSERT_BATCH_SIZE advertisers. Existing rules (including 'allowed' or
+    'denied') are never overwritten. NOT EXISTS skips the pairs that
+    already have a rule; the insert still ignores duplicates, since a
+    concurrent worker (another shard or site client) may create the same
+    rule after this statement's snapshot was taken.
+
+    Returns:
+        Number of rules created.
+    """
+    if not site_ids or not advertiser_ids:
+        return 0
+
+    p = _placeholder()
+    site_placeholders = ", ".join([p] * len(site_ids))
+    unique_ids = list(dict.fromkeys(advertiser_ids))
+    chunk_size = max(1, min(UPSERT_BATCH_SIZE, _SQLITE_MAX_VARIABLES - len(site_ids)))
+
+    insert = "INSERT OR IGNORE" if _use_sqlite else "INSERT IGNORE"
+    created = 0
+    for start in range(0, len(unique_ids), chunk_size):
+        chunk = unique_ids[start : start + chunk_size]
+        sql = f"""{insert} INTO site_advertiser_rules (site_id, advertiser_id, rule)
+                  SELECT s.id, a.id, 'default'
+                  FROM sites s
+                  CROSS JOIN advertisers a
+                  WHERE s.id IN ({site_placeholders})
+                  AND a.id IN ({", ".join([p] * len(chunk))})
+                  AND NOT EXISTS (
+                      SELECT 1 FROM site_advertiser_rules r
+                      WHERE r.site_id = s.id AND r.advertiser_id = a.id
+                  )"""
+        created += _execute_rowcount(conn, sql, (*site_ids, *chunk))
+    return created
+
+
+def get_allowed_advertiser_ids(conn, network: str) -> set[str]:
+    """Get the network advertiser IDs explicitly allowed on at least one site."""
+    p = _placeholder()
+    sql = f"""SELECT DISTINCT a.network_advertiser_id
+              FROM advertisers a
+              JOIN site_advertiser_rules r ON r.advertiser_id = a.id
+              WHERE a.network = {p} AND r.rule = 'allowed'"""
+    return {row["network_advertiser_id"] for row in _execute_query(conn, sql, (network,))}
+
+
 # =============================================================================
 # STALE DATA CLEANUP FUNCTIONS
 # =============================================================================
@@ -578,6 +936,12 @@ def ensure_site_advertiser_rule(conn, site_id: int, advertiser_id: int) -> None:
 def delete_stale_ads(conn, network: str, advertiser_id: int, seen_network_ad_ids: set[str]) -> int:
     """Delete ads that were not seen in the current sync for an advertiser.
 
+    For one advertiser outside a sync run (resync_advertiser()); full runs
+    stage their seen ads with stage_seen_ads() and call delete_unseen_ads().
+    A resync has no sync_logs row to stage against, so the seen IDs go to a
+    temporary table of the connection instead, and the unseen ads are
+    deleted with one NOT EXISTS statement however many ads there are.
+
     Args:
         conn: Database connection.
         network: Network identifier.
@@ -591,39 +955,252 @@ def delete_stale_ads(conn, network: str, advertiser_id: int, seen_network_ad_ids
         return 0
 
     p = _placeholder()
-    placeholders = ", ".join([p] * len(seen_network_ad_ids))
+    if _use_sqlite:
+        create = """CREATE TEMP TABLE IF NOT EXISTS resync_seen_ads (
+                      network_ad_id TEXT NOT NULL PRIMARY KEY
+                  )"""
+    else:
+        create = """CREATE TEMPORARY TABLE IF NOT EXISTS resync_seen_ads (
+                      network_ad_id VARCHAR(255) NOT NULL PRIMARY KEY
+                  ) DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"""
+    _execute_rowcount(conn, create)
+    _execute_rowcount(conn, "DELETE FROM resync_seen_ads")
+    _execute_many(
+        conn,
+        f"INSERT INTO resync_seen_ads (network_ad_id) VALUES ({p})",
+        [(network_ad_id,) for network_ad_id in seen_network_ad_ids],
+    )
 
     sql = f"""DELETE FROM ads
               WHERE network = {p}
               AND advertiser_id = {p}
-              AND network_ad_id NOT IN ({placeholders})"""
+              AND NOT EXISTS (
+                  SELECT 1 FROM resync_seen_ads s WHERE s.network_ad_id = ads.network_ad_id
+              )"""
+    deleted = _execute_rowcount(conn, sql, (network, advertiser_id))
+    _execute_rowcount(conn, "DELETE FROM resync_seen_ads")
+    return deleted
+
+
+def stage_seen_ads(conn, sync_log_id: int, seen_ads: list[tuple[int, str]]) -> None:
+    """Record ads returned during a sync run, for delete_unseen_ads().
+
+    Args:
+        conn: Database connection.
+        sync_log_id: The run's sync_logs ID.
+        seen_ads: (database advertiser ID, network_ad_id) pairs, one per ad
+            of advertisers whose complete ad list was fetched.
+    """
+    if not seen_ads:
+        return
+
+    p = _placeholder()
+    insert = "INSERT OR IGNORE" if _use_sqlite else "INSERT IGNORE"
+    sql = f"""{insert} INTO sync_seen_ads (sync_log_id, advertiser_id, network_ad_id)
+              VALUES ({p}, {p}, {p})"""
+    params = [
+        (sync_log_id, advertiser_id, network_ad_id) for advertiser_id, network_ad_id in seen_ads
+    ]
+    _execute_many(conn, sql, params)
+
 
-    params = (network, advertiser_id, *seen_network_ad_ids)
-    return _execute_rowcount(conn, sql, params)
+def delete_unseen_ads(conn, network: str, sync_log_id: int) -> int:
+    """Delete the staged advertisers' ads that the sync run did not see.
 
+    One statement for the whole run: ads of advertisers staged with
+    stage_seen_ads() whose network_ad_id was not staged are deleted. The
+    run's staged rows are then removed.
 
-def deactivate_stale_advertisers(conn, network: str, seen_network_advertiser_ids: set[str]) -> int:
+    Returns:
+        Number of ads deleted.
+    """
+    p = _placeholder()
+    sql = f"""DELETE FROM ads
+              WHERE network = {p}
+              AND advertiser_id IN (
+                  SELECT advertiser_id FROM sync_seen_ads WHERE sync_log_id = {p}
+              )
+              AND NOT EXISTS (
+                  SELECT 1 FROM sync_seen_ads s
+                  WHERE s.sync_log_id = {p} AND s.network_ad_id = ads.network_ad_id
+              )"""
+    deleted = _execute_rowcount(conn, sql, (network, sync_log_id, sync_log_id))
+    _execute_rowcount(conn, f"DELETE FROM sync_seen_ads WHERE sync_log_id = {p}", (sync_log_id,))
+    return deleted
+
+
+def claim_shared_crawl(conn, network: str, run_id: str) -> int | None:
+    """Claim a sharded run's global ads crawl for the calling shard to make.
+
+    The first shard of the run to call this creates the crawl. A crawl
+    left failed by another shard is taken over, dropping its stored ads.
+
+    Returns:
+        The crawl ID if the caller is to crawl, or None if another shard
+        has claimed it (see get_shared_crawl()).
+    """
+    p = _placeholder()
+    insert = "INSERT OR IGNORE" if _use_sqlite else "INSERT IGNORE"
+    claimed = _execute_rowcount(
+        conn,
+        f"{insert} INTO sync_shared_crawls (network, run_id) VALUES ({p}, {p})",
+        (network, run_id),
+    )
+    if not claimed:
+        sql = f"""UPDATE sync_shared_crawls
+                  SET status = 'running', complete = 1, replayed_at = NULL, started_at = {_now()}
+                  WHERE network = {p} AND run_id = {p} AND status = 'failed'"""
+        if not _execute_rowcount(conn, sql, (network, run_id)):
+            return None
+
+    crawl_id = get_shared_crawl(conn, network, run_id)["id"]
+    _execute_rowcount(conn, f"DELETE FROM sync_shared_ads WHERE crawl_id = {p}", (crawl_id,))
+    return crawl_id
+
+
+def get_shared_crawl(conn, network: str, run_id: str) -> dict | None:
+    """Get a sharded run's global ads crawl.
+
+    Returns:
+        Dict with id, status ('running', 'done' or 'failed'), complete
+        and replayed_at, or None if no shard has claimed it yet.
+    """
+    p = _placeholder()
+    sql = f"""SELECT id, status, complete, replayed_at FROM sync_shared_crawls
+              WHERE network = {p} AND run_id = {p}"""
+    row = _execute_one(conn, sql, (network, run_id))
+    if not row:
+        return None
+    row["complete"] = bool(row["complete"])
+    return row
+
+
+def add_shared_ads(conn, crawl_id: int, ads: list[tuple[str, dict]]) -> None:
+    """Store raw ads of a shared crawl.
+
+    Args:
+        ads: (network advertiser ID, raw ad dict) pairs.
+    """
+    if not ads:
+        return
+
+    p = _placeholder()
+    sql = f"""INSERT INTO sync_shared_ads (crawl_id, network_advertiser_id, raw)
+              VALUES ({p}, {p}, {p})"""
+    params = [(crawl_id, advertiser_id, json.dumps(raw_ad)) for advertiser_id, raw_ad in ads]
+    if _use_sqlite:
+        conn.executemany(sql, params)
+    else:
+        with conn.cursor() as cur:
+            cur.executemany(sql, params)
+
+
+def iter_shared_ads(
+    conn, crawl_id: int, batch_size: int = UPSERT_BATCH_SIZE
+) -> Iterator[tuple[str, dict]]:
+    """Yield a shared crawl's (network advertiser ID, raw ad) pairs in crawl order.
+
+    Rows are read batch_size at a time, so the crawl is never held in
+    memory at once.
+    """
+    p = _placeholder()
+    sql = f"""SELECT id, network_advertiser_id, raw FROM sync_shared_ads
+              WHERE crawl_id = {p} AND id > {p}
+              ORDER BY id LIMIT {p}"""
+    last_id = 0
+    while True:
+        rows = _execute_query(conn, sql, (crawl_id, last_id, batch_size))
+        for row in rows:
+            yield row["network_advertiser_id"], json.loads(row["raw"])
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1]["id"]
+
+
+def finish_shared_crawl(
+    conn, crawl_id: int, status: str, complete: bool = True, replayed_at: float | None = None
+) -> None:
+    """Mark a shared crawl 'done' (readable by every shard) or 'failed' (to be taken over)."""
+    p = _placeholder()
+    sql = f"""UPDATE sync_shared_crawls
+              SET status = {p}, complete = {p}, replayed_at = {p}
+              WHERE id = {p}"""
+    _execute_write(conn, sql, (status, int(complete), replayed_at, crawl_id))
+
+
+def delete_shared_crawls(conn, network: str, run_id: str, max_age_hours: int = 24) -> int:
+    """Delete a finished run's shared crawl, and any of the network's older than max_age_hours.
+
+    Older crawls belong to runs whose shards never all finished.
+
+    Returns:
+        Number of crawls deleted.
+    """
+    p = _placeholder()
+    if _use_sqlite:
+        cutoff = f"datetime('now', '-' || {p} || ' hours')"
+    else:
+        cutoff = f"NOW() - INTERVAL {p} HOUR"
+    where = f"network = {p} AND (run_id = {p} OR started_at < {cutoff})"
+    params = (network, run_id, max_age_hours)
+
+    _execute_rowcount(
+        conn,
+        f"""DELETE FROM sync_shared_ads
+            WHERE crawl_id IN (SELECT id FROM sync_shared_crawls WHERE {where})""",
+        params,
+    )
+    return _execute_rowcount(conn, f"DELETE FROM sync_shared_crawls WHERE {where}", params)
+
+
+def stage_seen_advertisers(conn, sync_log_id: int, network_advertiser_ids: list[str]) -> None:
+    """Record advertisers returned during a sync run, for deactivate_stale_advertisers()."""
+    if not network_advertiser_ids:
+        return
+
+    p = _placeholder()
+    insert = "INSERT OR IGNORE" if _use_sqlite else "INSERT IGNORE"
+    sql = f"""{insert} INTO sync_seen_advertisers (sync_log_id, network_advertiser_id)
+              VALUES ({p}, {p})"""
+    _execute_many(conn, sql, [(sync_log_id, nid) for nid in network_advertiser_ids])
+
+
+def deactivate_stale_advertisers(conn, network: str, sync_log_ids: list[int]) -> int:
     """Soft-delete advertisers not seen in the current sync.
 
+    One statement for the network: active advertisers not staged with
+    stage_seen_advertisers() under any of the logs (one per shard of a
+    sharded run) are deactivated. Nothing is deactivated if no advertiser
+    was staged at all, so an empty response cannot deactivate a network.
+    The logs' staged rows are then removed.
+
     Args:
         conn: Database connection.
         network: Network identifier.
-        seen_network_advertiser_ids: Set of network_advertiser_id values seen this sync.
+        sync_log_ids: The run's sync_logs IDs.
 
     Returns:
         Number of advertisers deactivated.
     """
-    if not seen_network_advertiser_ids:
+    if not sync_log_ids:
         return 0
 
     p = _placeholder()
-    placeholders = ", ".join([p] * len(seen_network_advertiser_ids))
-
+    logs = ", ".join([p] * len(sync_log_ids))
     sql = f"""UPDATE advertisers
               SET is_active = 0
               WHERE network = {p}
               AND is_active = 1
-              AND network_advertiser_id NOT IN ({placeholders})"""
-
-    params = (network, *seen_network_advertiser_ids)
-    return _execute_rowcount(conn, sql, params)
+              AND EXISTS (SELECT 1 FROM sync_seen_advertisers WHERE sync_log_id IN ({logs}))
+              AND NOT EXISTS (
+                  SELECT 1 FROM sync_seen_advertisers s
+                  WHERE s.sync_log_id IN ({logs})
+                  AND s.network_advertiser_id = advertisers.network_advertiser_id
+              )"""
+    deactivated = _execute_rowcount(conn, sql, (network, *sync_log_ids, *sync_log_ids))
+    _execute_rowcount(
+        conn,
+        f"DELETE FROM sync_seen_advertisers WHERE sync_log_id IN ({logs})",
+        tuple(sync_log_ids),
+    )
+    return deactivated
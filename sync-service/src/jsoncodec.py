@@ -0,0 +1,52 @@
+"""JSON decoding and canonical serialization, using orjson when installed.
+
+Network responses are decoded with loads(), records are serialized for
+change detection with canonical() and for temporary storage with dumps().
+orjson (``pip install .[json]``) is several times faster at loads() and
+dumps(); without it the standard library is used.
+
+canonical() always uses the standard library: its bytes are exactly those of
+the ``json.dumps(obj, sort_keys=True, default=str)`` that raw_hash values
+have always been computed from, and orjson cannot produce that form (``", "``
+separators, ``\\u`` escapes). Changing them would make every stored advertiser
+and ad look changed on the next run. It reuses one encoder rather than
+building a new one per call as json.dumps() does with those arguments.
+See bench_jsoncodec.py for timings.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# Same settings as json.dumps(obj, sort_keys=True, default=str)
+_canonical_encoder = json.JSONEncoder(sort_keys=True, default=str)
+
+
+def loads(data: bytes | str):
+    """Decode a JSON document (e.g. a response body).
+
+    Raises:
+        json.JSONDecodeError: If the document is invalid.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Serialize obj to compact JSON bytes (key order kept)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8", "surrogatepass"
+    )
+
+
+def canonical(obj) -> bytes:
+    """Serialize obj to canonical JSON bytes for hashing (ASCII, so encoding cannot fail)."""
+    return _canonical_encoder.encode(obj).encode()
@@ -1,14 +1,29 @@
 """Main entry point for the sync service."""
 
+import argparse
+import asyncio
+import dataclasses
 import logging
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-from .config import load_config
+from . import db, jsoncodec
+from .config import Config, SyncOptions, load_config
 from .db import get_connection, test_connection
-from .networks.awin import AwinClient
-from .networks.cj import CJClient
-from .networks.flexoffers import FlexOffersClient
-from .networks.impact import ImpactClient
+from .networks.awin import AsyncAwinClient, AwinClient
+from .networks.base import ActiveSitesCache, AsyncNetworkClient, NetworkClient
+from .networks.cassette import Cassette, ReplayOptions
+from .networks.cassette import record as record_traffic
+from .networks.cassette import replay as replay_traffic
+from .networks.cj import AsyncCJClient, CJAdvertiserCache, CJClient
+from .networks.flexoffers import AsyncFlexOffersClient, FlexOffersClient
+from .networks.httpcache import configure as configure_http_cache
+from .networks.httpcache import get_cache as get_http_cache
+from .networks.impact import AsyncImpactClient, ImpactClient
+from .networks.ratelimit import configure as configure_rate_limits
+from .networks.ratelimit import metrics as rate_limit_metrics
+from .networks.transport import configure as configure_http
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,55 +31,425 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+NETWORKS = ("flexoffers", "awin", "cj", "impact")
 
-def main() -> int:
-    """Run the sync service."""
-    logger.info("Starting affiliate ad sync")
+# Networks with one client per site domain
+PER_DOMAIN_NETWORKS = ("flexoffers", "cj")
 
-    # Test database connection on startup (exits if fails)
-    test_connection()
 
-    try:
-        config = load_config()
-    except ValueError as e:
-        logger.error(f"Configuration error: {e}")
-        return 1
+def build_clients(config: Config) -> list[NetworkClient]:
+    """Initialize network clients based on available credentials.
+
+    In async mode the httpx.AsyncClient variants of each client are used.
+    """
+    use_async = config.sync.mode == "async"
+    flexoffers_cls = AsyncFlexOffersClient if use_async else FlexOffersClient
+    awin_cls = AsyncAwinClient if use_async else AwinClient
+    cj_cls = AsyncCJClient if use_async else CJClient
+    impact_cls = AsyncImpactClient if use_async else ImpactClient
 
-    # Initialize network clients based on available credentials
-    clients = []
+    clients: list[NetworkClient] = []
 
     if config.flexoffers_domain_keys:
         for domain, api_key in config.flexoffers_domain_keys.items():
-            clients.append(FlexOffersClient(api_key, domain=domain))
+            clients.append(flexoffers_cls(api_key, domain=domain))
             logger.info(f"FlexOffers client initialized for {domain}")
 
     if config.awin_api_token and config.awin_publisher_id:
-        clients.append(AwinClient(config.awin_api_token, config.awin_publisher_id))
+        clients.append(awin_cls(config.awin_api_token, config.awin_publisher_id))
         logger.info("Awin client initialized")
 
     if config.cj_api_token and config.cj_cid and config.cj_domain_website_ids:
+        # All CJ domains share one CID: look up and upsert its advertisers once per run
+        cj_cache = CJAdvertiserCache(
+            share_links=config.cj_share_link_search,
+            domains=len(config.cj_domain_website_ids),
+            verify_sample=config.cj_link_verify_sample,
+            spill_threshold=config.sync.spill_threshold,
+        )
         for domain, website_id in config.cj_domain_website_ids.items():
-            clients.append(CJClient(config.cj_api_token, config.cj_cid, website_id, domain=domain))
+            clients.append(
+                cj_cls(
+                    config.cj_api_token,
+                    config.cj_cid,
+                    website_id,
+                    domain=domain,
+                    advertiser_cache=cj_cache,
+                )
+            )
             logger.info(f"CJ client initialized for {domain}")
 
     if config.impact_account_sid and config.impact_auth_token:
-        clients.append(ImpactClient(config.impact_account_sid, config.impact_auth_token))
+        clients.append(impact_cls(config.impact_account_sid, config.impact_auth_token))
         logger.info("Impact client initialized")
 
+    # Site rules target the same active sites for every client of the run
+    sites_cache = ActiveSitesCache()
+    for client in clients:
+        client.sites_cache = sites_cache
+
+    return clients
+
+
+def scope_config(config: Config, network: str | None = None, domain: str | None = None) -> Config:
+    """Drop the credentials of networks and sites outside a targeted sync.
+
+    Args:
+        network: Keep only this network's clients.
+        domain: Keep only this site's clients of the per-domain networks
+            (FlexOffers, CJ); networks without per-domain clients are dropped.
+
+    Returns:
+        A copy of config that build_clients() turns into just the needed clients.
+    """
+
+    def keep(name: str) -> bool:
+        return (network is None or network == name) and (
+            domain is None or name in PER_DOMAIN_NETWORKS
+        )
+
+    def for_domain(mapping: dict[str, str]) -> dict[str, str]:
+        return {d: value for d, value in mapping.items() if domain is None or d == domain}
+
+    return dataclasses.replace(
+        config,
+        flexoffers_domain_keys=(
+            for_domain(config.flexoffers_domain_keys) if keep("flexoffers") else {}
+        ),
+        awin_api_token=config.awin_api_token if keep("awin") else None,
+        cj_domain_website_ids=for_domain(config.cj_domain_website_ids) if keep("cj") else {},
+        impact_account_sid=config.impact_account_sid if keep("impact") else None,
+    )
+
+
+async def _run_async_sync(
+    client: AsyncNetworkClient, conn, site_domain: str | None, options: SyncOptions
+) -> dict:
+    """Run an async client's sync and close its AsyncClient on the same loop."""
+    try:
+        return await client.async_sync(conn, site_domain=site_domain, options=options)
+    finally:
+        await client.aclose()
+
+
+def sync_client(client: NetworkClient, options: SyncOptions | None = None) -> dict | None:
+    """Sync one client on its own connection and transaction.
+
+    Async clients run on their own event loop in the calling worker thread.
+
+    Returns:
+        The client's sync stats, or None if the sync failed.
+    """
+    try:
+        with get_connection() as conn:
+            logger.info(f"Syncing {client.network_name}...")
+            site_domain = getattr(client, "domain", None)
+            if isinstance(client, AsyncNetworkClient):
+                stats = asyncio.run(
+                    _run_async_sync(client, conn, site_domain, options or SyncOptions())
+                )
+            else:
+                stats = client.sync(conn, site_domain=site_domain, options=options)
+            logger.info(f"Completed {client.network_name} sync")
+            return stats
+    except Exception as e:
+        logger.error(f"Error syncing {client.network_name}: {e}")
+        return None
+
+
+def resync_client(client: NetworkClient, network_advertiser_id: str) -> dict | None:
+    """Sync one advertiser of one client on its own connection and transaction.
+
+    Returns:
+        The advertiser's sync stats, or None if it failed or was not found.
+    """
+    try:
+        with get_connection() as conn:
+            return client.resync_advertiser(
+                conn, network_advertiser_id, site_domain=getattr(client, "domain", None)
+            )
+    except Exception as e:
+        logger.error(f"Error syncing {client.network_name} advertiser {network_advertiser_id}: {e}")
+        return None
+
+
+def attach_cassettes(
+    clients: list[NetworkClient], args: argparse.Namespace
+) -> tuple[list[NetworkClient], list[Cassette]]:
+    """Record or replay each client's HTTP traffic (--record/--replay).
+
+    In replay mode, clients without a cassette are dropped so that they
+    never reach the live APIs.
+
+    Returns:
+        Tuple of (clients to sync, their cassettes).
+    """
+    if args.record:
+        return clients, [record_traffic(client, args.record) for client in clients]
+    if not args.replay:
+        return clients, []
+
+    options = ReplayOptions(
+        latency_ms=args.replay_latency, rate_limit_every=args.replay_rate_limit_every
+    )
+    replayed, cassettes = [], []
+    for client in clients:
+        try:
+            cassettes.append(replay_traffic(client, args.replay, options))
+        except FileNotFoundError as e:
+            logger.warning(f"Skipping {client.network_name}: no cassette ({e.filename})")
+            continue
+        replayed.append(client)
+    return replayed, cassettes
+
+
+def finish_cassettes(cassettes: list[Cassette], recording: bool) -> None:
+    """Save recorded cassettes, or log how the replayed ones were used."""
+    for cassette in cassettes:
+        if recording:
+            cassette.save()
+        else:
+            logger.info(
+                f"Replayed {cassette.path}: {cassette.played} responses, "
+                f"{cassette.missed} not recorded, {cassette.rate_limited} rate limits injected"
+            )
+
+
+def log_rate_limits() -> None:
+    """Log how each rate-limit bucket ended up: adapted rate, waiting, throttling."""
+    for key, m in sorted(rate_limit_metrics().items()):
+        logger.info(
+            f"Rate limit {key}: {m['rate_per_second']:.3g}/s of {m['max_rate_per_second']:.3g}/s, "
+            f"{m['requests']} requests, waited {m['waited_seconds']:.0f}s, "
+            f"{m['rate_limited']} rate-limited"
+        )
+
+
+def log_http_cache() -> None:
+    """Log how many responses the HTTP cache answered (304) and stored."""
+    cache = get_http_cache()
+    if cache is not None:
+        logger.info(
+            f"HTTP cache: {cache.hits} not modified, {cache.stores} stored, "
+            f"{cache.size() / 1024 / 1024:.1f} MB on disk"
+        )
+
+
+def run_clients(
+    clients: list[NetworkClient], max_workers: int = 1, options: SyncOptions | None = None
+) -> list[dict | None]:
+    """Sync all clients, running up to max_workers networks in parallel.
+
+    Networks are rate-limited independently and hit different hosts, so they
+    can overlap. Clients for the same network (e.g. one per FlexOffers domain)
+    share advertisers and ads rows, so they stay sequential inside one worker
+    to avoid lock contention between their transactions.
+
+    Args:
+        clients: Network clients to sync.
+        max_workers: Networks synced at the same time.
+        options: Sync options passed to every client.
+
+    Returns:
+        Sync stats per client, in the same order as clients.
+    """
+    # Group client indexes by network, preserving configuration order
+    groups: dict[str, list[int]] = {}
+    for i, client in enumerate(clients):
+        groups.setdefault(client.network_name, []).append(i)
+
+    results: list[dict | None] = [None] * len(clients)
+
+    def run_group(indexes: list[int]) -> None:
+        for i in indexes:
+            results[i] = sync_client(clients[i], options=options)
+
+    workers = max(1, min(max_workers, len(groups)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync") as executor:
+        futures = [executor.submit(run_group, indexes) for indexes in groups.values()]
+        for future in futures:
+            future.result()
+
+    return results
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse a ``--shard i/N`` value into (i, N), with 1 <= i <= N."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N (e.g. 2/4), got '{value}'") from None
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {value} is out of range (1 <= i <= N)")
+    return index, count
+
+
+def _add_run_arguments(parser: argparse.ArgumentParser, suppress_defaults: bool = False) -> None:
+    """Add the options shared by a full run and the sync subcommand.
+
+    The subcommand suppresses its defaults so that options it was not given
+    do not overwrite ones given before it.
+    """
+
+    def default(value):
+        return argparse.SUPPRESS if suppress_defaults else value
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        default=default(False),
+        help="continue each network's latest running/failed sync from its checkpoint",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=default((1, 1)),
+        metavar="i/N",
+        help="sync only the i-th of N slices of each network's advertisers",
+    )
+    parser.add_argument(
+        "--run-id",
+        default=default(os.getenv("GITHUB_RUN_ID")),
+        help="ID shared by all shards of one run (default: $GITHUB_RUN_ID)",
+    )
+    parser.add_argument(
+        "--record",
+        default=default(None),
+        metavar="DIR",
+        help="save each client's API traffic to a cassette in DIR",
+    )
+    parser.add_argument(
+        "--replay",
+        default=default(None),
+        metavar="DIR",
+        help="serve API requests from the cassettes in DIR instead of the network",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=default(0.0),
+        metavar="MS",
+        help="with --replay, delay every response by MS milliseconds",
+    )
+    parser.add_argument(
+        "--replay-rate-limit-every",
+        type=int,
+        default=default(0),
+        metavar="N",
+        help="with --replay, answer every Nth request with a rate-limit response first",
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    With no subcommand every configured network is synced. ``sync`` narrows
+    the run to one network, site or advertiser.
+    """
+    parser = argparse.ArgumentParser(description="Sync affiliate network ads to the database.")
+    _add_run_arguments(parser)
+    parser.set_defaults(command=None, network=None, domain=None, advertiser=None)
+
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    sync_parser = subparsers.add_parser(
+        "sync",
+        help="sync only one network, site or advertiser",
+        description="Sync only the given network, site (domain) and/or advertiser.",
+    )
+    _add_run_arguments(sync_parser, suppress_defaults=True)
+    sync_parser.add_argument("--network", choices=NETWORKS, help="sync only this network")
+    sync_parser.add_argument(
+        "--domain",
+        help="sync only this site's clients (FlexOffers and CJ have one per domain)",
+    )
+    sync_parser.add_argument(
+        "--advertiser",
+        metavar="ID",
+        help="sync only this network advertiser ID (requires --network)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.advertiser:
+        if not args.network:
+            parser.error("--advertiser needs --network")
+        if args.resume or args.shard[1] > 1:
+            parser.error("--advertiser cannot be combined with --resume or --shard")
+    if args.domain and args.network and args.network not in PER_DOMAIN_NETWORKS:
+        parser.error(f"--domain does not apply to {args.network} (it has no per-domain clients)")
+    if args.record and args.replay:
+        parser.error("--record and --replay cannot be combined")
+    if args.shard[1] > 1 and not args.run_id:
+        parser.error("--shard needs --run-id (or GITHUB_RUN_ID) to group the shards of a run")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the sync service."""
+    args = parse_args(argv)
+    logger.info(f"Starting affiliate ad sync (JSON backend: {jsoncodec.BACKEND})")
+
+    # Test database connection on startup (exits if fails)
+    test_connection()
+
+    try:
+        config = load_config()
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        return 1
+
+    configure_http(config.http)
+    # Cached validators would record 304s that a replay cannot answer
+    configure_http_cache(
+        dataclasses.replace(config.http, cache_path=None) if args.record else config.http
+    )
+    configure_rate_limits(config.rate_limits)
+
+    if args.resume:
+        config.sync = dataclasses.replace(config.sync, resume=True)
+    shard_index, shard_count = args.shard
+    if shard_count > 1:
+        config.sync = dataclasses.replace(
+            config.sync, shard_index=shard_index, shard_count=shard_count, run_id=args.run_id
+        )
+        logger.info(f"Running shard {shard_index}/{shard_count} of run {args.run_id}")
+
+    if args.network or args.domain:
+        config = scope_config(config, network=args.network, domain=args.domain)
+        logger.info(
+            f"Targeted sync: network={args.network or 'all'}, domain={args.domain or 'all'}"
+        )
+    if args.advertiser:
+        # A single advertiser has nothing to fan out, so use the blocking clients
+        config.sync = dataclasses.replace(config.sync, mode="default")
+
+    clients, cassettes = attach_cassettes(build_clients(config), args)
+
     if not clients:
+        if args.network or args.domain:
+            logger.error("No configured network client matches --network/--domain")
+            return 1
         logger.warning("No network clients configured - check API credentials")
         return 0
 
-    # Sync each network
-    with get_connection() as conn:
-        for client in clients:
-            try:
-                logger.info(f"Syncing {client.network_name}...")
-                site_domain = getattr(client, "domain", None)
-                client.sync(conn, site_domain=site_domain)
-                logger.info(f"Completed {client.network_name} sync")
-            except Exception as e:
-                logger.error(f"Error syncing {client.network_name}: {e}")
+    if args.advertiser:
+        logger.info(f"Syncing {args.network} advertiser {args.advertiser} only")
+        results = [resync_client(client, args.advertiser) for client in clients]
+        finish_cassettes(cassettes, recording=bool(args.record))
+        logger.info("Sync complete")
+        return 0 if all(result is not None for result in results) else 1
+
+    workers = config.sync_workers
+    if workers > 1 and db._use_sqlite:
+        logger.warning("SQLite allows a single writer - ignoring SYNC_WORKERS")
+        workers = 1
+
+    logger.info(
+        f"Syncing {len(clients)} clients with {workers} worker(s), {config.sync.mode} mode"
+    )
+    run_clients(clients, max_workers=workers, options=config.sync)
+    finish_cassettes(cassettes, recording=bool(args.record))
+    log_rate_limits()
+    log_http_cache()
 
     logger.info("Sync complete")
     return 0
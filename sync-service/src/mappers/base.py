@@ -1,11 +1,12 @@
 """Abstract base class for network response mappers."""
 
 import hashlib
-import json
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 
+from ..jsoncodec import canonical
+
 logger = logging.getLogger(__name__)
 
 
@@ -67,14 +68,17 @@ class Mapper(ABC):
     def compute_hash(raw: dict) -> str:
         """Compute SHA-256 hash of raw API response for change detection.
 
+        The input is jsoncodec.canonical() JSON, byte for byte the
+        json.dumps(raw, sort_keys=True, default=str) stored hashes were
+        computed from, with or without orjson.
+
         Args:
             raw: Raw API response dictionary.
 
         Returns:
             Hex-encoded SHA-256 hash string.
         """
-        serialized = json.dumps(raw, sort_keys=True, default=str)
-        return hashlib.sha256(serialized.encode()).hexdigest()
+        return hashlib.sha256(canonical(raw)).hexdigest()
 
 
 # Convenience alias for imports
@@ -1,8 +1,20 @@
 # Network clients for affiliate ad APIs
-from .awin import AwinClient
-from .base import NetworkClient
-from .cj import CJClient
-from .flexoffers import FlexOffersClient
-from .impact import ImpactClient
+from .awin import AsyncAwinClient, AwinClient
+from .base import AsyncNetworkClient, NetworkClient
+from .cj import AsyncCJClient, CJAdvertiserCache, CJClient
+from .flexoffers import AsyncFlexOffersClient, FlexOffersClient
+from .impact import AsyncImpactClient, ImpactClient
 
-__all__ = ["NetworkClient", "FlexOffersClient", "AwinClient", "CJClient", "ImpactClient"]
+__all__ = [
+    "NetworkClient",
+    "FlexOffersClient",
+    "AwinClient",
+    "CJClient",
+    "ImpactClient",
+    "AsyncNetworkClient",
+    "AsyncFlexOffersClient",
+    "AsyncAwinClient",
+    "AsyncCJClient",
+    "AsyncImpactClient",
+    "CJAdvertiserCache",
+]
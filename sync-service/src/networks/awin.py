@@ -14,15 +14,31 @@ Auth:
 """
 
 import logging
-import time
 
 import httpx
 
-from .base import NetworkClient
+from ..jsoncodec import loads
+from .base import AsyncNetworkClient, NetworkClient
+from .paginate import Incomplete, Page, Paginator, combine
+from .ratelimit import RateLimit
+from .transport import create_async_client, create_client
 
 logger = logging.getLogger(__name__)
 
-MAX_RETRIES = 3
+PAGE_SIZE = 200  # allowed 10-200 per docs
+
+
+def _pagination_total(payload) -> int | None:
+    """Total record count from a wrapped response's pagination block, if any."""
+    if not isinstance(payload, dict):
+        return None
+    pagination = payload.get("pagination")
+    if not isinstance(pagination, dict) or pagination.get("total") is None:
+        return None
+    try:
+        return int(pagination["total"])
+    except (TypeError, ValueError):
+        return None
 
 
 class AwinClient(NetworkClient):
@@ -30,10 +46,16 @@ class AwinClient(NetworkClient):
 
     BASE_URL = "https://api.awin.com"
 
+    # Awin signals rate limiting with 403
+    RATE_LIMIT_STATUS = 403
+
+    # 20 requests per minute per publisher
+    RATE_LIMITS = {"*": RateLimit(20, 60)}
+
     def __init__(self, api_token: str, publisher_id: str | int):
         self.api_token = api_token
         self.publisher_id = int(publisher_id)
-        self._client = httpx.Client(timeout=30.0)
+        self._client = create_client()
 
     @property
     def network_name(self) -> str:
@@ -42,6 +64,14 @@ class AwinClient(NetworkClient):
     def _get_headers(self) -> dict[str, str]:
         return {"Authorization": f"Bearer {self.api_token}"}
 
+    def _raise_if_unauthorized(self, response: httpx.Response) -> None:
+        if response.status_code == 401:
+            raise httpx.HTTPStatusError(
+                "Awin unauthorized (check API token / permissions)",
+                request=response.request,
+                response=response,
+            )
+
     def fetch_advertisers(self) -> list[dict]:
         """
         Fetch all programmes for this publisher.
@@ -51,51 +81,24 @@ class AwinClient(NetworkClient):
 
         logger.info(f"Fetching Awin programmes for publisher {self.publisher_id}")
 
-        response = None
-        for attempt in range(1, MAX_RETRIES + 1):
-            try:
-                response = self._client.get(
-                    url,
-                    headers=self._get_headers(),
-                    # Some Awin docs also show accessToken as a query param.
-                    # Including it improves compatibility.
-                    params={"accessToken": self.api_token, "relationship": "joined"},
-                )
-                # Handle 403 rate limit with exponential backoff
-                if response.status_code == 403:
-                    if attempt < MAX_RETRIES:
-                        wait_time = 2 ** attempt  # 2s, 4s, 8s
-                        logger.warning(
-                            f"Rate limit hit on programmes (attempt {attempt}/{MAX_RETRIES}), "
-                            f"waiting {wait_time}s before retry..."
-                        )
-                        time.sleep(wait_time)
-                        continue
-                    logger.warning(
-                        f"Rate limit exceeded on programmes after {MAX_RETRIES} retries, "
-                        f"returning empty list"
-                    )
-                    return []
-                break  # Success or other status, exit retry loop
-            except httpx.RequestError as e:
-                logger.warning(
-                    f"Awin programmes request error (attempt {attempt}/{MAX_RETRIES}): {e}"
-                )
-                if attempt < MAX_RETRIES:
-                    time.sleep(2 ** attempt)
-                    continue
-                return []
-
-        if response.status_code == 401:
-            raise httpx.HTTPStatusError(
-                "Awin unauthorized (check API token / permissions)",
-                request=response.request,
-                response=response,
-            )
+        response = self._send(
+            "GET",
+            url,
+            context="programmes",
+            cacheable=True,
+            headers=self._get_headers(),
+            # Some Awin docs also show accessToken as a query param.
+            # Including it improves compatibility.
+            params={"accessToken": self.api_token, "relationship": "joined"},
+        )
+        if response is None:
+            logger.warning("Failed to fetch Awin programmes, returning empty list")
+            return []
 
+        self._raise_if_unauthorized(response)
         response.raise_for_status()
 
-        data = response.json()
+        data = loads(response.content)
 
         # Docs indicate this endpoint returns a JSON array
         if isinstance(data, list):
@@ -104,6 +107,77 @@ class AwinClient(NetworkClient):
         # Fallback if Awin wraps results
         return data.get("data", data.get("results", []))
 
+    def _creatives_request(self, advertiser_id: str | int, page: int) -> dict:
+        """Build the request arguments for one page of creatives."""
+        return {
+            "method": "GET",
+            "url": (
+                f"{self.BASE_URL}/publishers/{self.publisher_id}"
+                f"/advertisers/{advertiser_id}/creatives"
+            ),
+            "context": f"creatives for advertiser {advertiser_id} page {page}",
+            "cacheable": True,
+            "headers": self._get_headers(),
+            "params": {
+                "accessToken": self.api_token,
+                "page": page,
+                "pageSize": PAGE_SIZE,
+            },
+        }
+
+    def _parse_creatives_page(
+        self, response: httpx.Response, advertiser_id: str | int, page: int
+    ) -> Page:
+        """Extract the creatives from one page. An empty page ends pagination."""
+        if response.status_code == 204:
+            logger.debug(f"Advertiser {advertiser_id} creatives page {page}: no content (204)")
+            return Page()
+
+        if response.status_code == 404:
+            logger.debug(
+                f"Advertiser {advertiser_id} creatives: endpoint returned 404 "
+                f"(creatives API may not be available)"
+            )
+            return Page()
+
+        self._raise_if_unauthorized(response)
+        response.raise_for_status()
+
+        payload = loads(response.content)
+
+        if isinstance(payload, list):
+            page_items = payload
+        else:
+            page_items = (
+                payload.get("data")
+                or payload.get("results")
+                or payload.get("creatives")
+                or []
+            )
+
+        # Log each creative at DEBUG level
+        for item in page_items:
+            logger.debug(
+                f"Creative: id={item.get('id')}, "
+                f"size={item.get('width', 0)}x{item.get('height', 0)}, "
+                f"imageUrl={item.get('imageUrl', '')[:80]}"
+            )
+
+        logger.debug(
+            f"Advertiser {advertiser_id} creatives page {page}: "
+            f"fetched {len(page_items)} creatives"
+        )
+        return Page(page_items, total=_pagination_total(payload))
+
+    def _creatives_pages(self, advertiser_id: str | int) -> Paginator:
+        return Paginator(
+            self,
+            lambda page: self._creatives_request(advertiser_id, page),
+            lambda response, page: self._parse_creatives_page(response, advertiser_id, page),
+            page_size=PAGE_SIZE,
+            label=f"creatives for advertiser {advertiser_id}",
+        )
+
     def fetch_creatives(self, advertiser_id: str | int) -> list[dict]:
         """
         Fetch banner creatives for a given advertiser/programme.
@@ -113,142 +187,27 @@ class AwinClient(NetworkClient):
 
         Returns list of raw creative dicts with imageUrl, width, height, etc.
         """
-        url = (
-            f"{self.BASE_URL}/publishers/{self.publisher_id}"
-            f"/advertisers/{advertiser_id}/creatives"
-        )
-
-        creatives: list[dict] = []
-        page = 1
-        page_size = 200
-
         logger.debug(
             f"Fetching Awin creatives for advertiser {advertiser_id} "
             f"(publisher {self.publisher_id})"
         )
 
-        while True:
-            response = None
-            for attempt in range(1, MAX_RETRIES + 1):
-                try:
-                    response = self._client.get(
-                        url,
-                        headers=self._get_headers(),
-                        params={
-                            "accessToken": self.api_token,
-                            "page": page,
-                            "pageSize": page_size,
-                        },
-                    )
-                    # Handle 403 rate limit with exponential backoff
-                    if response.status_code == 403:
-                        if attempt < MAX_RETRIES:
-                            wait_time = 2 ** attempt
-                            logger.warning(
-                                f"Rate limit hit for creatives advertiser {advertiser_id} "
-                                f"(attempt {attempt}/{MAX_RETRIES}), waiting {wait_time}s..."
-                            )
-                            time.sleep(wait_time)
-                            continue
-                        logger.warning(
-                            f"Rate limit exceeded for creatives advertiser {advertiser_id} "
-                            f"after {MAX_RETRIES} retries, returning {len(creatives)} partial results"
-                        )
-                        return creatives
-                    break
-                except httpx.RequestError as e:
-                    logger.warning(
-                        f"Awin creatives request error advertiser {advertiser_id} page {page} "
-                        f"(attempt {attempt}/{MAX_RETRIES}): {e}"
-                    )
-                    if attempt < MAX_RETRIES:
-                        time.sleep(2 ** attempt)
-                        continue
-                    return creatives
-
-            if response.status_code == 204:
-                logger.debug(f"Advertiser {advertiser_id} creatives page {page}: no content (204)")
-                break
-
-            if response.status_code == 404:
-                logger.debug(
-                    f"Advertiser {advertiser_id} creatives: endpoint returned 404 "
-                    f"(creatives API may not be available)"
-                )
-                return creatives  # return empty list
-
-            if response.status_code == 401:
-                raise httpx.HTTPStatusError(
-                    "Awin unauthorized (check API token / permissions)",
-                    request=response.request,
-                    response=response,
-                )
-
-            response.raise_for_status()
-
-            payload = response.json()
-
-            if isinstance(payload, list):
-                page_items = payload
-            else:
-                page_items = (
-                    payload.get("data")
-                    or payload.get("results")
-                    or payload.get("creatives")
-                    or []
-                )
-
-            if not page_items:
-                break
-
-            # Log each creative at DEBUG level
-            for item in page_items:
-                logger.debug(
-                    f"Creative: id={item.get('id')}, "
-                    f"size={item.get('width', 0)}x{item.get('height', 0)}, "
-                    f"imageUrl={item.get('imageUrl', '')[:80]}"
-                )
-
-            creatives.extend(page_items)
-            logger.debug(
-                f"Advertiser {advertiser_id} creatives page {page}: "
-                f"fetched {len(page_items)} creatives"
-            )
-
-            if len(page_items) < page_size:
-                break
-
-            page += 1
+        creatives = self._creatives_pages(advertiser_id).fetch_all()
 
         logger.debug(
             f"Fetched {len(creatives)} total creatives for advertiser {advertiser_id}"
         )
         return creatives
 
-    def fetch_ads(self, advertiser_id: str | int) -> list[dict]:
-        """
-        Fetch offers/promotions and creatives for a given advertiser/programme.
-
-        Merges results from two endpoints:
-        1. POST /publisher/{publisherId}/promotions — vouchers/text offers
-        2. GET /publishers/{publisherId}/advertisers/{advertiserId}/creatives — banners
-
-        Creative dicts are tagged with _source="creatives" so the mapper can
-        distinguish them from promotions.
-        """
-        # --- Promotions endpoint ---
-        url = f"{self.BASE_URL}/publisher/{self.publisher_id}/promotions"
-
-        offers: list[dict] = []
-        page = 1
-        page_size = 200  # allowed 10-200 per docs
-
-        logger.debug(
-            f"Fetching Awin offers for advertiser {advertiser_id} (publisher {self.publisher_id})"
-        )
-
-        while True:
-            body = {
+    def _offers_request(self, advertiser_id: str | int, page: int) -> dict:
+        """Build the request arguments for one page of promotions."""
+        return {
+            "method": "POST",
+            "url": f"{self.BASE_URL}/publisher/{self.publisher_id}/promotions",
+            "context": f"offers for advertiser {advertiser_id} page {page}",
+            "headers": self._get_headers(),
+            "params": {"accessToken": self.api_token},
+            "json": {
                 "filters": {
                     "advertiserIds": [int(advertiser_id)],
                     "membership": "all",
@@ -257,115 +216,108 @@ class AwinClient(NetworkClient):
                 },
                 "pagination": {
                     "page": page,
-                    "pageSize": page_size,
+                    "pageSize": PAGE_SIZE,
                 },
-            }
-
-            response = None
-            for attempt in range(1, MAX_RETRIES + 1):
-                try:
-                    response = self._client.post(
-                        url,
-                        headers=self._get_headers(),
-                        params={"accessToken": self.api_token},
-                        json=body,
-                    )
-                    # Handle 403 rate limit with exponential backoff
-                    if response.status_code == 403:
-                        if attempt < MAX_RETRIES:
-                            wait_time = 2 ** attempt
-                            logger.warning(
-                                f"Rate limit hit for offers advertiser {advertiser_id} "
-                                f"(attempt {attempt}/{MAX_RETRIES}), waiting {wait_time}s..."
-                            )
-                            time.sleep(wait_time)
-                            continue
-                        logger.warning(
-                            f"Rate limit exceeded for offers advertiser {advertiser_id} "
-                            f"after {MAX_RETRIES} retries, returning {len(offers)} partial results"
-                        )
-                        return offers
-                    break
-                except httpx.RequestError as e:
-                    logger.warning(
-                        f"Awin offers request error advertiser {advertiser_id} page {page} "
-                        f"(attempt {attempt}/{MAX_RETRIES}): {e}"
-                    )
-                    if attempt < MAX_RETRIES:
-                        time.sleep(2 ** attempt)
-                        continue
-                    return offers
-
-            if response.status_code == 204:
-                logger.debug(f"Advertiser {advertiser_id} page {page}: no content (204)")
-                break
-
-            if response.status_code == 401:
-                raise httpx.HTTPStatusError(
-                    "Awin unauthorized (check API token / permissions)",
-                    request=response.request,
-                    response=response,
-                )
-
-            response.raise_for_status()
-
-            payload = response.json()
-
-            # Some APIs return list, others wrap
-            if isinstance(payload, list):
-                page_items = payload
-            else:
-                page_items = (
-                    payload.get("data")
-                    or payload.get("results")
-                    or payload.get("offers")
-                    or []
-                )
-
-            if not page_items:
-                break
-
-            # Log each offer at DEBUG level
-            for item in page_items:
-                logger.debug(
-                    f"Offer: id={item.get('promotionId')}, "
-                    f"type={item.get('type', 'unknown')}, "
-                    f"title={str(item.get('title', ''))[:60]}"
-                )
-
-            offers.extend(page_items)
+            },
+        }
+
+    def _parse_offers_page(
+        self, response: httpx.Response, advertiser_id: str | int, page: int
+    ) -> Page:
+        """Extract the offers from one page. An empty page ends pagination."""
+        if response.status_code == 204:
+            logger.debug(f"Advertiser {advertiser_id} page {page}: no content (204)")
+            return Page()
+
+        self._raise_if_unauthorized(response)
+        response.raise_for_status()
+
+        payload = loads(response.content)
+
+        # Some APIs return list, others wrap
+        if isinstance(payload, list):
+            page_items = payload
+        else:
+            page_items = (
+                payload.get("data")
+                or payload.get("results")
+                or payload.get("offers")
+                or []
+            )
+
+        # Log each offer at DEBUG level
+        for item in page_items:
             logger.debug(
-                f"Advertiser {advertiser_id} page {page}: fetched {len(page_items)} offers"
+                f"Offer: id={item.get('promotionId')}, "
+                f"type={item.get('type', 'unknown')}, "
+                f"title={str(item.get('title', ''))[:60]}"
             )
 
-            # end pagination if fewer than requested
-            if len(page_items) < page_size:
-                break
+        logger.debug(
+            f"Advertiser {advertiser_id} page {page}: fetched {len(page_items)} offers"
+        )
+        return Page(page_items, total=_pagination_total(payload))
+
+    def _offers_pages(self, advertiser_id: str | int) -> Paginator:
+        return Paginator(
+            self,
+            lambda page: self._offers_request(advertiser_id, page),
+            lambda response, page: self._parse_offers_page(response, advertiser_id, page),
+            page_size=PAGE_SIZE,
+            label=f"offers for advertiser {advertiser_id}",
+        )
+
+    def _fetch_offers(self, advertiser_id: str | int) -> list[dict]:
+        """Fetch all active promotions/vouchers for an advertiser."""
+        logger.debug(
+            f"Fetching Awin offers for advertiser {advertiser_id} (publisher {self.publisher_id})"
+        )
 
-            page += 1
+        offers = self._offers_pages(advertiser_id).fetch_all()
 
         logger.debug(
             f"Fetched {len(offers)} total offers for advertiser {advertiser_id}"
         )
+        return offers
+
+    def _merge_creatives(
+        self, advertiser_id: str | int, offers: list[dict], creatives: list[dict]
+    ) -> list[dict]:
+        """Tag creatives with _source="creatives" and append them to the offers."""
+        # Tag each creative so the mapper can distinguish them
+        for c in creatives:
+            c["_source"] = "creatives"
+        merged = combine(offers, creatives)
+        logger.debug(
+            f"Advertiser {advertiser_id}: merged {len(creatives)} creatives, "
+            f"{len(merged)} total items"
+        )
+        return merged
+
+    def fetch_ads(self, advertiser_id: str | int) -> list[dict]:
+        """
+        Fetch offers/promotions and creatives for a given advertiser/programme.
+
+        Merges results from two endpoints:
+        1. POST /publisher/{publisherId}/promotions — vouchers/text offers
+        2. GET /publishers/{publisherId}/advertisers/{advertiserId}/creatives — banners
+
+        Creative dicts are tagged with _source="creatives" so the mapper can
+        distinguish them from promotions. If the creatives fail, the
+        promotions are returned as an Incomplete list.
+        """
+        offers = self._fetch_offers(advertiser_id)
 
-        # --- Creatives endpoint ---
         try:
             creatives = self.fetch_creatives(advertiser_id)
-            # Tag each creative so the mapper can distinguish them
-            for c in creatives:
-                c["_source"] = "creatives"
-            offers.extend(creatives)
-            logger.debug(
-                f"Advertiser {advertiser_id}: merged {len(creatives)} creatives, "
-                f"{len(offers)} total items"
-            )
         except Exception as e:
             logger.warning(
                 f"Failed to fetch creatives for advertiser {advertiser_id}: {e}. "
                 f"Continuing with {len(offers)} promotions only."
             )
+            return Incomplete(offers)
 
-        return offers
+        return self._merge_creatives(advertiser_id, offers, creatives)
 
     def close(self) -> None:
         self._client.close()
@@ -375,3 +327,29 @@ class AwinClient(NetworkClient):
 
     def __exit__(self, *args) -> None:
         self.close()
+
+
+class AsyncAwinClient(AsyncNetworkClient, AwinClient):
+    """AwinClient with async, concurrent per-advertiser offer/creative fetching."""
+
+    # Awin allows 20 requests/min, and each advertiser costs two endpoints
+    ADS_CONCURRENCY = 2
+
+    def __init__(self, api_token: str, publisher_id: str | int):
+        super().__init__(api_token, publisher_id)
+        self._aclient = create_async_client()
+
+    async def afetch_ads(self, advertiser_id: str | int) -> list[dict]:
+        """Async equivalent of fetch_ads()."""
+        offers = await self._offers_pages(advertiser_id).afetch_all()
+
+        try:
+            creatives = await self._creatives_pages(advertiser_id).afetch_all()
+        except Exception as e:
+            logger.warning(
+                f"Failed to fetch creatives for advertiser {advertiser_id}: {e}. "
+                f"Continuing with {len(offers)} promotions only."
+            )
+            return Incomplete(offers)
+
+        return self._merge_creatives(advertiser_id, offers, creatives)
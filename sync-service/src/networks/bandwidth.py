@@ -0,0 +1,84 @@
+"""Byte accounting for network API responses.
+
+Every response received by NetworkClient._send()/_asend() is counted
+against its endpoint (the last path segment, e.g. ``Ads`` or
+``link-search``) with two sizes:
+
+- wire: body bytes as transferred, i.e. still compressed
+- decoded: body bytes after gzip/brotli decoding
+
+The totals of a sync run are logged in its summary and stored on its
+sync_logs row (bytes_wire, bytes_decoded, transfer).
+"""
+
+import importlib.util
+import threading
+
+import httpx
+
+# Offered to every API; brotli only when httpx can decode it (httpx[brotli])
+ACCEPT_ENCODING = (
+    "br, gzip, deflate"
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi")
+    else "gzip, deflate"
+)
+
+
+def endpoint_label(url: httpx.URL | str) -> str:
+    """Name an endpoint by its last path segment, skipping numeric IDs."""
+    segments = [segment for segment in httpx.URL(url).path.split("/") if segment]
+    while segments and segments[-1].isdigit():
+        segments.pop()
+    return segments[-1] if segments else httpx.URL(url).host
+
+
+def wire_bytes(response: httpx.Response) -> int:
+    """Body bytes as transferred (before decompression)."""
+    if response.num_bytes_downloaded:
+        return response.num_bytes_downloaded
+    # Already-read bodies (e.g. test transports) report their encoded length
+    try:
+        return int(response.headers.get("Content-Length", 0))
+    except ValueError:
+        return 0
+
+
+class TransferStats:
+    """Thread-safe request and byte counts per endpoint for one sync run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, dict[str, int]] = {}
+
+    def record(self, response: httpx.Response) -> None:
+        """Count one response (its body must already be read)."""
+        endpoint = endpoint_label(response.request.url)
+        wire = wire_bytes(response)
+        decoded = len(response.content)
+        with self._lock:
+            counts = self._endpoints.setdefault(endpoint, {"requests": 0, "wire": 0, "decoded": 0})
+            counts["requests"] += 1
+            counts["wire"] += wire
+            counts["decoded"] += decoded
+
+    def by_endpoint(self) -> dict[str, dict[str, int]]:
+        """Counts per endpoint: {"Ads": {"requests": n, "wire": b, "decoded": b}}."""
+        with self._lock:
+            return {endpoint: dict(counts) for endpoint, counts in self._endpoints.items()}
+
+    def totals(self) -> dict[str, int]:
+        """Counts summed over all endpoints."""
+        totals = {"requests": 0, "wire": 0, "decoded": 0}
+        for counts in self.by_endpoint().values():
+            for key in totals:
+                totals[key] += counts[key]
+        return totals
+
+
+def format_bytes(count: int) -> str:
+    """Human-readable size, e.g. 1.5 MB."""
+    for unit in ("B", "KB", "MB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
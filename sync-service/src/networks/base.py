@@ -1,10 +1,276 @@
 """Abstract base class for network clients."""
 
+import asyncio
 import logging
+import threading
+import time
+import zlib
 from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+
+import httpx
+
+from ..config import SyncOptions
+from .bandwidth import TransferStats, format_bytes
+from .httpcache import CacheEntry, HttpCache, NotModified
+from .httpcache import get_cache as get_http_cache
+from .paginate import is_complete
+from .ratelimit import QUOTA_PERIOD, RateLimit, TokenBucket, get_bucket, read_hint
 
 logger = logging.getLogger(__name__)
 
+MAX_RETRIES = 3
+
+# Longest server-requested wait honoured before a retry; beyond it we give up
+MAX_RETRY_WAIT = 120
+
+
+def new_sync_stats() -> dict:
+    """Return an empty sync statistics dict."""
+    return {
+        "advertisers_synced": 0,
+        "ads_synced": 0,
+        "ads_deleted": 0,
+        "advertisers_fresh": 0,
+        "advertisers_not_modified": 0,
+        "errors": 0,
+        "ad_types": {},
+    }
+
+
+def shard_of(network_advertiser_id: str, shard_count: int) -> int:
+    """Return the 1-based shard that owns an advertiser in a ``--shard i/N`` run.
+
+    Uses CRC32 rather than hash(), which is salted per process, so every
+    process and node agrees on the partition.
+    """
+    return zlib.crc32(str(network_advertiser_id).encode()) % shard_count + 1
+
+
+def advertiser_priority(
+    adv_data: dict, allowed_ids: set[str], overdue_ids: set[str]
+) -> tuple:
+    """Sort key that puts the most valuable advertisers first under a time budget.
+
+    Advertisers skipped at the previous run's deadline come first, then
+    those allowed on a site, then by EPC and network rank (both descending).
+    """
+    network_advertiser_id = adv_data["network_program_id"]
+    return (
+        network_advertiser_id not in overdue_ids,
+        network_advertiser_id not in allowed_ids,
+        -float(adv_data.get("epc") or 0),
+        -float(adv_data.get("network_rank") or 0),
+    )
+
+
+def to_db_advertiser(adv_data: dict) -> dict:
+    """Map canonical advertiser keys to advertisers table columns."""
+    return {
+        "network": adv_data["network"],
+        "network_advertiser_id": adv_data["network_program_id"],
+        "name": adv_data["network_program_name"],
+        "website_url": adv_data.get("website_url"),
+        "category": adv_data.get("category"),
+        "description": adv_data.get("description"),
+        "logo_url": adv_data.get("logo_url"),
+        "network_rank": adv_data.get("network_rank"),
+        "country_code": adv_data.get("country_code"),
+        "epc": adv_data.get("epc", 0),
+        "raw_hash": adv_data["raw_hash"],
+    }
+
+
+def to_db_ad(ad_data: dict, advertiser_id: int, geo_countries: str) -> dict:
+    """Map canonical ad keys to ads table columns (network_link_id -> network_ad_id)."""
+    return {
+        "network": ad_data["network"],
+        "network_ad_id": ad_data["network_link_id"],
+        "advertiser_id": advertiser_id,
+        "creative_type": ad_data.get("creative_type", "banner"),
+        "tracking_url": ad_data["tracking_url"],
+        "destination_url": ad_data.get("destination_url"),
+        "status": ad_data.get("status", "active"),
+        "epc": ad_data.get("epc", 0),
+        "raw_hash": ad_data["raw_hash"],
+        "ad_content": ad_data.get("ad_content"),
+        "advert_name": ad_data["advert_name"],
+        "bannercode": ad_data["bannercode"],
+        "imagetype": ad_data.get("imagetype", ""),
+        "image_url": ad_data.get("image_url"),
+        "width": ad_data["width"],
+        "height": ad_data["height"],
+        "campaign_name": ad_data.get("campaign_name", "General Promotion"),
+        "enable_stats": ad_data.get("enable_stats", "Y"),
+        "show_everyone": ad_data.get("show_everyone", "Y"),
+        "show_desktop": ad_data.get("show_desktop", "Y"),
+        "show_mobile": ad_data.get("show_mobile", "Y"),
+        "show_tablet": ad_data.get("show_tablet", "Y"),
+        "show_ios": ad_data.get("show_ios", "Y"),
+        "show_android": ad_data.get("show_android", "Y"),
+        "autodelete": ad_data.get("autodelete", "Y"),
+        "autodisable": ad_data.get("autodisable", "N"),
+        "budget": ad_data.get("budget", 0),
+        "click_rate": ad_data.get("click_rate", 0),
+        "impression_rate": ad_data.get("impression_rate", 0),
+        "state_required": ad_data.get("state_required", "N"),
+        "geo_cities": ad_data.get("geo_cities", "a:0:{}"),
+        "geo_states": ad_data.get("geo_states", "a:0:{}"),
+        "geo_countries": geo_countries,
+        "schedule_start": ad_data.get("schedule_start", 0),
+        "schedule_end": ad_data.get("schedule_end", 2650941780),
+    }
+
+
+class SyncCheckpoint:
+    """Progress of one sync run, saved to its sync_logs row so it can be resumed.
+
+    Every ``interval`` completed advertisers the state (completed and seen
+    advertiser IDs, running stats) is written to sync_logs.checkpoint and
+    the transaction is committed, so a crash or disconnect only loses the
+    advertisers since the last save.
+    """
+
+    def __init__(self, conn, log_id: int, interval: int = 10, state: dict | None = None):
+        state = state or {}
+        self.conn = conn
+        self.log_id = log_id
+        self.interval = max(1, interval)
+        self.completed: set[str] = set(state.get("completed_advertiser_ids", []))
+        self.last_advertiser_id: str | None = state.get("last_advertiser_id")
+        # Advertisers returned this run; staged in sync_seen_advertisers at
+        # every save (older checkpoints still carry them in their state)
+        self.seen_advertiser_ids: set[str] = set(state.get("seen_advertiser_ids", []))
+        self._unstaged_advertiser_ids: list[str] = sorted(self.seen_advertiser_ids)
+        # Checkpoints saved by older versions may lack newer stats keys
+        self.stats: dict = {**new_sync_stats(), **(state.get("stats") or {})}
+        # Unfinished advertisers are upserted (and counted) again on resume
+        self.stats["advertisers_synced"] = len(self.completed)
+        self._since_save = 0
+
+        # Freshness window for this run (None = fetch every advertiser's ads).
+        # Decided when the run starts, not persisted.
+        self.ads_fresh_hours: int | None = None
+        # The site freshness is tracked for, if the client's ads differ per
+        # site (NetworkClient.PER_SITE_ADS); None = per advertiser
+        self.ads_site_id: int | None = None
+
+        # This process's slice of a sharded run (1/1 = every advertiser)
+        self.site_domain: str | None = None
+        self.run_id: str | None = None
+        self.shard_index = 1
+        self.shard_count = 1
+
+        # Time budget (time.monotonic() deadline, None = unlimited), the
+        # advertisers skipped last run (synced first) and those skipped now
+        self.deadline: float | None = None
+        self.overdue_advertiser_ids: set[str] = set()
+        self.skipped_advertiser_ids: set[str] = set()
+
+        # Response counts of this run, saved with each checkpoint so that
+        # concurrent runs see the quota used so far (set by _sync_log)
+        self.transfer: TransferStats | None = None
+
+        # (advertiser ID, network ad ID) of ads seen since the last save,
+        # staged in sync_seen_ads for the run's stale-ad cleanup
+        self.seen_ads: list[tuple[int, str]] = []
+
+    @property
+    def sharded(self) -> bool:
+        """Whether this run covers only one shard of the network's advertisers."""
+        return self.shard_count > 1
+
+    def owns(self, network_advertiser_id: str) -> bool:
+        """Whether an advertiser belongs to this run's shard."""
+        return not self.sharded or shard_of(network_advertiser_id, self.shard_count) == (
+            self.shard_index
+        )
+
+    def out_of_time(self) -> bool:
+        """Whether the run's time budget is used up."""
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def is_done(self, network_advertiser_id: str) -> bool:
+        """Whether an advertiser was fully synced before this run was resumed."""
+        return network_advertiser_id in self.completed
+
+    def advance(self, network_advertiser_id: str, flush=None) -> None:
+        """Record a completed advertiser, saving once the interval is reached.
+
+        Args:
+            network_advertiser_id: The advertiser whose ads are now processed.
+            flush: Called before saving to write any rows still buffered.
+        """
+        self.completed.add(network_advertiser_id)
+        self.last_advertiser_id = network_advertiser_id
+        self._since_save += 1
+        if self._since_save >= self.interval:
+            if flush is not None:
+                flush()
+            self.save()
+
+    def see_advertiser(self, network_advertiser_id: str) -> None:
+        """Record an advertiser returned this run, so it is not deactivated at the end."""
+        if network_advertiser_id not in self.seen_advertiser_ids:
+            self.seen_advertiser_ids.add(network_advertiser_id)
+            self._unstaged_advertiser_ids.append(network_advertiser_id)
+
+    def flush_seen_advertisers(self) -> None:
+        """Write the advertisers seen since the last save to sync_seen_advertisers."""
+        from .. import db
+
+        db.stage_seen_advertisers(self.conn, self.log_id, self._unstaged_advertiser_ids)
+        self._unstaged_advertiser_ids = []
+
+    def stage_seen_ads(self, advertiser_id: int, network_ad_ids: set[str]) -> None:
+        """Keep the complete set of an advertiser's ads; the rest are deleted at the end."""
+        self.seen_ads.extend((advertiser_id, network_ad_id) for network_ad_id in network_ad_ids)
+
+    def flush_seen_ads(self) -> None:
+        """Write the ads staged since the last save to sync_seen_ads."""
+        from .. import db
+
+        db.stage_seen_ads(self.conn, self.log_id, self.seen_ads)
+        self.seen_ads = []
+
+    def save(self) -> None:
+        """Write the checkpoint and commit everything synced so far."""
+        from .. import db
+
+        self.flush_seen_ads()
+        self.flush_seen_advertisers()
+        if self.transfer is not None:
+            db.save_transfer_stats(self.conn, self.log_id, self.transfer.by_endpoint())
+        db.save_sync_checkpoint(
+            self.conn,
+            self.log_id,
+            {
+                "completed_advertiser_ids": sorted(self.completed),
+                "last_advertiser_id": self.last_advertiser_id,
+                "stats": self.stats,
+            },
+        )
+        self.conn.commit()
+        self._since_save = 0
+
+
+class ActiveSitesCache:
+    """The active sites, loaded once per run and shared by every client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sites: list[dict] | None = None
+
+    def get(self, conn) -> list[dict]:
+        """Return the active sites, querying the database on first use."""
+        from .. import db
+
+        with self._lock:
+            if self._sites is None:
+                self._sites = db.get_active_sites(conn)
+            return self._sites
+
 
 class NetworkClient(ABC):
     """Abstract base class for affiliate network API clients.
@@ -13,6 +279,43 @@ class NetworkClient(ABC):
     to fetch advertisers and ads from their respective APIs.
     """
 
+    # Status code the network uses to signal rate limiting besides 429
+    # (retried after the server's Retry-After, or with backoff)
+    RATE_LIMIT_STATUS: int | None = None
+
+    # Proactive request rate limits by endpoint host ("*" = any host of this
+    # network); RATE_LIMITS in the environment can override them
+    RATE_LIMITS: dict[str, RateLimit] = {}
+
+    # Pages of one crawl fetched at the same time once its page count is
+    # known (see paginate.Paginator); the rate limit still paces them
+    PAGE_PREFETCH = 4
+
+    # Whether the ads depend on the client's site (CJ: the domain's PID is in
+    # every tracking URL), so freshness is tracked per site in site_ads_synced
+    PER_SITE_ADS = False
+
+    _client: httpx.Client
+
+    # Response bytes per endpoint for the current sync run (set by _sync_log)
+    transfer: TransferStats | None = None
+
+    # {network ID: (database ID, raw_hash)} of this network's advertisers and
+    # ads, loaded once per sync run (by _sync_log) so that unchanged rows are
+    # skipped without a query. None outside a run: each upsert queries instead.
+    advertiser_hashes: dict[str, tuple[int, str]] | None = None
+    ad_hashes: dict[str, tuple[int, str]] | None = None
+
+    # Rows per multi-row upsert statement (options.write_batch_size, set by _sync_log)
+    write_batch_size = 500
+
+    # The current run's checkpoint (set by _sync_log), on which _finish_ads()
+    # stages seen ads. None outside a run: stale ads are deleted right away.
+    progress: SyncCheckpoint | None = None
+
+    # Shared by the clients of one run so the sites are read once (None = query each sync)
+    sites_cache: ActiveSitesCache | None = None
+
     @property
     @abstractmethod
     def network_name(self) -> str:
@@ -36,11 +339,801 @@ class NetworkClient(ABC):
             advertiser_id: The network-specific advertiser/program ID.
 
         Returns:
-            List of raw ad dicts from the API.
+            List of raw ad dicts from the API, as a paginate.Incomplete list
+            if part of the crawl failed.
         """
         ...
 
-    def sync(self, conn, site_domain: str | None = None) -> dict:
+    def fetch_advertiser(self, advertiser_id: str) -> dict | None:
+        """Fetch one advertiser/program by its network ID.
+
+        The default scans fetch_advertisers(); networks whose API can look
+        up a single advertiser override this.
+
+        Returns:
+            The raw advertiser dict, or None if it is not among the
+            advertisers a full sync would see.
+        """
+        from ..mappers import get_mapper
+
+        mapper = get_mapper(self.network_name)
+        for raw_adv in self.fetch_advertisers():
+            try:
+                if mapper.map_advertiser(raw_adv)["network_program_id"] == str(advertiser_id):
+                    return raw_adv
+            except Exception:
+                continue
+        return None
+
+    def fetch_advertiser_ads(self, advertiser_id: str) -> list[dict]:
+        """Fetch the ads a full sync would write for one advertiser.
+
+        Same as fetch_ads() except for networks whose fetch_ads() is not
+        per-advertiser (Impact).
+        """
+        return self.fetch_ads(advertiser_id)
+
+    # =========================================================================
+    # HTTP
+    # =========================================================================
+
+    def _rate_limit_account(self) -> str:
+        """Whose quota this client's requests count against (one per API key)."""
+        return ""
+
+    def _bucket(self, url: str) -> TokenBucket | None:
+        """Return the token bucket a request to url must take a token from."""
+        return get_bucket(
+            self.network_name, self._rate_limit_account(), httpx.URL(url).host, self.RATE_LIMITS
+        )
+
+    def _is_rate_limited(self, response: httpx.Response) -> bool:
+        """Whether a response means the network is rate limiting us."""
+        return response.status_code in (429, self.RATE_LIMIT_STATUS)
+
+    def _rate_limit_delay(
+        self, bucket: TokenBucket | None, response: httpx.Response, attempt: int, context: str
+    ) -> float | None:
+        """Slow down after a rate-limited response and decide whether to retry.
+
+        The delay is what the server asks for (Retry-After, reset header or
+        body), or 2s, 4s, ... if it does not say. The bucket halves its
+        rate and pauses for that long, so other requests wait as well.
+
+        Returns:
+            Seconds to sleep before retrying (0 when the bucket enforces the
+            pause), or None to give up.
+        """
+        hint = read_hint(response, rate_limited=True)
+        delay = hint.retry_after if hint.retry_after is not None else float(2 ** attempt)
+        if bucket is not None:
+            bucket.throttle(delay)
+
+        if attempt >= MAX_RETRIES or delay > MAX_RETRY_WAIT:
+            logger.warning(
+                f"[{self.network_name}] Rate limit exceeded on {context} after {attempt} "
+                f"attempt(s) (retry in {delay:.0f}s)"
+            )
+            return None
+
+        logger.warning(
+            f"[{self.network_name}] Rate limit hit on {context} "
+            f"(attempt {attempt}/{MAX_RETRIES}), waiting {delay:.0f}s before retry..."
+        )
+        return 0.0 if bucket is not None else delay
+
+    def _cache_lookup(
+        self, method: str, url: str, kwargs: dict
+    ) -> tuple[HttpCache | None, str | None, CacheEntry | None]:
+        """Find a cacheable GET in the response cache, adding its validators to kwargs.
+
+        Returns:
+            Tuple of (cache, key, entry); cache is None when caching is off
+            or the request is not a GET.
+        """
+        cache = get_http_cache()
+        if cache is None or method.upper() != "GET":
+            return None, None, None
+        key = cache.key(method, url, kwargs.get("params"), self._rate_limit_account())
+        entry = cache.get(key)
+        if entry is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **entry.conditional_headers()}
+        return cache, key, entry
+
+    def _cache_response(
+        self,
+        cache: HttpCache | None,
+        key: str | None,
+        entry: CacheEntry | None,
+        response: httpx.Response,
+    ) -> httpx.Response:
+        """Replay the stored body for a 304, or store a fresh response."""
+        if cache is None:
+            return response
+        if response.status_code == 304 and entry is not None:
+            return cache.hit(entry, response)
+        cache.put(key, response)
+        return response
+
+    def _send(
+        self, method: str, url: str, *, context: str, cacheable: bool = False, **kwargs
+    ) -> httpx.Response | None:
+        """Send a request, retrying connection errors (with backoff) and rate limiting.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            context: Short description for log messages (e.g. "page 3").
+            cacheable: Revalidate against the HTTP response cache (if
+                enabled); a 304 is returned as the stored 200 response.
+            **kwargs: Passed through to httpx (headers, params, json).
+
+        Returns:
+            The response (any status other than the rate-limit status),
+            or None if all retries were exhausted.
+        """
+        bucket = self._bucket(url)
+        cache, key, entry = (
+            self._cache_lookup(method, url, kwargs) if cacheable else (None, None, None)
+        )
+        for attempt in range(1, MAX_RETRIES + 1):
+            if bucket is not None:
+                bucket.acquire()
+            try:
+                response = self._client.request(method, url, **kwargs)
+            except httpx.RequestError as e:
+                logger.warning(
+                    f"[{self.network_name}] Request error on {context} "
+                    f"(attempt {attempt}/{MAX_RETRIES}): {e}"
+                )
+                if attempt < MAX_RETRIES:
+                    time.sleep(2 ** attempt)
+                    continue
+                return None
+
+            if self.transfer is not None:
+                self.transfer.record(response)
+
+            if self._is_rate_limited(response):
+                delay = self._rate_limit_delay(bucket, response, attempt, context)
+                if delay is None:
+                    return None
+                if delay:
+                    time.sleep(delay)
+                continue
+
+            if bucket is not None:
+                bucket.observe(read_hint(response))
+            return self._cache_response(cache, key, entry, response)
+
+        return None
+
+    # =========================================================================
+    # SYNC
+    # =========================================================================
+
+    @contextmanager
+    def _sync_log(self, conn, site_domain: str | None, options: SyncOptions | None = None):
+        """Open a sync_logs row for this run and mark it failed if the body raises.
+
+        With options.resume, the latest unfinished log for this network,
+        site and shard is reopened and its checkpoint loaded instead of
+        starting over.
+
+        Yields:
+            The run's SyncCheckpoint (log ID, resume state, stats).
+        """
+        from .. import db
+
+        options = options or SyncOptions()
+        shard = {}
+        if options.shard_count > 1:
+            shard = {
+                "run_id": options.run_id,
+                "shard_index": options.shard_index,
+                "shard_count": options.shard_count,
+            }
+
+        resumable = None
+        if options.resume:
+            resumable = db.get_resumable_sync_log(
+                conn,
+                self.network_name,
+                site_domain,
+                run_id=shard.get("run_id"),
+                shard_index=shard.get("shard_index"),
+            )
+
+        if resumable:
+            db.reopen_sync_log(conn, resumable["id"])
+            progress = SyncCheckpoint(
+                conn, resumable["id"], options.checkpoint_interval, resumable["checkpoint"]
+            )
+            logger.info(
+                f"[{self.network_name}] Resuming {resumable['status']} sync log "
+                f"{progress.log_id} ({len(progress.completed)} advertisers already done)"
+            )
+        else:
+            log_id = db.create_sync_log(conn, self.network_name, site_domain=site_domain, **shard)
+            progress = SyncCheckpoint(conn, log_id, options.checkpoint_interval)
+
+        progress.site_domain = site_domain
+        if shard:
+            progress.run_id = options.run_id
+            progress.shard_index = options.shard_index
+            progress.shard_count = options.shard_count
+            logger.info(
+                f"[{self.network_name}] Syncing shard {options.shard_index}/"
+                f"{options.shard_count} of run {options.run_id}"
+            )
+
+        self.progress = progress
+        self.transfer = progress.transfer = TransferStats()
+        self._seed_quota(conn, progress)
+        self.write_batch_size = options.write_batch_size
+        self.advertiser_hashes = db.load_advertiser_hashes(conn, self.network_name)
+        self.ad_hashes = db.load_ad_hashes(conn, self.network_name)
+        logger.debug(
+            f"[{self.network_name}] Loaded hashes of {len(self.advertiser_hashes)} advertisers "
+            f"and {len(self.ad_hashes)} ads"
+        )
+        progress.ads_fresh_hours = self._ads_fresh_hours(conn, site_domain, options)
+        progress.ads_site_id = self._find_ads_site_id(conn)
+
+        if options.time_budget_seconds:
+            progress.deadline = time.monotonic() + options.time_budget_seconds
+            progress.overdue_advertiser_ids = db.get_skipped_advertisers(
+                conn, self.network_name, site_domain, shard_index=shard.get("shard_index")
+            )
+            logger.info(
+                f"[{self.network_name}] Time budget {options.time_budget_seconds}s, "
+                f"{len(progress.overdue_advertiser_ids)} advertisers skipped last run go first"
+            )
+
+        try:
+            yield progress
+        except Exception as e:
+            logger.error(f"[{self.network_name}] Sync failed: {e}")
+            self._forget_run()
+            try:
+                # Commit the failure so the row (and its checkpoint) survive the rollback
+                db.save_transfer_stats(conn, progress.log_id, self.transfer.by_endpoint())
+                db.update_sync_log(
+                    conn, progress.log_id, status="failed", error_message=str(e)
+                )
+                conn.commit()
+            except Exception as log_error:
+                logger.warning(f"[{self.network_name}] Could not record failure: {log_error}")
+            raise
+        finally:
+            # Only valid within this run's transaction
+            self.advertiser_hashes = self.ad_hashes = None
+            self.progress = None
+
+    def _forget_run(self) -> None:
+        """Drop in-memory state that relies on this run's writes (called when it fails)."""
+
+    def _seed_quota(self, conn, progress: SyncCheckpoint) -> None:
+        """Start a quota bucket (e.g. 2,000 requests a day) with what is left of the quota.
+
+        Buckets start full in every process, so without this each run
+        could spend the whole quota. The requests sync_logs records within
+        the quota's period are taken out first. The shards of a sharded run
+        are not given a share each: Impact, the one network with a daily
+        quota, crawls its ads once per run (see SharedCrawl).
+        """
+        from .. import db
+
+        bucket = get_bucket(self.network_name, self._rate_limit_account(), "*", self.RATE_LIMITS)
+        if bucket is None or bucket.limit.period < QUOTA_PERIOD:
+            return
+        used = db.count_api_requests(conn, self.network_name, int(bucket.limit.period))
+        available = max(0, bucket.limit.burst - used)
+        bucket.seed(available)
+        logger.info(
+            f"[{self.network_name}] {used} of {bucket.limit.requests} requests used in the "
+            f"last {bucket.limit.period / 3600:g}h; up to {available:.0f} available at once "
+            f"to this run"
+        )
+
+    def _ads_fresh_hours(self, conn, site_domain: str | None, options: SyncOptions) -> int | None:
+        """Pick this run's ads freshness window, or None for a full sweep.
+
+        Every options.full_sweep_every-th run refetches all ads regardless,
+        so nothing is skipped for longer than that many runs.
+        """
+        from .. import db
+
+        if not options.ads_fresh_hours:
+            return None
+
+        if options.full_sweep_every:
+            completed_runs = db.count_successful_syncs(
+                conn, self.network_name, site_domain, exclude_run_id=options.run_id
+            )
+            if (completed_runs + 1) % options.full_sweep_every == 0:
+                logger.info(f"[{self.network_name}] Full sweep: fetching ads for every advertiser")
+                return None
+
+        logger.info(
+            f"[{self.network_name}] Skipping ads of unchanged advertisers "
+            f"synced in the last {options.ads_fresh_hours}h"
+        )
+        return options.ads_fresh_hours
+
+    def _find_ads_site_id(self, conn) -> int | None:
+        """Look up the site whose own ads this client syncs (PER_SITE_ADS clients only)."""
+        from .. import db
+
+        domain = getattr(self, "domain", None)
+        if not self.PER_SITE_ADS or not domain:
+            return None
+        site = db.get_site_by_domain(conn, domain)
+        return site["id"] if site else None
+
+    def _ads_site_id(self, conn) -> int | None:
+        """The site freshness is tracked for: the run's, or looked up outside a run."""
+        if self.progress is not None:
+            return self.progress.ads_site_id
+        return self._find_ads_site_id(conn)
+
+    def _get_rule_site_ids(self, conn, site_domain: str | None) -> list[int]:
+        """Determine which sites to create site_advertiser_rules for."""
+        from .. import db
+
+        if site_domain:
+            site_row = db.get_site_by_domain(conn, site_domain)
+            return [site_row["id"]] if site_row else []
+        if self.sites_cache is not None:
+            return [s["id"] for s in self.sites_cache.get(conn)]
+        return [s["id"] for s in db.get_active_sites(conn)]
+
+    def _upsert_advertiser(self, conn, adv_data: dict) -> tuple[int, bool]:
+        """Upsert a mapped advertiser. Returns (database ID, was_changed)."""
+        from .. import db
+
+        return db.upsert_advertiser(conn, to_db_advertiser(adv_data), self.advertiser_hashes)
+
+    def _upsert_advertisers(self, conn, advertisers: list[dict]) -> dict[str, tuple[int, bool]]:
+        """Upsert mapped advertisers in batches.
+
+        Returns:
+            {network advertiser ID: (database ID, was_changed)}.
+        """
+        from .. import db
+
+        rows = [to_db_advertiser(adv_data) for adv_data in advertisers]
+        results = db.upsert_advertisers(conn, rows, self.advertiser_hashes, self.write_batch_size)
+        return {
+            row["network_advertiser_id"]: result for row, result in zip(rows, results, strict=True)
+        }
+
+    def _sync_advertiser(
+        self,
+        conn,
+        adv_data: dict,
+        rule_site_ids: list[int],
+        stats: dict,
+        fresh_hours: int | None = None,
+        upserted: tuple[int, bool] | None = None,
+    ) -> tuple[int, str, bool]:
+        """Upsert a mapped advertiser and ensure its site rules exist.
+
+        Args:
+            fresh_hours: If set, an unchanged advertiser whose ads were synced
+                within this many hours is reported as fresh.
+            upserted: (database ID, was_changed) if the advertiser and its
+                site rules were already written by _upsert_scheduled().
+
+        Returns:
+            Tuple of (database advertiser ID, resolved geo_countries string,
+            whether its ads are fresh and can be skipped this run).
+        """
+        from .. import db
+        from ..geo import resolve_geo_countries
+
+        advertiser_id, changed = upserted or self._upsert_advertiser(conn, adv_data)
+        stats["advertisers_synced"] += 1
+
+        # Create site_advertiser_rules for applicable sites, fresh or not, so
+        # sites added since the last fetch get rules straight away
+        if upserted is None:
+            db.ensure_site_advertiser_rules(conn, rule_site_ids, [advertiser_id])
+
+        if (
+            fresh_hours
+            and not changed
+            and db.ads_synced_within(conn, advertiser_id, fresh_hours, self._ads_site_id(conn))
+        ):
+            stats["advertisers_fresh"] += 1
+            return advertiser_id, "", True
+
+        # Resolve geo_countries for this advertiser's ads
+        geo_countries = resolve_geo_countries(conn, adv_data.get("country_code"))
+
+        return advertiser_id, geo_countries, False
+
+    def _schedule_advertisers(
+        self, conn, mapper, raw_advertisers: list[dict], progress: SyncCheckpoint
+    ) -> list[dict]:
+        """Map the fetched advertisers and return the ones to sync, in sync order.
+
+        Advertisers owned by another shard are dropped. The rest are marked
+        seen, and those completed before a resume are left out. With a time
+        budget the list is sorted by advertiser_priority(); otherwise API
+        order is kept.
+        """
+        from .. import db
+
+        scheduled: list[dict] = []
+        for raw_adv in raw_advertisers:
+            try:
+                adv_data = mapper.map_advertiser(raw_adv)
+            except Exception as e:
+                logger.warning(f"[{self.network_name}] Error processing advertiser: {e}")
+                progress.stats["errors"] += 1
+                continue
+            network_advertiser_id = adv_data["network_program_id"]
+            if not progress.owns(network_advertiser_id):
+                continue
+            progress.see_advertiser(network_advertiser_id)
+            if not progress.is_done(network_advertiser_id):
+                scheduled.append(adv_data)
+
+        if progress.deadline is not None:
+            allowed_ids = db.get_allowed_advertiser_ids(conn, self.network_name)
+            scheduled.sort(
+                key=lambda adv: advertiser_priority(
+                    adv, allowed_ids, progress.overdue_advertiser_ids
+                )
+            )
+
+        return scheduled
+
+    def _upsert_scheduled(
+        self, conn, scheduled: list[dict], rule_site_ids: list[int], progress: SyncCheckpoint
+    ) -> dict[str, tuple[int, bool]]:
+        """Batch-upsert the scheduled advertisers and their site rules.
+
+        Runs ahead of _sync_advertiser(), with one set-based statement for
+        all the site rules. Skipped under a time budget, so advertisers left
+        over at the deadline are not touched. If the batch fails, each
+        advertiser is upserted on its own instead and only the bad ones fail.
+
+        Returns:
+            {network advertiser ID: (database ID, was_changed)}, for
+            _sync_advertiser(upserted=...).
+        """
+        from .. import db
+
+        if progress.deadline is not None:
+            return {}
+        try:
+            upserted = self._upsert_advertisers(conn, scheduled)
+            created = db.ensure_site_advertiser_rules(
+                conn, rule_site_ids, [advertiser_id for advertiser_id, _ in upserted.values()]
+            )
+        except Exception as e:
+            logger.warning(f"[{self.network_name}] Batch advertiser upsert failed: {e}")
+            return {}
+        if created:
+            logger.info(f"[{self.network_name}] Created {created} site advertiser rules")
+        return upserted
+
+    def _sync_advertisers(
+        self,
+        conn,
+        mapper,
+        raw_advertisers: list[dict],
+        rule_site_ids: list[int],
+        progress: SyncCheckpoint,
+    ) -> list[tuple[str, int, str]]:
+        """Upsert every advertiser up front, for engines that fetch ads afterwards.
+
+        Advertisers are taken in _schedule_advertisers() order. Those whose
+        ads are still fresh are left out of the work list, and once the time
+        budget runs out the rest are skipped.
+
+        Returns:
+            Work list of (network advertiser ID, database advertiser ID,
+            geo_countries) for the advertisers whose ads still need syncing.
+        """
+        stats = progress.stats
+        work: list[tuple[str, int, str]] = []
+
+        scheduled = self._schedule_advertisers(conn, mapper, raw_advertisers, progress)
+        upserted = self._upsert_scheduled(conn, scheduled, rule_site_ids, progress)
+
+        for adv_data in scheduled:
+            network_advertiser_id = adv_data["network_program_id"]
+            if progress.out_of_time():
+                progress.skipped_advertiser_ids.add(network_advertiser_id)
+                continue
+            try:
+                advertiser_id, geo_countries, fresh = self._sync_advertiser(
+                    conn,
+                    adv_data,
+                    rule_site_ids,
+                    stats,
+                    progress.ads_fresh_hours,
+                    upserted.get(network_advertiser_id),
+                )
+                if fresh:
+                    progress.advance(network_advertiser_id)
+                    continue
+                work.append((network_advertiser_id, advertiser_id, geo_countries))
+            except Exception as e:
+                logger.warning(f"[{self.network_name}] Error processing advertiser: {e}")
+                stats["errors"] += 1
+
+        return work
+
+    def _map_ads(
+        self,
+        mapper,
+        advertiser_id: int,
+        geo_countries: str,
+        raw_ads: list[dict],
+        stats: dict,
+    ) -> tuple[list[dict], set[str]]:
+        """Map an advertiser's raw ads to ads table rows.
+
+        Pure CPU work (no database access), so it can run off the writer thread.
+
+        Returns:
+            Tuple of (ads table rows, network ad IDs seen).
+        """
+        rows: list[dict] = []
+        seen_ad_ids: set[str] = set()
+
+        for raw_ad in raw_ads:
+            try:
+                ad_data = mapper.map_ad(raw_ad, advertiser_id)
+
+                # Track ad types for stats
+                creative_type = ad_data.get("creative_type", "banner")
+                stats["ad_types"][creative_type] = stats["ad_types"].get(creative_type, 0) + 1
+
+                # Warn on missing image_url
+                if not ad_data.get("image_url"):
+                    logger.warning(
+                        f"[{self.network_name}] Ad {ad_data.get('network_link_id')} "
+                        f"has no image_url"
+                    )
+
+                seen_ad_ids.add(ad_data["network_link_id"])
+                rows.append(to_db_ad(ad_data, advertiser_id, geo_countries))
+
+            except Exception as e:
+                logger.warning(f"[{self.network_name}] Error processing ad: {e}")
+                stats["errors"] += 1
+
+        return rows, seen_ad_ids
+
+    def _write_ads(self, conn, rows: list[dict], stats: dict) -> None:
+        """Upsert mapped ad rows in batches, counting failures as errors.
+
+        A batch that fails is retried one row at a time, so only the bad
+        rows are lost.
+        """
+        from .. import db
+
+        for start in range(0, len(rows), self.write_batch_size):
+            batch = rows[start : start + self.write_batch_size]
+            try:
+                db.upsert_ads(conn, batch, self.ad_hashes, self.write_batch_size)
+                stats["ads_synced"] += len(batch)
+                continue
+            except Exception as e:
+                logger.warning(
+                    f"[{self.network_name}] Batch ad upsert failed ({e}), retrying one at a time"
+                )
+            for row in batch:
+                try:
+                    db.upsert_ad(conn, row, self.ad_hashes)
+                    stats["ads_synced"] += 1
+                except Exception as e:
+                    logger.warning(f"[{self.network_name}] Error processing ad: {e}")
+                    stats["errors"] += 1
+
+    def _finish_ads(
+        self, conn, advertiser_id: int, seen_ad_ids: set[str], stats: dict, complete: bool = True
+    ) -> None:
+        """Mark an advertiser's ads synced and remove the ones that were not returned.
+
+        Within a sync run the seen ads are staged, and the stale ones of every
+        advertiser are deleted together by _finish_sync(). After an incomplete
+        fetch (complete=False) the ads written are kept, but nothing is
+        deleted and the ads are not marked synced, so the freshness window
+        does not skip the advertiser next run.
+        """
+        from .. import db
+
+        if not complete:
+            logger.warning(
+                f"[{self.network_name}] Ads of advertiser {advertiser_id} incomplete, "
+                f"keeping its existing ads"
+            )
+            return
+        if seen_ad_ids:
+            if self.progress is not None:
+                self.progress.stage_seen_ads(advertiser_id, seen_ad_ids)
+            else:
+                deleted = db.delete_stale_ads(conn, self.network_name, advertiser_id, seen_ad_ids)
+                stats["ads_deleted"] += deleted
+        db.mark_ads_synced(conn, advertiser_id, self._ads_site_id(conn))
+
+    def _ads_not_modified(self, conn, advertiser_id: int, raw_ads: list[dict], stats: dict) -> bool:
+        """Whether raw_ads is a 304 replay the database already reflects.
+
+        True when every page of the crawl came back 304 and the advertiser's
+        ads were marked synced after the cached bodies were downloaded, so
+        mapping and writing them again would change nothing. The ads are
+        marked synced again and the advertiser is counted as not modified.
+        """
+        from .. import db
+
+        if not isinstance(raw_ads, NotModified):
+            return False
+        age_seconds = int(time.time() - raw_ads.downloaded_at) + 1
+        site_id = self._ads_site_id(conn)
+        if not db.ads_synced_within_seconds(conn, advertiser_id, age_seconds, site_id):
+            return False
+        db.mark_ads_synced(conn, advertiser_id, site_id)
+        stats["advertisers_not_modified"] += 1
+        return True
+
+    def _sync_ads(
+        self,
+        conn,
+        mapper,
+        advertiser_id: int,
+        geo_countries: str,
+        raw_ads: list[dict],
+        stats: dict,
+    ) -> None:
+        """Map and upsert an advertiser's ads, then delete the ones not seen.
+
+        A crawl that came back 304 and is already in the database is skipped.
+        """
+        if self._ads_not_modified(conn, advertiser_id, raw_ads, stats):
+            return
+        rows, seen_ad_ids = self._map_ads(mapper, advertiser_id, geo_countries, raw_ads, stats)
+        self._write_ads(conn, rows, stats)
+        self._finish_ads(conn, advertiser_id, seen_ad_ids, stats, is_complete(raw_ads))
+
+    def _finish_sync(self, conn, progress: SyncCheckpoint) -> None:
+        """Deactivate unseen advertisers, record the sync log and log a summary."""
+        from .. import db
+
+        stats = progress.stats
+
+        # Stale ads of every advertiser whose ads were fetched, in one statement
+        progress.flush_seen_ads()
+        stats["ads_deleted"] += db.delete_unseen_ads(conn, self.network_name, progress.log_id)
+
+        # Skipped advertisers were seen, so they stay active and keep their ads
+        db.save_skipped_advertisers(conn, progress.log_id, progress.skipped_advertiser_ids)
+        transfer = self.transfer or TransferStats()
+        db.save_transfer_stats(conn, progress.log_id, transfer.by_endpoint())
+
+        if progress.sharded:
+            self._finish_shard(conn, progress)
+        else:
+            # Deactivate advertisers not seen this sync, in one statement
+            progress.flush_seen_advertisers()
+            db.deactivate_stale_advertisers(conn, self.network_name, [progress.log_id])
+
+            # The run is complete, so there is nothing left to resume
+            db.save_sync_checkpoint(conn, progress.log_id, None)
+            db.update_sync_log(
+                conn,
+                progress.log_id,
+                advertisers_synced=stats["advertisers_synced"],
+                ads_synced=stats["ads_synced"],
+                ads_deleted=stats["ads_deleted"],
+                status="success",
+            )
+
+        # Enhanced logging output
+        name = self.network_name
+        logger.info(f"[{name}] Sync complete:")
+        logger.info(f"[{name}]   Advertisers: {stats['advertisers_synced']} synced")
+        logger.info(f"[{name}]   Ads: {stats['ads_synced']} synced, {stats['ads_deleted']} deleted")
+        if stats["advertisers_fresh"]:
+            logger.info(
+                f"[{name}]   Ads fetch skipped for {stats['advertisers_fresh']} fresh advertisers"
+            )
+        if stats["advertisers_not_modified"]:
+            logger.info(
+                f"[{name}]   Ads unchanged (HTTP 304) for "
+                f"{stats['advertisers_not_modified']} advertisers"
+            )
+        if progress.skipped_advertiser_ids:
+            logger.warning(
+                f"[{name}]   Time budget reached: {len(progress.skipped_advertiser_ids)} "
+                f"advertisers skipped (synced first next run)"
+            )
+        totals = transfer.totals()
+        if totals["requests"]:
+            by_endpoint = ", ".join(
+                f"{endpoint} {format_bytes(counts['wire'])}"
+                for endpoint, counts in sorted(transfer.by_endpoint().items())
+            )
+            logger.info(
+                f"[{name}]   Transfer: {totals['requests']} responses, "
+                f"{format_bytes(totals['wire'])} on the wire, "
+                f"{format_bytes(totals['decoded'])} decoded ({by_endpoint})"
+            )
+        if stats["ad_types"]:
+            ad_types_str = ", ".join(
+                f"{count} {atype}" for atype, count in sorted(stats["ad_types"].items())
+            )
+            logger.info(f"[{name}]   Ad types: {ad_types_str}")
+        if stats["errors"] > 0:
+            logger.warning(f"[{name}]   Errors: {stats['errors']}")
+
+    def _finish_shard(self, conn, progress: SyncCheckpoint) -> None:
+        """Record a finished shard, deactivating stale advertisers if it is the last one.
+
+        A shard only sees its own slice of advertisers, so its seen IDs stay
+        staged under its successful log (and its checkpoint is kept). The
+        shard that finds all N shards of the run successful deactivates
+        advertisers staged by none of them and clears the checkpoints.
+        """
+        from .. import db
+
+        stats = progress.stats
+        progress.save()
+        db.update_sync_log(
+            conn,
+            progress.log_id,
+            advertisers_synced=stats["advertisers_synced"],
+            ads_synced=stats["ads_synced"],
+            ads_deleted=stats["ads_deleted"],
+            status="success",
+        )
+        # Commit before looking at the other shards, so that of two shards
+        # finishing together the later one always sees both as done
+        conn.commit()
+
+        logs = db.get_shard_sync_logs(
+            conn, self.network_name, progress.site_domain, progress.run_id
+        )
+        done = [log for log in logs if log["status"] == "success"]
+        finished = {log["shard_index"] for log in done}
+        if len(finished) < progress.shard_count:
+            logger.info(
+                f"[{self.network_name}] Shard {progress.shard_index}/{progress.shard_count} "
+                f"done; {progress.shard_count - len(finished)} shard(s) still running"
+            )
+            return
+        if any(log["checkpoint"] is None for log in done):
+            # Another shard already ran the cleanup
+            return
+
+        for log in done:
+            # Shards checkpointed by older versions kept their seen IDs there
+            db.stage_seen_advertisers(
+                conn, log["id"], log["checkpoint"].get("seen_advertiser_ids", [])
+            )
+        deactivated = db.deactivate_stale_advertisers(
+            conn, self.network_name, [log["id"] for log in done]
+        )
+        logger.info(
+            f"[{self.network_name}] All {progress.shard_count} shards done: "
+            f"{deactivated} stale advertisers deactivated"
+        )
+        for log in done:
+            db.save_sync_checkpoint(conn, log["id"], None)
+        self._finish_run(conn, progress)
+
+    def _finish_run(self, conn, progress: SyncCheckpoint) -> None:
+        """Clean up after every shard of a sharded run succeeded (called once, by the last)."""
+
+    def sync(
+        self, conn, site_domain: str | None = None, options: SyncOptions | None = None
+    ) -> dict:
         """Sync advertisers and ads from this network to the database.
 
         Fetches all advertisers and their ads, using hash-based change detection
@@ -51,170 +1144,296 @@ class NetworkClient(ABC):
             conn: Database connection.
             site_domain: If set (e.g. FlexOffers per-domain keys), create rules
                 for this site only. Otherwise create rules for ALL active sites.
+            options: Sync tuning. In "pipeline" mode the work is handed to
+                pipeline_sync().
 
         Returns:
             Dict with sync statistics.
         """
-        from .. import db
-        from ..geo import resolve_geo_countries
         from ..mappers import get_mapper
 
-        mapper = get_mapper(self.network_name)
-        stats = {
-            "advertisers_synced": 0,
-            "ads_synced": 0,
-            "ads_deleted": 0,
-            "errors": 0,
-            "ad_types": {},
-        }
+        if options is not None and options.mode == "pipeline":
+            return self.pipeline_sync(conn, site_domain, options)
 
-        log_id = db.create_sync_log(conn, self.network_name, site_domain=site_domain)
+        mapper = get_mapper(self.network_name)
 
-        try:
-            # Determine which sites to create rules for
-            if site_domain:
-                site_row = db.get_site_by_domain(conn, site_domain)
-                rule_site_ids = [site_row["id"]] if site_row else []
-            else:
-                rule_site_ids = [s["id"] for s in db.get_active_sites(conn)]
+        with self._sync_log(conn, site_domain, options) as progress:
+            stats = progress.stats
+            rule_site_ids = self._get_rule_site_ids(conn, site_domain)
 
             raw_advertisers = self.fetch_advertisers()
             logger.info(f"[{self.network_name}] Fetched {len(raw_advertisers)} advertisers")
 
-            seen_advertiser_ids: set[str] = set()
+            scheduled = self._schedule_advertisers(conn, mapper, raw_advertisers, progress)
+            upserted = self._upsert_scheduled(conn, scheduled, rule_site_ids, progress)
 
-            for raw_adv in raw_advertisers:
+            for adv_data in scheduled:
+                network_advertiser_id = adv_data["network_program_id"]
+                if progress.out_of_time():
+                    progress.skipped_advertiser_ids.add(network_advertiser_id)
+                    continue
                 try:
-                    adv_data = mapper.map_advertiser(raw_adv)
-                    seen_advertiser_ids.add(adv_data["network_program_id"])
-
-                    # Map canonical keys to db columns
-                    db_adv = {
-                        "network": adv_data["network"],
-                        "network_advertiser_id": adv_data["network_program_id"],
-                        "name": adv_data["network_program_name"],
-                        "website_url": adv_data.get("website_url"),
-                        "category": adv_data.get("category"),
-                        "description": adv_data.get("description"),
-                        "logo_url": adv_data.get("logo_url"),
-                        "network_rank": adv_data.get("network_rank"),
-                        "country_code": adv_data.get("country_code"),
-                        "epc": adv_data.get("epc", 0),
-                        "raw_hash": adv_data["raw_hash"],
-                    }
-
-                    advertiser_id, _ = db.upsert_advertiser(conn, db_adv)
-                    stats["advertisers_synced"] += 1
-
-                    # Resolve geo_countries for this advertiser's ads
-                    geo_countries = resolve_geo_countries(conn, adv_data.get("country_code"))
-
-                    # Create site_advertiser_rules for applicable sites
-                    for sid in rule_site_ids:
-                        db.ensure_site_advertiser_rule(conn, sid, advertiser_id)
+                    advertiser_id, geo_countries, fresh = self._sync_advertiser(
+                        conn,
+                        adv_data,
+                        rule_site_ids,
+                        stats,
+                        progress.ads_fresh_hours,
+                        upserted.get(network_advertiser_id),
+                    )
+                    if fresh:
+                        progress.advance(network_advertiser_id)
+                        continue
 
                     # Fetch and process ads for this advertiser
-                    raw_ads = self.fetch_ads(adv_data["network_program_id"])
-                    seen_ad_ids: set[str] = set()
-
-                    for raw_ad in raw_ads:
-                        try:
-                            ad_data = mapper.map_ad(raw_ad, advertiser_id)
-
-                            # Track ad types for stats
-                            creative_type = ad_data.get("creative_type", "banner")
-                            stats["ad_types"][creative_type] = stats["ad_types"].get(creative_type, 0) + 1
-
-                            # Warn on missing image_url
-                            if not ad_data.get("image_url"):
-                                logger.warning(
-                                    f"[{self.network_name}] Ad {ad_data.get('network_link_id')} has no image_url"
-                                )
-
-                            network_ad_id = ad_data["network_link_id"]
-                            seen_ad_ids.add(network_ad_id)
-
-                            # Map to db columns (network_link_id -> network_ad_id)
-                            db_ad = {
-                                "network": ad_data["network"],
-                                "network_ad_id": network_ad_id,
-                                "advertiser_id": advertiser_id,
-                                "creative_type": ad_data.get("creative_type", "banner"),
-                                "tracking_url": ad_data["tracking_url"],
-                                "destination_url": ad_data.get("destination_url"),
-                                "status": ad_data.get("status", "active"),
-                                "epc": ad_data.get("epc", 0),
-                                "raw_hash": ad_data["raw_hash"],
-                                "ad_content": ad_data.get("ad_content"),
-                                "advert_name": ad_data["advert_name"],
-                                "bannercode": ad_data["bannercode"],
-                                "imagetype": ad_data.get("imagetype", ""),
-                                "image_url": ad_data.get("image_url"),
-                                "width": ad_data["width"],
-                                "height": ad_data["height"],
-                                "campaign_name": ad_data.get("campaign_name", "General Promotion"),
-                                "enable_stats": ad_data.get("enable_stats", "Y"),
-                                "show_everyone": ad_data.get("show_everyone", "Y"),
-                                "show_desktop": ad_data.get("show_desktop", "Y"),
-                                "show_mobile": ad_data.get("show_mobile", "Y"),
-                                "show_tablet": ad_data.get("show_tablet", "Y"),
-                                "show_ios": ad_data.get("show_ios", "Y"),
-                                "show_android": ad_data.get("show_android", "Y"),
-                                "autodelete": ad_data.get("autodelete", "Y"),
-                                "autodisable": ad_data.get("autodisable", "N"),
-                                "budget": ad_data.get("budget", 0),
-                                "click_rate": ad_data.get("click_rate", 0),
-                                "impression_rate": ad_data.get("impression_rate", 0),
-                                "state_required": ad_data.get("state_required", "N"),
-                                "geo_cities": ad_data.get("geo_cities", "a:0:{}"),
-                                "geo_states": ad_data.get("geo_states", "a:0:{}"),
-                                "geo_countries": geo_countries,
-                                "schedule_start": ad_data.get("schedule_start", 0),
-                                "schedule_end": ad_data.get("schedule_end", 2650941780),
-                            }
-
-                            _, changed = db.upsert_ad(conn, db_ad)
-                            stats["ads_synced"] += 1
-
-                        except Exception as e:
-                            logger.warning(f"[{self.network_name}] Error processing ad: {e}")
-                            stats["errors"] += 1
-
-                    # Delete stale ads for this advertiser
-                    if seen_ad_ids:
-                        deleted = db.delete_stale_ads(conn, self.network_name, advertiser_id, seen_ad_ids)
-                        stats["ads_deleted"] += deleted
+                    raw_ads = self.fetch_ads(network_advertiser_id)
+                    self._sync_ads(conn, mapper, advertiser_id, geo_countries, raw_ads, stats)
+                    progress.advance(network_advertiser_id)
 
                 except Exception as e:
                     logger.warning(f"[{self.network_name}] Error processing advertiser: {e}")
                     stats["errors"] += 1
 
-            # Deactivate advertisers not seen this sync
-            if seen_advertiser_ids:
-                db.deactivate_stale_advertisers(conn, self.network_name, seen_advertiser_ids)
+            self._finish_sync(conn, progress)
 
-            db.update_sync_log(
-                conn,
-                log_id,
-                advertisers_synced=stats["advertisers_synced"],
-                ads_synced=stats["ads_synced"],
-                ads_deleted=stats["ads_deleted"],
-                status="success",
+        return stats
+
+    def resync_advertiser(
+        self, conn, network_advertiser_id: str, site_domain: str | None = None
+    ) -> dict:
+        """Sync a single advertiser: upsert it, its site rules, its ads and stale-ad cleanup.
+
+        Meant for operational fixes and profiling, so it writes no sync_logs
+        row: a scoped run must not count as a full sync for freshness, skipped
+        advertisers or --resume. Other advertisers are never deactivated.
+
+        Args:
+            conn: Database connection.
+            network_advertiser_id: The network-specific advertiser/program ID.
+            site_domain: Same as sync().
+
+        Returns:
+            Dict with sync statistics.
+
+        Raises:
+            ValueError: If the network does not return the advertiser (not
+                joined/approved, or unknown).
+        """
+        from ..mappers import get_mapper
+
+        mapper = get_mapper(self.network_name)
+        stats = new_sync_stats()
+        started = time.monotonic()
+
+        raw_adv = self.fetch_advertiser(network_advertiser_id)
+        if raw_adv is None:
+            raise ValueError(
+                f"Advertiser {network_advertiser_id} not found on {self.network_name}"
             )
+        adv_data = mapper.map_advertiser(raw_adv)
 
-            # Enhanced logging output
-            logger.info(f"[{self.network_name}] Sync complete:")
-            logger.info(f"[{self.network_name}]   Advertisers: {stats['advertisers_synced']} synced")
-            logger.info(f"[{self.network_name}]   Ads: {stats['ads_synced']} synced, {stats['ads_deleted']} deleted")
-            if stats["ad_types"]:
-                ad_types_str = ", ".join(f"{count} {atype}" for atype, count in sorted(stats["ad_types"].items()))
-                logger.info(f"[{self.network_name}]   Ad types: {ad_types_str}")
-            if stats["errors"] > 0:
-                logger.warning(f"[{self.network_name}]   Errors: {stats['errors']}")
+        rule_site_ids = self._get_rule_site_ids(conn, site_domain)
+        advertiser_id, geo_countries, _ = self._sync_advertiser(
+            conn, adv_data, rule_site_ids, stats
+        )
+        raw_ads = self.fetch_advertiser_ads(adv_data["network_program_id"])
+        self._sync_ads(conn, mapper, advertiser_id, geo_countries, raw_ads, stats)
 
-        except Exception as e:
-            logger.error(f"[{self.network_name}] Sync failed: {e}")
-            db.update_sync_log(conn, log_id, status="failed", error_message=str(e))
-            raise
+        logger.info(
+            f"[{self.network_name}] Advertiser {network_advertiser_id} "
+            f"({adv_data['network_program_name']}) synced in {time.monotonic() - started:.1f}s: "
+            f"{stats['ads_synced']} ads synced, {stats['ads_deleted']} deleted, "
+            f"{stats['errors']} errors"
+        )
+        return stats
+
+    def pipeline_sync(
+        self, conn, site_domain: str | None = None, options: SyncOptions | None = None
+    ) -> dict:
+        """Equivalent of sync() with fetch, map and DB write stages overlapping.
+
+        All advertisers are upserted first. Their ads are then fetched on one
+        thread, mapped and hashed on another, and written on the calling
+        thread (which owns conn) in batches. Bounded queues between the
+        stages provide backpressure, so at most a few advertisers' ads are
+        held in memory regardless of network size.
+
+        Args:
+            conn: Database connection.
+            site_domain: Same as sync().
+            options: Queue and batch sizes (defaults from SyncOptions).
+
+        Returns:
+            Dict with sync statistics.
+        """
+        from ..mappers import get_mapper
+        from .pipeline import run_pipeline
+
+        options = options or SyncOptions(mode="pipeline")
+        mapper = get_mapper(self.network_name)
+
+        with self._sync_log(conn, site_domain, options) as progress:
+            rule_site_ids = self._get_rule_site_ids(conn, site_domain)
+
+            raw_advertisers = self.fetch_advertisers()
+            logger.info(f"[{self.network_name}] Fetched {len(raw_advertisers)} advertisers")
+
+            work = self._sync_advertisers(conn, mapper, raw_advertisers, rule_site_ids, progress)
+            run_pipeline(self, conn, mapper, work, progress, options)
+
+            self._finish_sync(conn, progress)
+
+        return progress.stats
+
+
+class AsyncNetworkClient(NetworkClient):
+    """Async variant of a network client built on httpx.AsyncClient.
+
+    Subclasses mix this in ahead of a concrete client (e.g.
+    ``class AsyncCJClient(AsyncNetworkClient, CJClient)``) and implement
+    afetch_ads(). async_sync() keeps the sync() contract (stats dict,
+    sync_logs row, stale cleanup) but fetches ads for many advertisers
+    concurrently, up to a per-network cap.
+
+    Database work stays on the event loop thread: connections are not
+    shared across threads, and the DB calls are short compared to the
+    HTTP round-trips they overlap with.
+    """
+
+    # Default number of advertisers whose ads are fetched at the same time
+    ADS_CONCURRENCY = 4
+
+    _aclient: httpx.AsyncClient
+
+    @abstractmethod
+    async def afetch_ads(self, advertiser_id: str) -> list[dict]:
+        """Async equivalent of fetch_ads()."""
+        ...
+
+    async def afetch_advertisers(self) -> list[dict]:
+        """Async equivalent of fetch_advertisers().
+
+        The advertiser list is a single paginated crawl with nothing to fan
+        out, so by default it runs the blocking implementation in a thread.
+        """
+        return await asyncio.to_thread(self.fetch_advertisers)
+
+    async def _asend(
+        self, method: str, url: str, *, context: str, cacheable: bool = False, **kwargs
+    ) -> httpx.Response | None:
+        """Async equivalent of _send() using the AsyncClient."""
+        bucket = self._bucket(url)
+        cache, key, entry = (
+            self._cache_lookup(method, url, kwargs) if cacheable else (None, None, None)
+        )
+        for attempt in range(1, MAX_RETRIES + 1):
+            if bucket is not None:
+                await bucket.aacquire()
+            try:
+                response = await self._aclient.request(method, url, **kwargs)
+            except httpx.RequestError as e:
+                logger.warning(
+                    f"[{self.network_name}] Request error on {context} "
+                    f"(attempt {attempt}/{MAX_RETRIES}): {e}"
+                )
+                if attempt < MAX_RETRIES:
+                    await asyncio.sleep(2 ** attempt)
+                    continue
+                return None
+
+            if self.transfer is not None:
+                self.transfer.record(response)
+
+            if self._is_rate_limited(response):
+                delay = self._rate_limit_delay(bucket, response, attempt, context)
+                if delay is None:
+                    return None
+                if delay:
+                    await asyncio.sleep(delay)
+                continue
+
+            if bucket is not None:
+                bucket.observe(read_hint(response))
+            return self._cache_response(cache, key, entry, response)
+
+        return None
+
+    async def async_sync(
+        self, conn, site_domain: str | None = None, options: SyncOptions | None = None
+    ) -> dict:
+        """Async equivalent of sync() with bounded fan-out of afetch_ads().
+
+        All advertisers are upserted first, then their ads are fetched with
+        at most options.async_concurrency requests in flight. Results are
+        processed in advertiser order as they arrive, so at most that many ad
+        lists are held in memory at once.
+
+        Args:
+            conn: Database connection.
+            site_domain: Same as sync().
+            options: Sync tuning; async_concurrency is the number of
+                advertisers fetched at once (default ADS_CONCURRENCY).
+
+        Returns:
+            Dict with sync statistics.
+        """
+        from ..mappers import get_mapper
+
+        mapper = get_mapper(self.network_name)
+        limit = max(1, (options and options.async_concurrency) or self.ADS_CONCURRENCY)
+
+        with self._sync_log(conn, site_domain, options) as progress:
+            stats = progress.stats
+            rule_site_ids = self._get_rule_site_ids(conn, site_domain)
+
+            raw_advertisers = await self.afetch_advertisers()
+            logger.info(f"[{self.network_name}] Fetched {len(raw_advertisers)} advertisers")
+
+            work = self._sync_advertisers(conn, mapper, raw_advertisers, rule_site_ids, progress)
+
+            logger.info(
+                f"[{self.network_name}] Fetching ads for {len(work)} advertisers "
+                f"({limit} at a time)"
+            )
+
+            # Sliding window: keep `limit` fetches in flight, consume in order
+            remaining = iter(work)
+            pending: deque = deque()
+
+            def schedule_next() -> None:
+                item = next(remaining, None)
+                while item is not None and progress.out_of_time():
+                    progress.skipped_advertiser_ids.add(item[0])
+                    item = next(remaining, None)
+                if item is not None:
+                    pending.append((item, asyncio.create_task(self.afetch_ads(item[0]))))
+
+            for _ in range(limit):
+                schedule_next()
+
+            while pending:
+                (network_advertiser_id, advertiser_id, geo_countries), task = pending.popleft()
+                try:
+                    raw_ads = await task
+                except Exception as e:
+                    logger.warning(f"[{self.network_name}] Error processing advertiser: {e}")
+                    stats["errors"] += 1
+                    schedule_next()
+                    continue
+
+                # Refill the window before the (blocking) DB work for this advertiser
+                schedule_next()
+                try:
+                    self._sync_ads(conn, mapper, advertiser_id, geo_countries, raw_ads, stats)
+                    progress.advance(network_advertiser_id)
+                except Exception as e:
+                    logger.warning(f"[{self.network_name}] Error processing advertiser: {e}")
+                    stats["errors"] += 1
+
+            self._finish_sync(conn, progress)
 
         return stats
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client."""
+        await self._aclient.aclose()
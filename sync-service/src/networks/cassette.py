@@ -0,0 +1,290 @@
+"""Record and replay network API traffic for offline sync runs.
+
+Recording wraps a client's transport so every request/response pair is
+kept, then written to a gzip-compressed JSON-lines cassette per client
+(``<network>[-<domain>].jsonl.gz``). Replaying feeds a cassette through
+httpx.MockTransport into the unchanged client, so the full
+NetworkClient.sync path (pagination, rate limiting, mapping, DB writes)
+runs without credentials. Optional latency and injected rate-limit
+responses make the replay behave more like the live APIs.
+
+Request headers are never stored, and credentials passed as query
+parameters (Awin's ``accessToken``) are redacted, so API tokens stay out of
+cassettes and a cassette replays under any token. Requests are matched on
+method, URL, sorted query params and body; a
+request recorded several times replays its responses in order, repeating
+the last one.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import httpx
+
+from .base import AsyncNetworkClient, NetworkClient
+
+logger = logging.getLogger(__name__)
+
+# Headers describing the original encoding; stored bodies are already decoded
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie"}
+
+# Query parameters carrying credentials (compared case-insensitively)
+_SECRET_PARAMS = {
+    "accesstoken",
+    "access_token",
+    "apikey",
+    "api_key",
+    "auth_token",
+    "authtoken",
+    "bearer",
+    "token",
+}
+
+_REDACTED = "REDACTED"
+
+
+def _redacted_params(url: httpx.URL) -> list[tuple[str, str]]:
+    """The URL's query parameters with credential values replaced."""
+    return [
+        (name, _REDACTED if name.lower() in _SECRET_PARAMS else value)
+        for name, value in url.params.multi_items()
+    ]
+
+
+def _redacted_url(url: httpx.URL) -> str:
+    """The URL with credential query parameter values replaced, for storing and logging."""
+    return str(url.copy_with(params=_redacted_params(url)))
+
+
+def _request_key(request: httpx.Request) -> str:
+    """Match key for a request: method, URL without query, sorted params, body hash."""
+    query = sorted(_redacted_params(request.url))
+    body = hashlib.sha256(request.content).hexdigest() if request.content else ""
+    url = str(request.url.copy_with(query=None))
+    return json.dumps([request.method, url, query, body])
+
+
+@dataclass
+class ReplayOptions:
+    """How a cassette is replayed.
+
+    Attributes:
+        latency_ms: Delay added to every replayed response.
+        rate_limit_every: Answer every Nth request with the client's
+            rate-limit status first (0 = never); the retry gets the
+            recorded response.
+        retry_after: Retry-After seconds on injected rate-limit responses.
+    """
+
+    latency_ms: float = 0.0
+    rate_limit_every: int = 0
+    retry_after: float = 1.0
+
+
+class Cassette:
+    """Recorded request/response pairs of one client, saved to one file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._interactions: list[dict] = []
+        self._responses: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+        # Replay metrics
+        self.played = 0
+        self.missed = 0
+        self.rate_limited = 0
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        """Read a cassette file written by save()."""
+        cassette = cls(path)
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    interaction = json.loads(line)
+                    cassette._interactions.append(interaction)
+                    cassette._responses.setdefault(interaction["key"], deque()).append(
+                        interaction["response"]
+                    )
+        return cassette
+
+    def __len__(self) -> int:
+        return len(self._interactions)
+
+    def record(self, request: httpx.Request, response: httpx.Response) -> None:
+        """Keep a request and its (already read) response."""
+        try:
+            body = {"text": response.content.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"base64": base64.b64encode(response.content).decode("ascii")}
+        headers = [
+            [name, value]
+            for name, value in response.headers.multi_items()
+            if name.lower() not in _DROPPED_HEADERS
+        ]
+        interaction = {
+            "key": _request_key(request),
+            "method": request.method,
+            "url": _redacted_url(request.url),
+            "response": {"status": response.status_code, "headers": headers, **body},
+        }
+        with self._lock:
+            self._interactions.append(interaction)
+
+    def save(self) -> None:
+        """Write all recorded interactions to the cassette file."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            interactions = list(self._interactions)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            for interaction in interactions:
+                f.write(json.dumps(interaction) + "\n")
+        logger.info(f"Recorded {len(interactions)} requests to {self.path}")
+
+    def play(self, request: httpx.Request) -> httpx.Response:
+        """Return the recorded response for a request, or a 404 if none was recorded."""
+        key = _request_key(request)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                self.missed += 1
+                logger.warning(
+                    f"No recorded response for {request.method} {_redacted_url(request.url)}"
+                )
+                return httpx.Response(404, json={"error": "not in cassette"})
+            recorded = responses.popleft() if len(responses) > 1 else responses[0]
+            self.played += 1
+
+        if "base64" in recorded:
+            content = base64.b64decode(recorded["base64"])
+        else:
+            content = recorded["text"].encode("utf-8")
+        return httpx.Response(recorded["status"], headers=recorded["headers"], content=content)
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Passes requests to the real transport and records each exchange."""
+
+    def __init__(self, inner: httpx.BaseTransport, cassette: Cassette):
+        self._inner = inner
+        self._cassette = cassette
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self._inner.handle_request(request)
+        response.read()
+        self._cassette.record(request, response)
+        return response
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    """Async equivalent of RecordingTransport."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, cassette: Cassette):
+        self._inner = inner
+        self._cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._inner.handle_async_request(request)
+        await response.aread()
+        self._cassette.record(request, response)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class Replayer:
+    """MockTransport handlers serving a cassette with optional latency and rate limits."""
+
+    def __init__(self, cassette: Cassette, options: ReplayOptions, rate_limit_status: int = 429):
+        self.cassette = cassette
+        self.options = options
+        self.rate_limit_status = rate_limit_status
+        self._requests = 0
+        self._lock = threading.Lock()
+
+    def _injected(self) -> httpx.Response | None:
+        """A rate-limit response if this request is one of every Nth."""
+        if self.options.rate_limit_every <= 0:
+            return None
+        with self._lock:
+            self._requests += 1
+            if self._requests % self.options.rate_limit_every:
+                return None
+            self.cassette.rate_limited += 1
+        return httpx.Response(
+            self.rate_limit_status, headers={"Retry-After": f"{self.options.retry_after:g}"}
+        )
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if self.options.latency_ms:
+            time.sleep(self.options.latency_ms / 1000)
+        return self._injected() or self.cassette.play(request)
+
+    async def ahandle(self, request: httpx.Request) -> httpx.Response:
+        if self.options.latency_ms:
+            await asyncio.sleep(self.options.latency_ms / 1000)
+        return self._injected() or self.cassette.play(request)
+
+
+def cassette_path(directory: str, client: NetworkClient) -> str:
+    """Cassette file for a client: one per network, and per domain where it has them."""
+    domain = getattr(client, "domain", None)
+    name = f"{client.network_name}-{domain}" if domain else client.network_name
+    return os.path.join(directory, f"{name}.jsonl.gz")
+
+
+def _rebuild(client: httpx.Client | httpx.AsyncClient, transport) -> dict:
+    """Keyword arguments for a copy of client (auth, headers, timeout) on transport."""
+    return {
+        "transport": transport,
+        "auth": client.auth,
+        "headers": client.headers,
+        "timeout": client.timeout,
+    }
+
+
+def record(client: NetworkClient, directory: str) -> Cassette:
+    """Record a client's traffic; call save() on the returned cassette afterwards."""
+    cassette = Cassette(cassette_path(directory, client))
+    http = client._client
+    client._client = httpx.Client(**_rebuild(http, RecordingTransport(http._transport, cassette)))
+    if isinstance(client, AsyncNetworkClient):
+        ahttp = client._aclient
+        client._aclient = httpx.AsyncClient(
+            **_rebuild(ahttp, AsyncRecordingTransport(ahttp._transport, cassette))
+        )
+    return cassette
+
+
+def replay(client: NetworkClient, directory: str, options: ReplayOptions | None = None) -> Cassette:
+    """Serve a client's requests from its cassette instead of the network.
+
+    Raises:
+        FileNotFoundError: If the client has no cassette in directory.
+    """
+    cassette = Cassette.load(cassette_path(directory, client))
+    replayer = Replayer(cassette, options or ReplayOptions(), client.RATE_LIMIT_STATUS)
+    http = client._client
+    client._client = httpx.Client(**_rebuild(http, httpx.MockTransport(replayer.handle)))
+    if isinstance(client, AsyncNetworkClient):
+        ahttp = client._aclient
+        client._aclient = httpx.AsyncClient(
+            **_rebuild(ahttp, httpx.MockTransport(replayer.ahandle))
+        )
+    return cassette
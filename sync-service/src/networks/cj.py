@@ -1,15 +1,192 @@
 """CJ (Commission Junction) API client - Rag's responsibility."""
 
 import logging
+import re
+import threading
 import xml.etree.ElementTree as ET
+from collections.abc import Callable
 
 import httpx
 
-from .base import NetworkClient
+from .base import AsyncNetworkClient, NetworkClient, SyncCheckpoint
+from .paginate import Page, Paginator, is_complete
+from .ratelimit import RateLimit
+from .spool import GroupSpool
+from .transport import create_async_client, create_client
+from .xmlstream import iter_records
 
 logger = logging.getLogger(__name__)
 
-MAX_RETRIES = 3
+ADVERTISERS_PAGE_SIZE = 100  # Max allowed by CJ advertiser lookup
+LINKS_PAGE_SIZE = 100  # Default/max for CJ link search
+
+
+def substitute_pid(link: dict, source_pid: str, target_pid: str) -> dict:
+    """Rewrite a link-search record fetched for one PID as if fetched for another.
+
+    Creatives are identical across a publisher's websites; only the PID in
+    the tracking URLs differs (``.../click-<PID>-<link-id>-...`` and
+    ``.../image-<PID>-<link-id>``), in clickUrl as well as inside
+    link-code-html.
+    """
+    pattern = re.compile(rf"\b(click|image)-{re.escape(source_pid)}-")
+    replacement = rf"\g<1>-{target_pid}-"
+    return {
+        key: pattern.sub(replacement, value) if isinstance(value, str) else value
+        for key, value in link.items()
+    }
+
+
+class CJAdvertiserCache:
+    """Advertiser-lookup results shared by the CJ clients of one run.
+
+    main.py creates one CJClient per domain, all with the same CID, so the
+    joined-advertiser list is identical for each of them. The first client
+    to ask for a CID's advertisers crawls advertiser-lookup; any client
+    asking at the same time waits for that crawl instead of starting its
+    own, and later clients reuse the result. Database IDs of advertisers
+    upserted this run are remembered as well, so later domains skip the
+    upsert and only add their own site rules. A client whose sync fails
+    forgets the upserts it remembered (forget_upserts()), as its
+    transaction may not have been committed.
+
+    With share_links, link-search results are shared too: the first domain
+    to search an advertiser stores its links, and the other domains derive
+    theirs with substitute_pid(). An entry is evicted once every domain is
+    done with it: it fetched the links, read them, or finished its run
+    (finish_links()) without reading them, e.g. because the advertiser was
+    fresh, over the time budget or failed. The domains sync one after the
+    other, so the first one's links are all held until the next reads them.
+    They are kept in a GroupSpool, which moves them to a temporary SQLite
+    file past ``spill_threshold`` links.
+
+    Scoped to a single run: create one in build_clients() and pass it to
+    each CJClient.
+    """
+
+    def __init__(
+        self,
+        share_links: bool = False,
+        domains: int = 1,
+        verify_sample: int = 3,
+        spill_threshold: int = 20000,
+    ):
+        """Initialize the cache.
+
+        Args:
+            share_links: Share link-search results across PIDs.
+            domains: Number of CJ clients (PIDs) sharing this cache.
+            verify_sample: Advertisers per client whose derived links are
+                checked against a real link-search before trusting them.
+            spill_threshold: Shared links held in memory before the rest
+                go to a temporary file.
+        """
+        self.share_links = share_links
+        self.domains = domains
+        self.verify_sample = verify_sample
+        self.spill_threshold = spill_threshold
+        self._lock = threading.Lock()
+        self._cid_locks: dict[str, threading.Lock] = {}
+        self._advertisers: dict[str, list[dict]] = {}
+        # (cid, network advertiser ID) -> (database ID, raw_hash)
+        self._upserted: dict[tuple[str, str], tuple[int, str]] = {}
+        # (cid, network advertiser ID) -> (source PID, PIDs done with it); the
+        # links themselves are in the spool, keyed "<cid>/<advertiser ID>"
+        self._links: dict[tuple[str, str], tuple[str, set[str]]] = {}
+        self._link_spool: GroupSpool | None = None
+        # (cid, PID) of clients whose run is over
+        self._finished: set[tuple[str, str]] = set()
+
+    def get_advertisers(self, cid: str, fetch: Callable[[], list[dict]]) -> list[dict]:
+        """Return the advertisers for a CID, calling fetch() at most once."""
+        with self._lock:
+            cid_lock = self._cid_locks.setdefault(cid, threading.Lock())
+
+        with cid_lock:
+            if cid not in self._advertisers:
+                self._advertisers[cid] = fetch()
+            else:
+                logger.info(f"Reusing {len(self._advertisers[cid])} CJ advertisers for CID {cid}")
+            return self._advertisers[cid]
+
+    def get_upserted(self, cid: str, network_advertiser_id: str, raw_hash: str) -> int | None:
+        """Return the database ID if this exact advertiser was upserted this run."""
+        with self._lock:
+            entry = self._upserted.get((cid, network_advertiser_id))
+        if entry and entry[1] == raw_hash:
+            return entry[0]
+        return None
+
+    def remember_upsert(
+        self, cid: str, network_advertiser_id: str, raw_hash: str, advertiser_id: int
+    ) -> None:
+        """Record an advertiser upserted this run."""
+        with self._lock:
+            self._upserted[(cid, network_advertiser_id)] = (advertiser_id, raw_hash)
+
+    def forget_upserts(self, cid: str, upserted: dict[str, tuple[int, str]]) -> None:
+        """Drop remembered upserts, unless another client has since replaced them.
+
+        Args:
+            cid: Publisher CID.
+            upserted: Network advertiser ID -> (database ID, raw_hash) as
+                passed to remember_upsert().
+        """
+        with self._lock:
+            for network_advertiser_id, entry in upserted.items():
+                key = (cid, network_advertiser_id)
+                if self._upserted.get(key) == entry:
+                    del self._upserted[key]
+
+    def put_links(self, cid: str, advertiser_id: str, pid: str, links: list[dict]) -> None:
+        """Store one advertiser's link-search results for the other domains."""
+        if not self.share_links or self.domains < 2:
+            return
+        with self._lock:
+            # Two domains may both search an advertiser; the first to finish is kept
+            if (cid, advertiser_id) in self._links:
+                return
+            done = {pid} | {p for c, p in self._finished if c == cid}
+            if len(done) >= self.domains:
+                return
+            if self._link_spool is None:
+                self._link_spool = GroupSpool(self.spill_threshold, label="shared CJ links")
+            key = f"{cid}/{advertiser_id}"
+            for link in links:
+                self._link_spool.add(key, link)
+            self._links[(cid, advertiser_id)] = (pid, done)
+
+    def take_links(self, cid: str, advertiser_id: str, pid: str) -> tuple[str, list[dict]] | None:
+        """Return (source PID, links) for an advertiser, evicting after the last domain."""
+        with self._lock:
+            entry = self._links.get((cid, advertiser_id))
+            if entry is None:
+                return None
+            source_pid, done = entry
+            done.add(pid)
+            if len(done) < self.domains:
+                return source_pid, self._link_spool.get(f"{cid}/{advertiser_id}")
+            return source_pid, self._evict(cid, advertiser_id)
+
+    def finish_links(self, cid: str, pid: str) -> None:
+        """Record that a domain's run is over, evicting what no other domain still needs."""
+        with self._lock:
+            self._finished.add((cid, pid))
+            for (entry_cid, advertiser_id), (_, done) in list(self._links.items()):
+                if entry_cid == cid:
+                    done.add(pid)
+                    if len(done) >= self.domains:
+                        self._evict(cid, advertiser_id)
+
+    def _evict(self, cid: str, advertiser_id: str) -> list[dict]:
+        """Remove an entry and return its links (with the lock held)."""
+        del self._links[(cid, advertiser_id)]
+        links = self._link_spool.pop(f"{cid}/{advertiser_id}")
+        if not self._links:
+            # Every domain is done with everything so far: drop the temporary file
+            self._link_spool.close()
+            self._link_spool = None
+        return links
 
 
 class CJClient(NetworkClient):
@@ -23,7 +200,21 @@ class CJClient(NetworkClient):
     ADVERTISER_URL = "https://advertiser-lookup.api.cj.com/v2/advertiser-lookup"
     LINK_SEARCH_URL = "https://link-search.api.cj.com/v2/link-search"
 
-    def __init__(self, api_token: str, cid: str, website_id: str, domain: str | None = None):
+    # 25 requests per 5 seconds per token, across both endpoints
+    RATE_LIMITS = {"*": RateLimit(25, 5)}
+
+    # Links carry the domain's PID, so another domain's fetch (or upsert,
+    # see CJAdvertiserCache) does not make this domain's ads fresh
+    PER_SITE_ADS = True
+
+    def __init__(
+        self,
+        api_token: str,
+        cid: str,
+        website_id: str,
+        domain: str | None = None,
+        advertiser_cache: CJAdvertiserCache | None = None,
+    ):
         """Initialize the CJ client.
 
         Args:
@@ -31,12 +222,23 @@ class CJClient(NetworkClient):
             cid: Publisher Company ID (CID) for advertiser lookup.
             website_id: Website/Property ID (PID) for link search.
             domain: Optional domain this client is scoped to.
+            advertiser_cache: Run-scoped cache shared with the other domains'
+                clients, so advertisers are fetched and upserted once per CID.
         """
         self.api_token = api_token
         self.cid = cid
         self.website_id = website_id
         self.domain = domain
-        self._client = httpx.Client(timeout=30.0)
+        self.advertiser_cache = advertiser_cache
+        self._client = create_client()
+
+        # Shared link-search: derived results checked so far, and whether
+        # derivation is still trusted for this PID
+        self._links_verified = 0
+        self._share_links = advertiser_cache is not None and advertiser_cache.share_links
+
+        # Upserts this client remembered in the cache, forgotten if its sync fails
+        self._remembered: dict[str, tuple[int, str]] = {}
 
     @property
     def network_name(self) -> str:
@@ -46,7 +248,7 @@ class CJClient(NetworkClient):
         """Return headers with Bearer token authentication."""
         return {"Authorization": f"Bearer {self.api_token}"}
 
-    def _parse_xml_elements(self, xml_text: str, tag: str) -> tuple[list[dict], dict]:
+    def _parse_xml_elements(self, content: bytes, tag: str) -> tuple[list[dict], dict]:
         """Parse CJ XML response into a list of dicts for the given tag.
 
         CJ returns XML like:
@@ -57,183 +259,325 @@ class CJClient(NetworkClient):
               </advertisers>
             </cj-api>
 
-        This method finds all elements matching `tag` (e.g., "advertiser" or "link")
-        and converts each one to a flat dict. Also returns the wrapper element's
-        attributes (total-matched, records-returned, page-number) for pagination.
+        Records are streamed out of the body by xmlstream.iter_records(), so
+        the whole document is never held as an element tree. Also returns
+        the wrapper element's attributes (total-matched, records-returned,
+        page-number) for pagination.
 
         Args:
-            xml_text: Raw XML response string from CJ API.
+            content: Raw XML response body from CJ API.
             tag: The element tag to extract (e.g., "advertiser" or "link").
 
         Returns:
             Tuple of (list of record dicts, wrapper attributes dict).
         """
-        root = ET.fromstring(xml_text)
+        wrapper_attribs: dict = {}
+        records = list(iter_records(content, tag, wrapper_attribs))
+        return records, wrapper_attribs
 
-        # Find the wrapper element (e.g., <advertisers> or <links>)
-        # Convention: wrapper tag is plural of record tag (advertiser -> advertisers, link -> links)
-        wrapper_tag = f"{tag}s"
-        wrapper = root.find(f".//{wrapper_tag}")
-        wrapper_attribs = dict(wrapper.attrib) if wrapper is not None else {}
+    def _raise_if_unauthorized(self, response: httpx.Response, message: str) -> None:
+        if response.status_code == 401:
+            raise httpx.HTTPStatusError(
+                message,
+                request=response.request,
+                response=response,
+            )
 
-        # Find all record elements
-        elements = root.findall(f".//{tag}")
-        records = []
+    def fetch_advertisers(self) -> list[dict]:
+        """Fetch all joined advertisers, once per CID when a cache is shared.
 
-        for elem in elements:
-            record = self._element_to_dict(elem)
-            records.append(record)
+        Returns:
+            List of raw advertiser dicts from the API. May return partial
+            results if some pages fail after retries.
+        """
+        if self.advertiser_cache is not None:
+            return self.advertiser_cache.get_advertisers(self.cid, self._lookup_advertisers)
+        return self._lookup_advertisers()
+
+    def _advertisers_request(self, page: int) -> dict:
+        """Build the request arguments for one page of advertiser-lookup."""
+        return {
+            "method": "GET",
+            "url": self.ADVERTISER_URL,
+            "context": f"advertisers page {page}",
+            "cacheable": True,
+            "headers": self._get_headers(),
+            "params": {
+                "requestor-cid": self.cid,
+                "advertiser-ids": "joined",
+                "page-number": page,
+                "records-per-page": ADVERTISERS_PAGE_SIZE,
+            },
+        }
 
-        return records, wrapper_attribs
+    def _parse_advertisers_page(self, response: httpx.Response, page: int) -> Page:
+        """Extract the advertisers from one advertiser-lookup page.
 
-    def _element_to_dict(self, elem: ET.Element) -> dict:
-        """Convert an XML element and its children to a flat dict.
+        Returns:
+            The page with total-matched. An empty page ends pagination
+            (empty page, or an HTTP/XML error that leaves partial results).
+        """
+        # Handle specific error codes
+        self._raise_if_unauthorized(response, "Invalid CJ API token or incorrect CID")
+
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"HTTP error on page {page}: {e}, returning partial results")
+            return Page()
+
+        # Parse XML response
+        try:
+            page_advertisers, attribs = self._parse_xml_elements(response.content, "advertiser")
+        except ET.ParseError as e:
+            logger.warning(f"XML parse error on page {page}: {e}")
+            return Page()
+
+        if not page_advertisers:
+            logger.debug(f"Page {page}: empty response, stopping pagination")
+            return Page()
+
+        # Log each advertiser at DEBUG level
+        for adv in page_advertisers:
+            logger.debug(
+                f"Advertiser: id={adv.get('advertiser-id')}, "
+                f"name={adv.get('advertiser-name')}, "
+                f"status={adv.get('account-status')}"
+            )
 
-        Handles nested elements by joining parent and child tag names.
-        For example:
-            <primary-category>
-                <parent>Home & Garden</parent>
-                <child>Utilities</child>
-            </primary-category>
+        logger.debug(f"Page {page}: fetched {len(page_advertisers)} advertisers")
+        return Page(page_advertisers, total=int(attribs.get("total-matched", 0)))
 
-        Becomes:
-            {"primary-category/parent": "Home & Garden", "primary-category/child": "Utilities"}
+    def _lookup_advertisers(self) -> list[dict]:
+        """Crawl advertiser-lookup for all joined advertisers, handling pagination."""
+        logger.info(f"Fetching CJ advertisers for CID {self.cid}")
 
-        Simple elements like <advertiser-id>1234</advertiser-id> become:
-            {"advertiser-id": "1234"}
+        advertisers = Paginator(
+            self,
+            self._advertisers_request,
+            self._parse_advertisers_page,
+            page_size=ADVERTISERS_PAGE_SIZE,
+            label="advertisers",
+        ).fetch_all()
 
-        Special case: elements with multiple children of the same tag (like <link-types>)
-        are collected into a list.
+        logger.info(f"Fetched {len(advertisers)} total CJ advertisers")
+        return advertisers
 
-        Args:
-            elem: An XML Element to convert.
+    def fetch_advertiser(self, advertiser_id: str) -> dict | None:
+        """Look up one advertiser by CID with a single advertiser-lookup request.
 
         Returns:
-            Dict mapping tag names to text values.
+            The raw advertiser dict, or None if it is unknown or not joined.
         """
-        record: dict = {}
+        response = self._send(
+            "GET",
+            self.ADVERTISER_URL,
+            context=f"advertiser {advertiser_id}",
+            headers=self._get_headers(),
+            params={"requestor-cid": self.cid, "advertiser-ids": advertiser_id},
+        )
+        if response is None:
+            return None
+        self._raise_if_unauthorized(response, "Invalid CJ API token or incorrect CID")
+        response.raise_for_status()
+
+        advertisers, _ = self._parse_xml_elements(response.content, "advertiser")
+        for adv in advertisers:
+            if (
+                str(adv.get("advertiser-id")) == str(advertiser_id)
+                and adv.get("relationship-status") == "joined"
+            ):
+                return adv
+        return None
+
+    def _upsert_advertiser(self, conn, adv_data: dict) -> tuple[int, bool]:
+        """Upsert an advertiser unless another domain's client already did this run."""
+        if self.advertiser_cache is None:
+            return super()._upsert_advertiser(conn, adv_data)
+
+        network_advertiser_id = adv_data["network_program_id"]
+        advertiser_id = self.advertiser_cache.get_upserted(
+            self.cid, network_advertiser_id, adv_data["raw_hash"]
+        )
+        if advertiser_id is not None:
+            return advertiser_id, False
+
+        advertiser_id, changed = super()._upsert_advertiser(conn, adv_data)
+        self._remember_upsert(network_advertiser_id, adv_data["raw_hash"], advertiser_id)
+        return advertiser_id, changed
+
+    def _upsert_advertisers(self, conn, advertisers: list[dict]) -> dict[str, tuple[int, bool]]:
+        """Batch-upsert the advertisers no other domain's client upserted this run."""
+        if self.advertiser_cache is None:
+            return super()._upsert_advertisers(conn, advertisers)
+
+        upserted: dict[str, tuple[int, bool]] = {}
+        pending: list[dict] = []
+        for adv_data in advertisers:
+            network_advertiser_id = adv_data["network_program_id"]
+            advertiser_id = self.advertiser_cache.get_upserted(
+                self.cid, network_advertiser_id, adv_data["raw_hash"]
+            )
+            if advertiser_id is not None:
+                upserted[network_advertiser_id] = (advertiser_id, False)
+            else:
+                pending.append(adv_data)
 
-        for child in elem:
-            # Check if this child has sub-elements (nested)
-            sub_children = list(child)
+        written = super()._upsert_advertisers(conn, pending)
+        for adv_data in pending:
+            network_advertiser_id = adv_data["network_program_id"]
+            self._remember_upsert(
+                network_advertiser_id, adv_data["raw_hash"], written[network_advertiser_id][0]
+            )
+        return {**upserted, **written}
 
-            if not sub_children:
-                # Simple element: <tag>value</tag>
-                record[child.tag] = (child.text or "").strip()
-            else:
-                # Check if all sub-children have the same tag (list-like)
-                sub_tags = [sc.tag for sc in sub_children]
-                if len(set(sub_tags)) == 1:
-                    # List of same-type elements (e.g., <link-types><link-type>...</link-type>...)
-                    record[child.tag] = [(sc.text or "").strip() for sc in sub_children]
-                else:
-                    # Nested element with different children (e.g., <primary-category>)
-                    for sub_child in sub_children:
-                        key = f"{child.tag}/{sub_child.tag}"
-                        record[key] = (sub_child.text or "").strip()
-
-        return record
+    def _remember_upsert(
+        self, network_advertiser_id: str, raw_hash: str, advertiser_id: int
+    ) -> None:
+        self.advertiser_cache.remember_upsert(
+            self.cid, network_advertiser_id, raw_hash, advertiser_id
+        )
+        self._remembered[network_advertiser_id] = (advertiser_id, raw_hash)
+
+    def _finish_sync(self, conn, progress: SyncCheckpoint) -> None:
+        """Finish the run, releasing the shared links it did not read."""
+        super()._finish_sync(conn, progress)
+        if self.advertiser_cache is not None:
+            self.advertiser_cache.finish_links(self.cid, self.website_id)
+
+    def _forget_run(self) -> None:
+        """Stop other domains reusing advertiser rows this run's rollback may discard."""
+        if self.advertiser_cache is not None:
+            if self._remembered:
+                self.advertiser_cache.forget_upserts(self.cid, self._remembered)
+            self.advertiser_cache.finish_links(self.cid, self.website_id)
+        self._remembered = {}
+
+    def _ads_request(self, advertiser_id: str, page: int) -> dict:
+        """Build the request arguments for one page of link-search."""
+        return {
+            "method": "GET",
+            "url": self.LINK_SEARCH_URL,
+            "context": f"ads for advertiser {advertiser_id} page {page}",
+            "cacheable": True,
+            "headers": self._get_headers(),
+            "params": {
+                "website-id": self.website_id,
+                "advertiser-ids": advertiser_id,
+                "language": "en",
+                "page-number": page,
+                "records-per-page": LINKS_PAGE_SIZE,
+            },
+        }
 
-    def fetch_advertisers(self) -> list[dict]:
-        """Fetch all joined advertisers, handling pagination.
+    def _parse_ads_page(
+        self, response: httpx.Response, advertiser_id: str, page: int
+    ) -> Page | None:
+        """Extract the links from one link-search page.
 
         Returns:
-            List of raw advertiser dicts from the API. May return partial
-            results if some pages fail after retries.
+            The page with total-matched. An empty page ends pagination; None
+            after an HTTP/XML error, which leaves the crawl incomplete.
         """
-        advertisers: list[dict] = []
-        page = 1
-        page_size = 100  # Max allowed by CJ API
+        # Handle specific error codes
+        self._raise_if_unauthorized(response, "Invalid CJ API token")
+
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.warning(
+                f"HTTP error fetching ads for advertiser {advertiser_id} page {page}: {e}, "
+                f"returning partial results"
+            )
+            return None
+
+        # Parse XML response
+        try:
+            page_ads, attribs = self._parse_xml_elements(response.content, "link")
+        except ET.ParseError as e:
+            logger.warning(
+                f"XML parse error for advertiser {advertiser_id} page {page}: {e}"
+            )
+            return None
 
-        logger.info(f"Fetching CJ advertisers for CID {self.cid}")
+        if not page_ads:
+            logger.debug(
+                f"Advertiser {advertiser_id} page {page}: empty response, stopping"
+            )
+            return Page()
 
-        while True:
-            params = {
-                "requestor-cid": self.cid,
-                "advertiser-ids": "joined",
-                "page-number": page,
-                "records-per-page": page_size,
-            }
-
-            # Retry logic for this page
-            response = None
-            for attempt in range(1, MAX_RETRIES + 1):
-                try:
-                    response = self._client.get(
-                        self.ADVERTISER_URL,
-                        headers=self._get_headers(),
-                        params=params,
-                    )
-                    break  # Success, exit retry loop
-                except httpx.RequestError as e:
-                    logger.warning(
-                        f"Request error on page {page} (attempt {attempt}/{MAX_RETRIES}): {e}"
-                    )
-                    if attempt < MAX_RETRIES:
-                        continue
-                    # All retries exhausted
-                    logger.warning(
-                        f"Failed to fetch page {page} after {MAX_RETRIES} retries, "
-                        f"returning {len(advertisers)} partial results"
-                    )
-                    return advertisers
-
-            # Handle specific error codes
-            if response.status_code == 401:
-                raise httpx.HTTPStatusError(
-                    "Invalid CJ API token or incorrect CID",
-                    request=response.request,
-                    response=response,
-                )
-
-            try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                logger.warning(
-                    f"HTTP error on page {page}: {e}, "
-                    f"returning {len(advertisers)} partial results"
-                )
-                return advertisers
-
-            # Parse XML response
-            try:
-                page_advertisers, attribs = self._parse_xml_elements(
-                    response.text, "advertiser"
-                )
-            except ET.ParseError as e:
-                logger.warning(f"XML parse error on page {page}: {e}")
-                return advertisers
-
-            if not page_advertisers:
-                logger.debug(f"Page {page}: empty response, stopping pagination")
-                break
-
-            # Log each advertiser at DEBUG level
-            for adv in page_advertisers:
-                logger.debug(
-                    f"Advertiser: id={adv.get('advertiser-id')}, "
-                    f"name={adv.get('advertiser-name')}, "
-                    f"status={adv.get('account-status')}"
-                )
-
-            advertisers.extend(page_advertisers)
-            logger.debug(f"Page {page}: fetched {len(page_advertisers)} advertisers")
-
-            # Check if we've fetched all results
-            total_matched = int(attribs.get("total-matched", 0))
-            if len(page_advertisers) < page_size:
-                break
-            if page * page_size >= total_matched:
-                break
-
-            page += 1
+        # Log each link at DEBUG level
+        for ad in page_ads:
+            link_type = ad.get("link-type", "unknown")
+            width = ad.get("creative-width", "0")
+            height = ad.get("creative-height", "0")
+            logger.debug(
+                f"Link: id={ad.get('link-id')}, name={ad.get('link-name')}, "
+                f"type={link_type}, {width}x{height}"
+            )
 
-        logger.info(f"Fetched {len(advertisers)} total CJ advertisers")
-        return advertisers
+        logger.debug(
+            f"Advertiser {advertiser_id} page {page}: fetched {len(page_ads)} links"
+        )
+        return Page(page_ads, total=int(attribs.get("total-matched", 0)))
+
+    def _links_pages(self, advertiser_id: str) -> Paginator:
+        return Paginator(
+            self,
+            lambda page: self._ads_request(advertiser_id, page),
+            lambda response, page: self._parse_ads_page(response, advertiser_id, page),
+            page_size=LINKS_PAGE_SIZE,
+            label=f"ads for advertiser {advertiser_id}",
+        )
+
+    def _take_shared_links(self, advertiser_id: str) -> list[dict] | None:
+        """Derive this PID's links from another domain's link-search, if available."""
+        if not self._share_links:
+            return None
+        shared = self.advertiser_cache.take_links(self.cid, advertiser_id, self.website_id)
+        if shared is None:
+            return None
+        source_pid, links = shared
+        return [substitute_pid(link, source_pid, self.website_id) for link in links]
+
+    def _needs_link_search(self, derived: list[dict] | None) -> bool:
+        """Whether to call link-search: nothing shared, or still verifying derivation."""
+        return derived is None or self._links_verified < self.advertiser_cache.verify_sample
+
+    def _after_link_search(
+        self, advertiser_id: str, links: list[dict], derived: list[dict] | None
+    ) -> None:
+        """Share fresh links, or check derived links against the real ones."""
+        if not self._share_links:
+            return
+        if derived is None:
+            # Incomplete links would look complete once derived, so are not shared
+            if is_complete(links):
+                self.advertiser_cache.put_links(self.cid, advertiser_id, self.website_id, links)
+            return
+        if not is_complete(links):
+            return
+
+        by_id = {link.get("link-id"): link for link in links}
+        if len(by_id) == len(derived) and all(
+            by_id.get(link.get("link-id")) == link for link in derived
+        ):
+            self._links_verified += 1
+            return
+
+        logger.warning(
+            f"[cj] Links derived for PID {self.website_id} differ from link-search "
+            f"for advertiser {advertiser_id} - searching every advertiser for {self.domain}"
+        )
+        self._share_links = False
 
     def fetch_ads(self, advertiser_id: str) -> list[dict]:
         """Fetch all links/creatives for an advertiser.
 
+        With a link-sharing cache, links another domain already fetched are
+        reused with this client's PID substituted in (after the first few
+        have been verified against a real link-search).
+
         Args:
             advertiser_id: The CJ advertiser CID.
 
@@ -242,100 +586,19 @@ class CJClient(NetworkClient):
             Includes banners (with dimensions) and text links (0x0).
             May return partial results if some pages fail after retries.
         """
-        ads: list[dict] = []
-        page = 1
-        page_size = 100  # Default/max for CJ link search
+        derived = self._take_shared_links(advertiser_id)
+        if not self._needs_link_search(derived):
+            return derived
 
-        logger.debug(f"Fetching ads for CJ advertiser {advertiser_id}")
+        links = self._search_links(advertiser_id)
+        self._after_link_search(advertiser_id, links, derived)
+        return links
 
-        while True:
-            params = {
-                "website-id": self.website_id,
-                "advertiser-ids": advertiser_id,
-                "language": "en",
-                "page-number": page,
-                "records-per-page": page_size,
-            }
-
-            # Retry logic for this page
-            response = None
-            for attempt in range(1, MAX_RETRIES + 1):
-                try:
-                    response = self._client.get(
-                        self.LINK_SEARCH_URL,
-                        headers=self._get_headers(),
-                        params=params,
-                    )
-                    break  # Success, exit retry loop
-                except httpx.RequestError as e:
-                    logger.warning(
-                        f"Request error fetching ads for advertiser {advertiser_id} "
-                        f"page {page} (attempt {attempt}/{MAX_RETRIES}): {e}"
-                    )
-                    if attempt < MAX_RETRIES:
-                        continue
-                    # All retries exhausted
-                    logger.warning(
-                        f"Failed to fetch ads for advertiser {advertiser_id} page {page} "
-                        f"after {MAX_RETRIES} retries, returning {len(ads)} partial results"
-                    )
-                    return ads
-
-            # Handle specific error codes
-            if response.status_code == 401:
-                raise httpx.HTTPStatusError(
-                    "Invalid CJ API token",
-                    request=response.request,
-                    response=response,
-                )
-
-            try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                logger.warning(
-                    f"HTTP error fetching ads for advertiser {advertiser_id} page {page}: {e}, "
-                    f"returning {len(ads)} partial results"
-                )
-                return ads
-
-            # Parse XML response
-            try:
-                page_ads, attribs = self._parse_xml_elements(response.text, "link")
-            except ET.ParseError as e:
-                logger.warning(
-                    f"XML parse error for advertiser {advertiser_id} page {page}: {e}"
-                )
-                return ads
-
-            if not page_ads:
-                logger.debug(
-                    f"Advertiser {advertiser_id} page {page}: empty response, stopping"
-                )
-                break
-
-            # Log each link at DEBUG level
-            for ad in page_ads:
-                link_type = ad.get("link-type", "unknown")
-                width = ad.get("creative-width", "0")
-                height = ad.get("creative-height", "0")
-                logger.debug(
-                    f"Link: id={ad.get('link-id')}, name={ad.get('link-name')}, "
-                    f"type={link_type}, {width}x{height}"
-                )
-
-            ads.extend(page_ads)
-            logger.debug(
-                f"Advertiser {advertiser_id} page {page}: fetched {len(page_ads)} links"
-            )
-
-            # Check if we've fetched all results
-            total_matched = int(attribs.get("total-matched", 0))
-            if len(page_ads) < page_size:
-                break
-            if page * page_size >= total_matched:
-                break
+    def _search_links(self, advertiser_id: str) -> list[dict]:
+        """Crawl link-search for one advertiser, handling pagination."""
+        logger.debug(f"Fetching ads for CJ advertiser {advertiser_id}")
 
-            page += 1
+        ads = self._links_pages(advertiser_id).fetch_all()
 
         logger.debug(
             f"Fetched {len(ads)} total links for CJ advertiser {advertiser_id}"
@@ -351,3 +614,41 @@ class CJClient(NetworkClient):
 
     def __exit__(self, *args) -> None:
         self.close()
+
+
+class AsyncCJClient(AsyncNetworkClient, CJClient):
+    """CJClient with async, concurrent per-advertiser link-search."""
+
+    # CJ allows 25 requests per 5 seconds across both endpoints
+    ADS_CONCURRENCY = 2
+
+    def __init__(
+        self,
+        api_token: str,
+        cid: str,
+        website_id: str,
+        domain: str | None = None,
+        advertiser_cache: CJAdvertiserCache | None = None,
+    ):
+        super().__init__(
+            api_token, cid, website_id, domain=domain, advertiser_cache=advertiser_cache
+        )
+        self._aclient = create_async_client()
+
+    async def afetch_ads(self, advertiser_id: str) -> list[dict]:
+        """Async equivalent of fetch_ads()."""
+        derived = self._take_shared_links(advertiser_id)
+        if not self._needs_link_search(derived):
+            return derived
+
+        links = await self._asearch_links(advertiser_id)
+        self._after_link_search(advertiser_id, links, derived)
+        return links
+
+    async def _asearch_links(self, advertiser_id: str) -> list[dict]:
+        """Async equivalent of _search_links()."""
+        ads = await self._links_pages(advertiser_id).afetch_all()
+        logger.debug(
+            f"Fetched {len(ads)} total links for CJ advertiser {advertiser_id}"
+        )
+        return ads
@@ -1,15 +1,29 @@
 """FlexOffers API client - Mark's responsibility."""
 
 import logging
-import time
 
 import httpx
 
-from .base import NetworkClient
+from ..jsoncodec import loads
+from .base import AsyncNetworkClient, NetworkClient
+from .paginate import Page, Paginator
+from .ratelimit import RateLimit
+from .transport import create_async_client, create_client
 
 logger = logging.getLogger(__name__)
 
-MAX_RETRIES = 3
+ADVERTISERS_PAGE_SIZE = 25  # Max allowed by FlexOffers API
+ADS_PAGE_SIZE = 100  # Max allowed by FlexOffers API for promotions
+
+
+def _total_count(data) -> int | None:
+    """The totalCount of a wrapped response, if present."""
+    if not isinstance(data, dict) or data.get("totalCount") is None:
+        return None
+    try:
+        return int(data["totalCount"])
+    except (TypeError, ValueError):
+        return None
 
 
 class FlexOffersClient(NetworkClient):
@@ -21,6 +35,12 @@ class FlexOffersClient(NetworkClient):
 
     BASE_URL = "https://api.flexoffers.com/v3"
 
+    # FlexOffers signals rate limiting with 403
+    RATE_LIMIT_STATUS = 403
+
+    # About 100 requests per minute per API key
+    RATE_LIMITS = {"*": RateLimit(100, 60)}
+
     def __init__(self, api_key: str, domain: str | None = None):
         """Initialize the FlexOffers client.
 
@@ -30,7 +50,11 @@ class FlexOffersClient(NetworkClient):
         """
         self.api_key = api_key
         self.domain = domain
-        self._client = httpx.Client(timeout=30.0)
+        self._client = create_client()
+
+    def _rate_limit_account(self) -> str:
+        """Each domain has its own API key, and with it its own quota."""
+        return self.domain or self.api_key
 
     @property
     def network_name(self) -> str:
@@ -40,6 +64,74 @@ class FlexOffersClient(NetworkClient):
         """Return headers with API key authentication."""
         return {"apiKey": self.api_key}
 
+    def _raise_if_unauthorized(self, response: httpx.Response) -> None:
+        if response.status_code == 401:
+            raise httpx.HTTPStatusError(
+                "Invalid FlexOffers API key",
+                request=response.request,
+                response=response,
+            )
+
+    def _advertisers_request(self, page: int) -> dict:
+        """Build the request arguments for one page of advertisers."""
+        return {
+            "method": "GET",
+            "url": f"{self.BASE_URL}/advertisers",
+            "context": f"advertisers page {page}",
+            "cacheable": True,
+            "headers": self._get_headers(),
+            "params": {
+                "ProgramStatus": "Approved",
+                "ApplicationStatus": "Approved",
+                "Page": page,
+                "pageSize": ADVERTISERS_PAGE_SIZE,
+            },
+        }
+
+    def _parse_advertisers_page(self, response: httpx.Response, page: int) -> Page:
+        """Extract the advertisers from one page.
+
+        Returns:
+            The page. An empty page ends pagination (no content, empty
+            page, or an HTTP error that leaves partial results).
+        """
+        domain_info = f" for {self.domain}" if self.domain else ""
+
+        # Handle specific error codes
+        self._raise_if_unauthorized(response)
+        if response.status_code == 204:
+            # No content - empty result
+            logger.debug(f"Page {page}: no content (204)")
+            return Page()
+
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"HTTP error on page {page}: {e}, returning partial results{domain_info}")
+            return Page()
+
+        data = loads(response.content)
+
+        # Handle both list response and paginated object response
+        if isinstance(data, list):
+            page_advertisers = data
+        else:
+            page_advertisers = data.get("results", data.get("advertisers", data.get("data", [])))
+
+        if not page_advertisers:
+            logger.debug(f"Page {page}: empty response, stopping pagination")
+            return Page()
+
+        # Log each advertiser at DEBUG level
+        for adv in page_advertisers:
+            logger.debug(
+                f"Advertiser: id={adv.get('id')}, name={adv.get('name')}, "
+                f"domainUrl={adv.get('domainUrl')}"
+            )
+
+        logger.debug(f"Page {page}: fetched {len(page_advertisers)} advertisers")
+        return Page(page_advertisers, total=_total_count(data))
+
     def fetch_advertisers(self) -> list[dict]:
         """Fetch all approved advertisers, handling pagination.
 
@@ -47,112 +139,94 @@ class FlexOffersClient(NetworkClient):
             List of raw advertiser dicts from the API. May return partial
             results if some pages fail after retries.
         """
-        advertisers: list[dict] = []
-        page = 1
-        page_size = 25  # Max allowed by FlexOffers API
-
         domain_info = f" for {self.domain}" if self.domain else ""
         logger.info(f"Fetching FlexOffers advertisers{domain_info}")
 
-        while True:
-            params = {
-                "ProgramStatus": "Approved",
-                "ApplicationStatus": "Approved",
-                "Page": page,
-                "pageSize": page_size,
-            }
-
-            # Retry logic for this page
-            response = None
-            for attempt in range(1, MAX_RETRIES + 1):
-                try:
-                    response = self._client.get(
-                        f"{self.BASE_URL}/advertisers",
-                        headers=self._get_headers(),
-                        params=params,
-                    )
-                    # Handle 403 rate limit with exponential backoff
-                    if response.status_code == 403:
-                        if attempt < MAX_RETRIES:
-                            wait_time = 2 ** attempt  # 2s, 4s, 8s
-                            logger.warning(
-                                f"Rate limit hit on page {page} (attempt {attempt}/{MAX_RETRIES}), "
-                                f"waiting {wait_time}s before retry..."
-                            )
-                            time.sleep(wait_time)
-                            continue
-                        # All retries exhausted
-                        logger.warning(
-                            f"Rate limit exceeded on page {page} after {MAX_RETRIES} retries, "
-                            f"returning {len(advertisers)} partial results{domain_info}"
-                        )
-                        return advertisers
-                    break  # Success or other status, exit retry loop
-                except httpx.RequestError as e:
-                    logger.warning(
-                        f"Request error on page {page} (attempt {attempt}/{MAX_RETRIES}): {e}"
-                    )
-                    if attempt < MAX_RETRIES:
-                        continue
-                    # All retries exhausted
-                    logger.warning(
-                        f"Failed to fetch page {page} after {MAX_RETRIES} retries, "
-                        f"returning {len(advertisers)} partial results{domain_info}"
-                    )
-                    return advertisers
-
-            # Handle specific error codes
-            if response.status_code == 401:
-                raise httpx.HTTPStatusError(
-                    "Invalid FlexOffers API key",
-                    request=response.request,
-                    response=response,
-                )
-            if response.status_code == 204:
-                # No content - empty result
-                logger.debug(f"Page {page}: no content (204)")
-                break
-
-            try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                logger.warning(
-                    f"HTTP error on page {page}: {e}, "
-                    f"returning {len(advertisers)} partial results{domain_info}"
-                )
-                return advertisers
-
-            data = response.json()
-
-            # Handle both list response and paginated object response
-            if isinstance(data, list):
-                page_advertisers = data
-            else:
-                page_advertisers = data.get("results", data.get("advertisers", data.get("data", [])))
-
-            if not page_advertisers:
-                logger.debug(f"Page {page}: empty response, stopping pagination")
-                break
-
-            # Log each advertiser at DEBUG level
-            for adv in page_advertisers:
-                logger.debug(
-                    f"Advertiser: id={adv.get('id')}, name={adv.get('name')}, "
-                    f"domainUrl={adv.get('domainUrl')}"
-                )
-
-            advertisers.extend(page_advertisers)
-            logger.debug(f"Page {page}: fetched {len(page_advertisers)} advertisers")
-
-            # If we got fewer than page_size, we've reached the end
-            if len(page_advertisers) < page_size:
-                break
-
-            page += 1
+        advertisers = Paginator(
+            self,
+            self._advertisers_request,
+            self._parse_advertisers_page,
+            page_size=ADVERTISERS_PAGE_SIZE,
+            label=f"advertisers{domain_info}",
+        ).fetch_all()
 
         logger.info(f"Fetched {len(advertisers)} total advertisers{domain_info}")
         return advertisers
 
+    def _ads_request(self, advertiser_id: str, page: int) -> dict:
+        """Build the request arguments for one page of promotions."""
+        return {
+            "method": "GET",
+            "url": f"{self.BASE_URL}/promotions",
+            "context": f"ads for advertiser {advertiser_id} page {page}",
+            "cacheable": True,
+            "headers": self._get_headers(),
+            "params": {
+                "page": page,
+                "pageSize": ADS_PAGE_SIZE,
+                "advertiserIds": advertiser_id,
+            },
+        }
+
+    def _parse_ads_page(
+        self, response: httpx.Response, advertiser_id: str, page: int
+    ) -> Page | None:
+        """Extract the ads from one promotions page.
+
+        Returns:
+            The page. An empty page ends pagination (no content or empty
+            page); None after an HTTP error, which leaves the crawl incomplete.
+        """
+        # Handle specific error codes
+        self._raise_if_unauthorized(response)
+        if response.status_code == 204:
+            # No content - empty result
+            logger.debug(f"Advertiser {advertiser_id} page {page}: no content (204)")
+            return Page()
+
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.warning(
+                f"HTTP error fetching ads for advertiser {advertiser_id} page {page}: {e}, "
+                f"returning partial results"
+            )
+            return None
+
+        data = loads(response.content)
+
+        # API returns {"results": [...], "totalCount": N}
+        if isinstance(data, dict):
+            page_ads = data.get("results", [])
+        else:
+            page_ads = data if isinstance(data, list) else []
+
+        if not page_ads:
+            logger.debug(f"Advertiser {advertiser_id} page {page}: empty response")
+            return Page()
+
+        # Log each ad at DEBUG level
+        for ad in page_ads:
+            link_type = ad.get("linkType", "unknown")
+            width = ad.get("bannerWidth") or 0
+            height = ad.get("bannerHeight") or 0
+            logger.debug(
+                f"Ad: id={ad.get('linkId')}, name={ad.get('linkName')}, "
+                f"type={link_type}, {width}x{height}"
+            )
+
+        logger.debug(f"Advertiser {advertiser_id} page {page}: fetched {len(page_ads)} ads")
+        return Page(page_ads, total=_total_count(data))
+
+    def _ads_pages(self, advertiser_id: str) -> Paginator:
+        return Paginator(
+            self,
+            lambda page: self._ads_request(advertiser_id, page),
+            lambda response, page: self._parse_ads_page(response, advertiser_id, page),
+            page_size=ADS_PAGE_SIZE,
+            label=f"ads for advertiser {advertiser_id}",
+        )
+
     def fetch_ads(self, advertiser_id: str) -> list[dict]:
         """Fetch all ads for an advertiser (banners and text links).
 
@@ -164,113 +238,10 @@ class FlexOffersClient(NetworkClient):
             Includes both banners (with dimensions) and text links (0x0).
             May return partial results if some pages fail after retries.
         """
-        ads: list[dict] = []
-        page = 1
-        page_size = 100  # Max allowed by FlexOffers API for promotions
-
         logger.debug(f"Fetching ads for advertiser {advertiser_id}")
 
-        while True:
-            params = {
-                "page": page,
-                "pageSize": page_size,
-                "advertiserIds": advertiser_id,
-            }
-
-            # Retry logic for this page
-            response = None
-            for attempt in range(1, MAX_RETRIES + 1):
-                try:
-                    response = self._client.get(
-                        f"{self.BASE_URL}/promotions",
-                        headers=self._get_headers(),
-                        params=params,
-                    )
-                    # Handle 403 rate limit with exponential backoff
-                    if response.status_code == 403:
-                        if attempt < MAX_RETRIES:
-                            wait_time = 2 ** attempt  # 2s, 4s, 8s
-                            logger.warning(
-                                f"Rate limit hit for advertiser {advertiser_id} "
-                                f"(attempt {attempt}/{MAX_RETRIES}), waiting {wait_time}s before retry..."
-                            )
-                            time.sleep(wait_time)
-                            continue
-                        # All retries exhausted
-                        logger.warning(
-                            f"Rate limit exceeded for advertiser {advertiser_id} after {MAX_RETRIES} retries, "
-                            f"returning {len(ads)} partial results"
-                        )
-                        return ads
-                    break  # Success or other status, exit retry loop
-                except httpx.RequestError as e:
-                    logger.warning(
-                        f"Request error fetching ads for advertiser {advertiser_id} "
-                        f"page {page} (attempt {attempt}/{MAX_RETRIES}): {e}"
-                    )
-                    if attempt < MAX_RETRIES:
-                        continue
-                    # All retries exhausted
-                    logger.warning(
-                        f"Failed to fetch ads for advertiser {advertiser_id} page {page} "
-                        f"after {MAX_RETRIES} retries, returning {len(ads)} partial results"
-                    )
-                    return ads
-
-            # Handle specific error codes
-            if response.status_code == 401:
-                raise httpx.HTTPStatusError(
-                    "Invalid FlexOffers API key",
-                    request=response.request,
-                    response=response,
-                )
-            if response.status_code == 204:
-                # No content - empty result
-                logger.debug(f"Advertiser {advertiser_id} page {page}: no content (204)")
-                break
-
-            try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                logger.warning(
-                    f"HTTP error fetching ads for advertiser {advertiser_id} page {page}: {e}, "
-                    f"returning {len(ads)} partial results"
-                )
-                return ads
-
-            data = response.json()
-
-            # API returns {"results": [...], "totalCount": N}
-            if isinstance(data, dict):
-                page_ads = data.get("results", [])
-            else:
-                page_ads = data if isinstance(data, list) else []
-
-            if not page_ads:
-                logger.debug(f"Advertiser {advertiser_id} page {page}: empty response")
-                break
-
-            # Log each ad at DEBUG level
-            for ad in page_ads:
-                link_type = ad.get("linkType", "unknown")
-                width = ad.get("bannerWidth") or 0
-                height = ad.get("bannerHeight") or 0
-                logger.debug(
-                    f"Ad: id={ad.get('linkId')}, name={ad.get('linkName')}, "
-                    f"type={link_type}, {width}x{height}"
-                )
-
-            # Store all ads; export logic filters by dimension
-            ads.extend(page_ads)
-            logger.debug(
-                f"Advertiser {advertiser_id} page {page}: fetched {len(page_ads)} ads"
-            )
-
-            # If we got fewer than page_size, we've reached the end
-            if len(page_ads) < page_size:
-                break
-
-            page += 1
+        # Store all ads; export logic filters by dimension
+        ads = self._ads_pages(advertiser_id).fetch_all()
 
         logger.debug(f"Fetched {len(ads)} total ads for advertiser {advertiser_id}")
         return ads
@@ -284,3 +255,19 @@ class FlexOffersClient(NetworkClient):
 
     def __exit__(self, *args) -> None:
         self.close()
+
+
+class AsyncFlexOffersClient(AsyncNetworkClient, FlexOffersClient):
+    """FlexOffersClient with async, concurrent per-advertiser ad fetching."""
+
+    ADS_CONCURRENCY = 4
+
+    def __init__(self, api_key: str, domain: str | None = None):
+        super().__init__(api_key, domain=domain)
+        self._aclient = create_async_client()
+
+    async def afetch_ads(self, advertiser_id: str) -> list[dict]:
+        """Async equivalent of fetch_ads()."""
+        ads = await self._ads_pages(advertiser_id).afetch_all()
+        logger.debug(f"Fetched {len(ads)} total ads for advertiser {advertiser_id}")
+        return ads
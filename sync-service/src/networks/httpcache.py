@@ -0,0 +1,230 @@
+"""Persistent HTTP response cache for conditional requests.
+
+Responses to cacheable GET requests (advertiser lists, ad pages) that carry
+an ETag or Last-Modified header are stored in a SQLite file. The next run
+sends If-None-Match/If-Modified-Since, and a 304 is answered with the
+stored body, marked so the caller can tell nothing changed. Paginator turns
+a crawl whose pages all came back 304 into a NotModified list, which lets
+the sync skip mapping and writing ads the database already has.
+
+Entries are refetched in full once they are older than the TTL (so mapper
+changes reach the database eventually), and the least recently used are
+evicted when the file grows past its size cap.
+
+Settings come from HttpOptions (HTTP_CACHE_* env vars) via configure().
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import httpx
+
+from ..config import HttpOptions
+
+logger = logging.getLogger(__name__)
+
+# Response extension holding when a replayed body was downloaded
+STORED_AT = "http_cache_stored_at"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    used_at REAL NOT NULL
+)
+"""
+
+
+class NotModified(list):
+    """A crawl result rebuilt entirely from cached bodies after 304 responses.
+
+    Attributes:
+        downloaded_at: When the oldest of those bodies was downloaded (epoch).
+    """
+
+    def __init__(self, items=(), downloaded_at: float = 0.0):
+        super().__init__(items)
+        self.downloaded_at = downloaded_at
+
+
+@dataclass
+class CacheEntry:
+    """A stored response body and its validators."""
+
+    key: str
+    etag: str | None
+    last_modified: str | None
+    content_type: str | None
+    body: bytes
+    stored_at: float
+
+    def conditional_headers(self) -> dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def replay(self, response: httpx.Response) -> httpx.Response:
+        """Build a 200 response with the stored body, for a 304 to the same request."""
+        headers = {"Content-Type": self.content_type} if self.content_type else {}
+        return httpx.Response(
+            200,
+            headers=headers,
+            content=self.body,
+            request=response.request,
+            extensions={STORED_AT: self.stored_at},
+        )
+
+
+def stored_at(response: httpx.Response) -> float | None:
+    """When a replayed response's body was downloaded, or None for a fresh response."""
+    return response.extensions.get(STORED_AT)
+
+
+class HttpCache:
+    """Thread-safe, size-bounded response store in a SQLite file."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float,
+        max_bytes: int,
+        clock: Callable[[], float] = time.time,
+    ):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(_SCHEMA)
+
+        # Metrics
+        self.hits = 0
+        self.stores = 0
+
+    @staticmethod
+    def key(method: str, url: str, params=None, account: str = "") -> str:
+        """Cache key for a request: method, URL, sorted query params and account."""
+        query = sorted(httpx.QueryParams(params or {}).multi_items())
+        raw = json.dumps([method.upper(), str(url), query, account])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the entry for a key, dropping it if older than the TTL."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_type, body, stored_at "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if self._clock() - row[4] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+        return CacheEntry(key, row[0], row[1], row[2], row[3], row[4])
+
+    def hit(self, entry: CacheEntry, response: httpx.Response) -> httpx.Response:
+        """Record a 304 for an entry and return its replayed response."""
+        with self._lock:
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE responses SET used_at = ? WHERE key = ?", (self._clock(), entry.key)
+            )
+        return entry.replay(response)
+
+    def put(self, key: str, response: httpx.Response) -> None:
+        """Store a 200 response that has validators, then evict down to the size cap."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+
+        now = self._clock()
+        with self._lock:
+            self.stores += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, etag, last_modified, content_type, body, size, stored_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    etag,
+                    last_modified,
+                    response.headers.get("Content-Type"),
+                    body,
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete expired entries, then the least recently used beyond max_bytes."""
+        self._conn.execute(
+            "DELETE FROM responses WHERE stored_at < ?", (self._clock() - self.ttl_seconds,)
+        )
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY used_at").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def size(self) -> int:
+        """Total bytes of stored bodies."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: HttpCache | None = None
+
+
+def configure(options: HttpOptions) -> None:
+    """Open the cache file from HttpOptions, or disable caching if cache_path is unset."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+    if options.cache_path:
+        _cache = HttpCache(
+            options.cache_path,
+            ttl_seconds=options.cache_ttl_hours * 3600,
+            max_bytes=options.cache_max_mb * 1024 * 1024,
+        )
+        logger.info(f"HTTP response cache at {options.cache_path}")
+
+
+def get_cache() -> HttpCache | None:
+    """The process-wide cache, or None when caching is disabled."""
+    return _cache
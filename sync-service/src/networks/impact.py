@@ -1,16 +1,31 @@
 """Impact API client - Rag's responsibility."""
 
+import asyncio
 import logging
-from collections import defaultdict
+import time
+from collections.abc import Callable
 
 import httpx
 
-from .base import NetworkClient
+from ..config import SyncOptions
+from ..jsoncodec import loads
+from .base import AsyncNetworkClient, NetworkClient, SyncCheckpoint
+from .httpcache import NotModified
+from .paginate import Incomplete, Page, Paginator
+from .ratelimit import RateLimit
+from .sharedcrawl import POLL_SECONDS, SharedCrawl
+from .spool import GroupSpool
+from .transport import create_async_client, create_client
 
 logger = logging.getLogger(__name__)
 
-MAX_RETRIES = 3
 BASE_URL = "https://api.impact.com"
+PAGE_SIZE = 100  # Impact default and max
+
+
+def _is_english(raw_ad: dict) -> bool:
+    """Whether an ad is in English (Impact has no server-side language filter)."""
+    return raw_ad.get("Language", "").upper() == "ENGLISH"
 
 
 class ImpactClient(NetworkClient):
@@ -20,6 +35,11 @@ class ImpactClient(NetworkClient):
     XML by default, so we must request JSON via Accept header.
     """
 
+    # 2,000 requests per day. A run may use what is left of the quota back to
+    # back, since pacing it evenly would mean one request every 43 seconds;
+    # _seed_quota() takes out what earlier runs and other shards used.
+    RATE_LIMITS = {"*": RateLimit(2000, 86400, burst=2000)}
+
     def __init__(self, account_sid: str, auth_token: str):
         """Initialize the Impact client.
 
@@ -29,8 +49,7 @@ class ImpactClient(NetworkClient):
         """
         self.account_sid = account_sid
         self.auth_token = auth_token
-        self._client = httpx.Client(
-            timeout=30.0,
+        self._client = create_client(
             auth=(account_sid, auth_token),
             headers={"Accept": "application/json"},
         )
@@ -39,93 +58,111 @@ class ImpactClient(NetworkClient):
     def network_name(self) -> str:
         return "impact"
 
-    def fetch_advertisers(self) -> list[dict]:
-        """Fetch all campaigns (advertisers), handling pagination.
+    def _parse_page(
+        self, response: httpx.Response, key: str, label: str, page: int
+    ) -> Page | None:
+        """Extract the records under `key` from one page of a collection.
 
         Returns:
-            List of raw campaign dicts from the API. May return partial
-            results if some pages fail after retries.
+            The page, with @numpages and whether @nextpageuri is set. An
+            empty page ends pagination (no content or empty page); None
+            after an HTTP error, which leaves the crawl incomplete.
         """
-        campaigns: list[dict] = []
-        page = 1
-        page_size = 100  # Impact default and max
-
-        logger.info("Fetching Impact campaigns")
-
-        while True:
-            params = {"Page": page, "PageSize": page_size}
-
-            # Retry logic for this page
-            response = None
-            for attempt in range(1, MAX_RETRIES + 1):
-                try:
-                    response = self._client.get(
-                        f"{BASE_URL}/Mediapartners/{self.account_sid}/Campaigns",
-                        params=params,
-                    )
-                    break  # Success, exit retry loop
-                except httpx.RequestError as e:
-                    logger.warning(
-                        f"Request error on page {page} (attempt {attempt}/{MAX_RETRIES}): {e}"
-                    )
-                    if attempt < MAX_RETRIES:
-                        continue
-                    # All retries exhausted
-                    logger.warning(
-                        f"Failed to fetch page {page} after {MAX_RETRIES} retries, "
-                        f"returning {len(campaigns)} partial results"
-                    )
-                    return campaigns
-
-            # Handle specific error codes
-            if response.status_code == 401:
-                raise httpx.HTTPStatusError(
-                    "Invalid Impact credentials",
-                    request=response.request,
-                    response=response,
-                )
-            if response.status_code == 403:
-                raise httpx.HTTPStatusError(
-                    "Impact rate limit exceeded or access denied",
-                    request=response.request,
-                    response=response,
-                )
-            if response.status_code == 204:
-                logger.debug(f"Page {page}: no content (204)")
-                break
+        # Handle specific error codes
+        if response.status_code == 401:
+            raise httpx.HTTPStatusError(
+                "Invalid Impact credentials",
+                request=response.request,
+                response=response,
+            )
+        if response.status_code == 403:
+            raise httpx.HTTPStatusError(
+                "Impact rate limit exceeded or access denied",
+                request=response.request,
+                response=response,
+            )
+        if response.status_code == 204:
+            logger.debug(f"{label} page {page}: no content (204)")
+            return Page()
 
-            try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                logger.warning(
-                    f"HTTP error on page {page}: {e}, "
-                    f"returning {len(campaigns)} partial results"
-                )
-                return campaigns
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"HTTP error on {label} page {page}: {e}, returning partial results")
+            return None
 
-            data = response.json()
-            page_campaigns = data.get("Campaigns", [])
+        data = loads(response.content)
+        records = data.get(key, [])
 
-            if not page_campaigns:
-                logger.debug(f"Page {page}: empty response, stopping pagination")
-                break
+        if not records:
+            logger.debug(f"{label} page {page}: empty response, stopping pagination")
+            return Page()
 
-            for camp in page_campaigns:
+        try:
+            page_count = int(data["@numpages"])
+        except (KeyError, TypeError, ValueError):
+            page_count = None
+
+        return Page(records, page_count=page_count, has_next=bool(data.get("@nextpageuri", "")))
+
+    def _campaigns_pages(self) -> Paginator:
+        def parse(response: httpx.Response, page: int) -> Page | None:
+            parsed = self._parse_page(response, "Campaigns", "Campaigns", page)
+            if parsed is None:
+                return None
+            for camp in parsed.items:
                 logger.debug(
                     f"Campaign: id={camp.get('CampaignId')}, "
                     f"name={camp.get('CampaignName')}, "
                     f"status={camp.get('ContractStatus')}"
                 )
+            logger.debug(f"Page {page}: fetched {len(parsed.items)} campaigns")
+            return parsed
 
-            campaigns.extend(page_campaigns)
-            logger.debug(f"Page {page}: fetched {len(page_campaigns)} campaigns")
+        return Paginator(
+            self, self._campaigns_request, parse, page_size=PAGE_SIZE, label="campaigns"
+        )
 
-            # Check if there are more pages
-            next_page_uri = data.get("@nextpageuri", "")
-            if not next_page_uri:
-                break
+    def _ads_pages(self) -> Paginator:
+        def parse(response: httpx.Response, page: int) -> Page | None:
+            parsed = self._parse_page(response, "Ads", "Ads", page)
+            if parsed is None:
+                return None
+            self._log_ads_page(parsed.items, page)
+            return parsed
+
+        return Paginator(self, self._ads_request, parse, page_size=PAGE_SIZE, label="ads")
+
+    def _campaigns_request(self, page: int) -> dict:
+        """Build the request arguments for one page of campaigns."""
+        return {
+            "method": "GET",
+            "url": f"{BASE_URL}/Mediapartners/{self.account_sid}/Campaigns",
+            "context": f"campaigns page {page}",
+            "cacheable": True,
+            "params": {"Page": page, "PageSize": PAGE_SIZE},
+        }
 
-            page += 1
+    def _ads_request(self, page: int) -> dict:
+        """Build the request arguments for one page of the global ads endpoint."""
+        return {
+            "method": "GET",
+            "url": f"{BASE_URL}/Mediapartners/{self.account_sid}/Ads",
+            "context": f"ads page {page}",
+            "cacheable": True,
+            "params": {"Page": page, "PageSize": PAGE_SIZE},
+        }
+
+    def fetch_advertisers(self) -> list[dict]:
+        """Fetch all campaigns (advertisers), handling pagination.
+
+        Returns:
+            List of raw campaign dicts from the API. May return partial
+            results if some pages fail after retries.
+        """
+        logger.info("Fetching Impact campaigns")
+
+        campaigns = self._campaigns_pages().fetch_all()
 
         logger.info(f"Fetched {len(campaigns)} total campaigns")
         return campaigns
@@ -145,291 +182,271 @@ class ImpactClient(NetworkClient):
             List of raw ad dicts from the API. May return partial
             results if some pages fail after retries.
         """
-        ads: list[dict] = []
-        page = 1
-        page_size = 100  # Impact default and max
+        logger.info("Fetching Impact ads (global endpoint)")
+
+        ads = self._ads_pages().fetch_all()
+
+        logger.info(f"Fetched {len(ads)} total ads")
+        return ads
+
+    def fetch_advertiser(self, advertiser_id: str) -> dict | None:
+        """Find one Active campaign in the campaigns list."""
+        for camp in self.fetch_advertisers():
+            if str(camp.get("CampaignId")) == str(advertiser_id):
+                return camp if camp.get("ContractStatus", "") == "Active" else None
+        return None
+
+    def fetch_advertiser_ads(self, advertiser_id: str) -> list[dict]:
+        """Crawl the global ads and keep one campaign's English ads.
+
+        There is no per-campaign ads endpoint, so this still costs a full
+        crawl, but only the matching ads are kept from each page.
+        """
+        paginator = self._ads_pages()
+        ads = [
+            ad
+            for page_ads in paginator.pages()
+            for ad in page_ads
+            if str(ad.get("CampaignId")) == str(advertiser_id) and _is_english(ad)
+        ]
+        return ads if paginator.complete else Incomplete(ads)
+
+    def _spool_ads_page(
+        self,
+        spool: GroupSpool,
+        page_ads: list[dict],
+        wanted: Callable[[str], bool],
+        publish: Callable[[list[tuple[str, dict]]], None] | None = None,
+    ) -> int:
+        """Add one page's English ads of wanted campaigns to the spool.
 
+        Args:
+            publish: Also given every English ad of the page, wanted or not
+                (SharedCrawl.publish() for the other shards).
+
+        Returns:
+            The number of non-English ads dropped.
+        """
+        non_english = 0
+        shared: list[tuple[str, dict]] = []
+        for raw_ad in page_ads:
+            if not _is_english(raw_ad):
+                non_english += 1
+                continue
+            campaign_id = str(raw_ad.get("CampaignId", ""))
+            if wanted(campaign_id):
+                spool.add(campaign_id, raw_ad)
+            shared.append((campaign_id, raw_ad))
+        if publish is not None:
+            publish(shared)
+        return non_english
+
+    def _log_ads_crawl(self, paginator: Paginator, spool: GroupSpool, non_english: int) -> None:
+        logger.info(f"Fetched {paginator.item_count} total ads, kept {spool.count}")
+        if non_english:
+            logger.info(f"[impact] Filtered out {non_english} non-English ads")
+
+    def _crawl_ads(
+        self,
+        spool: GroupSpool,
+        wanted: Callable[[str], bool],
+        publish: Callable[[list[tuple[str, dict]]], None] | None = None,
+    ) -> Paginator:
+        """Stream the global ads crawl into the spool, grouped by campaign.
+
+        Pages are filtered as they arrive, so the full crawl is never held
+        in memory at once.
+
+        Returns:
+            The finished crawl, for its complete flag and replayed_at().
+        """
         logger.info("Fetching Impact ads (global endpoint)")
 
-        while True:
-            params = {"Page": page, "PageSize": page_size}
-
-            # Retry logic for this page
-            response = None
-            for attempt in range(1, MAX_RETRIES + 1):
-                try:
-                    response = self._client.get(
-                        f"{BASE_URL}/Mediapartners/{self.account_sid}/Ads",
-                        params=params,
-                    )
-                    break  # Success, exit retry loop
-                except httpx.RequestError as e:
-                    logger.warning(
-                        f"Request error fetching ads page {page} "
-                        f"(attempt {attempt}/{MAX_RETRIES}): {e}"
-                    )
-                    if attempt < MAX_RETRIES:
-                        continue
-                    # All retries exhausted
-                    logger.warning(
-                        f"Failed to fetch ads page {page} after {MAX_RETRIES} retries, "
-                        f"returning {len(ads)} partial results"
-                    )
-                    return ads
-
-            # Handle specific error codes
-            if response.status_code == 401:
-                raise httpx.HTTPStatusError(
-                    "Invalid Impact credentials",
-                    request=response.request,
-                    response=response,
-                )
-            if response.status_code == 403:
-                raise httpx.HTTPStatusError(
-                    "Impact rate limit exceeded or access denied",
-                    request=response.request,
-                    response=response,
-                )
-            if response.status_code == 204:
-                logger.debug(f"Ads page {page}: no content (204)")
-                break
+        paginator = self._ads_pages()
+        non_english = 0
+        for page_ads in paginator.pages():
+            non_english += self._spool_ads_page(spool, page_ads, wanted, publish)
 
-            try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                logger.warning(
-                    f"HTTP error on ads page {page}: {e}, "
-                    f"returning {len(ads)} partial results"
-                )
-                return ads
+        self._log_ads_crawl(paginator, spool, non_english)
+        return paginator
 
-            data = response.json()
-            page_ads = data.get("Ads", [])
+    def _crawl(
+        self, conn, progress: SyncCheckpoint, spool: GroupSpool, wanted: Callable[[str], bool]
+    ) -> tuple[bool, float | None]:
+        """Crawl the global ads into the spool, once per sharded run.
 
-            if not page_ads:
-                logger.debug(f"Ads page {page}: empty response, stopping pagination")
-                break
+        The shards of a sharded run share one crawl (see SharedCrawl): the
+        first shard crawls and stores every English ad, the others wait
+        for it and read their campaigns' ads back.
 
-            for ad in page_ads:
-                logger.debug(
-                    f"Ad: id={ad.get('Id')}, name={ad.get('Name')}, "
-                    f"type={ad.get('Type')}, campaign={ad.get('CampaignId')}"
-                )
+        Returns:
+            Whether the crawl was complete, and when its pages were
+            downloaded if every one was a 304 replay.
+        """
+        if not progress.sharded:
+            crawl = self._crawl_ads(spool, wanted)
+            return crawl.complete, crawl.replayed_at()
+
+        shared = SharedCrawl(conn, self.network_name, progress.run_id)
+        while (crawls := shared.join()) is None:
+            time.sleep(POLL_SECONDS)
+        if not crawls:
+            return shared.load(spool, wanted)
+        try:
+            crawl = self._crawl_ads(spool, wanted, publish=shared.publish)
+        except BaseException:
+            shared.abandon()
+            raise
+        return shared.finish(crawl)
 
-            ads.extend(page_ads)
-            logger.debug(f"Ads page {page}: fetched {len(page_ads)} ads")
+    def _log_ads_page(self, page_ads: list[dict], page: int) -> None:
+        for ad in page_ads:
+            logger.debug(
+                f"Ad: id={ad.get('Id')}, name={ad.get('Name')}, "
+                f"type={ad.get('Type')}, campaign={ad.get('CampaignId')}"
+            )
+        logger.debug(f"Ads page {page}: fetched {len(page_ads)} ads")
+
+    def _sync_campaigns(
+        self,
+        conn,
+        raw_campaigns: list[dict],
+        ads: GroupSpool,
+        crawl: tuple[bool, float | None],
+        rule_site_ids: list[int],
+        progress: SyncCheckpoint,
+    ) -> None:
+        """Sync each Active campaign with its ads from the spooled crawl.
+
+        Campaigns owned by another shard are skipped entirely; those
+        completed before a resume are marked seen but skipped. The
+        global ads crawl itself cannot be resumed part-way, since its pages
+        are not grouped by campaign.
+
+        Args:
+            crawl: From _crawl(): whether the crawl was complete (if a page
+                failed, every campaign's ads are incomplete) and when it
+                was downloaded if every page was a 304 replay (then they
+                are all unchanged).
+        """
+        from ..mappers import get_mapper
 
-            # Check if there are more pages
-            next_page_uri = data.get("@nextpageuri", "")
-            if not next_page_uri:
-                break
+        mapper = get_mapper(self.network_name)
 
-            page += 1
+        stats = progress.stats
+        complete, replayed_at = crawl
 
-        logger.info(f"Fetched {len(ads)} total ads")
-        return ads
+        # Filter to only Active campaigns (approved advertisers)
+        raw_campaigns = [
+            c for c in raw_campaigns
+            if c.get("ContractStatus", "") == "Active"
+        ]
+        logger.info(f"[impact] {len(raw_campaigns)} campaigns with Active status")
 
-    def sync(self, conn, site_domain: str | None = None) -> dict:
+        scheduled: list[dict] = []
+        for raw_camp in raw_campaigns:
+            try:
+                adv_data = mapper.map_advertiser(raw_camp)
+            except Exception as e:
+                logger.warning(f"[impact] Error processing campaign: {e}")
+                stats["errors"] += 1
+                continue
+            campaign_id = adv_data["network_program_id"]
+            if not progress.owns(campaign_id):
+                continue
+            progress.see_advertiser(campaign_id)
+            if not progress.is_done(campaign_id):
+                scheduled.append(adv_data)
+
+        upserted = self._upsert_scheduled(conn, scheduled, rule_site_ids, progress)
+
+        # Process each campaign and its ads
+        for adv_data in scheduled:
+            campaign_id = adv_data["network_program_id"]
+            try:
+                # Ads come from the global crawl anyway, so freshness does not apply
+                advertiser_id, geo_countries, _ = self._sync_advertiser(
+                    conn, adv_data, rule_site_ids, stats, upserted=upserted.get(campaign_id)
+                )
+
+                campaign_ads = ads.pop(campaign_id)
+                if not complete:
+                    # Any campaign's ads may have been on the failed pages
+                    campaign_ads = Incomplete(campaign_ads)
+                elif replayed_at is not None:
+                    # The whole crawl was a 304, so each campaign's ads are unchanged too
+                    campaign_ads = NotModified(campaign_ads, replayed_at)
+                self._sync_ads(conn, mapper, advertiser_id, geo_countries, campaign_ads, stats)
+                progress.advance(campaign_id)
+
+            except Exception as e:
+                logger.warning(f"[impact] Error processing campaign: {e}")
+                stats["errors"] += 1
+
+    def sync(
+        self, conn, site_domain: str | None = None, options: SyncOptions | None = None
+    ) -> dict:
         """Sync campaigns and ads from Impact to the database.
 
         Overrides the base class sync() because Impact's per-campaign ads
-        endpoint returns 403. Instead, we batch-fetch all ads globally
-        and group them by CampaignId before processing.
+        endpoint returns 403. Instead, we crawl all ads globally and group
+        them by CampaignId as pages arrive, keeping only the English ads of
+        Active campaigns this run will sync. Past options.spill_threshold
+        ads the groups move to a temporary file. The shards of a sharded
+        run crawl only once between them (see _crawl()).
 
         Args:
             conn: Database connection.
             site_domain: If set, create rules for this site only.
                 Otherwise create rules for ALL active sites.
+            options: Sync tuning. Pipeline mode does not apply: all ads
+                arrive from one global crawl, so there is no per-campaign
+                fetch to overlap with mapping and writes.
 
         Returns:
             Dict with sync statistics.
         """
-        from .. import db
-        from ..geo import resolve_geo_countries
-        from ..mappers import get_mapper
-
-        mapper = get_mapper(self.network_name)
-        stats = {
-            "advertisers_synced": 0,
-            "ads_synced": 0,
-            "ads_deleted": 0,
-            "errors": 0,
-            "ad_types": {},
-        }
-
-        log_id = db.create_sync_log(conn, self.network_name, site_domain=site_domain)
-
-        try:
-            # Determine which sites to create rules for
-            if site_domain:
-                site_row = db.get_site_by_domain(conn, site_domain)
-                rule_site_ids = [site_row["id"]] if site_row else []
-            else:
-                rule_site_ids = [s["id"] for s in db.get_active_sites(conn)]
-
-            # Fetch all campaigns and all ads up front
+        spill_threshold = (options or SyncOptions()).spill_threshold
+        with (
+            self._sync_log(conn, site_domain, options) as progress,
+            GroupSpool(spill_threshold, label="Impact ads") as ads,
+        ):
+            rule_site_ids = self._get_rule_site_ids(conn, site_domain)
+
+            # Campaigns first, so the ads crawl only keeps the ones to sync
             raw_campaigns = self.fetch_advertisers()
             logger.info(f"[impact] Fetched {len(raw_campaigns)} campaigns")
+            active_ids = {
+                str(c.get("CampaignId", ""))
+                for c in raw_campaigns
+                if c.get("ContractStatus", "") == "Active"
+            }
 
-            raw_ads = self.fetch_ads("")
-            logger.info(f"[impact] Fetched {len(raw_ads)} ads")
+            def wanted(campaign_id: str) -> bool:
+                return (
+                    campaign_id in active_ids
+                    and progress.owns(campaign_id)
+                    and not progress.is_done(campaign_id)
+                )
 
-            # Filter to English-only ads (Impact has no server-side language filter)
-            english_ads = [ad for ad in raw_ads if ad.get("Language", "").upper() == "ENGLISH"]
-            skipped = len(raw_ads) - len(english_ads)
-            if skipped:
-                logger.info(f"[impact] Filtered out {skipped} non-English ads")
+            crawl = self._crawl(conn, progress, ads, wanted)
 
-            # Group ads by CampaignId for lookup
-            ads_by_campaign: dict[str, list[dict]] = defaultdict(list)
-            for raw_ad in english_ads:
-                ads_by_campaign[raw_ad.get("CampaignId", "")].append(raw_ad)
+            self._sync_campaigns(conn, raw_campaigns, ads, crawl, rule_site_ids, progress)
+            self._finish_sync(conn, progress)
 
-            seen_advertiser_ids: set[str] = set()
+        return progress.stats
 
-            # Filter to only Active campaigns (approved advertisers)
-            raw_campaigns = [
-                c for c in raw_campaigns
-                if c.get("ContractStatus", "") == "Active"
-            ]
-            logger.info(f"[impact] {len(raw_campaigns)} campaigns with Active status")
-
-            # Process each campaign and its ads
-            for raw_camp in raw_campaigns:
-                try:
-                    adv_data = mapper.map_advertiser(raw_camp)
-                    seen_advertiser_ids.add(adv_data["network_program_id"])
-
-                    # Map canonical keys to db columns
-                    db_adv = {
-                        "network": adv_data["network"],
-                        "network_advertiser_id": adv_data["network_program_id"],
-                        "name": adv_data["network_program_name"],
-                        "website_url": adv_data.get("website_url"),
-                        "category": adv_data.get("category"),
-                        "description": adv_data.get("description"),
-                        "logo_url": adv_data.get("logo_url"),
-                        "network_rank": adv_data.get("network_rank"),
-                        "country_code": adv_data.get("country_code"),
-                        "epc": adv_data.get("epc", 0),
-                        "raw_hash": adv_data["raw_hash"],
-                    }
-
-                    advertiser_id, _ = db.upsert_advertiser(conn, db_adv)
-                    stats["advertisers_synced"] += 1
-
-                    # Resolve geo_countries for this advertiser's ads
-                    geo_countries = resolve_geo_countries(conn, adv_data.get("country_code"))
-
-                    # Create site_advertiser_rules for applicable sites
-                    for sid in rule_site_ids:
-                        db.ensure_site_advertiser_rule(conn, sid, advertiser_id)
-
-                    # Look up ads for this campaign from the grouped dict
-                    campaign_id = adv_data["network_program_id"]
-                    campaign_ads = ads_by_campaign.get(campaign_id, [])
-                    seen_ad_ids: set[str] = set()
-
-                    for raw_ad in campaign_ads:
-                        try:
-                            ad_data = mapper.map_ad(raw_ad, advertiser_id)
-
-                            # Track ad types for stats
-                            creative_type = ad_data.get("creative_type", "banner")
-                            stats["ad_types"][creative_type] = stats["ad_types"].get(creative_type, 0) + 1
-
-                            # Warn on missing image_url
-                            if not ad_data.get("image_url"):
-                                logger.warning(
-                                    f"[impact] Ad {ad_data.get('network_link_id')} has no image_url"
-                                )
-
-                            network_ad_id = ad_data["network_link_id"]
-                            seen_ad_ids.add(network_ad_id)
-
-                            db_ad = {
-                                "network": ad_data["network"],
-                                "network_ad_id": network_ad_id,
-                                "advertiser_id": advertiser_id,
-                                "creative_type": ad_data.get("creative_type", "banner"),
-                                "tracking_url": ad_data["tracking_url"],
-                                "destination_url": ad_data.get("destination_url"),
-                                "status": ad_data.get("status", "active"),
-                                "epc": ad_data.get("epc", 0),
-                                "raw_hash": ad_data["raw_hash"],
-                                "ad_content": ad_data.get("ad_content"),
-                                "advert_name": ad_data["advert_name"],
-                                "bannercode": ad_data["bannercode"],
-                                "imagetype": ad_data.get("imagetype", ""),
-                                "image_url": ad_data.get("image_url"),
-                                "width": ad_data["width"],
-                                "height": ad_data["height"],
-                                "campaign_name": ad_data.get("campaign_name", "General Promotion"),
-                                "enable_stats": ad_data.get("enable_stats", "Y"),
-                                "show_everyone": ad_data.get("show_everyone", "Y"),
-                                "show_desktop": ad_data.get("show_desktop", "Y"),
-                                "show_mobile": ad_data.get("show_mobile", "Y"),
-                                "show_tablet": ad_data.get("show_tablet", "Y"),
-                                "show_ios": ad_data.get("show_ios", "Y"),
-                                "show_android": ad_data.get("show_android", "Y"),
-                                "autodelete": ad_data.get("autodelete", "Y"),
-                                "autodisable": ad_data.get("autodisable", "N"),
-                                "budget": ad_data.get("budget", 0),
-                                "click_rate": ad_data.get("click_rate", 0),
-                                "impression_rate": ad_data.get("impression_rate", 0),
-                                "state_required": ad_data.get("state_required", "N"),
-                                "geo_cities": ad_data.get("geo_cities", "a:0:{}"),
-                                "geo_states": ad_data.get("geo_states", "a:0:{}"),
-                                "geo_countries": geo_countries,
-                                "schedule_start": ad_data.get("schedule_start", 0),
-                                "schedule_end": ad_data.get("schedule_end", 2650941780),
-                            }
-
-                            _, changed = db.upsert_ad(conn, db_ad)
-                            stats["ads_synced"] += 1
-
-                        except Exception as e:
-                            logger.warning(f"[impact] Error processing ad: {e}")
-                            stats["errors"] += 1
-
-                    # Delete stale ads for this campaign/advertiser
-                    if seen_ad_ids:
-                        deleted = db.delete_stale_ads(conn, self.network_name, advertiser_id, seen_ad_ids)
-                        stats["ads_deleted"] += deleted
-
-                except Exception as e:
-                    logger.warning(f"[impact] Error processing campaign: {e}")
-                    stats["errors"] += 1
-
-            # Deactivate advertisers not seen this sync
-            if seen_advertiser_ids:
-                db.deactivate_stale_advertisers(conn, self.network_name, seen_advertiser_ids)
-
-            db.update_sync_log(
-                conn,
-                log_id,
-                advertisers_synced=stats["advertisers_synced"],
-                ads_synced=stats["ads_synced"],
-                ads_deleted=stats["ads_deleted"],
-                status="success",
-            )
+    def _finish_run(self, conn, progress: SyncCheckpoint) -> None:
+        """Delete the run's shared ads crawl."""
+        from .. import db
 
-            # Enhanced logging output
-            logger.info("[impact] Sync complete:")
-            logger.info(f"[impact]   Advertisers: {stats['advertisers_synced']} synced")
-            logger.info(f"[impact]   Ads: {stats['ads_synced']} synced, {stats['ads_deleted']} deleted")
-            if stats["ad_types"]:
-                ad_types_str = ", ".join(f"{count} {atype}" for atype, count in sorted(stats["ad_types"].items()))
-                logger.info(f"[impact]   Ad types: {ad_types_str}")
-            if stats["errors"] > 0:
-                logger.warning(f"[impact]   Errors: {stats['errors']}")
-
-        except Exception as e:
-            logger.error(f"[impact] Sync failed: {e}")
-            db.update_sync_log(conn, log_id, status="failed", error_message=str(e))
-            raise
+        db.delete_shared_crawls(conn, self.network_name, progress.run_id)
 
-        return stats
+    def pipeline_sync(
+        self, conn, site_domain: str | None = None, options: SyncOptions | None = None
+    ) -> dict:
+        """Impact has no per-campaign fetch stage; runs the regular sync()."""
+        return self.sync(conn, site_domain=site_domain, options=options)
 
     def close(self) -> None:
         """Close the HTTP client."""
@@ -440,3 +457,91 @@ class ImpactClient(NetworkClient):
 
     def __exit__(self, *args) -> None:
         self.close()
+
+
+class AsyncImpactClient(AsyncNetworkClient, ImpactClient):
+    """ImpactClient on httpx.AsyncClient.
+
+    Impact's ads come from a single global /Ads crawl, so there is no
+    per-advertiser fan-out: async_sync() crawls campaigns and ads at the
+    same time (prefetching pages once @numpages is known) and then
+    processes them exactly like sync(). Since campaign statuses are not
+    known yet, the ads of inactive campaigns are spooled too.
+    """
+
+    def __init__(self, account_sid: str, auth_token: str):
+        super().__init__(account_sid, auth_token)
+        self._aclient = create_async_client(
+            auth=(account_sid, auth_token),
+            headers={"Accept": "application/json"},
+        )
+
+    async def afetch_ads(self, advertiser_id: str) -> list[dict]:
+        """Async equivalent of fetch_ads() (global endpoint)."""
+        logger.info("Fetching Impact ads (global endpoint)")
+
+        ads = await self._ads_pages().afetch_all()
+
+        logger.info(f"Fetched {len(ads)} total ads")
+        return ads
+
+    async def _acrawl_ads(
+        self,
+        spool: GroupSpool,
+        wanted: Callable[[str], bool],
+        publish: Callable[[list[tuple[str, dict]]], None] | None = None,
+    ) -> Paginator:
+        """Async equivalent of _crawl_ads()."""
+        logger.info("Fetching Impact ads (global endpoint)")
+
+        paginator = self._ads_pages()
+        non_english = 0
+        async for page_ads in paginator.apages():
+            non_english += self._spool_ads_page(spool, page_ads, wanted, publish)
+
+        self._log_ads_crawl(paginator, spool, non_english)
+        return paginator
+
+    async def _acrawl(
+        self, conn, progress: SyncCheckpoint, spool: GroupSpool, wanted: Callable[[str], bool]
+    ) -> tuple[bool, float | None]:
+        """Async equivalent of _crawl()."""
+        if not progress.sharded:
+            crawl = await self._acrawl_ads(spool, wanted)
+            return crawl.complete, crawl.replayed_at()
+
+        shared = SharedCrawl(conn, self.network_name, progress.run_id)
+        while (crawls := shared.join()) is None:
+            await asyncio.sleep(POLL_SECONDS)
+        if not crawls:
+            return shared.load(spool, wanted)
+        try:
+            crawl = await self._acrawl_ads(spool, wanted, publish=shared.publish)
+        except BaseException:
+            shared.abandon()
+            raise
+        return shared.finish(crawl)
+
+    async def async_sync(
+        self, conn, site_domain: str | None = None, options: SyncOptions | None = None
+    ) -> dict:
+        """Async equivalent of sync(); async_concurrency is unused for Impact."""
+        spill_threshold = (options or SyncOptions()).spill_threshold
+        with (
+            self._sync_log(conn, site_domain, options) as progress,
+            GroupSpool(spill_threshold, label="Impact ads") as ads,
+        ):
+            rule_site_ids = self._get_rule_site_ids(conn, site_domain)
+
+            def wanted(campaign_id: str) -> bool:
+                return progress.owns(campaign_id) and not progress.is_done(campaign_id)
+
+            raw_campaigns, crawl = await asyncio.gather(
+                self.afetch_advertisers(), self._acrawl(conn, progress, ads, wanted)
+            )
+            logger.info(f"[impact] Fetched {len(raw_campaigns)} campaigns, {ads.count} ads")
+
+            self._sync_campaigns(conn, raw_campaigns, ads, crawl, rule_site_ids, progress)
+            self._finish_sync(conn, progress)
+
+        return progress.stats
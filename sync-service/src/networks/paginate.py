@@ -0,0 +1,299 @@
+"""Shared pagination for network API crawls.
+
+Every paginated endpoint is described by two callables: one building the
+_send() arguments for a page number, and one parsing a response into a
+Page. Paginator fetches page 1 and, once the response says how many
+records or pages there are, fetches the remaining pages concurrently
+(``NetworkClient.PAGE_PREFETCH`` at a time) while still yielding them in
+order. Without a total it falls back to one page after another until a
+short, empty or last page.
+
+Concurrent pages still go through _send()/_asend(), so they take their
+tokens from the network's rate-limit bucket like any other request.
+
+Cacheable requests (``"cacheable": True`` in the built arguments) are
+revalidated against the HTTP response cache. When every page comes back
+304, fetch_all() returns a httpcache.NotModified list; callers consuming
+pages() directly check replayed_at() instead.
+
+A page that still fails after retries ends the crawl early. fetch_all()
+then returns an Incomplete list (``complete`` for pages() callers), so the
+sync neither deletes the advertiser's other ads nor counts its ads as
+freshly synced.
+"""
+
+import asyncio
+import logging
+import math
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import httpx
+
+from .httpcache import NotModified, stored_at
+
+if TYPE_CHECKING:
+    from .base import AsyncNetworkClient, NetworkClient
+
+logger = logging.getLogger(__name__)
+
+
+class Incomplete(list):
+    """A crawl result missing the records of a page or endpoint that failed."""
+
+
+def is_complete(items: list[dict]) -> bool:
+    """Whether a crawl result holds everything the network offered."""
+    return not isinstance(items, Incomplete)
+
+
+def combine(*results: list[dict]) -> list[dict]:
+    """Concatenate crawl results of one advertiser (e.g. two endpoints).
+
+    The result is Incomplete if any part is, and NotModified only if every
+    part is.
+    """
+    items = [item for result in results for item in result]
+    if not all(is_complete(result) for result in results):
+        return Incomplete(items)
+    if results and all(isinstance(result, NotModified) for result in results):
+        return NotModified(items, downloaded_at=min(result.downloaded_at for result in results))
+    return items
+
+
+@dataclass
+class Page:
+    """One parsed page. An empty items list ends pagination.
+
+    Attributes:
+        items: Records on this page.
+        total: Total records across all pages, if the response says.
+        page_count: Total number of pages, if the response says.
+        has_next: Whether another page follows, if the response says.
+            When unknown, a page shorter than the page size is the last.
+    """
+
+    items: list[dict] = field(default_factory=list)
+    total: int | None = None
+    page_count: int | None = None
+    has_next: bool | None = None
+
+
+class Paginator:
+    """Fetch every page of one endpoint, prefetching once the page count is known."""
+
+    def __init__(
+        self,
+        client: "NetworkClient",
+        build_request: Callable[[int], dict],
+        parse_page: Callable[[httpx.Response, int], Page | None],
+        *,
+        page_size: int,
+        label: str,
+        prefetch: int | None = None,
+    ):
+        """Initialize the paginator.
+
+        Args:
+            client: Client whose _send()/_asend() fetches the pages.
+            build_request: Returns the _send() keyword arguments for a page.
+            parse_page: Parses a page response, raising on fatal errors and
+                returning None for a failed page (the crawl stops there,
+                incomplete).
+            page_size: Records requested per page.
+            label: What is being crawled, for log messages.
+            prefetch: Pages fetched at the same time once the page count is
+                known; defaults to the client's PAGE_PREFETCH.
+        """
+        self.client = client
+        self.build_request = build_request
+        self.parse_page = parse_page
+        self.page_size = page_size
+        self.label = label
+        self.prefetch = max(1, prefetch if prefetch is not None else client.PAGE_PREFETCH)
+        self.item_count = 0
+
+        # False once a page failed and the crawl stopped short
+        self.complete = True
+
+        # Whether any page was downloaded (not a 304 replay) or failed, and
+        # when the oldest replayed body was downloaded
+        self._modified = False
+        self._downloaded_at: float | None = None
+
+    def _last_page(self, page: Page) -> int | None:
+        """Number of the last page, if the first page says how many there are."""
+        if page.page_count is not None:
+            return page.page_count
+        if page.total is not None:
+            return math.ceil(page.total / self.page_size)
+        return None
+
+    def _is_last(self, page_no: int, page: Page) -> bool:
+        if not page.items or page.has_next is False:
+            return True
+        if page.has_next is None and len(page.items) < self.page_size:
+            return True
+        last = self._last_page(page)
+        return last is not None and page_no >= last
+
+    def _parse(self, response: httpx.Response | None, page_no: int) -> Page | None:
+        if response is None:
+            return None
+        replayed_at = stored_at(response)
+        if replayed_at is None:
+            self._modified = True
+        elif self._downloaded_at is None or replayed_at < self._downloaded_at:
+            self._downloaded_at = replayed_at
+        return self.parse_page(response, page_no)
+
+    def replayed_at(self) -> float | None:
+        """When the oldest page was downloaded, if every page so far was a 304 replay."""
+        return None if self._modified else self._downloaded_at
+
+    def _result(self, items: list[dict]) -> list[dict]:
+        """All items: Incomplete if a page failed, NotModified if every page was a 304 replay."""
+        if not self.complete:
+            return Incomplete(items)
+        downloaded_at = self.replayed_at()
+        if downloaded_at is None:
+            return items
+        return NotModified(items, downloaded_at=downloaded_at)
+
+    def _failed(self, page_no: int) -> None:
+        self._modified = True
+        self.complete = False
+        logger.warning(
+            f"[{self.client.network_name}] Failed to fetch {self.label} page {page_no}, "
+            f"returning {self.item_count} partial results"
+        )
+
+    def _accept(self, page_no: int, page: Page | None) -> list[dict] | None:
+        """Count a fetched page's items, or log a failed one (None)."""
+        if page is None:
+            self._failed(page_no)
+            return None
+        self.item_count += len(page.items)
+        return page.items
+
+    def _fetch(self, page_no: int) -> Page | None:
+        return self._parse(self.client._send(**self.build_request(page_no)), page_no)
+
+    async def _afetch(self, page_no: int) -> Page | None:
+        client: AsyncNetworkClient = self.client  # type: ignore[assignment]
+        return self._parse(await client._asend(**self.build_request(page_no)), page_no)
+
+    def pages(self) -> Iterator[list[dict]]:
+        """Yield each page's items in page order."""
+        page = self._fetch(1)
+        if self._accept(1, page) is None:
+            return
+        yield page.items
+        if self._is_last(1, page):
+            return
+
+        last = self._last_page(page)
+        if last is not None and self.prefetch > 1:
+            yield from self._prefetched(2, last)
+            return
+
+        page_no = 1
+        while True:
+            page_no += 1
+            page = self._fetch(page_no)
+            if self._accept(page_no, page) is None:
+                return
+            yield page.items
+            if self._is_last(page_no, page):
+                return
+
+    def _prefetched(self, first: int, last: int) -> Iterator[list[dict]]:
+        """Fetch pages first..last with a sliding window of threads, yielding in order."""
+        with ThreadPoolExecutor(
+            max_workers=self.prefetch, thread_name_prefix=f"{self.client.network_name}-pages"
+        ) as executor:
+            pending = deque()
+            next_page = first
+
+            def fill() -> None:
+                nonlocal next_page
+                while next_page <= last and len(pending) < self.prefetch:
+                    pending.append((next_page, executor.submit(self._fetch, next_page)))
+                    next_page += 1
+
+            try:
+                fill()
+                while pending:
+                    page_no, future = pending.popleft()
+                    page = future.result()
+                    if self._accept(page_no, page) is None:
+                        return
+                    yield page.items
+                    if self._is_last(page_no, page):
+                        return
+                    fill()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    def fetch_all(self) -> list[dict]:
+        """Return the items of every page (partial if a page fails)."""
+        return self._result([item for items in self.pages() for item in items])
+
+    async def apages(self) -> AsyncIterator[list[dict]]:
+        """Async equivalent of pages()."""
+        page = await self._afetch(1)
+        if self._accept(1, page) is None:
+            return
+        yield page.items
+        if self._is_last(1, page):
+            return
+
+        last = self._last_page(page)
+        if last is not None and self.prefetch > 1:
+            async for items in self._aprefetched(2, last):
+                yield items
+            return
+
+        page_no = 1
+        while True:
+            page_no += 1
+            page = await self._afetch(page_no)
+            if self._accept(page_no, page) is None:
+                return
+            yield page.items
+            if self._is_last(page_no, page):
+                return
+
+    async def _aprefetched(self, first: int, last: int) -> AsyncIterator[list[dict]]:
+        """Async equivalent of _prefetched() using tasks."""
+        pending = deque()
+        next_page = first
+
+        def fill() -> None:
+            nonlocal next_page
+            while next_page <= last and len(pending) < self.prefetch:
+                pending.append((next_page, asyncio.ensure_future(self._afetch(next_page))))
+                next_page += 1
+
+        try:
+            fill()
+            while pending:
+                page_no, task = pending.popleft()
+                page = await task
+                if self._accept(page_no, page) is None:
+                    return
+                yield page.items
+                if self._is_last(page_no, page):
+                    return
+                fill()
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def afetch_all(self) -> list[dict]:
+        """Async equivalent of fetch_all()."""
+        return self._result([item async for items in self.apages() for item in items])
@@ -0,0 +1,212 @@
+"""Pipelined sync engine: fetch -> map -> write stages joined by bounded queues.
+
+Used by NetworkClient.pipeline_sync(). Ads are fetched on one thread,
+mapped/hashed on a second, and written on the calling thread, which owns
+the database connection. Each queue holds at most ``pipeline_queue_size``
+advertisers, so a slow stage blocks the ones feeding it instead of letting
+ad lists pile up in memory.
+"""
+
+import logging
+import queue
+import threading
+
+from ..config import SyncOptions
+from .base import NetworkClient, SyncCheckpoint, new_sync_stats
+from .httpcache import NotModified
+from .paginate import is_complete
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's output
+_DONE = object()
+
+# How often blocked stages wake up to check for shutdown (seconds)
+_POLL_INTERVAL = 0.1
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put an item, blocking while the queue is full. Returns False on shutdown."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    """Get an item, blocking while the queue is empty. Returns _DONE on shutdown."""
+    while True:
+        try:
+            return q.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            if stop.is_set():
+                return _DONE
+
+
+def _merge_stats(stats: dict, partial: dict) -> None:
+    """Add one advertiser's stats (from the fetch/map stages) into the run totals."""
+    for key in (
+        "advertisers_synced",
+        "ads_synced",
+        "ads_deleted",
+        "advertisers_fresh",
+        "advertisers_not_modified",
+        "errors",
+    ):
+        stats[key] += partial[key]
+    for creative_type, count in partial["ad_types"].items():
+        stats["ad_types"][creative_type] = stats["ad_types"].get(creative_type, 0) + count
+
+
+def run_pipeline(
+    client: NetworkClient,
+    conn,
+    mapper,
+    work: list[tuple[str, int, str]],
+    progress: SyncCheckpoint,
+    options: SyncOptions,
+) -> None:
+    """Fetch, map and write ads for already-upserted advertisers.
+
+    Args:
+        client: Network client whose fetch_ads() feeds the pipeline.
+        conn: Database connection (only used on the calling thread).
+        mapper: The network's mapper module.
+        work: (network advertiser ID, database advertiser ID, geo_countries)
+            tuples, as returned by NetworkClient._sync_advertisers().
+        progress: The run's checkpoint; its stats are updated in place and
+            buffered rows are flushed before each save. Advertisers not yet
+            fetched when its time budget runs out are skipped.
+        options: Queue and batch sizes.
+    """
+    name = client.network_name
+    stats = progress.stats
+    fetched: queue.Queue = queue.Queue(maxsize=options.pipeline_queue_size)
+    mapped: queue.Queue = queue.Queue(maxsize=options.pipeline_queue_size)
+    stop = threading.Event()
+    failures: list[BaseException] = []
+
+    def fetch_stage() -> None:
+        try:
+            for network_advertiser_id, advertiser_id, geo_countries in work:
+                if progress.out_of_time():
+                    # Only this thread touches the set until the stages are joined
+                    progress.skipped_advertiser_ids.add(network_advertiser_id)
+                    continue
+                partial = new_sync_stats()
+                try:
+                    raw_ads = client.fetch_ads(network_advertiser_id)
+                except Exception as e:
+                    logger.warning(f"[{name}] Error processing advertiser: {e}")
+                    partial["errors"] += 1
+                    raw_ads = None
+                item = (network_advertiser_id, advertiser_id, geo_countries, raw_ads, partial)
+                if not _put(fetched, item, stop):
+                    return
+        except BaseException as e:
+            # End the stream; downstream stages drain what was already produced
+            failures.append(e)
+        finally:
+            _put(fetched, _DONE, stop)
+
+    def map_stage() -> None:
+        try:
+            while (item := _get(fetched, stop)) is not _DONE:
+                network_advertiser_id, advertiser_id, geo_countries, raw_ads, partial = item
+                complete = raw_ads is not None and is_complete(raw_ads)
+                if raw_ads is None:
+                    # Fetch failed: pass the error count on without touching the DB
+                    rows, seen_ad_ids = [], None
+                elif isinstance(raw_ads, NotModified):
+                    # 304: the writer checks the database and maps only if needed
+                    rows, seen_ad_ids = raw_ads, set()
+                else:
+                    rows, seen_ad_ids = client._map_ads(
+                        mapper, advertiser_id, geo_countries, raw_ads, partial
+                    )
+                item = (
+                    network_advertiser_id,
+                    advertiser_id,
+                    geo_countries,
+                    rows,
+                    seen_ad_ids,
+                    complete,
+                    partial,
+                )
+                if not _put(mapped, item, stop):
+                    return
+        except BaseException as e:
+            failures.append(e)
+        finally:
+            _put(mapped, _DONE, stop)
+
+    threads = [
+        threading.Thread(target=fetch_stage, name=f"{name}-fetch", daemon=True),
+        threading.Thread(target=map_stage, name=f"{name}-map", daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    logger.info(
+        f"[{name}] Pipelining ads for {len(work)} advertisers "
+        f"(queue {options.pipeline_queue_size}, batch {options.pipeline_batch_size})"
+    )
+
+    batch: list[dict] = []
+
+    def flush() -> None:
+        client._write_ads(conn, batch, stats)
+        batch.clear()
+
+    try:
+        while (item := _get(mapped, stop)) is not _DONE:
+            (
+                network_advertiser_id,
+                advertiser_id,
+                geo_countries,
+                rows,
+                seen_ad_ids,
+                complete,
+                partial,
+            ) = item
+            _merge_stats(stats, partial)
+            if seen_ad_ids is None:
+                continue
+
+            if isinstance(rows, NotModified):
+                try:
+                    if client._ads_not_modified(conn, advertiser_id, rows, stats):
+                        progress.advance(network_advertiser_id, flush=flush)
+                        continue
+                except Exception as e:
+                    logger.warning(f"[{name}] Error processing advertiser: {e}")
+                    stats["errors"] += 1
+                    continue
+                rows, seen_ad_ids = client._map_ads(
+                    mapper, advertiser_id, geo_countries, rows, stats
+                )
+
+            batch.extend(rows)
+            if len(batch) >= options.pipeline_batch_size:
+                flush()
+            try:
+                # Rows still buffered are in seen_ad_ids, so this never removes them
+                client._finish_ads(conn, advertiser_id, seen_ad_ids, stats, complete)
+            except Exception as e:
+                logger.warning(f"[{name}] Error processing advertiser: {e}")
+                stats["errors"] += 1
+                continue
+            progress.advance(network_advertiser_id, flush=flush)
+
+        if batch:
+            flush()
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if failures:
+        raise failures[0]
@@ -0,0 +1,286 @@
+"""Proactive token-bucket rate limiting for network API requests.
+
+Every request sent by NetworkClient._send()/_asend() first takes a token
+from the bucket for its network account and endpoint, sleeping until one
+is available. Requests are spaced at exactly the allowed rate, so the
+reactive retry on the network's rate-limit status is a fallback rather
+than the normal way of slowing down.
+
+Buckets live for the whole process and are shared by every client with the
+same key, including threads and event loops, so per-domain clients of one
+account draw from one budget.
+
+The configured limit is a ceiling. Each bucket adapts below it (AIMD): a
+rate-limited response halves the rate and pauses the bucket for as long as
+the server asks (Retry-After, RateLimit-Reset, or a hint in the body), and
+every successful response adds back a small step. RateLimit-Remaining and
+Reset headers cap the rate so the remaining quota lasts until the reset.
+
+Limits with a period of QUOTA_PERIOD or more (Impact's 2,000 a day) are
+quotas shared by every run and shard within the period, while a bucket
+only lives as long as its process. Each sync therefore starts such a bucket
+from what sync_logs says is left (see NetworkClient._seed_quota()).
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from ..config import RateLimit
+
+logger = logging.getLogger(__name__)
+
+# AIMD: halve the rate when rate-limited, add back 5% of the ceiling per
+# successful response, never below 5% of the ceiling
+DECREASE_FACTOR = 0.5
+INCREASE_FRACTION = 0.05
+MIN_RATE_FRACTION = 0.05
+
+# Limits over at least this many seconds are quotas carried across runs
+QUOTA_PERIOD = 3600
+
+# Values above this in X-RateLimit-Reset are Unix timestamps, not seconds
+_EPOCH_THRESHOLD = 1_000_000_000
+
+# "retry after 30 seconds", "try again in 30s", ...
+_BODY_RETRY = re.compile(
+    r"(?:retry|try again)\D{0,20}?(\d+(?:\.\d+)?)\s*(?:s\b|sec|second)", re.IGNORECASE
+)
+
+
+@dataclass
+class ServerHint:
+    """What a response says about the rate limit (None = not stated)."""
+
+    retry_after: float | None = None
+    remaining: int | None = None
+    reset_in: float | None = None
+
+
+def _header(response: httpx.Response, *names: str) -> str | None:
+    for name in names:
+        value = response.headers.get(name)
+        if value is not None:
+            return value.strip()
+    return None
+
+
+def _parse_retry_after(value: str) -> float | None:
+    """Parse Retry-After: delay in seconds or an HTTP date."""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def read_hint(response: httpx.Response, rate_limited: bool = False) -> ServerHint:
+    """Read Retry-After and (X-)RateLimit-Remaining/Reset headers.
+
+    For rate-limited responses without Retry-After, the body is searched
+    for a "retry after N seconds" style message as well.
+    """
+    hint = ServerHint()
+
+    retry_after = _header(response, "Retry-After")
+    if retry_after:
+        hint.retry_after = _parse_retry_after(retry_after)
+
+    remaining = _header(response, "RateLimit-Remaining", "X-RateLimit-Remaining")
+    if remaining:
+        try:
+            hint.remaining = int(float(remaining))
+        except ValueError:
+            pass
+
+    reset = _header(response, "RateLimit-Reset", "X-RateLimit-Reset")
+    if reset:
+        try:
+            reset_value = float(reset)
+            if reset_value > _EPOCH_THRESHOLD:
+                reset_value -= time.time()
+            hint.reset_in = max(0.0, reset_value)
+        except ValueError:
+            pass
+
+    if rate_limited and hint.retry_after is None:
+        match = _BODY_RETRY.search(response.text[:2000])
+        if match:
+            hint.retry_after = float(match.group(1))
+        elif hint.remaining == 0 and hint.reset_in is not None:
+            hint.retry_after = hint.reset_in
+
+    return hint
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at an adaptive rate of at most ``requests / period``."""
+
+    def __init__(self, limit: RateLimit, clock: Callable[[], float] = time.monotonic):
+        self.limit = limit
+        self.max_rate = limit.requests / limit.period
+        self.rate = self.max_rate
+        self._clock = clock
+        self._tokens = float(limit.burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.requests = 0
+        self.rate_limited = 0
+        self.waited_seconds = 0.0
+
+    def reserve(self) -> float:
+        """Take a token, returning how many seconds to wait before using it.
+
+        The bucket may go negative: each caller reserves its own future
+        slot, so concurrent callers queue up instead of racing for the
+        next token.
+        """
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._updated
+            self._updated = now
+            self._tokens = min(float(self.limit.burst), self._tokens + elapsed * self.rate)
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            # Queue behind a server-requested pause, still spaced by the rate
+            wait += max(0.0, self._paused_until - now)
+            self.requests += 1
+            self.waited_seconds += wait
+            return wait
+
+    def seed(self, available: float) -> None:
+        """Cap the tokens on hand, e.g. at what is left of a quota other processes share.
+
+        Never adds tokens, so seeding twice does not count the same requests twice.
+        """
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._updated
+            self._updated = now
+            self._tokens = min(float(self.limit.burst), self._tokens + elapsed * self.rate)
+            self._tokens = min(self._tokens, max(0.0, available))
+
+    def observe(self, hint: ServerHint) -> None:
+        """Additive increase after a successful response, capped by its quota headers."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * INCREASE_FRACTION)
+            if hint.remaining is not None and hint.reset_in:
+                if hint.remaining <= 0:
+                    self._paused_until = max(self._paused_until, self._clock() + hint.reset_in)
+                else:
+                    self.rate = min(self.rate, hint.remaining / hint.reset_in)
+
+    def throttle(self, delay: float) -> None:
+        """Multiplicative decrease after a rate-limited response, pausing for delay seconds."""
+        with self._lock:
+            self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate * DECREASE_FACTOR)
+            self.rate_limited += 1
+            self._paused_until = max(self._paused_until, self._clock() + delay)
+
+    def metrics(self) -> dict:
+        """Current rate, ceiling, time spent waiting and rate-limited responses."""
+        with self._lock:
+            return {
+                "rate_per_second": self.rate,
+                "max_rate_per_second": self.max_rate,
+                "requests": self.requests,
+                "waited_seconds": self.waited_seconds,
+                "rate_limited": self.rate_limited,
+            }
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        """Async equivalent of acquire()."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_overrides: dict[str, RateLimit] = {}
+_enabled = True
+_buckets: dict[tuple[str, str, str], TokenBucket] = {}
+_lock = threading.Lock()
+
+
+def configure(overrides: dict[str, RateLimit] | None = None, enabled: bool = True) -> None:
+    """Set limits that replace the clients' defaults and drop existing buckets.
+
+    Args:
+        overrides: Keyed by ``network`` or ``network:host``.
+        enabled: False turns rate limiting off (offline tests).
+    """
+    global _overrides, _enabled
+    with _lock:
+        _overrides = dict(overrides or {})
+        _enabled = enabled
+        _buckets.clear()
+
+
+def get_bucket(
+    network: str, account: str, host: str, defaults: dict[str, RateLimit]
+) -> TokenBucket | None:
+    """Return the shared bucket for a request, or None if it is not limited.
+
+    The limit is the first of: override for ``network:host``, override for
+    ``network``, the client's default for ``host``, its default for ``"*"``.
+    Requests matched by a network-wide limit share one bucket across hosts.
+
+    Args:
+        network: Network name.
+        account: Identifies whose quota this is (e.g. the API key's domain).
+        host: Request host.
+        defaults: The client class's RATE_LIMITS.
+    """
+    if not _enabled:
+        return None
+
+    candidates = (
+        (_overrides, f"{network}:{host}", host),
+        (_overrides, network, "*"),
+        (defaults, host, host),
+        (defaults, "*", "*"),
+    )
+    for table, lookup, endpoint in candidates:
+        limit = table.get(lookup)
+        if limit is not None:
+            break
+    else:
+        return None
+
+    key = (network, account, endpoint)
+    with _lock:
+        bucket = _buckets.get(key)
+        if bucket is None or bucket.limit != limit:
+            bucket = _buckets[key] = TokenBucket(limit)
+            logger.debug(
+                f"[{network}] Rate limit for {endpoint}: "
+                f"{limit.requests} requests / {limit.period:g}s"
+            )
+        return bucket
+
+
+def metrics() -> dict[str, dict]:
+    """Return TokenBucket.metrics() for every bucket, keyed "network[/account]/endpoint"."""
+    with _lock:
+        buckets = list(_buckets.items())
+    return {
+        "/".join(part for part in key if part): bucket.metrics() for key, bucket in buckets
+    }
@@ -0,0 +1,140 @@
+"""A global ads crawl made once per sharded run and read by all its shards.
+
+Impact's ads only come from one global /Ads crawl, so without this every
+shard of a sharded run (``--shard i/N``) would crawl it in full and the run
+would spend N times the API quota. The first shard to start claims the
+crawl in sync_shared_crawls and stores the ads in sync_shared_ads as pages
+arrive; the other shards wait for it to finish and read their own
+campaigns' ads back, a batch of rows at a time. Shards started after the
+crawl (or resumed) read it back straight away. A crawl whose shard failed
+is taken over by the next shard to look, and the last shard of the run
+deletes it.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+
+from .. import db
+from .paginate import Paginator
+from .spool import GroupSpool
+
+logger = logging.getLogger(__name__)
+
+# How often a waiting shard checks on the crawl, and how long it waits for it
+POLL_SECONDS = 10
+TIMEOUT_SECONDS = 3 * 3600
+
+
+class SharedCrawl:
+    """One sharded run's global ads crawl, stored in the database for every shard."""
+
+    def __init__(
+        self,
+        conn,
+        network: str,
+        run_id: str,
+        timeout: float = TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the shared crawl.
+
+        Args:
+            conn: The shard's database connection. join(), finish() and
+                abandon() commit it.
+            network: Network name.
+            run_id: The sharded run's ID.
+            timeout: Seconds to wait for another shard's crawl.
+            clock: Monotonic clock, replaceable for tests.
+        """
+        self.conn = conn
+        self.network = network
+        self.run_id = run_id
+        self.timeout = timeout
+        self._clock = clock
+        self.crawl_id: int | None = None
+        self._waiting_since: float | None = None
+
+        # The finished crawl's complete flag and replayed_at()
+        self.complete = True
+        self.replayed_at: float | None = None
+
+    def join(self) -> bool | None:
+        """Claim the crawl, or check on the shard making it.
+
+        Commits, so the claim is visible to the other shards and the next
+        check sees theirs.
+
+        Returns:
+            True if this shard is to crawl (then publish() every page and
+            finish()), False once another shard's crawl is done (then
+            load()), None while it is still running (call again later).
+
+        Raises:
+            RuntimeError: The crawl is still running after the timeout.
+        """
+        crawl_id = db.claim_shared_crawl(self.conn, self.network, self.run_id)
+        if crawl_id is not None:
+            self.conn.commit()
+            self.crawl_id = crawl_id
+            logger.info(f"[{self.network}] Crawling ads for every shard of run {self.run_id}")
+            return True
+
+        crawl = db.get_shared_crawl(self.conn, self.network, self.run_id)
+        # End the read snapshot, so the next check sees the crawling shard's commits
+        self.conn.commit()
+        if crawl["status"] == "done":
+            self.crawl_id = crawl["id"]
+            self.complete = crawl["complete"]
+            self.replayed_at = crawl["replayed_at"]
+            return False
+
+        now = self._clock()
+        if self._waiting_since is None:
+            self._waiting_since = now
+            logger.info(f"[{self.network}] Waiting for another shard's ads crawl")
+        elif now - self._waiting_since > self.timeout:
+            raise RuntimeError(
+                f"[{self.network}] Ads crawl of run {self.run_id} still unfinished "
+                f"after {self.timeout:.0f}s"
+            )
+        return None
+
+    def publish(self, ads: list[tuple[str, dict]]) -> None:
+        """Store one page's (network advertiser ID, raw ad) pairs for the other shards."""
+        db.add_shared_ads(self.conn, self.crawl_id, ads)
+
+    def finish(self, crawl: Paginator) -> tuple[bool, float | None]:
+        """Make the finished crawl readable by the other shards.
+
+        Returns:
+            The crawl's complete flag and replayed_at().
+        """
+        self.complete = crawl.complete
+        self.replayed_at = crawl.replayed_at()
+        db.finish_shared_crawl(self.conn, self.crawl_id, "done", self.complete, self.replayed_at)
+        self.conn.commit()
+        return self.complete, self.replayed_at
+
+    def abandon(self) -> None:
+        """Leave a crawl that raised for another shard to take over."""
+        try:
+            self.conn.rollback()
+            db.finish_shared_crawl(self.conn, self.crawl_id, "failed")
+            self.conn.commit()
+        except Exception as e:
+            logger.warning(f"[{self.network}] Could not release the shared ads crawl: {e}")
+
+    def load(self, spool: GroupSpool, wanted: Callable[[str], bool]) -> tuple[bool, float | None]:
+        """Add the stored ads of wanted campaigns to the spool.
+
+        Returns:
+            The crawl's complete flag and replayed_at().
+        """
+        loaded = 0
+        for campaign_id, raw_ad in db.iter_shared_ads(self.conn, self.crawl_id):
+            if wanted(campaign_id):
+                spool.add(campaign_id, raw_ad)
+                loaded += 1
+        logger.info(f"[{self.network}] Read {loaded} ads from the run's shared crawl")
+        return self.complete, self.replayed_at
@@ -0,0 +1,126 @@
+"""Records grouped by key, spilling to a temporary SQLite file past a limit.
+
+Impact's ads come from one global crawl, but are synced campaign by
+campaign. GroupSpool buckets them by campaign as pages arrive. Up to
+``max_in_memory`` records are kept in dicts; once that is exceeded, every
+bucket moves to a temporary SQLite file and later records go straight
+there, so memory stays bounded however large the account is. pop() hands
+back one group, in arrival order, and releases its memory (or its rows
+in the file).
+
+CJ's shared link-search results are held the same way (CJAdvertiserCache),
+read by each domain's client with get() and by the last one with pop().
+"""
+
+import logging
+import os
+import sqlite3
+import tempfile
+from collections import defaultdict
+
+from ..jsoncodec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+class GroupSpool:
+    """Append-only record groups, in memory up to a limit and then on disk.
+
+    Not thread-safe: a spool shared between threads must be used under
+    the caller's lock.
+    """
+
+    def __init__(self, max_in_memory: int, label: str = "records"):
+        """Initialize the spool.
+
+        Args:
+            max_in_memory: Records kept in memory before spilling to disk
+                (0 = spill from the first record).
+            label: What is being spooled, for log messages.
+        """
+        self.max_in_memory = max_in_memory
+        self.label = label
+        self.count = 0
+        self._groups: dict[str, list[dict]] = defaultdict(list)
+        self._in_memory = 0
+        self._dir: tempfile.TemporaryDirectory | None = None
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def spilled(self) -> bool:
+        """Whether records have moved to the temporary file."""
+        return self._conn is not None
+
+    def add(self, key: str, record: dict) -> None:
+        """Append a record to its group."""
+        self.count += 1
+        if self._conn is not None:
+            self._conn.execute("INSERT INTO records (key, raw) VALUES (?, ?)", (key, dumps(record)))
+            return
+        self._groups[key].append(record)
+        self._in_memory += 1
+        if self._in_memory > self.max_in_memory:
+            self._spill()
+
+    def _spill(self) -> None:
+        """Move every in-memory group to a new temporary SQLite file."""
+        self._dir = tempfile.TemporaryDirectory(prefix="spool-")
+        path = os.path.join(self._dir.name, "spool.sqlite")
+        # Any thread may use the spool once it has spilled (see the class docstring)
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = OFF")
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.execute(
+            "CREATE TABLE records (seq INTEGER PRIMARY KEY, key TEXT NOT NULL, raw BLOB NOT NULL)"
+        )
+        self._conn.execute("BEGIN")
+        self._conn.executemany(
+            "INSERT INTO records (key, raw) VALUES (?, ?)",
+            ((key, dumps(record)) for key, records in self._groups.items() for record in records),
+        )
+        logger.info(
+            f"Spooling {self.label} to disk after {self._in_memory} in memory ({self._dir.name})"
+        )
+        self._groups.clear()
+        self._in_memory = 0
+
+    def get(self, key: str) -> list[dict]:
+        """Return a group's records in the order they were added, keeping the group."""
+        if self._conn is None:
+            return list(self._groups.get(key, []))
+        return self._read(key)
+
+    def pop(self, key: str) -> list[dict]:
+        """Return a group's records in the order they were added, releasing their memory."""
+        if self._conn is None:
+            records = self._groups.pop(key, [])
+            self._in_memory -= len(records)
+            return records
+        records = self._read(key)
+        self._conn.execute("DELETE FROM records WHERE key = ?", (key,))
+        return records
+
+    def _read(self, key: str) -> list[dict]:
+        """Read a group back from the temporary file."""
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_records_key ON records (key, seq)")
+        rows = self._conn.execute(
+            "SELECT raw FROM records WHERE key = ? ORDER BY seq", (key,)
+        ).fetchall()
+        return [loads(raw) for (raw,) in rows]
+
+    def close(self) -> None:
+        """Delete the temporary file, if any."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._dir is not None:
+            self._dir.cleanup()
+            self._dir = None
+
+    def __enter__(self) -> "GroupSpool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
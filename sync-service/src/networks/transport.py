@@ -0,0 +1,150 @@
+"""Shared, pooled HTTP transport for the network clients.
+
+Every blocking client is built on one process-wide httpx.HTTPTransport, so
+the per-domain FlexOffers and CJ clients (and networks synced in parallel
+threads) reuse keep-alive connections to the same hosts instead of each
+doing its own TLS handshakes. Async clients run on their own event loops,
+which cannot share a pool, so each gets a pool with the same limits.
+
+Settings come from HttpOptions (HTTP_* env vars) via configure().
+"""
+
+import logging
+import threading
+
+import httpx
+
+from ..config import HttpOptions
+from .bandwidth import ACCEPT_ENCODING
+
+logger = logging.getLogger(__name__)
+
+_options = HttpOptions()
+_pool: httpx.HTTPTransport | None = None
+_lock = threading.Lock()
+
+
+def configure(options: HttpOptions) -> None:
+    """Apply HTTP settings to clients created from now on."""
+    global _options
+    close_shared_transport()
+    _options = options
+
+
+def close_shared_transport() -> None:
+    """Close the shared connection pool (a new one is opened on next use)."""
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def _http2_available() -> bool:
+    """Whether HTTP/2 is enabled and the h2 package is installed."""
+    if not _options.http2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("HTTP_HTTP2 is set but h2 is not installed - using HTTP/1.1")
+        return False
+    return True
+
+
+def _pool_kwargs() -> dict:
+    """Keyword arguments for a pooled httpx transport."""
+    return {
+        "limits": httpx.Limits(
+            max_connections=_options.max_connections,
+            max_keepalive_connections=_options.max_keepalive_connections,
+            keepalive_expiry=_options.keepalive_expiry,
+        ),
+        "http2": _http2_available(),
+    }
+
+
+def _timeout() -> httpx.Timeout:
+    """Default timeout for every request."""
+    return httpx.Timeout(_options.timeout, connect=_options.connect_timeout or _options.timeout)
+
+
+def _apply_host_timeout(request: httpx.Request) -> None:
+    """Replace the request's timeout with its host's override, if any."""
+    seconds = _options.host_timeouts.get(request.url.host)
+    if seconds is not None:
+        request.extensions["timeout"] = httpx.Timeout(seconds).as_dict()
+
+
+class SharedTransport(httpx.BaseTransport):
+    """Routes a client's requests through a pool shared with other clients.
+
+    Closing the client leaves the pool open for the others; the pool
+    itself is closed by close_shared_transport().
+    """
+
+    def __init__(self, pool: httpx.BaseTransport):
+        self._pool = pool
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        _apply_host_timeout(request)
+        return self._pool.handle_request(request)
+
+    def close(self) -> None:
+        pass
+
+
+class HostTimeoutAsyncTransport(httpx.AsyncBaseTransport):
+    """Async client transport that applies per-host timeouts to its own pool."""
+
+    def __init__(self, pool: httpx.AsyncBaseTransport):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        _apply_host_timeout(request)
+        return await self._pool.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+def _shared_pool() -> httpx.HTTPTransport:
+    """Return the process-wide connection pool, opening it on first use."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = httpx.HTTPTransport(**_pool_kwargs())
+        return _pool
+
+
+def _headers(headers: dict | None) -> dict:
+    """Client default headers: compressed responses, plus the client's own."""
+    return {"Accept-Encoding": ACCEPT_ENCODING, **(headers or {})}
+
+
+def create_client(headers: dict | None = None, **kwargs) -> httpx.Client:
+    """Create an httpx.Client on the shared connection pool.
+
+    Args:
+        headers: Default headers, added to Accept-Encoding.
+        **kwargs: Passed to httpx.Client (auth).
+    """
+    return httpx.Client(
+        transport=SharedTransport(_shared_pool()),
+        timeout=_timeout(),
+        headers=_headers(headers),
+        **kwargs,
+    )
+
+
+def create_async_client(headers: dict | None = None, **kwargs) -> httpx.AsyncClient:
+    """Create an httpx.AsyncClient with its own pool, tuned like the shared one.
+
+    Args:
+        headers: Default headers, added to Accept-Encoding.
+        **kwargs: Passed to httpx.AsyncClient (auth).
+    """
+    transport = HostTimeoutAsyncTransport(httpx.AsyncHTTPTransport(**_pool_kwargs()))
+    return httpx.AsyncClient(
+        transport=transport, timeout=_timeout(), headers=_headers(headers), **kwargs
+    )
@@ -0,0 +1,135 @@
+"""Streaming parser for CJ's XML API responses.
+
+CJ wraps records in a plural element whose attributes carry the paging
+totals:
+
+    <cj-api>
+      <links total-matched="50" records-returned="25" page-number="1">
+        <link>...</link>
+        ...
+      </links>
+    </cj-api>
+
+iter_records() feeds the response bytes to a pull parser in chunks and
+yields each record as a flat dict as soon as its closing tag is read. The
+record is then dropped from the tree, so a page never exists as a full
+element tree alongside its dicts.
+
+lxml is used when installed (``pip install .[xml]``), with entity
+resolution and network access disabled; otherwise the standard library
+parser. Parse errors from either backend are raised as ET.ParseError.
+"""
+
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+
+try:
+    from lxml import etree as _lxml
+except ImportError:  # pragma: no cover - depends on the environment
+    _lxml = None
+
+# lxml's errors, re-raised as ET.ParseError
+_LXML_ERRORS = (_lxml.XMLSyntaxError,) if _lxml is not None else ()
+
+# Bytes fed to the parser at a time
+CHUNK_SIZE = 64 * 1024
+
+
+def _pull_parser():
+    if _lxml is not None:
+        return _lxml.XMLPullParser(
+            events=("start", "end"),
+            resolve_entities=False,
+            no_network=True,
+            remove_comments=True,
+            remove_pis=True,
+        )
+    return ET.XMLPullParser(events=("start", "end"))
+
+
+def element_to_dict(elem) -> dict:
+    """Convert a record element and its children to a flat dict.
+
+    Handles nested elements by joining parent and child tag names.
+    For example:
+        <primary-category>
+            <parent>Home & Garden</parent>
+            <child>Utilities</child>
+        </primary-category>
+
+    Becomes:
+        {"primary-category/parent": "Home & Garden", "primary-category/child": "Utilities"}
+
+    Simple elements like <advertiser-id>1234</advertiser-id> become:
+        {"advertiser-id": "1234"}
+
+    Special case: elements whose children all have the same tag (like
+    <link-types>) are collected into a list.
+    """
+    record: dict = {}
+
+    for child in elem:
+        if len(child) == 0:
+            # Simple element: <tag>value</tag>
+            record[child.tag] = (child.text or "").strip()
+            continue
+
+        first_tag = child[0].tag
+        if all(sub_child.tag == first_tag for sub_child in child):
+            # List of same-type elements (e.g., <link-types><link-type>...</link-type>...)
+            record[child.tag] = [(sub_child.text or "").strip() for sub_child in child]
+        else:
+            # Nested element with different children (e.g., <primary-category>)
+            prefix = f"{child.tag}/"
+            for sub_child in child:
+                record[prefix + sub_child.tag] = (sub_child.text or "").strip()
+
+    return record
+
+
+def iter_records(content: bytes, tag: str, wrapper_attribs: dict | None = None) -> Iterator[dict]:
+    """Yield each `tag` element of a CJ response as a flat dict.
+
+    Args:
+        content: Raw XML response body.
+        tag: The record tag (e.g. "advertiser" or "link"). The wrapper is
+            its plural (advertiser -> advertisers, link -> links).
+        wrapper_attribs: If given, filled with the wrapper element's
+            attributes (total-matched, records-returned, page-number) once
+            the wrapper is read, which is before its first record.
+
+    Raises:
+        ET.ParseError: If the XML is malformed.
+    """
+    parser = _pull_parser()
+    wrapper_tag = f"{tag}s"
+    wrapper = None
+    depth = 0  # open record elements, so nested same-tag elements stay in their record
+
+    def events() -> Iterator[tuple[str, object]]:
+        for start in range(0, len(content), CHUNK_SIZE):
+            parser.feed(content[start : start + CHUNK_SIZE])
+            yield from parser.read_events()
+        parser.close()
+        yield from parser.read_events()
+
+    try:
+        for event, elem in events():
+            if elem.tag == tag:
+                if event == "start":
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth:
+                    continue
+                yield element_to_dict(elem)
+                # Drop the finished record so the tree does not grow with the page
+                elem.clear()
+                if wrapper is not None:
+                    wrapper.clear()
+            elif event == "start" and elem.tag == wrapper_tag and wrapper is None and not depth:
+                wrapper = elem
+                if wrapper_attribs is not None:
+                    wrapper_attribs.update(elem.attrib)
+    except _LXML_ERRORS as e:
+        raise ET.ParseError(str(e)) from e
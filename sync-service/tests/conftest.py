@@ -1,16 +1,29 @@
 """Shared pytest fixtures for sync-service tests."""
 
 import sqlite3
+import threading
+from collections.abc import Iterable
 from pathlib import Path
 
+import httpx
 import pytest
 
-from src.config import load_config
+from src.config import SyncOptions, load_config
+from src.networks import ratelimit
+from src.networks.flexoffers import FlexOffersClient
 
 # Path to the SQLite schema
 SCHEMA_FILE = Path(__file__).parent.parent.parent / "database" / "schema.sqlite.sql"
 
 
+@pytest.fixture(autouse=True)
+def no_rate_limits():
+    """Send mocked requests without pacing them to the real APIs' limits."""
+    ratelimit.configure(enabled=False)
+    yield
+    ratelimit.configure()
+
+
 @pytest.fixture
 def conn():
     """Create an in-memory SQLite database with the schema."""
@@ -25,14 +38,109 @@ def conn():
     connection.close()
 
 
+class FakeFlexOffersAPI:
+    """Serves FlexOffers /advertisers and /promotions for offline sync tests.
+
+    Advertisers and their ads can be changed between syncs. Test modules
+    subclass it for behaviour of their own (ETags, gzip, slow fetches).
+    """
+
+    def __init__(self, advertiser_ids: int | Iterable[int], ads_per_advertiser: int = 2):
+        """Initialize the fake API.
+
+        Args:
+            advertiser_ids: The advertisers to serve, or how many (IDs 1 to n).
+            ads_per_advertiser: Ads per advertiser, with link IDs
+                advertiser ID * 100 + n.
+        """
+        if isinstance(advertiser_ids, int):
+            advertiser_ids = range(1, advertiser_ids + 1)
+        # Advertiser records by ID, and the link IDs of each one's ads
+        self.advertisers = {i: self.advertiser(i) for i in advertiser_ids}
+        self.links = {i: [i * 100 + n for n in range(ads_per_advertiser)] for i in self.advertisers}
+        # Advertisers whose ads requests fail with a server error
+        self.failing: set[int] = set()
+        self.requests = 0
+        self.ad_requests: list[int] = []
+        self.lock = threading.Lock()
+
+    def advertiser(self, advertiser_id: int) -> dict:
+        return {
+            "id": advertiser_id,
+            "name": f"Advertiser {advertiser_id}",
+            "programStatus": "Approved",
+            "applicationStatus": "Approved",
+            "domainUrl": f"https://adv{advertiser_id}.example.com",
+        }
+
+    def ad(self, advertiser_id: int, link_id: int) -> dict:
+        return {
+            "linkId": link_id,
+            "linkName": f"Banner {link_id}",
+            "linkType": "Banner",
+            "imageUrl": "https://example.com/banner.jpg",
+            "linkUrl": "https://track.example.com/click",
+            "bannerWidth": 300,
+            "bannerHeight": 250,
+        }
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            self.requests += 1
+        if request.url.path.endswith("/advertisers"):
+            return httpx.Response(200, json={"results": list(self.advertisers.values())})
+
+        advertiser_id = int(request.url.params["advertiserIds"])
+        with self.lock:
+            self.ad_requests.append(advertiser_id)
+        if advertiser_id in self.failing:
+            return httpx.Response(500)
+        ads = [self.ad(advertiser_id, link_id) for link_id in self.links[advertiser_id]]
+        return httpx.Response(200, json={"results": ads, "totalCount": len(ads)})
+
+    async def ahandle(self, request: httpx.Request) -> httpx.Response:
+        return self.handle(request)
+
+
+@pytest.fixture
+def fake_flexoffers_client():
+    """Provide a function creating a FlexOffers client served by a FakeFlexOffersAPI.
+
+    Call it with the fake API and optionally the client class (e.g.
+    AsyncFlexOffersClient, or a subclass overriding a sync step).
+    """
+
+    def make(api: FakeFlexOffersAPI, cls: type = FlexOffersClient) -> FlexOffersClient:
+        client = cls("test-key", domain="rvtravellife.com")
+        client._client = httpx.Client(
+            transport=httpx.MockTransport(api.handle), headers=client._client.headers
+        )
+        if hasattr(client, "_aclient"):
+            client._aclient = httpx.AsyncClient(
+                transport=httpx.MockTransport(api.ahandle), headers=client._aclient.headers
+            )
+        return client
+
+    return make
+
+
+@pytest.fixture
+def fake_flexoffers_sync(fake_flexoffers_client):
+    """Provide a function running a FlexOffers sync for rvtravellife.com against a fake API."""
+
+    def sync(conn, api: FakeFlexOffersAPI, options: SyncOptions | None = None) -> dict:
+        client = fake_flexoffers_client(api)
+        return client.sync(conn, site_domain="rvtravellife.com", options=options)
+
+    return sync
+
+
 @pytest.fixture
 def flexoffers_client():
     """Provide FlexOffersClient for first configured domain.
 
     Skips test if FLEXOFFERS_DOMAIN_KEYS environment variable is not set.
     """
-    from src.networks.flexoffers import FlexOffersClient
-
     config = load_config()
     if not config.flexoffers_domain_keys:
         pytest.skip("FLEXOFFERS_DOMAIN_KEYS not configured")
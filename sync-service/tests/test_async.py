@@ -0,0 +1,76 @@
+"""Offline tests for the async client layer (httpx.MockTransport, no credentials)."""
+
+import asyncio
+
+import httpx
+
+from src.config import SyncOptions
+from src.networks.flexoffers import AsyncFlexOffersClient
+
+from .conftest import FakeFlexOffersAPI
+
+
+class ConcurrencyTrackingAPI(FakeFlexOffersAPI):
+    """Tracks how many ads requests are in flight at once on the async client."""
+
+    def __init__(self, advertiser_count: int, ads_per_advertiser: int = 2):
+        super().__init__(advertiser_count, ads_per_advertiser)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ahandle(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self.handle(request)
+
+
+class TestAsyncSync:
+    """Test AsyncNetworkClient.async_sync against the blocking sync()."""
+
+    def test_matches_blocking_sync(self, conn, fake_flexoffers_client):
+        """Async sync should write the same rows and stats as sync()."""
+        api = FakeFlexOffersAPI(5)
+
+        blocking_stats = fake_flexoffers_client(api, AsyncFlexOffersClient).sync(
+            conn, site_domain="rvtravellife.com"
+        )
+        blocking_ads = conn.execute("SELECT network_ad_id, raw_hash FROM ads").fetchall()
+
+        async_stats = asyncio.run(
+            fake_flexoffers_client(api, AsyncFlexOffersClient).async_sync(
+                conn, site_domain="rvtravellife.com", options=SyncOptions(async_concurrency=3)
+            )
+        )
+        async_ads = conn.execute("SELECT network_ad_id, raw_hash FROM ads").fetchall()
+
+        assert async_stats == blocking_stats
+        assert async_stats["advertisers_synced"] == 5
+        assert async_stats["ads_synced"] == 10
+        assert sorted(map(tuple, async_ads)) == sorted(map(tuple, blocking_ads))
+
+        logs = conn.execute("SELECT status FROM sync_logs ORDER BY id").fetchall()
+        assert [row["status"] for row in logs] == ["success", "success"]
+
+    def test_respects_concurrency_cap(self, conn, fake_flexoffers_client):
+        """No more than max_concurrency advertisers should be fetched at once."""
+        api = ConcurrencyTrackingAPI(12)
+        client = fake_flexoffers_client(api, AsyncFlexOffersClient)
+
+        stats = asyncio.run(client.async_sync(conn, options=SyncOptions(async_concurrency=3)))
+
+        assert stats["ads_synced"] == 24
+        assert 1 < api.max_in_flight <= 3
+
+    def test_deletes_stale_ads(self, conn, fake_flexoffers_client):
+        """Ads no longer returned should be deleted, as in sync()."""
+        api = FakeFlexOffersAPI(2, ads_per_advertiser=3)
+        asyncio.run(fake_flexoffers_client(api, AsyncFlexOffersClient).async_sync(conn))
+
+        api.links = {1: [100], 2: [200]}
+        stats = asyncio.run(fake_flexoffers_client(api, AsyncFlexOffersClient).async_sync(conn))
+
+        assert stats["ads_deleted"] == 4
+        remaining = conn.execute("SELECT COUNT(*) AS cnt FROM ads").fetchone()["cnt"]
+        assert remaining == 2
@@ -0,0 +1,96 @@
+"""Tests for compressed transfer and per-endpoint byte accounting."""
+
+import gzip
+import json
+
+import httpx
+import pytest
+
+from src.networks import bandwidth
+from src.networks.flexoffers import FlexOffersClient
+
+from .conftest import FakeFlexOffersAPI
+
+
+class GzipFlexOffersAPI(FakeFlexOffersAPI):
+    """Serves long ad names, gzip-compressed when the client accepts it."""
+
+    def __init__(self, advertiser_count: int):
+        super().__init__(advertiser_count, ads_per_advertiser=5)
+        self.accept_encoding: set[str] = set()
+
+    def ad(self, advertiser_id: int, link_id: int) -> dict:
+        return {**super().ad(advertiser_id, link_id), "linkName": "Banner " * 20}
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        accepted = request.headers.get("Accept-Encoding", "")
+        self.accept_encoding.add(accepted)
+        body = super().handle(request).content
+        if "gzip" in accepted:
+            return httpx.Response(
+                200,
+                content=gzip.compress(body),
+                headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+            )
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+
+
+class TestEndpointLabel:
+    """Test endpoint_label()."""
+
+    def test_last_path_segment(self):
+        assert bandwidth.endpoint_label("https://api.impact.com/Mediapartners/IR1/Ads") == "Ads"
+        assert (
+            bandwidth.endpoint_label("https://link-search.api.cj.com/v2/link-search?page-number=2")
+            == "link-search"
+        )
+
+    def test_skips_numeric_ids(self):
+        assert bandwidth.endpoint_label("https://api.awin.com/publishers/123/programmes/") == (
+            "programmes"
+        )
+        assert bandwidth.endpoint_label("https://api.example.com/ads/42") == "ads"
+
+
+class TestTransferAccounting:
+    """Test compression negotiation and byte counts through a sync."""
+
+    def test_clients_accept_compression(self):
+        """Every client offers gzip (and brotli when it can decode it)."""
+        client = FlexOffersClient("test-key", domain="rvtravellife.com")
+
+        assert client._client.headers["Accept-Encoding"] == bandwidth.ACCEPT_ENCODING
+        assert "gzip" in bandwidth.ACCEPT_ENCODING
+
+    def test_sync_records_wire_and_decoded_bytes(self, conn, fake_flexoffers_client):
+        """Bytes per endpoint are logged on the sync_logs row, compressed and decoded."""
+        api = GzipFlexOffersAPI(3)
+        client = fake_flexoffers_client(api)
+
+        client.sync(conn, site_domain="rvtravellife.com")
+
+        row = conn.execute(
+            "SELECT bytes_wire, bytes_decoded, transfer FROM sync_logs ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        transfer = json.loads(row["transfer"])
+        assert api.accept_encoding == {bandwidth.ACCEPT_ENCODING}
+        assert transfer["advertisers"]["requests"] == 1
+        assert transfer["promotions"]["requests"] == 3
+        assert 0 < row["bytes_wire"] < row["bytes_decoded"]
+        assert row["bytes_decoded"] == sum(t["decoded"] for t in transfer.values())
+        assert client.transfer.totals()["wire"] == row["bytes_wire"]
+
+    def test_failed_sync_keeps_byte_counts(self, conn, monkeypatch, fake_flexoffers_client):
+        """A run that fails still records what it downloaded."""
+        client = fake_flexoffers_client(GzipFlexOffersAPI(1))
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(client, "_finish_sync", fail)
+        with pytest.raises(RuntimeError):
+            client.sync(conn, site_domain="rvtravellife.com")
+
+        row = conn.execute("SELECT status, bytes_wire FROM sync_logs").fetchone()
+        assert row["status"] == "failed"
+        assert row["bytes_wire"] > 0
@@ -0,0 +1,103 @@
+"""Offline tests for recording and replaying network traffic (httpx.MockTransport)."""
+
+import asyncio
+import gzip
+
+import httpx
+
+from src.networks import cassette
+from src.networks.flexoffers import AsyncFlexOffersClient, FlexOffersClient
+
+from .conftest import FakeFlexOffersAPI
+
+
+def _record(conn, tmp_path, client: FlexOffersClient) -> dict:
+    recorded = cassette.record(client, str(tmp_path))
+    stats = client.sync(conn, site_domain="rvtravellife.com")
+    recorded.save()
+    return stats
+
+
+def _ad_count(conn) -> int:
+    return conn.execute("SELECT COUNT(*) AS cnt FROM ads").fetchone()["cnt"]
+
+
+class TestCassette:
+    """Test recording a sync and replaying it into a fresh client and database."""
+
+    def test_replay_matches_recording(self, conn, tmp_path, fake_flexoffers_client):
+        """A replayed sync writes the same data without reaching the API."""
+        api = FakeFlexOffersAPI(3)
+        recorded = _record(conn, tmp_path, fake_flexoffers_client(api))
+        conn.execute("DELETE FROM ads")
+        conn.execute("DELETE FROM advertisers")
+
+        client = FlexOffersClient("test-key", domain="rvtravellife.com")
+        played = cassette.replay(client, str(tmp_path))
+        stats = client.sync(conn, site_domain="rvtravellife.com")
+
+        assert api.requests == 4
+        assert played.played == 4 and played.missed == 0
+        assert stats["ads_synced"] == recorded["ads_synced"] == 6
+        assert _ad_count(conn) == 6
+
+    def test_file_is_compressed_without_credentials(self, conn, tmp_path, fake_flexoffers_client):
+        """Cassettes are gzip files per client, and request headers are not kept."""
+        _record(conn, tmp_path, fake_flexoffers_client(FakeFlexOffersAPI(1)))
+
+        path = tmp_path / "flexoffers-rvtravellife.com.jsonl.gz"
+        text = gzip.decompress(path.read_bytes()).decode()
+
+        assert "Advertiser 1" in text
+        assert "test-key" not in text
+
+    def test_async_client_replay(self, conn, tmp_path, fake_flexoffers_client):
+        """Async clients replay through both their blocking and async clients."""
+        _record(conn, tmp_path, fake_flexoffers_client(FakeFlexOffersAPI(3)))
+        conn.execute("DELETE FROM ads")
+
+        client = AsyncFlexOffersClient("test-key", domain="rvtravellife.com")
+        played = cassette.replay(client, str(tmp_path))
+        stats = asyncio.run(client.async_sync(conn, site_domain="rvtravellife.com"))
+
+        assert played.missed == 0
+        assert stats["ads_synced"] == 6
+
+    def test_injected_rate_limits_are_retried(self, conn, tmp_path, fake_flexoffers_client):
+        """Every Nth request is rate limited first, and the retry gets the recording."""
+        _record(conn, tmp_path, fake_flexoffers_client(FakeFlexOffersAPI(3)))
+        conn.execute("DELETE FROM ads")
+
+        client = FlexOffersClient("test-key", domain="rvtravellife.com")
+        options = cassette.ReplayOptions(rate_limit_every=2, retry_after=0.01)
+        played = cassette.replay(client, str(tmp_path), options)
+        stats = client.sync(conn, site_domain="rvtravellife.com")
+
+        assert played.rate_limited >= 2
+        assert stats["ads_synced"] == 6
+        assert stats["errors"] == 0
+
+    def test_unrecorded_request_is_a_404(self, tmp_path):
+        """Requests missing from the cassette never fall through to the network."""
+        client = FlexOffersClient("test-key", domain="rvtravellife.com")
+        cassette.Cassette(cassette.cassette_path(str(tmp_path), client)).save()
+        played = cassette.replay(client, str(tmp_path))
+
+        assert client.fetch_ads("1") == []
+        assert played.missed == 1
+
+    def test_query_tokens_are_redacted(self, tmp_path):
+        """Tokens in the query string are not stored, and replay under another token."""
+        path = str(tmp_path / "awin.jsonl.gz")
+        recording = cassette.Cassette(path)
+        url = "https://api.awin.com/publishers/1/programmes"
+        request = httpx.Request("GET", url, params={"accessToken": "token-a", "page": "1"})
+        recording.record(request, httpx.Response(200, json={"ok": True}))
+        recording.save()
+
+        assert "token-a" not in gzip.decompress((tmp_path / "awin.jsonl.gz").read_bytes()).decode()
+
+        played = cassette.Cassette.load(path)
+        other = httpx.Request("GET", url, params={"accessToken": "token-b", "page": "1"})
+        assert played.play(other).json() == {"ok": True}
+        assert played.missed == 0
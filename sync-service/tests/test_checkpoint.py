@@ -0,0 +1,73 @@
+"""Offline tests for sync checkpoints and --resume (httpx.MockTransport, no credentials)."""
+
+import json
+
+import httpx
+import pytest
+
+from src.config import SyncOptions
+
+from .conftest import FakeFlexOffersAPI
+
+
+class CrashingAPI(FakeFlexOffersAPI):
+    """Dies on one advertiser's ads request."""
+
+    def __init__(self, advertiser_count: int, crash_on: int):
+        super().__init__(advertiser_count)
+        self.crash_on = crash_on
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.params.get("advertiserIds") == str(self.crash_on):
+            # Stands in for the process being killed (CI timeout, SIGINT)
+            raise KeyboardInterrupt
+        return super().handle(request)
+
+
+def _interrupted_run(conn, make_client, options: SyncOptions) -> None:
+    """Sync 5 advertisers, dying on the 4th, then roll back like get_connection()."""
+    with pytest.raises(KeyboardInterrupt):
+        make_client(CrashingAPI(5, crash_on=4)).sync(conn, options=options)
+    conn.rollback()
+
+
+@pytest.mark.parametrize("mode", ["default", "pipeline"])
+class TestResume:
+    """Test resuming an interrupted sync from its sync_logs checkpoint."""
+
+    def test_resume_skips_completed_advertisers(self, conn, mode, fake_flexoffers_client):
+        """A resumed run should only fetch ads for advertisers after the checkpoint."""
+        options = SyncOptions(mode=mode, checkpoint_interval=2, pipeline_queue_size=1)
+        _interrupted_run(conn, fake_flexoffers_client, options)
+
+        row = conn.execute("SELECT id, status, checkpoint FROM sync_logs").fetchone()
+        assert row["status"] == "running"
+        assert json.loads(row["checkpoint"])["completed_advertiser_ids"] == ["1", "2"]
+        assert conn.execute("SELECT COUNT(*) AS cnt FROM ads").fetchone()["cnt"] == 4
+
+        api = FakeFlexOffersAPI(5)
+        resume = SyncOptions(mode=mode, checkpoint_interval=2, resume=True)
+        stats = fake_flexoffers_client(api).sync(conn, options=resume)
+
+        assert api.ad_requests == [3, 4, 5]
+        assert stats["advertisers_synced"] == 5
+        assert stats["ads_synced"] == 10
+
+        logs = conn.execute("SELECT id, status, checkpoint, ads_synced FROM sync_logs").fetchall()
+        assert len(logs) == 1
+        assert logs[0]["id"] == row["id"]
+        assert logs[0]["status"] == "success"
+        assert logs[0]["checkpoint"] is None
+        assert logs[0]["ads_synced"] == 10
+
+    def test_without_resume_starts_over(self, conn, mode, fake_flexoffers_client):
+        """Without resume, an interrupted run is left alone and a new log starts."""
+        options = SyncOptions(mode=mode, checkpoint_interval=2)
+        _interrupted_run(conn, fake_flexoffers_client, options)
+
+        api = FakeFlexOffersAPI(5)
+        fake_flexoffers_client(api).sync(conn, options=options)
+
+        assert api.ad_requests == [1, 2, 3, 4, 5]
+        statuses = [r["status"] for r in conn.execute("SELECT status FROM sync_logs ORDER BY id")]
+        assert statuses == ["running", "success"]
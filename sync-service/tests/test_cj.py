@@ -0,0 +1,342 @@
+"""Offline tests for CJClient (httpx.MockTransport, no credentials)."""
+
+import threading
+from html import escape
+
+import httpx
+import pytest
+
+from src import db
+from src.config import SyncOptions
+from src.networks.base import NetworkClient
+from src.networks.cj import CJAdvertiserCache, CJClient, substitute_pid
+
+CID = "7000001"
+WEBSITE_IDS = {"rvtravellife.com": "100001", "thisoldcampsite.com": "100002"}
+
+
+def _advertiser_xml(advertiser_id: int) -> str:
+    return f"""<advertiser>
+      <advertiser-id>{advertiser_id}</advertiser-id>
+      <account-status>Active</account-status>
+      <seven-day-epc>20.00</seven-day-epc>
+      <advertiser-name>Advertiser {advertiser_id}</advertiser-name>
+      <program-url>https://adv{advertiser_id}.example.com</program-url>
+      <relationship-status>joined</relationship-status>
+      <network-rank>5</network-rank>
+      <primary-category><parent>Travel</parent><child>Camping</child></primary-category>
+    </advertiser>"""
+
+
+def _link_xml(advertiser_id: int, link_id: int, pid: str) -> str:
+    click_url = f"https://www.tkqlhce.com/click-{pid}-{link_id}-1700475083000"
+    image_url = f"https://www.ftjcfx.com/image-{pid}-{link_id}"
+    link_code = escape(f'<a href="{click_url}"><img src="{image_url}" /></a>')
+    return f"""<link>
+      <advertiser-id>{advertiser_id}</advertiser-id>
+      <advertiser-name>Advertiser {advertiser_id}</advertiser-name>
+      <creative-height>250</creative-height>
+      <creative-width>300</creative-width>
+      <link-code-html>{link_code}</link-code-html>
+      <destination>https://adv{advertiser_id}.example.com/</destination>
+      <link-id>{link_id}</link-id>
+      <link-name>Banner {link_id}</link-name>
+      <link-type>Banner</link-type>
+      <seven-day-epc>N/A</seven-day-epc>
+      <image-url>{image_url}</image-url>
+      <clickUrl>{click_url}</clickUrl>
+    </link>"""
+
+
+class FakeCJAPI:
+    """Serves advertiser-lookup and link-search as XML, counting requests."""
+
+    def __init__(self, advertiser_count: int = 3, links_per_advertiser: int = 2):
+        self.advertiser_ids = [5000 + i for i in range(1, advertiser_count + 1)]
+        self.links_per_advertiser = links_per_advertiser
+        self.lookups = 0
+        self.link_searches: list[tuple[str, str]] = []
+        self.lock = threading.Lock()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        if "advertiser-lookup" in request.url.host:
+            with self.lock:
+                self.lookups += 1
+            requested = params["advertiser-ids"]
+            advertiser_ids = [
+                a for a in self.advertiser_ids if requested == "joined" or str(a) == requested
+            ]
+            body = "".join(_advertiser_xml(a) for a in advertiser_ids)
+            count = len(advertiser_ids)
+            return httpx.Response(
+                200,
+                text=f'<cj-api><advertisers total-matched="{count}" records-returned="{count}" '
+                f'page-number="1">{body}</advertisers></cj-api>',
+            )
+
+        pid = params["website-id"]
+        advertiser_id = int(params["advertiser-ids"])
+        with self.lock:
+            self.link_searches.append((pid, str(advertiser_id)))
+        links = [
+            _link_xml(advertiser_id, advertiser_id * 100 + n, pid)
+            for n in range(self.links_per_advertiser)
+        ]
+        return httpx.Response(
+            200,
+            text=f'<cj-api><links total-matched="{len(links)}" records-returned="{len(links)}" '
+            f'page-number="1">{"".join(links)}</links></cj-api>',
+        )
+
+
+def _clients(api: FakeCJAPI, **kwargs) -> list[CJClient]:
+    clients = []
+    for domain, website_id in WEBSITE_IDS.items():
+        client = CJClient("test-token", CID, website_id, domain=domain, **kwargs)
+        client._client = httpx.Client(transport=httpx.MockTransport(api.handle))
+        clients.append(client)
+    return clients
+
+
+def _rule_sites(conn) -> set[str]:
+    rows = conn.execute(
+        """SELECT DISTINCT s.domain FROM site_advertiser_rules r
+           JOIN sites s ON s.id = r.site_id"""
+    ).fetchall()
+    return {row["domain"] for row in rows}
+
+
+class TestAdvertiserCache:
+    """Test sharing advertiser-lookup across per-domain CJ clients."""
+
+    def test_advertisers_fetched_once_per_cid(self, conn):
+        """Every domain should sync, but advertiser-lookup is only crawled once."""
+        api = FakeCJAPI()
+        cache = CJAdvertiserCache()
+
+        stats = [c.sync(conn, site_domain=c.domain) for c in _clients(api, advertiser_cache=cache)]
+
+        assert api.lookups == 1
+        assert [s["advertisers_synced"] for s in stats] == [3, 3]
+        assert _rule_sites(conn) == set(WEBSITE_IDS)
+        # link-search still runs per website
+        assert {pid for pid, _ in api.link_searches} == set(WEBSITE_IDS.values())
+
+    def test_without_cache_each_domain_fetches(self, conn):
+        """Clients built without a shared cache keep their own lookups."""
+        api = FakeCJAPI()
+
+        for client in _clients(api):
+            client.sync(conn, site_domain=client.domain)
+
+        assert api.lookups == 2
+
+    def test_single_flight(self):
+        """Concurrent callers should share one in-flight fetch."""
+        cache = CJAdvertiserCache()
+        calls = 0
+        started = threading.Event()
+        release = threading.Event()
+
+        def fetch():
+            nonlocal calls
+            calls += 1
+            started.set()
+            release.wait(timeout=5)
+            return [{"advertiser-id": "1"}]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_advertisers(CID, fetch)))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        started.wait(timeout=5)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert calls == 1
+        assert results == [[{"advertiser-id": "1"}]] * 3
+
+    def test_upsert_skipped_for_later_domains(self, conn, monkeypatch):
+        """A second domain should reuse the advertiser IDs instead of upserting again."""
+        api = FakeCJAPI(advertiser_count=2)
+        first, second = _clients(api, advertiser_cache=CJAdvertiserCache())
+        first.sync(conn, site_domain=first.domain)
+
+        upserts = []
+        original = NetworkClient._upsert_advertiser
+
+        def counting_upsert(self, conn, adv_data):
+            upserts.append(adv_data["network_program_id"])
+            return original(self, conn, adv_data)
+
+        monkeypatch.setattr(NetworkClient, "_upsert_advertiser", counting_upsert)
+        second.sync(conn, site_domain=second.domain)
+
+        assert upserts == []
+
+    def test_freshness_is_per_domain(self, conn):
+        """Another domain's fetch does not make this domain's links fresh."""
+        api = FakeCJAPI(advertiser_count=2)
+        options = SyncOptions(ads_fresh_hours=6, full_sweep_every=0)
+        first, second = _clients(api, advertiser_cache=CJAdvertiserCache())
+
+        first.sync(conn, site_domain=first.domain, options=options)
+        stats = second.sync(conn, site_domain=second.domain, options=options)
+
+        assert stats["advertisers_fresh"] == 0
+        searched_by_second = {a for pid, a in api.link_searches if pid == second.website_id}
+        assert searched_by_second == {"5001", "5002"}
+
+        # Next run, each domain's own links are fresh
+        api.link_searches.clear()
+        for client in _clients(api, advertiser_cache=CJAdvertiserCache()):
+            stats = client.sync(conn, site_domain=client.domain, options=options)
+            assert stats["advertisers_fresh"] == 2
+        assert api.link_searches == []
+
+    def test_failed_sync_forgets_upserts(self, conn):
+        """Advertiser IDs from a sync that failed should not be reused by later domains."""
+        api = FakeCJAPI(advertiser_count=2)
+        cache = CJAdvertiserCache()
+        first, second = _clients(api, advertiser_cache=cache)
+
+        def failing_finish(conn, progress):
+            raise RuntimeError("connection lost")
+
+        first._finish_sync = failing_finish
+        with pytest.raises(RuntimeError):
+            first.sync(conn, site_domain=first.domain)
+
+        assert cache._upserted == {}
+        second.sync(conn, site_domain=second.domain)
+        assert len(cache._upserted) == 2
+
+
+class TestSharedLinkSearch:
+    """Test deriving per-PID links from one link-search per advertiser."""
+
+    def test_substitute_pid(self):
+        """Only the PID inside click/image URLs should change."""
+        link = {
+            "link-id": "11470088",
+            "clickUrl": "https://www.tkqlhce.com/click-3074780-11470088-1700475083000",
+            "link-code-html": '<a href="https://www.tkqlhce.com/click-3074780-11470088">x</a>'
+            '<img src="https://www.ftjcfx.com/image-3074780-11470088" />',
+            "description": "Save 3074780 ways",
+            "link-types": ["Banner"],
+        }
+
+        derived = substitute_pid(link, "3074780", "999")
+
+        assert derived["clickUrl"] == "https://www.tkqlhce.com/click-999-11470088-1700475083000"
+        assert "click-999-11470088" in derived["link-code-html"]
+        assert "image-999-11470088" in derived["link-code-html"]
+        assert derived["description"] == "Save 3074780 ways"
+        assert derived["link-types"] == ["Banner"]
+
+    def test_links_searched_once_per_advertiser(self, conn):
+        """After verification, later domains should reuse the first domain's links."""
+        api = FakeCJAPI(advertiser_count=4)
+        cache = CJAdvertiserCache(share_links=True, domains=2, verify_sample=1)
+        first, second = _clients(api, advertiser_cache=cache)
+
+        first.sync(conn, site_domain=first.domain)
+        first_ads = {
+            row["network_ad_id"]: row["tracking_url"]
+            for row in conn.execute("SELECT network_ad_id, tracking_url FROM ads")
+        }
+        second.sync(conn, site_domain=second.domain)
+        second_ads = {
+            row["network_ad_id"]: row["tracking_url"]
+            for row in conn.execute("SELECT network_ad_id, tracking_url FROM ads")
+        }
+
+        searched_by_second = [a for pid, a in api.link_searches if pid == second.website_id]
+        # One verification search, then everything else is derived
+        assert len(searched_by_second) == 1
+        assert set(second_ads) == set(first_ads)
+        assert all(f"click-{second.website_id}-" in url for url in second_ads.values())
+        # Every entry was read by the second domain and evicted
+        assert cache.take_links(CID, str(api.advertiser_ids[-1]), "100003") is None
+
+    def test_mismatch_disables_sharing(self, conn):
+        """If derived links differ from the real ones, the domain searches everything."""
+        api = FakeCJAPI(advertiser_count=3)
+        cache = CJAdvertiserCache(share_links=True, domains=2, verify_sample=2)
+        first, second = _clients(api, advertiser_cache=cache)
+        first.sync(conn, site_domain=first.domain)
+
+        # The real link-search for the second PID now returns an extra link
+        api.links_per_advertiser = 3
+        second.sync(conn, site_domain=second.domain)
+
+        searched_by_second = [a for pid, a in api.link_searches if pid == second.website_id]
+        assert len(searched_by_second) == 3
+        ads = conn.execute("SELECT COUNT(*) AS cnt FROM ads").fetchone()["cnt"]
+        assert ads == 9
+
+    def test_links_spill_to_disk(self):
+        """Past spill_threshold, shared links are read back from a temporary file."""
+        cache = CJAdvertiserCache(share_links=True, domains=3, spill_threshold=2)
+        links = {a: [{"link-id": f"{a}0{n}"} for n in range(2)] for a in ("1", "2")}
+        for advertiser_id, advertiser_links in links.items():
+            cache.put_links(CID, advertiser_id, "100001", advertiser_links)
+
+        spool = cache._link_spool
+        assert spool.spilled
+        # Every domain but the first reads each advertiser's links
+        for pid in ("100002", "100003"):
+            for advertiser_id, advertiser_links in links.items():
+                assert cache.take_links(CID, advertiser_id, pid) == ("100001", advertiser_links)
+
+        assert cache.take_links(CID, "1", "100003") is None
+        # The temporary file goes once every entry has been read
+        assert cache._link_spool is None
+        assert not spool.spilled
+
+    def test_skipped_links_are_released(self, conn):
+        """Links a later domain never reads are dropped when its run is over."""
+        api = FakeCJAPI(advertiser_count=2)
+        cache = CJAdvertiserCache(share_links=True, domains=2, verify_sample=0)
+        first, second = _clients(api, advertiser_cache=cache)
+        first.sync(conn, site_domain=first.domain)
+        assert len(cache._links) == 2
+
+        # The second domain's ads of 5001 are fresh, so it never reads them
+        options = SyncOptions(ads_fresh_hours=6, full_sweep_every=0)
+        site_id = conn.execute(
+            "SELECT id FROM sites WHERE domain = ?", (second.domain,)
+        ).fetchone()["id"]
+        advertiser_id = conn.execute(
+            "SELECT id FROM advertisers WHERE network_advertiser_id = '5001'"
+        ).fetchone()["id"]
+        db.mark_ads_synced(conn, advertiser_id, site_id)
+        stats = second.sync(conn, site_domain=second.domain, options=options)
+
+        assert stats["advertisers_fresh"] == 1
+        assert cache._links == {}
+        assert cache._link_spool is None
+        # Nothing is shared again once both domains are done
+        cache.put_links(CID, "5001", first.website_id, [{"link-id": "1"}])
+        assert cache._links == {}
+
+
+class TestResyncAdvertiser:
+    """Test CJClient.resync_advertiser() (targeted `sync --advertiser`)."""
+
+    def test_single_lookup_and_link_search(self, conn):
+        """One advertiser costs one advertiser-lookup and one link-search."""
+        api = FakeCJAPI(advertiser_count=5)
+        client = _clients(api)[0]
+
+        stats = client.resync_advertiser(conn, "5003", site_domain="rvtravellife.com")
+
+        assert api.lookups == 1
+        assert api.link_searches == [("100001", "5003")]
+        assert stats["advertisers_synced"] == 1
+        assert stats["ads_synced"] == 2
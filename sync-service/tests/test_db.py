@@ -138,6 +138,25 @@ class TestUpsertAdvertiser:
         assert row["is_active"] == 1
 
 
+    def test_known_hashes_skip_queries(self, conn):
+        """With a preloaded index, an unchanged advertiser needs no query."""
+        data = {
+            "network": "flexoffers",
+            "network_advertiser_id": "12345",
+            "name": "Indexed",
+            "raw_hash": "hash_1",
+        }
+        advertiser_id, _ = db.upsert_advertiser(conn, data)
+        known = db.load_advertiser_hashes(conn, "flexoffers")
+        assert known == {"12345": (advertiser_id, "hash_1")}
+
+        statements: list[str] = []
+        conn.set_trace_callback(statements.append)
+        assert db.upsert_advertiser(conn, data, known) == (advertiser_id, False)
+        conn.set_trace_callback(None)
+        assert statements == []
+
+
 class TestGetAdHash:
     """Test get_ad_hash function."""
 
@@ -278,6 +297,153 @@ class TestUpsertAd:
         ).fetchone()
         assert row["weight_override"] is None  # Not set by upsert
 
+    def test_known_hashes_skip_queries(self, conn, advertiser_id):
+        """With a preloaded index, unchanged ads need no query and writes update the index."""
+        data = {
+            "network": "flexoffers",
+            "network_ad_id": "link-123",
+            "advertiser_id": advertiser_id,
+            "tracking_url": "https://track.example.com",
+            "advert_name": "Indexed Ad",
+            "bannercode": "<a>test</a>",
+            "image_url": "",
+            "width": 300,
+            "height": 250,
+            "raw_hash": "hash_1",
+        }
+        known = db.load_ad_hashes(conn, "flexoffers")
+        assert known == {}
+
+        ad_id, was_changed = db.upsert_ad(conn, data, known)
+        assert was_changed is True
+        assert known == {"link-123": (ad_id, "hash_1")}
+        assert db.load_ad_hashes(conn, "flexoffers") == known
+
+        statements: list[str] = []
+        conn.set_trace_callback(statements.append)
+        assert db.upsert_ad(conn, data, known) == (ad_id, False)
+        conn.set_trace_callback(None)
+        assert statements == []
+
+        assert db.upsert_ad(conn, {**data, "raw_hash": "hash_2"}, known) == (ad_id, True)
+        assert known["link-123"] == (ad_id, "hash_2")
+
+
+    @pytest.mark.parametrize("returning", [True, False])
+    def test_write_returns_id_without_select(self, conn, advertiser_id, monkeypatch, returning):
+        """Inserts and updates return the row ID from the write itself (RETURNING)."""
+        monkeypatch.setattr(db, "_SQLITE_RETURNING", returning)
+        data = {
+            "network": "flexoffers",
+            "network_ad_id": "link-1",
+            "advertiser_id": advertiser_id,
+            "tracking_url": "https://track.example.com",
+            "advert_name": "Ad",
+            "bannercode": "<a>test</a>",
+            "width": 300,
+            "height": 250,
+            "raw_hash": "hash_1",
+        }
+        known = db.load_ad_hashes(conn, "flexoffers")
+        statements: list[str] = []
+        conn.set_trace_callback(statements.append)
+
+        inserted_id, _ = db.upsert_ad(conn, data, known)
+        updated_id, _ = db.upsert_ad(conn, {**data, "raw_hash": "hash_2"}, known)
+
+        conn.set_trace_callback(None)
+        # (The trace repeats a statement once per trigger it fires, so only SELECTs are counted)
+        selects = [sql for sql in statements if sql.lstrip().startswith("SELECT")]
+        assert len(selects) == (0 if returning else 2)
+        assert inserted_id == updated_id
+        assert conn.execute("SELECT id FROM ads").fetchone()["id"] == inserted_id
+
+
+class TestBatchUpsert:
+    """Test upsert_ads and upsert_advertisers."""
+
+    @pytest.fixture
+    def advertiser_id(self, conn):
+        """Create a test advertiser and return its ID."""
+        conn.execute(
+            "INSERT INTO advertisers (network, network_advertiser_id, name) "
+            "VALUES ('flexoffers', '1', 'Test Advertiser')"
+        )
+        return conn.execute("SELECT id FROM advertisers").fetchone()["id"]
+
+    def _ad(self, advertiser_id: int, n: int, raw_hash: str = "hash") -> dict:
+        return {
+            "network": "flexoffers",
+            "network_ad_id": f"link-{n}",
+            "advertiser_id": advertiser_id,
+            "tracking_url": f"https://track.example.com/{n}",
+            "advert_name": f"Ad {n}",
+            "bannercode": "<a>test</a>",
+            "width": 300,
+            "height": 250,
+            "raw_hash": f"{raw_hash}-{n}",
+        }
+
+    def test_writes_in_multi_row_statements(self, conn, advertiser_id):
+        """Rows are written batch_size per statement, with IDs and flags in order."""
+        rows = [self._ad(advertiser_id, n) for n in range(5)]
+        statements: list[str] = []
+        conn.set_trace_callback(statements.append)
+
+        results = db.upsert_ads(conn, rows, batch_size=2)
+
+        conn.set_trace_callback(None)
+        assert len([sql for sql in statements if sql.lstrip().startswith("INSERT")]) == 3
+        stored = dict(conn.execute("SELECT network_ad_id, id FROM ads").fetchall())
+        assert results == [(stored[f"link-{n}"], True) for n in range(5)]
+        row = conn.execute("SELECT * FROM ads WHERE network_ad_id = 'link-3'").fetchone()
+        assert row["advert_name"] == "Ad 3"
+        assert row["campaign_name"] == "General Promotion"
+        assert row["last_synced_at"] is not None
+
+    def test_only_changed_rows_are_written(self, conn, advertiser_id):
+        """Unchanged rows are skipped and changed ones updated, as with upsert_ad()."""
+        db.upsert_ads(conn, [self._ad(advertiser_id, n) for n in range(3)])
+        known = db.load_ad_hashes(conn, "flexoffers")
+        rows = [
+            self._ad(advertiser_id, 0),
+            {**self._ad(advertiser_id, 1, "changed"), "advert_name": "Updated"},
+            self._ad(advertiser_id, 3),
+        ]
+
+        results = db.upsert_ads(conn, rows, known)
+
+        assert [changed for _, changed in results] == [False, True, True]
+        assert known["link-1"][1] == "changed-1"
+        assert results[2][0] == known["link-3"][0]
+        row = conn.execute("SELECT advert_name FROM ads WHERE network_ad_id = 'link-1'").fetchone()
+        assert row["advert_name"] == "Updated"
+        assert db.load_ad_hashes(conn, "flexoffers") == known
+
+    def test_advertisers_reactivated(self, conn):
+        """Changed advertisers are written and reactivated."""
+        conn.execute(
+            "INSERT INTO advertisers (network, network_advertiser_id, name, raw_hash, is_active) "
+            "VALUES ('flexoffers', '1', 'Old', 'old_hash', 0)"
+        )
+        rows = [
+            {
+                "network": "flexoffers",
+                "network_advertiser_id": str(n),
+                "name": f"Adv {n}",
+                "raw_hash": f"hash-{n}",
+            }
+            for n in (1, 2)
+        ]
+
+        results = db.upsert_advertisers(conn, rows)
+
+        assert [changed for _, changed in results] == [True, True]
+        active = conn.execute(
+            "SELECT name, is_active FROM advertisers ORDER BY network_advertiser_id"
+        ).fetchall()
+        assert [tuple(row) for row in active] == [("Adv 1", 1), ("Adv 2", 1)]
+
 
 class TestSyncLog:
     """Test sync log functions."""
@@ -344,6 +510,49 @@ class TestSyncLog:
         assert row["status"] == "failed"
         assert row["error_message"] == "Connection timeout"
 
+    def test_resumable_sync_log_round_trip(self, conn):
+        """A running log with a checkpoint should be returned with it parsed."""
+        log_id = db.create_sync_log(conn, "cj", site_domain="rvtravellife.com")
+        db.save_sync_checkpoint(conn, log_id, {"completed_advertiser_ids": ["1", "2"]})
+
+        resumable = db.get_resumable_sync_log(conn, "cj", site_domain="rvtravellife.com")
+
+        assert resumable["id"] == log_id
+        assert resumable["status"] == "running"
+        assert resumable["checkpoint"] == {"completed_advertiser_ids": ["1", "2"]}
+        assert db.get_resumable_sync_log(conn, "cj", site_domain="other.com") is None
+
+    def test_resumable_sync_log_matches_null_site(self, conn):
+        """Networks synced for all sites (site_domain NULL) should be resumable."""
+        log_id = db.create_sync_log(conn, "impact")
+        db.save_sync_checkpoint(conn, log_id, {"completed_advertiser_ids": []})
+
+        assert db.get_resumable_sync_log(conn, "impact")["id"] == log_id
+
+    def test_no_resume_after_success(self, conn):
+        """Only the latest log counts, and a successful one is not resumable."""
+        failed_id = db.create_sync_log(conn, "awin")
+        db.save_sync_checkpoint(conn, failed_id, {"completed_advertiser_ids": ["1"]})
+        db.update_sync_log(conn, failed_id, status="failed", error_message="boom")
+        done_id = db.create_sync_log(conn, "awin")
+        db.update_sync_log(conn, done_id, status="success")
+
+        assert db.get_resumable_sync_log(conn, "awin") is None
+
+    def test_reopen_sync_log(self, conn):
+        """Reopening should reset status and clear the failure details."""
+        log_id = db.create_sync_log(conn, "awin")
+        db.update_sync_log(conn, log_id, status="failed", error_message="boom")
+
+        db.reopen_sync_log(conn, log_id)
+
+        row = conn.execute(
+            "SELECT status, error_message, completed_at FROM sync_logs WHERE id = ?", (log_id,)
+        ).fetchone()
+        assert row["status"] == "running"
+        assert row["error_message"] is None
+        assert row["completed_at"] is None
+
 
 class TestSiteLookup:
     """Test site lookup functions."""
@@ -409,6 +618,52 @@ class TestSiteAdvertiserRules:
         ).fetchone()
         assert row["rule"] == "allowed"
 
+    def test_ensure_rules_creates_missing_pairs(self, conn, advertiser_id):
+        """One call creates every missing pair and keeps existing rules."""
+        conn.execute(
+            "INSERT INTO advertisers (network, network_advertiser_id, name) "
+            "VALUES ('flexoffers', '2', 'Other')"
+        )
+        other_id = conn.execute(
+            "SELECT id FROM advertisers WHERE network_advertiser_id = '2'"
+        ).fetchone()["id"]
+        site_ids = [s["id"] for s in db.get_active_sites(conn)]
+        conn.execute(
+            "INSERT INTO site_advertiser_rules (site_id, advertiser_id, rule) "
+            "VALUES (?, ?, 'denied')",
+            (site_ids[0], advertiser_id),
+        )
+
+        created = db.ensure_site_advertiser_rules(
+            conn, site_ids, [advertiser_id, other_id, other_id]
+        )
+
+        assert created == 2 * len(site_ids) - 1
+        rules = {
+            (row["site_id"], row["advertiser_id"]): row["rule"]
+            for row in conn.execute("SELECT * FROM site_advertiser_rules")
+        }
+        assert len(rules) == 2 * len(site_ids)
+        assert rules[(site_ids[0], advertiser_id)] == "denied"
+        assert db.ensure_site_advertiser_rules(conn, site_ids, [advertiser_id, other_id]) == 0
+
+    def test_ensure_rules_ignores_concurrent_inserts(self, conn, advertiser_id):
+        """A rule another worker inserts after the NOT EXISTS check is not an error."""
+        site_ids = [s["id"] for s in db.get_active_sites(conn)]
+        # Stands in for a concurrent worker creating the same rule first
+        conn.execute(
+            """CREATE TRIGGER concurrent_rule BEFORE INSERT ON site_advertiser_rules
+               BEGIN
+                   INSERT INTO site_advertiser_rules (site_id, advertiser_id, rule)
+                   VALUES (NEW.site_id, NEW.advertiser_id, 'allowed');
+               END"""
+        )
+
+        db.ensure_site_advertiser_rules(conn, site_ids, [advertiser_id])
+
+        rules = conn.execute("SELECT rule FROM site_advertiser_rules").fetchall()
+        assert [row["rule"] for row in rules] == ["allowed"] * len(site_ids)
+
 
 class TestStaleCleanup:
     """Test stale data cleanup functions."""
@@ -444,20 +699,90 @@ class TestStaleCleanup:
         remaining = conn.execute("SELECT COUNT(*) as cnt FROM ads").fetchone()["cnt"]
         assert remaining == 2
 
+    def test_delete_stale_ads_beyond_variable_limit(self, conn, setup_advertiser_with_ads):
+        """A seen set larger than SQLite's variable limit is still one delete."""
+        adv_id = setup_advertiser_with_ads
+        seen = {"ad-1"} | {f"gone-{i}" for i in range(db._SQLITE_MAX_VARIABLES + 1)}
+
+        deleted = db.delete_stale_ads(conn, "flexoffers", adv_id, seen)
+
+        assert deleted == 2
+        assert conn.execute("SELECT COUNT(*) AS cnt FROM resync_seen_ads").fetchone()["cnt"] == 0
+
     def test_deactivate_stale_advertisers(self, conn):
-        """Should deactivate advertisers not in the seen set."""
+        """Should deactivate advertisers not staged as seen."""
         for i in range(1, 4):
             conn.execute(
                 "INSERT INTO advertisers (network, network_advertiser_id, name, is_active) "
                 "VALUES ('flexoffers', ?, ?, 1)",
                 (f"adv-{i}", f"Advertiser {i}"),
             )
+        log_id = db.create_sync_log(conn, "flexoffers")
 
         # Only adv-1 was seen
-        deactivated = db.deactivate_stale_advertisers(conn, "flexoffers", {"adv-1"})
+        db.stage_seen_advertisers(conn, log_id, ["adv-1"])
+        deactivated = db.deactivate_stale_advertisers(conn, "flexoffers", [log_id])
 
         assert deactivated == 2  # adv-2 and adv-3 deactivated
         active = conn.execute(
             "SELECT COUNT(*) as cnt FROM advertisers WHERE is_active = 1"
         ).fetchone()["cnt"]
         assert active == 1
+        staged = conn.execute("SELECT COUNT(*) AS cnt FROM sync_seen_advertisers").fetchone()
+        assert staged["cnt"] == 0
+
+    def test_delete_unseen_ads(self, conn, setup_advertiser_with_ads):
+        """Staged advertisers lose their unstaged ads in one statement, others keep theirs."""
+        adv_id = setup_advertiser_with_ads
+        conn.execute(
+            "INSERT INTO advertisers (network, network_advertiser_id, name) "
+            "VALUES ('flexoffers', '2', 'Not fetched')"
+        )
+        other_id = conn.execute("SELECT MAX(id) AS id FROM advertisers").fetchone()["id"]
+        conn.execute(
+            "INSERT INTO ads (network, network_ad_id, advertiser_id, tracking_url, "
+            "advert_name, bannercode, width, height) "
+            "VALUES ('flexoffers', 'other-1', ?, 'https://track.example.com', "
+            "'Ad', '<a>test</a>', 300, 250)",
+            (other_id,),
+        )
+        log_id = db.create_sync_log(conn, "flexoffers")
+
+        db.stage_seen_ads(conn, log_id, [(adv_id, "ad-1"), (adv_id, "ad-2")])
+        deleted = db.delete_unseen_ads(conn, "flexoffers", log_id)
+
+        assert deleted == 1  # ad-3; other-1 belongs to an advertiser not staged
+        remaining = {row["network_ad_id"] for row in conn.execute("SELECT network_ad_id FROM ads")}
+        assert remaining == {"ad-1", "ad-2", "other-1"}
+        assert conn.execute("SELECT COUNT(*) AS cnt FROM sync_seen_ads").fetchone()["cnt"] == 0
+
+    def test_deactivate_across_shard_logs(self, conn):
+        """Advertisers staged under any of the run's logs stay active."""
+        for i in range(1, 4):
+            conn.execute(
+                "INSERT INTO advertisers (network, network_advertiser_id, name, is_active) "
+                "VALUES ('flexoffers', ?, ?, 1)",
+                (f"adv-{i}", f"Advertiser {i}"),
+            )
+        first = db.create_sync_log(conn, "flexoffers")
+        second = db.create_sync_log(conn, "flexoffers")
+        db.stage_seen_advertisers(conn, first, ["adv-1"])
+        db.stage_seen_advertisers(conn, second, ["adv-2"])
+
+        deactivated = db.deactivate_stale_advertisers(conn, "flexoffers", [first, second])
+
+        assert deactivated == 1
+        inactive = conn.execute(
+            "SELECT network_advertiser_id FROM advertisers WHERE is_active = 0"
+        ).fetchall()
+        assert [row["network_advertiser_id"] for row in inactive] == ["adv-3"]
+
+    def test_nothing_staged_deactivates_nothing(self, conn):
+        """A run that saw no advertisers (e.g. an empty response) keeps them all active."""
+        conn.execute(
+            "INSERT INTO advertisers (network, network_advertiser_id, name, is_active) "
+            "VALUES ('flexoffers', 'adv-1', 'Advertiser 1', 1)"
+        )
+        log_id = db.create_sync_log(conn, "flexoffers")
+
+        assert db.deactivate_stale_advertisers(conn, "flexoffers", [log_id]) == 0
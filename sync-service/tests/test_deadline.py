@@ -0,0 +1,121 @@
+"""Offline tests for the per-network time budget and value-ordered scheduling."""
+
+import json
+
+import httpx
+import pytest
+
+from src.config import SyncOptions
+from src.networks import base
+
+from .conftest import FakeFlexOffersAPI
+
+
+class FakeClock:
+    """Stands in for the time module in networks.base; advances only when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class SlowFlexOffersAPI(FakeFlexOffersAPI):
+    """Serves advertisers with the given EPCs; every ads fetch takes `fetch_seconds`."""
+
+    def __init__(self, clock: FakeClock, epcs: dict[int, float], fetch_seconds: float = 6):
+        super().__init__(list(epcs), ads_per_advertiser=1)
+        for advertiser_id, epc in epcs.items():
+            self.advertisers[advertiser_id]["sevenDayEpc"] = epc
+        self.clock = clock
+        self.fetch_seconds = fetch_seconds
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if not request.url.path.endswith("/advertisers"):
+            self.clock.sleep(self.fetch_seconds)
+        return super().handle(request)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(base, "time", fake)
+    return fake
+
+
+def _skipped(conn) -> list[str] | None:
+    row = conn.execute(
+        "SELECT skipped_advertisers FROM sync_logs ORDER BY id DESC LIMIT 1"
+    ).fetchone()
+    return json.loads(row["skipped_advertisers"]) if row["skipped_advertisers"] else None
+
+
+class TestTimeBudget:
+    """Test SyncOptions.time_budget_seconds."""
+
+    @pytest.mark.parametrize("mode", ["default", "pipeline"])
+    def test_highest_epc_first_and_skips_at_deadline(self, conn, clock, mode, fake_flexoffers_sync):
+        """Advertisers should be synced by EPC until the budget runs out."""
+        api = SlowFlexOffersAPI(clock, {1: 1.0, 2: 4.0, 3: 2.0, 4: 3.0})
+        options = SyncOptions(mode=mode, time_budget_seconds=10)
+
+        fake_flexoffers_sync(conn, api, options)
+
+        assert api.ad_requests == [2, 4]
+        assert _skipped(conn) == ["1", "3"]
+        status = conn.execute("SELECT status FROM sync_logs").fetchone()["status"]
+        assert status == "success"
+
+    def test_skipped_advertisers_go_first_next_run(self, conn, clock, fake_flexoffers_sync):
+        """Advertisers skipped at the deadline should be synced first on the next run."""
+        api = SlowFlexOffersAPI(clock, {1: 1.0, 2: 4.0, 3: 2.0, 4: 3.0})
+        options = SyncOptions(time_budget_seconds=10)
+
+        fake_flexoffers_sync(conn, api, options)
+        api.ad_requests.clear()
+        fake_flexoffers_sync(conn, api, options)
+
+        assert api.ad_requests == [3, 1]
+        assert _skipped(conn) == ["2", "4"]
+
+    def test_allowed_advertisers_before_epc(self, conn, clock, fake_flexoffers_sync):
+        """An advertiser allowed on a site should outrank higher-EPC advertisers."""
+        api = SlowFlexOffersAPI(clock, {1: 1.0, 2: 4.0, 3: 2.0})
+        fake_flexoffers_sync(conn, api, SyncOptions())
+        conn.execute(
+            """UPDATE site_advertiser_rules SET rule = 'allowed'
+               WHERE advertiser_id = (
+                   SELECT id FROM advertisers WHERE network_advertiser_id = '1'
+               )"""
+        )
+
+        api.ad_requests.clear()
+        fake_flexoffers_sync(conn, api, SyncOptions(time_budget_seconds=10))
+
+        assert api.ad_requests == [1, 2]
+
+    def test_skipped_advertisers_stay_active(self, conn, clock, fake_flexoffers_sync):
+        """Skipping an advertiser at the deadline must not deactivate it or its ads."""
+        api = SlowFlexOffersAPI(clock, {1: 1.0, 2: 4.0})
+        fake_flexoffers_sync(conn, api, SyncOptions())
+
+        fake_flexoffers_sync(conn, api, SyncOptions(time_budget_seconds=1))
+
+        active = conn.execute(
+            "SELECT COUNT(*) AS cnt FROM advertisers WHERE is_active = 1"
+        ).fetchone()["cnt"]
+        assert active == 2
+        assert conn.execute("SELECT COUNT(*) AS cnt FROM ads").fetchone()["cnt"] == 2
+
+    def test_no_budget_keeps_api_order(self, conn, clock, fake_flexoffers_sync):
+        """Without a budget advertisers are synced in API order and none are skipped."""
+        api = SlowFlexOffersAPI(clock, {1: 1.0, 2: 4.0, 3: 2.0})
+
+        fake_flexoffers_sync(conn, api, SyncOptions())
+
+        assert api.ad_requests == [1, 2, 3]
+        assert _skipped(conn) is None
@@ -0,0 +1,93 @@
+"""Offline tests for skipping the ads fetch of fresh, unchanged advertisers."""
+
+from dataclasses import replace
+
+from src.config import SyncOptions
+
+from .conftest import FakeFlexOffersAPI
+
+
+class TestAdsFreshness:
+    """Test SyncOptions.ads_fresh_hours and full_sweep_every."""
+
+    def test_skips_unchanged_advertisers(self, conn, fake_flexoffers_sync):
+        """Only new or changed advertisers should have their ads refetched."""
+        api = FakeFlexOffersAPI(3, ads_per_advertiser=1)
+        options = SyncOptions(ads_fresh_hours=6, full_sweep_every=0)
+
+        fake_flexoffers_sync(conn, api, options)
+        assert api.ad_requests == [1, 2, 3]
+
+        api.ad_requests.clear()
+        stats = fake_flexoffers_sync(conn, api, options)
+        assert api.ad_requests == []
+        assert stats["advertisers_fresh"] == 3
+        assert stats["ads_deleted"] == 0
+        assert conn.execute("SELECT COUNT(*) AS cnt FROM ads").fetchone()["cnt"] == 3
+
+        api.advertisers[2]["name"] = "Advertiser 2 (renamed)"
+        stats = fake_flexoffers_sync(conn, api, options)
+        assert api.ad_requests == [2]
+        assert stats["advertisers_fresh"] == 2
+
+    def test_disabled_by_default(self, conn, fake_flexoffers_sync):
+        """Without a freshness window every run fetches every advertiser's ads."""
+        api = FakeFlexOffersAPI(2, ads_per_advertiser=1)
+
+        fake_flexoffers_sync(conn, api, SyncOptions())
+        fake_flexoffers_sync(conn, api, SyncOptions())
+
+        assert api.ad_requests == [1, 2, 1, 2]
+
+    def test_full_sweep_every_nth_run(self, conn, fake_flexoffers_sync):
+        """Every Nth run should refetch all ads even when they are fresh."""
+        api = FakeFlexOffersAPI(2, ads_per_advertiser=1)
+        options = SyncOptions(ads_fresh_hours=6, full_sweep_every=2)
+
+        fetched_per_run = []
+        for _ in range(4):
+            api.ad_requests.clear()
+            fake_flexoffers_sync(conn, api, options)
+            fetched_per_run.append(len(api.ad_requests))
+
+        # Run 1 has nothing synced yet; runs 2 and 4 are full sweeps
+        assert fetched_per_run == [2, 2, 0, 2]
+
+    def test_incomplete_ads_are_not_marked_synced(self, conn, fake_flexoffers_sync):
+        """An advertiser whose ads crawl failed keeps its ads and is fetched again next run."""
+        api = FakeFlexOffersAPI(2, ads_per_advertiser=1)
+        options = SyncOptions(ads_fresh_hours=6, full_sweep_every=0)
+        fake_flexoffers_sync(conn, api, options)
+
+        # A failed crawl is not marked synced, and nothing of advertiser 2 is deleted
+        conn.execute("UPDATE advertisers SET ads_synced_at = NULL")
+        api.failing = {2}
+        stats = fake_flexoffers_sync(conn, api, options)
+        assert stats["ads_deleted"] == 0
+        assert conn.execute("SELECT COUNT(*) AS cnt FROM ads").fetchone()["cnt"] == 2
+        synced = conn.execute(
+            "SELECT network_advertiser_id FROM advertisers WHERE ads_synced_at IS NOT NULL"
+        ).fetchall()
+        assert [row["network_advertiser_id"] for row in synced] == ["1"]
+
+        api.failing.clear()
+        api.ad_requests.clear()
+        fake_flexoffers_sync(conn, api, options)
+        assert api.ad_requests == [2]
+
+    def test_fresh_advertisers_get_missing_rules(self, conn, fake_flexoffers_sync):
+        """Rules missing for a fresh advertiser are created without fetching its ads."""
+        api = FakeFlexOffersAPI(2, ads_per_advertiser=1)
+        options = SyncOptions(ads_fresh_hours=6, full_sweep_every=0)
+        fake_flexoffers_sync(conn, api, options)
+
+        # Batched upsert, then the per-advertiser path used under a time budget
+        for run_options in (options, replace(options, time_budget_seconds=60)):
+            conn.execute("DELETE FROM site_advertiser_rules")
+            api.ad_requests.clear()
+            stats = fake_flexoffers_sync(conn, api, run_options)
+
+            assert stats["advertisers_fresh"] == 2
+            assert api.ad_requests == []
+            rules = conn.execute("SELECT COUNT(*) AS cnt FROM site_advertiser_rules").fetchone()
+            assert rules["cnt"] == 2
@@ -0,0 +1,177 @@
+"""Offline tests for the persistent HTTP response cache (httpx.MockTransport, no credentials)."""
+
+import hashlib
+
+import httpx
+import pytest
+
+from src.config import HttpOptions, SyncOptions
+from src.networks import httpcache
+
+from .conftest import FakeFlexOffersAPI
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _response(body: bytes, etag: str | None = '"v1"') -> httpx.Response:
+    headers = {"ETag": etag} if etag else {}
+    return httpx.Response(
+        200, headers=headers, content=body, request=httpx.Request("GET", "https://x")
+    )
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """Enable the cache in a temporary file, disabling it again afterwards."""
+    path = str(tmp_path / "http-cache.sqlite")
+    httpcache.configure(HttpOptions(cache_path=path))
+    yield path
+    httpcache.configure(HttpOptions())
+
+
+class TestHttpCache:
+    """Test HttpCache storage, TTL and eviction."""
+
+    def test_stores_only_responses_with_validators(self, tmp_path):
+        """Bodies without an ETag or Last-Modified cannot be revalidated, so are not kept."""
+        cache = httpcache.HttpCache(str(tmp_path / "c.sqlite"), ttl_seconds=60, max_bytes=1000)
+
+        cache.put("a", _response(b"body"))
+        cache.put("b", _response(b"body", etag=None))
+
+        assert cache.get("a").conditional_headers() == {"If-None-Match": '"v1"'}
+        assert cache.get("b") is None
+
+    def test_entries_expire(self, tmp_path):
+        """Entries older than the TTL are dropped, forcing a full download."""
+        clock = FakeClock()
+        cache = httpcache.HttpCache(
+            str(tmp_path / "c.sqlite"), ttl_seconds=60, max_bytes=1000, clock=clock
+        )
+        cache.put("a", _response(b"body"))
+
+        clock.now += 61
+
+        assert cache.get("a") is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Past the size cap, the least recently used entries go first."""
+        clock = FakeClock()
+        cache = httpcache.HttpCache(
+            str(tmp_path / "c.sqlite"), ttl_seconds=3600, max_bytes=10, clock=clock
+        )
+        cache.put("a", _response(b"aaaa"))
+        clock.now += 1
+        cache.put("b", _response(b"bbbb"))
+        clock.now += 1
+        cache.hit(cache.get("a"), _response(b""))
+        clock.now += 1
+
+        cache.put("c", _response(b"cccc"))
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        assert cache.size() == 8
+
+    def test_key_ignores_param_order(self):
+        """The same query in a different order is the same request."""
+        key = httpcache.HttpCache.key
+        assert key("GET", "https://x/a", {"a": 1, "b": 2}) == key(
+            "GET", "https://x/a", {"b": 2, "a": 1}
+        )
+        assert key("GET", "https://x/a", {"a": 1}) != key("GET", "https://x/a", {"a": 2})
+
+
+class ETagFlexOffersAPI(FakeFlexOffersAPI):
+    """Sends ETags, answering 304 when If-None-Match matches; ad names can change."""
+
+    def __init__(self, advertiser_count: int):
+        super().__init__(advertiser_count, ads_per_advertiser=1)
+        self.ad_names = {i: "Banner" for i in self.advertisers}
+        self.not_modified = 0
+        self.conditional = 0
+
+    def ad(self, advertiser_id: int, link_id: int) -> dict:
+        return {**super().ad(advertiser_id, link_id), "linkName": self.ad_names[advertiser_id]}
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        response = super().handle(request)
+        etag = f'"{hashlib.sha1(response.content).hexdigest()}"'
+        if "If-None-Match" in request.headers:
+            self.conditional += 1
+            if request.headers["If-None-Match"] == etag:
+                self.not_modified += 1
+                return httpx.Response(304, headers={"ETag": etag})
+        headers = {"ETag": etag, "Content-Type": "application/json"}
+        return httpx.Response(200, headers=headers, content=response.content)
+
+
+class TestConditionalSync:
+    """Test 304 responses flowing through the sync."""
+
+    def test_not_modified_ads_skip_mapping_and_writes(self, conn, cache_path, fake_flexoffers_sync):
+        """The second run revalidates every request and skips unchanged ads."""
+        api = ETagFlexOffersAPI(3)
+
+        first = fake_flexoffers_sync(conn, api)
+        second = fake_flexoffers_sync(conn, api)
+
+        assert first["advertisers_not_modified"] == 0
+        assert api.conditional == api.not_modified == 4
+        assert second["advertisers_synced"] == 3
+        assert second["advertisers_not_modified"] == 3
+        assert second["ads_synced"] == 0
+        assert second["ads_deleted"] == 0
+        assert conn.execute("SELECT COUNT(*) AS cnt FROM ads").fetchone()["cnt"] == 3
+
+    def test_changed_ads_are_written(self, conn, cache_path, fake_flexoffers_sync):
+        """A changed body gets a 200 and is synced as usual."""
+        api = ETagFlexOffersAPI(2)
+        fake_flexoffers_sync(conn, api)
+
+        api.ad_names[2] = "Banner (new)"
+        stats = fake_flexoffers_sync(conn, api)
+
+        assert stats["advertisers_not_modified"] == 1
+        assert stats["ads_synced"] == 1
+        row = conn.execute("SELECT advert_name FROM ads WHERE network_ad_id = '200'").fetchone()
+        assert "new" in row["advert_name"]
+
+    def test_304_not_trusted_without_db_write(self, conn, cache_path, fake_flexoffers_sync):
+        """If the ads were not written after the body was downloaded, they are synced again."""
+        api = ETagFlexOffersAPI(2)
+        fake_flexoffers_sync(conn, api)
+        conn.execute("UPDATE advertisers SET ads_synced_at = NULL")
+        conn.execute("DELETE FROM ads")
+
+        stats = fake_flexoffers_sync(conn, api)
+
+        assert api.not_modified == 3
+        assert stats["advertisers_not_modified"] == 0
+        assert conn.execute("SELECT COUNT(*) AS cnt FROM ads").fetchone()["cnt"] == 2
+
+    def test_pipeline_mode(self, conn, cache_path, fake_flexoffers_sync):
+        """The pipeline engine skips unchanged ads too."""
+        api = ETagFlexOffersAPI(3)
+        fake_flexoffers_sync(conn, api, SyncOptions(mode="pipeline"))
+
+        stats = fake_flexoffers_sync(conn, api, SyncOptions(mode="pipeline"))
+
+        assert stats["advertisers_not_modified"] == 3
+        assert stats["ads_synced"] == 0
+
+    def test_disabled_by_default(self, conn, fake_flexoffers_sync):
+        """Without HTTP_CACHE_PATH no conditional headers are sent."""
+        api = ETagFlexOffersAPI(1)
+
+        fake_flexoffers_sync(conn, api)
+        fake_flexoffers_sync(conn, api)
+
+        assert api.conditional == 0
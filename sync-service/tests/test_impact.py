@@ -0,0 +1,217 @@
+"""Offline tests for ImpactClient's streamed ads crawl (httpx.MockTransport, no credentials)."""
+
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from src.config import SyncOptions
+from src.networks.impact import AsyncImpactClient, ImpactClient
+from src.networks.sharedcrawl import SharedCrawl
+from src.networks.spool import GroupSpool
+
+ACCOUNT_SID = "IRtest"
+PAGE_SIZE = 100
+
+
+class FakeImpactAPI:
+    """Serves /Campaigns and a paginated global /Ads, interleaving campaigns across pages."""
+
+    def __init__(self, ads_per_campaign: int = 60):
+        self.campaigns = [
+            {"CampaignId": "101", "CampaignName": "Active One", "ContractStatus": "Active"},
+            {"CampaignId": "102", "CampaignName": "Active Two", "ContractStatus": "Active"},
+            {"CampaignId": "103", "CampaignName": "Expired", "ContractStatus": "Expired"},
+        ]
+        self.ads = [
+            {
+                "Id": str(1000 * int(campaign["CampaignId"]) + n),
+                "Name": f"Banner {n}",
+                "Type": "BANNER",
+                "TrackingLink": f"https://track.example.com/c/{campaign['CampaignId']}/{n}",
+                "LandingPageUrl": "https://example.com/",
+                "CreativeUrl": f"https://cdn.example.com/{campaign['CampaignId']}/{n}.jpg",
+                "Width": "300",
+                "Height": "250",
+                # Every fifth ad is French and must be dropped
+                "Language": "FRENCH" if n % 5 == 4 else "ENGLISH",
+                # Impact returns some IDs as numbers
+                "CampaignId": int(campaign["CampaignId"]),
+            }
+            for n in range(ads_per_campaign)
+            for campaign in self.campaigns
+        ]
+        self.ads_pages_served = 0
+
+    def _page(self, key: str, records: list[dict], page: int) -> httpx.Response:
+        page_count = max(1, -(-len(records) // PAGE_SIZE))
+        chunk = records[(page - 1) * PAGE_SIZE : page * PAGE_SIZE]
+        next_uri = "next" if page < page_count else ""
+        return httpx.Response(
+            200,
+            json={key: chunk, "@numpages": str(page_count), "@nextpageuri": next_uri},
+        )
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["Page"])
+        if request.url.path.endswith("/Campaigns"):
+            return self._page("Campaigns", self.campaigns, page)
+        self.ads_pages_served += 1
+        return self._page("Ads", self.ads, page)
+
+    async def ahandle(self, request: httpx.Request) -> httpx.Response:
+        return self.handle(request)
+
+
+def _client(api: FakeImpactAPI, cls=ImpactClient) -> ImpactClient:
+    client = cls(ACCOUNT_SID, "test-token")
+    client._client = httpx.Client(transport=httpx.MockTransport(api.handle))
+    if cls is AsyncImpactClient:
+        client._aclient = httpx.AsyncClient(transport=httpx.MockTransport(api.ahandle))
+    return client
+
+
+def _ads_by_campaign(conn) -> dict[str, int]:
+    rows = conn.execute(
+        """SELECT adv.network_advertiser_id, COUNT(*) AS n FROM ads a
+           JOIN advertisers adv ON adv.id = a.advertiser_id
+           WHERE a.network = 'impact' GROUP BY adv.network_advertiser_id"""
+    ).fetchall()
+    return {row["network_advertiser_id"]: row["n"] for row in rows}
+
+
+class TestGroupSpool:
+    """Test grouping records in memory and after spilling to disk."""
+
+    def test_in_memory(self):
+        """Below the threshold, groups stay in memory and pop in order."""
+        with GroupSpool(10) as spool:
+            for n in range(4):
+                spool.add("a" if n % 2 else "b", {"n": n})
+
+            assert not spool.spilled
+            assert spool.pop("a") == [{"n": 1}, {"n": 3}]
+            assert spool.pop("b") == [{"n": 0}, {"n": 2}]
+            assert spool.pop("missing") == []
+
+    def test_spills_to_disk(self):
+        """Past the threshold, earlier and later records come back from the file in order."""
+        spool = GroupSpool(2)
+        for n in range(6):
+            spool.add("a" if n % 2 else "b", {"n": n, "name": "Café"})
+
+        assert spool.spilled
+        assert spool.count == 6
+        assert [r["n"] for r in spool.get("a")] == [1, 3, 5]
+        assert [r["n"] for r in spool.pop("a")] == [1, 3, 5]
+        assert spool.pop("a") == []
+        assert spool.pop("b")[0] == {"n": 0, "name": "Café"}
+        # Popped groups leave the file
+        assert spool._conn.execute("SELECT COUNT(*) FROM records").fetchone() == (0,)
+
+        spool_dir = spool._dir.name
+        spool.close()
+        assert not os.path.exists(spool_dir)
+
+
+class TestStreamedAdsCrawl:
+    """Test syncing Impact ads grouped from the global crawl."""
+
+    def test_sync_groups_ads_by_campaign(self, conn):
+        """Only English ads of Active campaigns are written, each under its campaign."""
+        api = FakeImpactAPI()
+
+        stats = _client(api).sync(conn)
+
+        assert api.ads_pages_served == 2
+        assert stats["advertisers_synced"] == 2
+        assert _ads_by_campaign(conn) == {"101": 48, "102": 48}
+        rules = conn.execute("SELECT COUNT(*) AS n FROM site_advertiser_rules").fetchone()["n"]
+        sites = conn.execute("SELECT COUNT(*) AS n FROM sites WHERE is_active = 1").fetchone()["n"]
+        assert rules == 2 * sites
+
+    def test_spilled_sync_matches_in_memory(self, conn):
+        """A spill threshold below the ad count gives the same result."""
+        api = FakeImpactAPI()
+
+        _client(api).sync(conn, options=SyncOptions(spill_threshold=10))
+
+        assert _ads_by_campaign(conn) == {"101": 48, "102": 48}
+
+    def test_async_sync(self, conn):
+        """The async crawl spools ads before campaign statuses are known, with the same result."""
+        api = FakeImpactAPI()
+
+        stats = asyncio.run(
+            _client(api, AsyncImpactClient).async_sync(
+                conn, options=SyncOptions(mode="async", spill_threshold=10)
+            )
+        )
+
+        assert stats["advertisers_synced"] == 2
+        assert _ads_by_campaign(conn) == {"101": 48, "102": 48}
+
+    def test_fetch_advertiser_ads(self):
+        """A targeted fetch keeps only one campaign's English ads."""
+        api = FakeImpactAPI()
+
+        ads = _client(api).fetch_advertiser_ads("102")
+
+        assert len(ads) == 48
+        assert {ad["CampaignId"] for ad in ads} == {102}
+
+
+class TestSharedCrawl:
+    """Test the shards of a sharded run sharing one global ads crawl."""
+
+    @pytest.mark.parametrize("cls", [ImpactClient, AsyncImpactClient])
+    def test_shards_crawl_once(self, conn, cls):
+        """Only the first shard crawls; every shard syncs its own campaigns' ads."""
+        api = FakeImpactAPI()
+
+        for index in (1, 2):
+            options = SyncOptions(shard_index=index, shard_count=2, run_id="run-1")
+            client = _client(api, cls)
+            if cls is AsyncImpactClient:
+                asyncio.run(client.async_sync(conn, options=options))
+            else:
+                client.sync(conn, options=options)
+
+        assert api.ads_pages_served == 2
+        assert _ads_by_campaign(conn) == {"101": 48, "102": 48}
+        # The last shard deleted the stored crawl
+        assert conn.execute("SELECT COUNT(*) AS n FROM sync_shared_ads").fetchone()["n"] == 0
+        assert conn.execute("SELECT COUNT(*) AS n FROM sync_shared_crawls").fetchone()["n"] == 0
+
+    def test_wait_and_take_over(self, conn):
+        """Other shards wait while the crawl runs, and take over one that failed."""
+        clock = [0.0]
+        first = SharedCrawl(conn, "impact", "run-1")
+        second = SharedCrawl(conn, "impact", "run-1", timeout=60, clock=lambda: clock[0])
+
+        assert first.join() is True
+        first.publish([("101", {"Id": "1"})])
+        assert second.join() is None
+        clock[0] = 61
+        with pytest.raises(RuntimeError):
+            second.join()
+
+        first.abandon()
+        assert second.join() is True
+        # The failed crawl's ads were dropped
+        assert conn.execute("SELECT COUNT(*) AS n FROM sync_shared_ads").fetchone()["n"] == 0
+
+    def test_load_finished_crawl(self, conn):
+        """A finished crawl is read back with its complete flag, wanted campaigns only."""
+        api = FakeImpactAPI()
+        crawler = SharedCrawl(conn, "impact", "run-1")
+        crawler.join()
+        crawler.finish(_client(api)._crawl_ads(GroupSpool(0), lambda _: False, crawler.publish))
+
+        reader = SharedCrawl(conn, "impact", "run-1")
+        with GroupSpool(1000) as spool:
+            assert reader.join() is False
+            assert reader.load(spool, lambda campaign_id: campaign_id == "102") == (True, None)
+            assert len(spool.pop("102")) == 48
+            assert spool.pop("101") == []
@@ -0,0 +1,68 @@
+"""Tests for JSON decoding and canonical serialization."""
+
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+
+from src import jsoncodec
+from src.mappers.base import Mapper
+
+# Shaped like an Impact /Ads record, with the characters that differ between encoders
+IMPACT_AD = {
+    "Id": "1234567",
+    "Name": "Spring Sale – 20% off “everything” 🏕",
+    "Description": 'Tents, stoves & more.\n<b>"Quoted"</b> \\ back\tslash   \x01',
+    "Type": "BANNER",
+    "Width": "300",
+    "Height": 250,
+    "DiscountPercent": 20.5,
+    "TopSeller": False,
+    "EndDate": None,
+    "Labels": ["Outdoor", "Café"],
+    "Campaign": {"Id": 98765, "Name": "Outdoor Gear Co", "Nested": {"z": 1, "a": [1.25, -3]}},
+}
+
+# SHA-256 of json.dumps(IMPACT_AD, sort_keys=True, default=str), the form every
+# stored raw_hash was computed from
+IMPACT_AD_HASH = "fcd1243b4c31cfdbe03b61de5193a464e9b3bb519ad95abf9cfa7d25b70c8b81"
+
+
+class TestCanonical:
+    """Test canonical() and the raw_hash it feeds."""
+
+    @pytest.mark.parametrize(
+        "record",
+        [
+            IMPACT_AD,
+            {"b": "é", "a": [1, None], "lone": "\ud800"},
+            {"when": datetime(2026, 10, 16, tzinfo=UTC), "epc": Decimal("0.10")},
+            {"id": 2**70, "ratio": 1e-05, "nan": float("nan")},
+        ],
+    )
+    def test_matches_json_dumps(self, record):
+        """canonical() is byte for byte the json.dumps() form stored hashes came from."""
+        expected = json.dumps(record, sort_keys=True, default=str).encode()
+
+        assert jsoncodec.canonical(record) == expected
+
+    def test_pinned_hash(self, monkeypatch):
+        """raw_hash values stay stable with and without orjson."""
+        assert Mapper.compute_hash(IMPACT_AD) == IMPACT_AD_HASH
+
+        monkeypatch.setattr(jsoncodec, "orjson", None)
+        assert Mapper.compute_hash(IMPACT_AD) == IMPACT_AD_HASH
+
+
+class TestLoads:
+    """Test loads()."""
+
+    def test_decodes_bytes(self):
+        body = json.dumps(IMPACT_AD).encode()
+
+        assert jsoncodec.loads(body) == IMPACT_AD
+
+    def test_invalid_json_raises_json_decode_error(self):
+        with pytest.raises(json.JSONDecodeError):
+            jsoncodec.loads(b"{not json")
@@ -0,0 +1,159 @@
+"""Tests for sync orchestration in main.py."""
+
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from src import main
+
+
+class FakeClient:
+    """Minimal stand-in for a NetworkClient that records how it was synced."""
+
+    def __init__(self, network: str, domain: str | None = None, barrier=None, fail=False):
+        self.network = network
+        self.domain = domain
+        self.barrier = barrier
+        self.fail = fail
+        self.conn = None
+
+    @property
+    def network_name(self) -> str:
+        return self.network
+
+    def sync(self, conn, site_domain=None, options=None):
+        self.conn = conn
+        if self.barrier is not None:
+            # Blocks until every network has started; times out if run sequentially
+            self.barrier.wait(timeout=5)
+        if self.fail:
+            raise RuntimeError("boom")
+        return {"network": self.network, "site_domain": site_domain}
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Replace get_connection with one that hands out a fresh sentinel per call."""
+    opened: list[object] = []
+    lock = threading.Lock()
+
+    @contextmanager
+    def fake_get_connection():
+        conn = object()
+        with lock:
+            opened.append(conn)
+        yield conn
+
+    monkeypatch.setattr(main, "get_connection", fake_get_connection)
+    return opened
+
+
+class TestRunClients:
+    """Test run_clients orchestration."""
+
+    def test_each_client_gets_own_connection(self, connections):
+        """Every client should sync on its own connection."""
+        clients = [FakeClient("awin"), FakeClient("cj", "a.com"), FakeClient("cj", "b.com")]
+
+        results = main.run_clients(clients, max_workers=1)
+
+        assert len(connections) == 3
+        assert len({id(c.conn) for c in clients}) == 3
+        assert [r["site_domain"] for r in results] == [None, "a.com", "b.com"]
+
+    def test_networks_run_in_parallel(self, connections):
+        """Different networks should overlap when workers allow it."""
+        barrier = threading.Barrier(3)
+        clients = [
+            FakeClient("awin", barrier=barrier),
+            FakeClient("cj", barrier=barrier),
+            FakeClient("impact", barrier=barrier),
+        ]
+
+        results = main.run_clients(clients, max_workers=3)
+
+        assert all(r is not None for r in results)
+
+    def test_same_network_clients_run_sequentially(self, connections):
+        """Per-domain clients of one network should never overlap."""
+        active = 0
+        max_active = 0
+        lock = threading.Lock()
+
+        class TrackingClient(FakeClient):
+            def sync(self, conn, site_domain=None, options=None):
+                nonlocal active, max_active
+                with lock:
+                    active += 1
+                    max_active = max(max_active, active)
+                result = super().sync(conn, site_domain)
+                with lock:
+                    active -= 1
+                return result
+
+        clients = [TrackingClient("flexoffers", f"site{i}.com") for i in range(4)]
+
+        main.run_clients(clients, max_workers=4)
+
+        assert max_active == 1
+
+    def test_failed_client_does_not_stop_others(self, connections):
+        """A failing client should yield None while the rest still sync."""
+        clients = [FakeClient("awin", fail=True), FakeClient("cj")]
+
+        results = main.run_clients(clients, max_workers=2)
+
+        assert results[0] is None
+        assert results[1]["network"] == "cj"
+
+
+class TestTargetedSync:
+    """Test the `sync` subcommand's argument parsing and client scoping."""
+
+    def _config(self):
+        return main.Config(
+            flexoffers_domain_keys={"a.com": "key-a", "b.com": "key-b"},
+            awin_api_token="awin-token",
+            awin_publisher_id="1",
+            cj_api_token="cj-token",
+            cj_cid="7000001",
+            cj_domain_website_ids={"a.com": "100001", "b.com": "100002"},
+            impact_account_sid="sid",
+            impact_auth_token="token",
+        )
+
+    def _scoped(self, **kwargs) -> list[tuple[str, str | None]]:
+        clients = main.build_clients(main.scope_config(self._config(), **kwargs))
+        return [(c.network_name, getattr(c, "domain", None)) for c in clients]
+
+    def test_no_subcommand_syncs_everything(self):
+        """Plain `python -m src.main` keeps syncing every network."""
+        args = main.parse_args([])
+
+        assert args.command is None
+        assert (args.network, args.domain, args.advertiser) == (None, None, None)
+
+    def test_sync_subcommand(self):
+        """Options before and after `sync` are both kept."""
+        args = main.parse_args(["--resume", "sync", "--network", "cj", "--domain", "a.com"])
+
+        assert (args.network, args.domain, args.resume) == ("cj", "a.com", True)
+
+    def test_invalid_combinations(self):
+        """--advertiser needs a network, and --domain only fits per-domain networks."""
+        for argv in (
+            ["sync", "--advertiser", "1234"],
+            ["sync", "--network", "awin", "--domain", "a.com"],
+            ["sync", "--network", "cj", "--advertiser", "1234", "--resume"],
+            ["--record", "cassettes", "--replay", "cassettes"],
+        ):
+            with pytest.raises(SystemExit):
+                main.parse_args(argv)
+
+    def test_scope_network_and_domain(self):
+        """Only the clients in scope are constructed."""
+        assert self._scoped(network="cj", domain="b.com") == [("cj", "b.com")]
+        assert self._scoped(network="awin") == [("awin", None)]
+        assert self._scoped(domain="a.com") == [("flexoffers", "a.com"), ("cj", "a.com")]
+        assert len(self._scoped()) == 6
@@ -0,0 +1,124 @@
+"""Offline tests for the shared paginator (httpx.MockTransport, no credentials)."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+
+from src.networks.flexoffers import ADS_PAGE_SIZE, AsyncFlexOffersClient, FlexOffersClient
+from src.networks.paginate import is_complete
+
+
+def _ad(n: int) -> dict:
+    return {
+        "linkId": n,
+        "linkName": f"Banner {n}",
+        "linkType": "Banner",
+        "imageUrl": "https://example.com/banner.jpg",
+        "linkUrl": "https://track.example.com/click",
+        "bannerWidth": 300,
+        "bannerHeight": 250,
+    }
+
+
+class FakePromotionsAPI:
+    """Serves /promotions in pages, tracking requested pages and concurrency."""
+
+    def __init__(self, ad_count: int, total: bool = True, fail_page: int | None = None):
+        self.ads = [_ad(n) for n in range(ad_count)]
+        self.total = total
+        self.fail_page = fail_page
+        self.pages: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def _response(self, request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        self.pages.append(page)
+        if page == self.fail_page:
+            return httpx.Response(500)
+        start = (page - 1) * ADS_PAGE_SIZE
+        body = {"results": self.ads[start : start + ADS_PAGE_SIZE]}
+        if self.total:
+            body["totalCount"] = len(self.ads)
+        return httpx.Response(200, json=body)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self.lock:
+            self.in_flight -= 1
+        return self._response(request)
+
+    async def ahandle(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self._response(request)
+
+
+def _client(api: FakePromotionsAPI) -> AsyncFlexOffersClient:
+    client = AsyncFlexOffersClient("test-key", domain="rvtravellife.com")
+    client._client = httpx.Client(transport=httpx.MockTransport(api.handle))
+    client._aclient = httpx.AsyncClient(transport=httpx.MockTransport(api.ahandle))
+    return client
+
+
+def _ids(ads: list[dict]) -> list[int]:
+    return [ad["linkId"] for ad in ads]
+
+
+class TestPaginator:
+    """Test Paginator through FlexOffersClient.fetch_ads()."""
+
+    def test_prefetches_when_total_known(self):
+        """After page 1, the remaining pages are fetched concurrently but kept in order."""
+        api = FakePromotionsAPI(ad_count=ADS_PAGE_SIZE * 6 + 10)
+
+        ads = _client(api).fetch_ads("1")
+
+        assert _ids(ads) == list(range(len(api.ads)))
+        assert sorted(api.pages) == [1, 2, 3, 4, 5, 6, 7]
+        assert 1 < api.max_in_flight <= FlexOffersClient.PAGE_PREFETCH
+
+    def test_sequential_without_total(self):
+        """Without a total, pages are fetched one after another until a short page."""
+        api = FakePromotionsAPI(ad_count=ADS_PAGE_SIZE * 2 + 5, total=False)
+
+        ads = _client(api).fetch_ads("1")
+
+        assert len(ads) == len(api.ads)
+        assert api.pages == [1, 2, 3]
+        assert api.max_in_flight == 1
+
+    def test_exact_multiple_stops_at_total(self):
+        """A full last page does not cost an extra empty request when the total is known."""
+        api = FakePromotionsAPI(ad_count=ADS_PAGE_SIZE * 2)
+
+        _client(api).fetch_ads("1")
+
+        assert sorted(api.pages) == [1, 2]
+
+    def test_failed_page_returns_earlier_pages(self):
+        """A failing page ends the crawl with the pages before it, in order."""
+        api = FakePromotionsAPI(ad_count=ADS_PAGE_SIZE * 6, fail_page=4)
+
+        ads = _client(api).fetch_ads("1")
+
+        assert _ids(ads) == list(range(ADS_PAGE_SIZE * 3))
+        assert not is_complete(ads)
+        assert is_complete(_client(FakePromotionsAPI(ad_count=5)).fetch_ads("1"))
+
+    def test_async_prefetch(self):
+        """afetch_ads() prefetches with tasks and matches fetch_ads()."""
+        api = FakePromotionsAPI(ad_count=ADS_PAGE_SIZE * 5 + 1)
+
+        ads = asyncio.run(_client(api).afetch_ads("1"))
+
+        assert _ids(ads) == list(range(len(api.ads)))
+        assert 1 < api.max_in_flight <= FlexOffersClient.PAGE_PREFETCH
@@ -0,0 +1,68 @@
+"""Offline tests for the pipelined sync engine (httpx.MockTransport, no credentials)."""
+
+import time
+
+from src.config import SyncOptions
+from src.networks.flexoffers import FlexOffersClient
+
+from .conftest import FakeFlexOffersAPI
+
+
+class TestPipelineSync:
+    """Test NetworkClient.sync() in pipeline mode against the default engine."""
+
+    def test_matches_default_sync(self, conn, fake_flexoffers_client):
+        """Pipeline mode should write the same rows and stats as the default engine."""
+        api = FakeFlexOffersAPI(6)
+
+        default_stats = fake_flexoffers_client(api).sync(conn, site_domain="rvtravellife.com")
+        default_ads = conn.execute("SELECT network_ad_id, raw_hash FROM ads").fetchall()
+
+        options = SyncOptions(mode="pipeline", pipeline_queue_size=2, pipeline_batch_size=5)
+        pipeline_stats = fake_flexoffers_client(api).sync(
+            conn, site_domain="rvtravellife.com", options=options
+        )
+        pipeline_ads = conn.execute("SELECT network_ad_id, raw_hash FROM ads").fetchall()
+
+        assert pipeline_stats == default_stats
+        assert pipeline_stats["ads_synced"] == 12
+        assert sorted(map(tuple, pipeline_ads)) == sorted(map(tuple, default_ads))
+
+        logs = conn.execute("SELECT status FROM sync_logs ORDER BY id").fetchall()
+        assert [row["status"] for row in logs] == ["success", "success"]
+
+    def test_deletes_stale_ads(self, conn, fake_flexoffers_client):
+        """Ads no longer returned should be deleted, as in the default engine."""
+        options = SyncOptions(mode="pipeline", pipeline_batch_size=1)
+        api = FakeFlexOffersAPI(2, ads_per_advertiser=3)
+        fake_flexoffers_client(api).sync(conn, options=options)
+
+        api.links = {1: [100], 2: [200]}
+        stats = fake_flexoffers_client(api).sync(conn, options=options)
+
+        assert stats["ads_deleted"] == 4
+        remaining = conn.execute("SELECT COUNT(*) AS cnt FROM ads").fetchone()["cnt"]
+        assert remaining == 2
+
+    def test_backpressure_bounds_fetch_lead(self, conn, fake_flexoffers_client):
+        """A slow writer should stall fetching instead of buffering every advertiser."""
+        api = FakeFlexOffersAPI(20)
+        max_lead = 0
+
+        class SlowWriterClient(FlexOffersClient):
+            written = 0
+
+            def _finish_ads(self, conn, advertiser_id, seen_ad_ids, stats):
+                nonlocal max_lead
+                time.sleep(0.01)
+                self.written += 1
+                with api.lock:
+                    max_lead = max(max_lead, len(api.ad_requests) - self.written)
+                super()._finish_ads(conn, advertiser_id, seen_ad_ids, stats)
+
+        options = SyncOptions(mode="pipeline", pipeline_queue_size=1)
+        stats = fake_flexoffers_client(api, SlowWriterClient).sync(conn, options=options)
+
+        assert stats["ads_synced"] == 40
+        # One advertiser in each queue plus one held by each stage
+        assert max_lead <= 4
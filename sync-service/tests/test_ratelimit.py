@@ -0,0 +1,253 @@
+"""Tests for proactive per-network rate limiting."""
+
+import httpx
+import pytest
+
+from src import db
+from src.config import RateLimit, load_config, parse_rate_limit
+from src.networks import ratelimit
+from src.networks.base import SyncCheckpoint
+from src.networks.cj import CJClient
+from src.networks.flexoffers import FlexOffersClient
+from src.networks.impact import ImpactClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def limits_on():
+    """Turn rate limiting back on (conftest disables it for offline tests)."""
+    ratelimit.configure()
+
+
+class TestTokenBucket:
+    """Test TokenBucket.reserve() pacing."""
+
+    def test_spaces_requests_at_the_rate(self):
+        """With burst 1, requests are spaced exactly period / requests apart."""
+        clock = FakeClock()
+        bucket = ratelimit.TokenBucket(RateLimit(25, 5), clock=clock)
+
+        waits = [bucket.reserve() for _ in range(3)]
+
+        assert waits == pytest.approx([0.0, 0.2, 0.4])
+
+    def test_refills_over_time(self):
+        """Idle time refills the bucket up to its burst size."""
+        clock = FakeClock()
+        bucket = ratelimit.TokenBucket(RateLimit(20, 60, burst=2), clock=clock)
+
+        assert [bucket.reserve() for _ in range(3)] == pytest.approx([0.0, 0.0, 3.0])
+
+        clock.now = 60
+        assert [bucket.reserve() for _ in range(3)] == pytest.approx([0.0, 0.0, 3.0])
+
+    def test_seed_caps_tokens(self):
+        """seed() lowers the tokens on hand but never adds any."""
+        clock = FakeClock()
+        bucket = ratelimit.TokenBucket(RateLimit(100, 100, burst=10), clock=clock)
+
+        bucket.seed(2)
+        assert [bucket.reserve() for _ in range(3)] == pytest.approx([0.0, 0.0, 1.0])
+
+        bucket.seed(50)
+        assert bucket.reserve() == pytest.approx(2.0)
+
+    def test_parse_rate_limit(self):
+        """RATE_LIMITS values are requests/seconds with an optional burst."""
+        assert parse_rate_limit("25/5") == RateLimit(25, 5.0)
+        assert parse_rate_limit("2000/86400/100") == RateLimit(2000, 86400.0, 100)
+        for bad in ("25", "0/5", "25/0", "a/b"):
+            with pytest.raises(ValueError):
+                parse_rate_limit(bad)
+
+    def test_load_config(self, monkeypatch):
+        """RATE_LIMITS is parsed into per-network and per-host overrides."""
+        monkeypatch.setenv("RATE_LIMITS", "awin=10/60,cj:link-search.api.cj.com=5/1/2")
+
+        config = load_config()
+
+        assert config.rate_limits == {
+            "awin": RateLimit(10, 60.0),
+            "cj:link-search.api.cj.com": RateLimit(5, 1.0, 2),
+        }
+
+
+class TestBuckets:
+    """Test how clients map to shared buckets."""
+
+    def test_cj_domains_share_one_bucket(self, limits_on):
+        """CJ's limit is per token, so every domain's client paces together."""
+        clients = [
+            CJClient("token", "7000001", pid, domain=domain)
+            for domain, pid in (("a.com", "1"), ("b.com", "2"))
+        ]
+
+        buckets = {
+            id(c._bucket(url)) for c in clients for url in (c.ADVERTISER_URL, c.LINK_SEARCH_URL)
+        }
+
+        assert len(buckets) == 1
+
+    def test_flexoffers_keys_have_own_buckets(self, limits_on):
+        """Each FlexOffers domain key has its own quota."""
+        a = FlexOffersClient("key-a", domain="a.com")
+        b = FlexOffersClient("key-b", domain="b.com")
+
+        assert a._bucket(a.BASE_URL) is not b._bucket(b.BASE_URL)
+        assert a._bucket(a.BASE_URL) is a._bucket(a.BASE_URL)
+
+    def test_overrides(self):
+        """A network:host override wins over a network override and the defaults."""
+        ratelimit.configure(
+            {
+                "cj": RateLimit(10, 5),
+                "cj:link-search.api.cj.com": RateLimit(2, 1),
+            }
+        )
+        client = CJClient("token", "7000001", "1")
+
+        assert client._bucket(client.LINK_SEARCH_URL).limit == RateLimit(2, 1)
+        assert client._bucket(client.ADVERTISER_URL).limit == RateLimit(10, 5)
+
+    def test_quota_is_seeded_from_sync_logs(self, conn, limits_on):
+        """An Impact run starts with the daily quota less what today's runs used."""
+        earlier = db.create_sync_log(conn, "impact")
+        db.save_transfer_stats(conn, earlier, {"/Ads": {"requests": 1500, "wire": 0, "decoded": 0}})
+        progress = SyncCheckpoint(conn, db.create_sync_log(conn, "impact"))
+        client = ImpactClient("SID", "token")
+
+        client._seed_quota(conn, progress)
+
+        bucket = ratelimit.get_bucket(
+            "impact", client._rate_limit_account(), "*", client.RATE_LIMITS
+        )
+        assert bucket.reserve() == 0.0
+        assert bucket._tokens == pytest.approx(499, abs=0.1)
+
+    def test_every_send_takes_a_token(self, limits_on, monkeypatch):
+        """_send() acquires a token before each attempt, including retries."""
+        acquired: list[float] = []
+        monkeypatch.setattr(
+            ratelimit.TokenBucket, "acquire", lambda self: acquired.append(self.limit.period)
+        )
+        responses = iter([httpx.Response(403), httpx.Response(200)])
+        client = FlexOffersClient("key-a", domain="a.com")
+        client._client = httpx.Client(transport=httpx.MockTransport(lambda r: next(responses)))
+        monkeypatch.setattr("src.networks.base.time.sleep", lambda seconds: None)
+
+        response = client._send("GET", f"{client.BASE_URL}/advertisers", context="test")
+
+        assert response.status_code == 200
+        assert acquired == [60, 60]
+
+
+class TestServerHints:
+    """Test read_hint() and the adaptive rate."""
+
+    def test_retry_after_seconds_and_date(self):
+        """Retry-After is either a delay in seconds or an HTTP date."""
+        assert ratelimit.read_hint(httpx.Response(429, headers={"Retry-After": "30"})) == (
+            ratelimit.ServerHint(retry_after=30.0)
+        )
+
+        date = httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        assert ratelimit.read_hint(date).retry_after == 0.0
+
+    def test_quota_headers(self):
+        """X-RateLimit-Reset may be seconds or an epoch timestamp."""
+        response = httpx.Response(
+            200, headers={"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "20"}
+        )
+
+        assert ratelimit.read_hint(response) == ratelimit.ServerHint(remaining=10, reset_in=20.0)
+
+    def test_body_message(self):
+        """Rate-limited responses without headers are searched for a wait in the body."""
+        response = httpx.Response(403, text="Rate limit exceeded, please retry after 45 seconds")
+
+        assert ratelimit.read_hint(response, rate_limited=True).retry_after == 45.0
+        assert ratelimit.read_hint(response).retry_after is None
+
+    def test_throttle_and_recover(self):
+        """A rate-limited response halves the rate and pauses; successes add it back."""
+        clock = FakeClock()
+        bucket = ratelimit.TokenBucket(RateLimit(10, 1), clock=clock)
+
+        bucket.throttle(5)
+
+        assert bucket.rate == pytest.approx(5)
+        assert bucket.reserve() == pytest.approx(5)
+
+        for _ in range(20):
+            bucket.observe(ratelimit.ServerHint())
+        assert bucket.rate == pytest.approx(10)
+
+    def test_remaining_quota_caps_rate(self):
+        """The rate is capped so the remaining quota lasts until the reset."""
+        bucket = ratelimit.TokenBucket(RateLimit(10, 1), clock=FakeClock())
+
+        bucket.observe(ratelimit.ServerHint(remaining=30, reset_in=60))
+
+        assert bucket.rate == pytest.approx(0.5)
+
+    def test_metrics(self, limits_on):
+        """metrics() reports every bucket by network, account and endpoint."""
+        client = FlexOffersClient("key-a", domain="a.com")
+        client._bucket(client.BASE_URL).reserve()
+
+        metrics = ratelimit.metrics()
+
+        assert metrics["flexoffers/a.com/*"]["requests"] == 1
+        assert metrics["flexoffers/a.com/*"]["rate_limited"] == 0
+
+
+class TestRetryAfter:
+    """Test how _send() reacts to rate-limited responses."""
+
+    def _client(self, responses: list[httpx.Response]) -> CJClient:
+        client = CJClient("token", "7000001", "1")
+        queue = iter(responses)
+        client._client = httpx.Client(transport=httpx.MockTransport(lambda r: next(queue)))
+        return client
+
+    def test_429_waits_for_retry_after(self, monkeypatch):
+        """A 429 is retried after the server's Retry-After, not the default backoff."""
+        slept: list[float] = []
+        monkeypatch.setattr("src.networks.base.time.sleep", slept.append)
+        client = self._client(
+            [httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200)]
+        )
+
+        response = client._send("GET", client.ADVERTISER_URL, context="test")
+
+        assert response.status_code == 200
+        assert slept == [7.0]
+
+    def test_bucket_enforces_the_pause(self, limits_on, monkeypatch):
+        """With a bucket, the pause is taken from it so other requests wait too."""
+        slept: list[float] = []
+        monkeypatch.setattr(ratelimit.time, "sleep", slept.append)
+        monkeypatch.setattr("src.networks.base.time.sleep", slept.append)
+        client = self._client(
+            [httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200)]
+        )
+
+        client._send("GET", client.ADVERTISER_URL, context="test")
+
+        # One sleep in acquire(): the 7s pause plus the halved rate's spacing
+        assert len(slept) == 1 and 7 <= slept[0] < 8
+        assert client._bucket(client.ADVERTISER_URL).rate_limited == 1
+
+    def test_gives_up_on_long_wait(self, monkeypatch):
+        """A Retry-After beyond MAX_RETRY_WAIT is not waited out."""
+        monkeypatch.setattr("src.networks.base.time.sleep", lambda seconds: pytest.fail("slept"))
+        client = self._client([httpx.Response(429, headers={"Retry-After": "3600"})])
+
+        assert client._send("GET", client.ADVERTISER_URL, context="test") is None
@@ -0,0 +1,87 @@
+"""Offline tests for splitting a network's advertisers across shards (--shard i/N)."""
+
+import argparse
+
+import pytest
+
+from src.config import SyncOptions
+from src.main import parse_shard
+from src.networks.base import shard_of
+
+from .conftest import FakeFlexOffersAPI
+
+
+def _shard(index: int, count: int, run_id: str = "run-1", **kwargs) -> SyncOptions:
+    return SyncOptions(shard_index=index, shard_count=count, run_id=run_id, **kwargs)
+
+
+def _active_ids(conn) -> set[str]:
+    rows = conn.execute(
+        "SELECT network_advertiser_id FROM advertisers WHERE is_active = 1"
+    ).fetchall()
+    return {row["network_advertiser_id"] for row in rows}
+
+
+class TestShardOf:
+    """Test the advertiser -> shard partition."""
+
+    def test_partition_is_stable_and_complete(self):
+        """Every advertiser lands in exactly one shard, the same one every time."""
+        ids = [str(i) for i in range(200)]
+        shards = [shard_of(i, 4) for i in ids]
+
+        assert shards == [shard_of(i, 4) for i in ids]
+        assert set(shards) == {1, 2, 3, 4}
+
+    def test_parse_shard(self):
+        """--shard takes a 1-based i/N."""
+        assert parse_shard("2/4") == (2, 4)
+        for bad in ("0/4", "5/4", "2", "a/b"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                parse_shard(bad)
+
+
+class TestShardedSync:
+    """Test NetworkClient.sync() with SyncOptions.shard_index/shard_count."""
+
+    @pytest.mark.parametrize("mode", ["default", "pipeline"])
+    def test_shards_cover_every_advertiser_once(self, conn, mode, fake_flexoffers_sync):
+        """Together the shards fetch each advertiser's ads exactly once."""
+        api = FakeFlexOffersAPI(12, ads_per_advertiser=1)
+
+        stats = [fake_flexoffers_sync(conn, api, _shard(i, 3, mode=mode)) for i in (1, 2, 3)]
+
+        assert sorted(api.ad_requests) == list(range(1, 13))
+        assert sum(s["advertisers_synced"] for s in stats) == 12
+        assert conn.execute("SELECT COUNT(*) AS cnt FROM ads").fetchone()["cnt"] == 12
+
+        logs = conn.execute(
+            "SELECT status, run_id, shard_index, shard_count, checkpoint FROM sync_logs"
+        ).fetchall()
+        assert [(r["shard_index"], r["shard_count"]) for r in logs] == [(1, 3), (2, 3), (3, 3)]
+        assert all(r["status"] == "success" and r["run_id"] == "run-1" for r in logs)
+        assert all(r["checkpoint"] is None for r in logs)
+
+    def test_last_shard_deactivates_stale_advertisers(self, conn, fake_flexoffers_sync):
+        """Advertisers gone from the network are deactivated once every shard is done."""
+        api = FakeFlexOffersAPI(8, ads_per_advertiser=1)
+        fake_flexoffers_sync(conn, api, SyncOptions())
+
+        del api.advertisers[5]
+        fake_flexoffers_sync(conn, api, _shard(1, 2, run_id="run-2"))
+        # Shard 1 alone cannot tell a removed advertiser from one owned by shard 2
+        assert "5" in _active_ids(conn)
+
+        fake_flexoffers_sync(conn, api, _shard(2, 2, run_id="run-2"))
+        assert _active_ids(conn) == {str(i) for i in range(1, 9)} - {"5"}
+
+    def test_resume_stays_in_shard(self, conn, fake_flexoffers_sync):
+        """--resume reopens the log of the same shard, not another shard's."""
+        api = FakeFlexOffersAPI(8, ads_per_advertiser=1)
+        fake_flexoffers_sync(conn, api, _shard(1, 2))
+        conn.execute("UPDATE sync_logs SET status = 'failed', checkpoint = '{}'")
+
+        fake_flexoffers_sync(conn, api, _shard(2, 2, resume=True))
+
+        logs = conn.execute("SELECT id, shard_index FROM sync_logs ORDER BY id").fetchall()
+        assert [r["shard_index"] for r in logs] == [1, 2]
@@ -0,0 +1,56 @@
+"""Offline tests for re-syncing a single advertiser (`sync --advertiser ID`)."""
+
+import pytest
+
+from src.config import SyncOptions
+
+from .conftest import FakeFlexOffersAPI
+
+
+def _count(conn, sql: str) -> int:
+    return conn.execute(sql).fetchone()[0]
+
+
+class TestResyncAdvertiser:
+    """Test NetworkClient.resync_advertiser()."""
+
+    def test_syncs_only_that_advertiser(self, conn, fake_flexoffers_client):
+        """Only the requested advertiser's ads are fetched, and no sync log is written."""
+        api = FakeFlexOffersAPI([1, 2, 3])
+
+        stats = fake_flexoffers_client(api).resync_advertiser(
+            conn, "2", site_domain="rvtravellife.com"
+        )
+
+        assert api.ad_requests == [2]
+        assert stats["advertisers_synced"] == 1
+        assert stats["ads_synced"] == 2
+        assert _count(conn, "SELECT COUNT(*) FROM advertisers") == 1
+        assert _count(conn, "SELECT COUNT(*) FROM site_advertiser_rules") == 1
+        assert _count(conn, "SELECT COUNT(*) FROM sync_logs") == 0
+
+    def test_cleans_up_only_its_own_stale_ads(self, conn, fake_flexoffers_client):
+        """Stale ads of the advertiser are deleted; other advertisers are untouched."""
+        api = FakeFlexOffersAPI([1, 2])
+        fake_flexoffers_client(api).sync(
+            conn, site_domain="rvtravellife.com", options=SyncOptions()
+        )
+
+        api.links[1] = [100]
+        del api.advertisers[2]
+        stats = fake_flexoffers_client(api).resync_advertiser(
+            conn, "1", site_domain="rvtravellife.com"
+        )
+
+        assert stats["ads_deleted"] == 1
+        assert _count(conn, "SELECT COUNT(*) FROM ads") == 3
+        assert _count(conn, "SELECT COUNT(*) FROM advertisers WHERE is_active = 1") == 2
+
+    def test_unknown_advertiser(self, conn, fake_flexoffers_client):
+        """An advertiser the network does not return is an error, not an empty sync."""
+        api = FakeFlexOffersAPI([1])
+
+        with pytest.raises(ValueError, match="not found"):
+            fake_flexoffers_client(api).resync_advertiser(conn, "99")
+
+        assert api.ad_requests == []
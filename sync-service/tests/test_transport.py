@@ -0,0 +1,79 @@
+"""Tests for the shared HTTP transport used by the network clients."""
+
+import sys
+
+import httpx
+import pytest
+
+from src.config import HttpOptions
+from src.networks import transport
+from src.networks.cj import CJClient
+from src.networks.flexoffers import FlexOffersClient
+
+
+@pytest.fixture(autouse=True)
+def http_options():
+    """Reset the transport settings (and shared pool) around each test."""
+    transport.configure(HttpOptions())
+    yield
+    transport.configure(HttpOptions())
+
+
+class TestSharedTransport:
+    """Test create_client() and SharedTransport."""
+
+    def test_clients_share_one_pool(self):
+        """Per-domain and per-network clients should reuse one connection pool."""
+        clients = [
+            FlexOffersClient("key-a", domain="a.com"),
+            FlexOffersClient("key-b", domain="b.com"),
+            CJClient("token", "7000001", "100001", domain="a.com"),
+        ]
+
+        pools = {id(c._client._transport._pool) for c in clients}
+
+        assert len(pools) == 1
+
+    def test_closing_a_client_keeps_the_pool(self):
+        """One client closing must not close connections the others are using."""
+        first = FlexOffersClient("key-a", domain="a.com")
+        pool = first._client._transport._pool
+
+        first.close()
+        second = FlexOffersClient("key-b", domain="b.com")
+
+        assert second._client._transport._pool is pool
+
+    def test_limits_and_timeouts_from_options(self):
+        """Pool limits and the default timeout come from HttpOptions."""
+        transport.configure(HttpOptions(max_connections=5, timeout=12, connect_timeout=3))
+        client = transport.create_client()
+
+        assert client.timeout == httpx.Timeout(12, connect=3)
+        assert client._transport._pool._pool._max_connections == 5
+
+    def test_host_timeout_override(self):
+        """Requests to a host with an override get that host's timeout."""
+        transport.configure(HttpOptions(timeout=30, host_timeouts={"slow.example.com": 90}))
+        seen: dict[str, dict] = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen[request.url.host] = request.extensions["timeout"]
+            return httpx.Response(200)
+
+        client = httpx.Client(
+            transport=transport.SharedTransport(httpx.MockTransport(handler)),
+            timeout=transport._timeout(),
+        )
+        client.get("https://slow.example.com/")
+        client.get("https://fast.example.com/")
+
+        assert seen["slow.example.com"]["read"] == 90
+        assert seen["fast.example.com"]["read"] == 30
+
+    def test_http2_without_h2_falls_back(self, monkeypatch):
+        """HTTP/2 is only negotiated when the optional h2 package is installed."""
+        monkeypatch.setitem(sys.modules, "h2", None)
+        transport.configure(HttpOptions(http2=True))
+
+        assert transport._http2_available() is False
@@ -0,0 +1,83 @@
+"""Tests for the streaming CJ XML parser."""
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from src.networks import xmlstream
+
+LINKS_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<cj-api>
+  <links total-matched="3" records-returned="2" page-number="1">
+    <link>
+      <link-id> 11 </link-id>
+      <link-name>Spring &amp; Summer</link-name>
+      <promotion-start-date/>
+      <category>
+        <parent>Home &amp; Garden</parent>
+        <child>Utilities</child>
+      </category>
+      <link-types>
+        <link-type>Banner</link-type>
+        <link-type>Text Link</link-type>
+      </link-types>
+    </link>
+    <link>
+      <link-id>12</link-id>
+      <link-name>Caf\xc3\xa9</link-name>
+    </link>
+  </links>
+</cj-api>
+"""
+
+
+class TestIterRecords:
+    """Test iter_records() and its flattening of CJ records."""
+
+    def test_flattens_records(self):
+        """Simple, nested and list-like children flatten as before."""
+        attribs: dict = {}
+
+        records = list(xmlstream.iter_records(LINKS_XML, "link", attribs))
+
+        assert records == [
+            {
+                "link-id": "11",
+                "link-name": "Spring & Summer",
+                "promotion-start-date": "",
+                "category/parent": "Home & Garden",
+                "category/child": "Utilities",
+                "link-types": ["Banner", "Text Link"],
+            },
+            {"link-id": "12", "link-name": "Café"},
+        ]
+        assert attribs == {"total-matched": "3", "records-returned": "2", "page-number": "1"}
+
+    def test_records_split_across_chunks(self, monkeypatch):
+        """Records are assembled correctly however the bytes are chunked."""
+        expected = list(xmlstream.iter_records(LINKS_XML, "link"))
+        monkeypatch.setattr(xmlstream, "CHUNK_SIZE", 7)
+
+        assert list(xmlstream.iter_records(LINKS_XML, "link")) == expected
+
+    def test_yields_before_the_document_ends(self):
+        """The first record is available before the rest of the body is parsed."""
+        truncated = LINKS_XML[: LINKS_XML.index(b"<link>", LINKS_XML.index(b"</link>"))]
+        records = xmlstream.iter_records(truncated, "link")
+
+        assert next(records)["link-id"] == "11"
+        with pytest.raises(ET.ParseError):
+            next(records)
+
+    def test_empty_wrapper(self):
+        """A page without records yields nothing but still reports the totals."""
+        attribs: dict = {}
+        body = b'<cj-api><advertisers total-matched="0" records-returned="0"/></cj-api>'
+
+        assert list(xmlstream.iter_records(body, "advertiser", attribs)) == []
+        assert attribs["total-matched"] == "0"
+
+    def test_malformed_xml_raises_parse_error(self):
+        """Both backends report malformed XML as ET.ParseError."""
+        with pytest.raises(ET.ParseError):
+            list(xmlstream.iter_records(b"<cj-api><links><link>", "link"))